@@ -0,0 +1,96 @@
+"""
+Benchmark switching palette banks against rebuilding the grid.
+
+For each grid size, four banks of the same size are saved. The old way to
+change palette, writing COLOUR_SET so the grid is torn down and rebuilt,
+is timed against a bank's first switch (its grid is built) and later
+switches (a page flip from the cache). Every column has a live colour, so
+the flip includes carrying that state over. Widgets held per cached bank
+show what the LRU bound is protecting.
+
+Run with: python benchmarks/bench_banks.py [--sizes 8x5 16x16 32x32] [--runs 20]
+"""
+
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import argparse
+import logging
+import statistics
+import time
+
+from PySide6.QtWidgets import QApplication
+
+from resolume_colour_picker import CONSTS
+from resolume_colour_picker.application import ColourPickerEngine
+from resolume_colour_picker.stand_in_server import StandInResolume
+
+from bench_ui import colour_set, dispose, make_config
+
+
+BANKS = 4
+
+
+def timed_ms(app, fn):
+    """(ms in the call, ms including the repaint that follows)"""
+    start = time.perf_counter()
+    fn()
+    called = time.perf_counter()
+    app.processEvents()
+    return (called - start) * 1000, (time.perf_counter() - start) * 1000
+
+
+def medians(times):
+    return tuple(statistics.median(column) for column in zip(*times))
+
+
+def run(app, port, colours, layers, runs):
+    config = make_config(port, colours, layers)
+    banks = {f"Bank {i}": colour_set(colours, seed=i) for i in range(BANKS)}
+    config["PALETTE_BANKS"] = banks
+    config["ACTIVE_BANK"] = "Bank 0"
+    config["COLOUR_SET"] = dict(banks["Bank 0"])
+    engine = ColourPickerEngine(config, CONSTS)
+    engine.show()
+    app.processEvents()
+    engine.dispatcher.send = lambda targets, force=False: None
+    for i, column in enumerate(engine.non_all_columns):
+        engine.on_press(column, i % colours, None)
+
+    rebuild = []
+    for i in range(runs):
+        def edit():
+            config["COLOUR_SET"] = dict(banks[f"Bank {1 + i % 2}"])
+            engine.config_callback("COLOUR_SET", None)
+        rebuild.append(timed_ms(app, edit))
+
+    widgets = len(QApplication.allWidgets())
+    first = [timed_ms(app, lambda: engine.switch_bank(f"Bank {i}")) for i in (2, 3)]
+    per_page = (len(QApplication.allWidgets()) - widgets) / 2
+    names = [f"Bank {i}" for i in (1, 2, 3)]
+    flips = [timed_ms(app, lambda: engine.switch_bank(names[i % 3])) for i in range(runs)]
+    dispose(engine)
+    return medians(rebuild), medians(first), medians(flips), per_page
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", nargs="+", default=["8x5", "16x16", "32x32"], help="colours x layers")
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    logging.getLogger("resolume_colour_picker").setLevel(logging.ERROR)
+    print(f"Palette change, median ms in the call / with the repaint ({CONSTS['BANK_CACHE_SIZE']} bank grids cached)")
+    print(f"{'grid':>7} {'rebuild':>17} {'first switch':>17} {'cached switch':>17} {'widgets/bank':>13}")
+    with StandInResolume() as server:
+        for size in args.sizes:
+            colours, layers = (int(n) for n in size.split("x"))
+            rebuild, first, flip, widgets = run(app, server.port, colours, layers, args.runs)
+            cells = " ".join(f"{call:8.2f} /{total:8.2f}" for call, total in (rebuild, first, flip))
+            print(f"{size:>7} {cells} {widgets:13.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Benchmark parameter bindings: compiled setters and merged requests.
+
+First the cost of building one request body: a deep copy of the template
+with the value written in, as colour requests used to be built, against
+the setter a binding's path is compiled into. Then a fader drag of two
+bound parameters over every mapped layer, against a stand-in server that
+takes a while per request: sending a request per parameter per step, as a
+control wired straight to the API would, against set_parameters, which
+merges the parameters of a layer and coalesces steps while a layer's
+request is in flight.
+
+Run with: python benchmarks/bench_bindings.py [--layers 16] [--steps 100] [--latency-ms 5]
+"""
+
+import argparse
+import copy
+import logging
+import time
+import timeit
+
+from PySide6.QtCore import QCoreApplication
+
+from resolume_colour_picker import CONSTS
+from resolume_colour_picker.bindings import compile_template, parse_path
+from resolume_colour_picker.layers import target_path
+from resolume_colour_picker.replay import HeadlessCore, ReplayConfig, _base_payload
+from resolume_colour_picker.stand_in_server import StandInResolume
+
+
+BINDINGS = {
+    "Opacity": {"path": "video/opacity", "control": "fader"},
+    "Hue": {"path": "video/effects/1/params/Hue Rotate", "control": "fader"},
+}
+
+
+def setter_us(number=100000):
+    payload = _base_payload()
+    path = parse_path("video/effects/0/params/Color")
+
+    def deep_copy(value):
+        body = copy.deepcopy(payload)
+        node = body
+        for key in path:
+            node = node[key]
+        node["value"] = value
+        return body
+
+    compiled = compile_template(payload)
+    return {
+        name: timeit.timeit(lambda: build("#ff0000"), number=number) / number * 1e6
+        for name, build in (("deep copy", deep_copy), ("compiled", compiled))
+    }
+
+
+def landed(server, layers, value):
+    """Whether every layer's last opacity request carried this value"""
+    last = {}
+    for _, layer, _, body in list(server.requests):
+        opacity = body.get("video", {}).get("opacity")
+        if opacity is not None:
+            last[layer] = opacity["value"]
+    return all(last.get(layer) == value for layer in layers)
+
+
+def drag(server, dispatcher, layers, steps, merged):
+    """Drag both faders from 0 to 1; returns (requests, ms until the last position landed everywhere)"""
+    server.requests.clear()
+    channel = dispatcher.hosts["main"]
+    bindings = dispatcher.bindings
+    start = time.perf_counter()
+    for step in range(1, steps + 1):
+        value = step / steps
+        if merged:
+            dispatcher.set_parameters({("main", layer): {"Opacity": value, "Hue": value} for layer in layers})
+        else:
+            for layer in layers:
+                url = channel.api_base_url + target_path(layer)
+                for name in ("Opacity", "Hue"):
+                    channel.submit(channel.session.put, url, json=bindings.get(name).build(value))
+        time.sleep(0.001)  # a fader reports about once a millisecond while it moves
+    deadline = time.monotonic() + 30
+    while not landed(server, layers, 1.0) and time.monotonic() < deadline:
+        time.sleep(0.0005)
+    elapsed = (time.perf_counter() - start) * 1000
+    while channel.pending["normal"] or channel.parameters_busy:
+        time.sleep(0.001)
+    time.sleep(0.05)
+    return len(server.requests), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--layers", type=int, default=16)
+    parser.add_argument("--steps", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="server time per request")
+    args = parser.parse_args()
+
+    QCoreApplication.instance() or QCoreApplication([])
+    logging.getLogger("resolume_colour_picker").setLevel(logging.ERROR)
+
+    print("Building one colour request body")
+    for name, us in setter_us().items():
+        print(f"  {name:<10} {us:6.2f} us")
+
+    with StandInResolume(latency_ms=args.latency_ms) as server:
+        config = ReplayConfig({
+            "WEBSERVER_IP": "127.0.0.1",
+            "WEBSERVER_PORT": str(server.port),
+            "LAYER_MAP": {"ALL": "ALL", **{f"Layer {i}": i for i in range(1, args.layers + 1)}},
+            "EXTRA_HOSTS": [],
+            "COLUMN_HOSTS": {},
+            "PARAMETER_BINDINGS": BINDINGS,
+        })
+        dispatcher = HeadlessCore(config, CONSTS).dispatcher
+        dispatcher.warm_all()
+        time.sleep(0.3)
+        layers = list(range(1, args.layers + 1))
+        results = {name: drag(server, dispatcher, layers, args.steps, merged) for name, merged in (
+            ("per parameter", False), ("merged", True),
+        )}
+        dispatcher.close()
+
+    print(
+        f"\nDragging 2 bound faders over {args.layers} layers in {args.steps} steps "
+        f"({args.latency_ms:g} ms server)"
+    )
+    print(f"{'':>15} {'requests':>9} {'last position landed ms':>24}")
+    for name, (count, ms) in results.items():
+        print(f"{name:>15} {count:9d} {ms:24.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark per-layer calibration lookup tables.
+
+Every layer of a 64-layer rig gets its own gain/gamma curve (every fourth one
+a 17^3 .cube LUT as well) over a 64-colour palette. The full build, a
+one-colour palette edit and a one-layer calibration edit are timed, then the
+per-press cost of looking a corrected colour up is compared with working it
+out from the curve on every press.
+
+Run with: python benchmarks/bench_calibration.py [--layers 64] [--colours 64]
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+from resolume_colour_picker.calibration import CalibrationTable
+from resolume_colour_picker.palette import hex_to_rgb_array, rgb_array_to_hex
+
+
+def write_cube(size=17):
+    """A warm-tinted 17^3 LUT, the size most LED processors export"""
+    steps = np.linspace(0.0, 1.0, size)
+    rows = [f"{min(r * 1.05, 1):.6f} {g:.6f} {b * 0.9:.6f}" for b in steps for g in steps for r in steps]
+    handle, path = tempfile.mkstemp(suffix=".cube")
+    with os.fdopen(handle, "w") as f:
+        f.write(f"LUT_3D_SIZE {size}\n" + "\n".join(rows))
+    return path
+
+
+def timed_ms(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--layers", type=int, default=64)
+    parser.add_argument("--colours", type=int, default=64)
+    parser.add_argument("--presses", type=int, default=10000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    colours = rgb_array_to_hex(rng.random((args.colours, 3)))
+    cube = write_cube()
+    calibration = {
+        str(layer): {"gain": [1.0, 0.9, 0.8], "gamma": 1.1, **({"lut": cube} if layer % 4 == 0 else {})}
+        for layer in range(1, args.layers + 1)
+    }
+
+    table = CalibrationTable()
+    build_ms, _ = timed_ms(table.update, calibration, colours)
+    print(f"{args.layers} layers x {args.colours} colours")
+    print(f"  full build:             {build_ms:7.2f} ms  ({table.computed} corrections)")
+
+    before = table.computed
+    edited = colours[:-1] + ["#123456"]
+    palette_ms, _ = timed_ms(table.update, calibration, edited)
+    print(f"  one colour edited:      {palette_ms:7.2f} ms  ({table.computed - before} corrections)")
+
+    before = table.computed
+    calibration["2"] = {"gain": [1.0, 0.85, 0.8], "gamma": 1.1}
+    layer_ms, changed = timed_ms(table.update, calibration, edited)
+    print(f"  one layer recalibrated: {layer_ms:7.2f} ms  ({table.computed - before} corrections, layers {sorted(changed)})")
+
+    presses = [(("main", int(rng.integers(1, args.layers + 1))), edited[int(rng.integers(len(edited)))]) for _ in range(args.presses)]
+    lookup_us, direct_us = [], []
+    for layer, colour in presses:
+        start = time.perf_counter()
+        table.correct(layer, colour)
+        lookup_us.append((time.perf_counter() - start) * 1e6)
+        curve = table.curves[layer]
+        start = time.perf_counter()
+        rgb_array_to_hex(curve.apply(hex_to_rgb_array([colour])))
+        direct_us.append((time.perf_counter() - start) * 1e6)
+    os.remove(cube)
+
+    print(f"per press, {args.presses} presses:")
+    print(f"  lookup table:    median {statistics.median(lookup_us):6.2f} us  max {max(lookup_us):7.1f} us")
+    print(f"  curve per press: median {statistics.median(direct_us):6.2f} us  max {max(direct_us):7.1f} us")
+
+
+if __name__ == "__main__":
+    main()
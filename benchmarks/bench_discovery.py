@@ -0,0 +1,35 @@
+"""
+Benchmark a /24 discovery sweep against local stand-in servers.
+
+Every 127.0.0.x address is loopback, so the sweep exercises the full
+host x port fan-out while only 127.0.0.1 has responders.
+
+Run with: python benchmarks/bench_discovery.py
+"""
+
+import time
+
+from resolume_colour_picker.discovery import scan, subnet_hosts
+from resolume_colour_picker.stand_in_server import StandInResolume
+
+
+def main(server_count=3):
+    servers = [StandInResolume().start() for _ in range(server_count)]
+    try:
+        ports = [s.port for s in servers]
+        hosts = subnet_hosts("127.0.0.0/24")
+        start = time.perf_counter()
+        found = scan(hosts, ports)
+        elapsed = time.perf_counter() - start
+        print(f"Discovery sweep: {len(hosts)} hosts x {len(ports)} ports")
+        print(f"  elapsed:    {elapsed * 1000:8.1f} ms")
+        print(f"  responders: {len(found)}")
+        for server in found:
+            print(f"    {server.ip}:{server.port}  {server.latency_ms:6.2f} ms  {server.product}")
+    finally:
+        for server in servers:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
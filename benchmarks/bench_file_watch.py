@@ -0,0 +1,133 @@
+"""
+Benchmark hot reload, from saving a watched file to the grid showing it.
+
+For each grid size the engine follows a palette file and a layer-map file.
+A palette save that recolours one row restyles that row in place, and one
+that adds or removes a row adds or deletes only that row's buttons.
+Likewise a layer-map save that only moves layers keeps every widget,
+while one that renames a column replaces only that column's. Each time
+runs from the write to the change being on the widgets, including the
+file notification, the debounce, the off-thread parse and the repaint.
+
+Run with: python benchmarks/bench_file_watch.py [--sizes 8x5 16x16 32x32] [--runs 10]
+"""
+
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import argparse
+import json
+import logging
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from PySide6.QtCore import QEvent
+from PySide6.QtWidgets import QApplication
+
+from resolume_colour_picker import CONSTS
+from resolume_colour_picker.application import ColourPickerEngine
+from resolume_colour_picker.replay import ReplayConfig
+from resolume_colour_picker.stand_in_server import StandInResolume
+
+from bench_ui import colour_set, dispose, layer_map
+
+
+def wait_for(app, condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        app.processEvents()
+    if not condition():
+        raise TimeoutError("The save never reached the grid")
+
+
+def save_ms(app, path, data, applied):
+    """Write a file and time until applied() is true"""
+    # Widgets a previous rebuild let go of are deleted before the clock starts
+    app.sendPostedEvents(None, QEvent.DeferredDelete)
+    app.processEvents()
+    start = time.perf_counter()
+    path.write_text(json.dumps(data), encoding="utf-8")
+    wait_for(app, applied)
+    app.processEvents()
+    return (time.perf_counter() - start) * 1000
+
+
+def run(app, port, colours, layers, runs, folder):
+    palette_file, map_file = folder / "palette.json", folder / "layers.json"
+    palette, columns = colour_set(colours), layer_map(layers)
+    palette_file.write_text(json.dumps(palette), encoding="utf-8")
+    map_file.write_text(json.dumps(columns), encoding="utf-8")
+    config = ReplayConfig({
+        "WEBSERVER_IP": "127.0.0.1",
+        "WEBSERVER_PORT": str(port),
+        "COLOUR_SET": palette,
+        "LAYER_MAP": columns,
+        "EXTRA_HOSTS": [],
+        "COLUMN_HOSTS": {},
+        "PALETTE_FILE": str(palette_file),
+        "LAYER_MAP_FILE": str(map_file),
+    })
+    engine = ColourPickerEngine(config, CONSTS)
+    engine.show()
+    app.processEvents()
+    engine.dispatcher.send = lambda targets, force=False: None
+    first = next(iter(palette))
+    last = list(palette)[-1]
+    column = "Layer 1"
+
+    results = {"recolour": [], "add/remove row": [], "move layers": [], "rename column": []}
+    for i in range(runs):
+        hex_val = f"#{i:02x}{i:02x}80"
+        results["recolour"].append(save_ms(
+            app, palette_file, {**palette, first: hex_val},
+            lambda: hex_val in engine.buttons[(column, 0)].styleSheet(),
+        ))
+        trimmed = {label: colour for label, colour in palette.items() if label != last}
+        for rows in (trimmed, palette):
+            results["add/remove row"].append(save_ms(
+                app, palette_file, rows,
+                lambda: len(engine.colour_rows) == len(rows) and (column, 0) in engine.buttons,
+            ))
+
+        moved = {**columns, column: f"1-{2 + i % 2}"}
+        results["move layers"].append(save_ms(
+            app, map_file, moved,
+            lambda: config["LAYER_MAP"] == moved and not engine.file_watcher.timers["LAYER_MAP_FILE"].isActive(),
+        ))
+        name = f"Layer 1 ({i})"
+        renamed = {name if key == column else key: value for key, value in columns.items()}
+        results["rename column"].append(save_ms(
+            app, map_file, renamed,
+            lambda: (name, 0) in engine.buttons,
+        ))
+        column, columns = name, renamed
+    engine.file_watcher.stop()
+    dispose(engine)
+    return {name: statistics.median(times) for name, times in results.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", nargs="+", default=["8x5", "16x16", "32x32"], help="colours x layers")
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    logging.getLogger("resolume_colour_picker").setLevel(logging.ERROR)
+    print(f"Save to grid, median ms ({CONSTS['FILE_RELOAD_DEBOUNCE']} ms debounce included)")
+    print(f"{'grid':>7} {'recolour':>9} {'add/remove row':>15} {'move layers':>12} {'rename column':>14}")
+    with StandInResolume() as server, tempfile.TemporaryDirectory() as folder:
+        for size in args.sizes:
+            colours, layers = (int(n) for n in size.split("x"))
+            times = run(app, server.port, colours, layers, args.runs, Path(folder))
+            print(
+                f"{size:>7} {times['recolour']:9.1f} {times['add/remove row']:15.1f} "
+                f"{times['move layers']:12.1f} {times['rename column']:14.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Benchmark gradients spread across the mapped layers.
+
+The per-layer colours are worked out in one vectorised OKLab pass and
+compared with converting each layer's colour on its own. The gradient is
+then sent across a 16-layer rig, once as the single batch apply_gradient()
+sends and once as one send per column, as pressing a different row in each
+column would, against a stand-in server answering each request in 2 ms.
+
+Run with: python benchmarks/bench_gradient.py [--layers 16] [--runs 50]
+"""
+
+import argparse
+import logging
+import statistics
+import time
+
+import numpy as np
+from PySide6.QtCore import QCoreApplication
+
+from resolume_colour_picker import CONSTS
+from resolume_colour_picker.palette import (
+    gradient, hex_to_rgb_array, oklab_to_srgb, rgb_array_to_hex, srgb_to_oklab
+)
+from resolume_colour_picker.replay import HeadlessCore, ReplayConfig
+from resolume_colour_picker.stand_in_server import StandInResolume
+
+
+STOPS = ["#ff0000", "#ffffff", "#0000ff"]
+
+
+def gradient_per_layer(stops, count):
+    """The same gradient, one layer at a time"""
+    lab = srgb_to_oklab(hex_to_rgb_array(stops))
+    colours = []
+    for i in range(count):
+        position = i * (len(lab) - 1) / max(count - 1, 1)
+        segment = min(int(position), len(lab) - 2)
+        frac = position - segment
+        mixed = lab[segment] * (1 - frac) + lab[segment + 1] * frac
+        colours.append(rgb_array_to_hex(oklab_to_srgb(mixed[np.newaxis]))[0])
+    return colours
+
+
+def median_us(fn, runs=200):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(times)
+
+
+def wait_for(app, condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.001)
+    return condition()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--layers", type=int, default=16)
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="server time per request")
+    args = parser.parse_args()
+
+    print("Working out per-layer colours (3 stops)")
+    print(f"{'layers':>7} {'vectorised us':>14} {'per layer us':>13}")
+    for count in (8, 64, 512, 4096):
+        assert gradient(STOPS, count) == gradient_per_layer(STOPS, count)
+        vectorised = median_us(lambda: gradient(STOPS, count))
+        looped = median_us(lambda: gradient_per_layer(STOPS, count), runs=20)
+        print(f"{count:7d} {vectorised:14.1f} {looped:13.1f}")
+
+    app = QCoreApplication.instance() or QCoreApplication([])
+    logging.getLogger("resolume_colour_picker").setLevel(logging.ERROR)
+    with StandInResolume(latency_ms=args.latency_ms) as server:
+        config = ReplayConfig({
+            "WEBSERVER_IP": "127.0.0.1",
+            "WEBSERVER_PORT": str(server.port),
+            "LAYER_MAP": {"ALL": "ALL", **{f"Layer {i}": i for i in range(1, args.layers + 1)}},
+            "EXTRA_HOSTS": [],
+            "COLUMN_HOSTS": {},
+        })
+        core = HeadlessCore(config, CONSTS)
+        dispatcher = core.dispatcher
+        dispatcher.warm_all()
+        time.sleep(0.3)
+
+        def per_column(start, end):
+            slots = dispatcher.layer_slots(core.non_all_columns)
+            for (_, targets), colour in zip(slots, gradient([start, end], len(slots))):
+                dispatcher.send(dict.fromkeys(targets, colour))
+
+        batches = []
+        dispatcher.batch_completed.connect(lambda latencies, skew: batches.append(skew))
+        results = {}
+        for name, apply in (("one batch", core.apply_gradient), ("per column", per_column)):
+            times = []
+            batches.clear()
+            for i in range(args.runs):
+                server.requests.clear()
+                # Alternate the direction so every layer changes each run
+                start = time.perf_counter()
+                apply(*(STOPS[::2] if i % 2 else STOPS[2::-2]))
+                wait_for(app, lambda: len(server.requests) >= args.layers)
+                times.append((max(t for t, *_ in server.requests) - start) * 1000)
+            wait_for(app, lambda: not any(channel.state.in_flight for channel in dispatcher.hosts.values()))
+            app.processEvents()  # completions are queued to this thread
+            results[name] = times, len(batches) / args.runs
+        dispatcher.close()
+
+    print(f"\nGradient across {args.layers} layers ({args.latency_ms:g} ms server), last layer landed after:")
+    for name, (times, batch_count) in results.items():
+        print(
+            f"  {name:<11} median {statistics.median(times):6.2f} ms  max {max(times):6.2f} ms  "
+            f"{batch_count:g} batch(es) per gradient"
+        )
+
+
+if __name__ == "__main__":
+    main()
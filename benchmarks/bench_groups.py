@@ -0,0 +1,103 @@
+"""
+Benchmark the requests saved by addressing Resolume layer groups directly.
+
+A 20-layer rig is split into three layer groups (stage left, stage right,
+DJ booth). The same ALL presses and blackout are run with one column per
+layer, then with one column per group resolved through composition
+discovery, against a stand-in server answering each request in 2 ms.
+Requests are counted from the server's own log.
+
+Run with: python benchmarks/bench_groups.py [--presses 50] [--latency-ms 2]
+"""
+
+import argparse
+import logging
+import statistics
+import time
+
+from PySide6.QtCore import QCoreApplication
+
+from resolume_colour_picker import CONSTS
+from resolume_colour_picker.replay import HeadlessCore, ReplayConfig
+from resolume_colour_picker.stand_in_server import StandInResolume
+
+
+LAYERS = 20
+GROUPS = {"Stage Left": list(range(1, 9)), "Stage Right": list(range(9, 17)), "DJ Booth": list(range(17, 21))}
+COLOURS = ("#ff0000", "#00ff00", "#0000ff", "#ffffff")
+
+LAYER_MAPS = {
+    "per layer": {"ALL": "ALL", **{f"Layer {i}": i for i in range(1, LAYERS + 1)}},
+    "per group": {"ALL": "ALL", **{name: f"group:{name}" for name in GROUPS}},
+}
+
+
+def wait_for(app, condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.001)
+    return condition()
+
+
+def run(app, server, layer_map, presses):
+    """ALL presses then a blackout; returns (requests per press, median ms per press, blackout requests)"""
+    config = ReplayConfig({
+        "WEBSERVER_IP": "127.0.0.1",
+        "WEBSERVER_PORT": str(server.port),
+        "LAYER_MAP": layer_map,
+        "EXTRA_HOSTS": [],
+        "COLUMN_HOSTS": {},
+    })
+    core = HeadlessCore(config, CONSTS)
+    dispatcher = core.dispatcher
+    dispatcher.warm_all()
+    dispatcher.discover_groups()
+    # Group columns drive nothing until the composition has been read
+    wait_for(app, lambda: all(dispatcher.targets_for(column) for column in core.non_all_columns))
+    time.sleep(0.3)
+
+    counts, times = [], []
+    for i in range(presses):
+        server.requests.clear()
+        expected = len(dispatcher.mapped_layers()["main"])
+        start = time.perf_counter()
+        core.on_press("ALL", i % len(COLOURS), COLOURS[i % len(COLOURS)])
+        wait_for(app, lambda: len(server.requests) >= expected)
+        times.append((max(t for t, *_ in server.requests) - start) * 1000)
+        counts.append(len(server.requests))
+
+    server.requests.clear()
+    core.panic(next(iter(dispatcher.panic_colours)))
+    wait_for(app, lambda: len(server.requests) >= expected)
+    blackout = len(server.requests)
+
+    dispatcher.close()
+    for channel in dispatcher.hosts.values():
+        channel.close()
+    return statistics.mean(counts), statistics.median(times), blackout
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--presses", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="server time per request")
+    args = parser.parse_args()
+
+    app = QCoreApplication.instance() or QCoreApplication([])
+    logging.getLogger("resolume_colour_picker").setLevel(logging.ERROR)
+    results = {}
+    with StandInResolume(latency_ms=args.latency_ms, layer_groups=GROUPS) as server:
+        for name, layer_map in LAYER_MAPS.items():
+            results[name] = run(app, server, layer_map, args.presses)
+
+    print(f"ALL press on a {LAYERS}-layer rig in {len(GROUPS)} groups ({args.latency_ms:g} ms server)")
+    print(f"{'mapping':<10} {'requests/press':>15} {'median ms':>10} {'blackout reqs':>14}")
+    for name, (requests, ms, blackout) in results.items():
+        print(f"{name:<10} {requests:15.1f} {ms:10.2f} {blackout:14d}")
+    layers, groups = results["per layer"][0], results["per group"][0]
+    print(f"request count cut by {(1 - groups / layers) * 100:.0f}% ({layers:g} -> {groups:g})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Benchmark dominant-colour extraction against image size.
+
+Run with: QT_QPA_PLATFORM=offscreen python benchmarks/bench_image_palette.py
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from PySide6.QtGui import QGuiApplication, QImage
+
+from resolume_colour_picker.image_palette import extract_palette
+
+
+SIZES = [(640, 480), (1920, 1080), (3840, 2160), (6000, 4000)]
+
+
+def make_image(width, height, rng) -> QImage:
+    """Blocky artwork with a handful of flat colours plus noise"""
+    colours = rng.integers(0, 256, size=(6, 3))
+    blocks = rng.integers(0, len(colours), size=(height // 64 + 1, width // 64 + 1))
+    pixels = colours[np.kron(blocks, np.ones((64, 64), dtype=int))[:height, :width]]
+    pixels = np.clip(pixels + rng.normal(0, 8, pixels.shape), 0, 255).astype(np.uint8)
+    data = np.ascontiguousarray(pixels).tobytes()
+    return QImage(data, width, height, width * 3, QImage.Format_RGB888).copy()
+
+
+def main(repeats=3):
+    app = QGuiApplication.instance() or QGuiApplication([])
+    rng = np.random.default_rng(42)
+    print("Image palette extraction (8 colours)")
+    with tempfile.TemporaryDirectory() as tmp:
+        for width, height in SIZES:
+            path = Path(tmp) / f"{width}x{height}.jpg"
+            make_image(width, height, rng).save(str(path), quality=90)
+            times = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                extract_palette(path, 8)
+                times.append((time.perf_counter() - start) * 1000)
+            megapixels = width * height / 1e6
+            print(f"  {width:5d}x{height:<5d} ({megapixels:5.1f} MP): {min(times):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Benchmark nearest-swatch lookups against a large swatch library.
+
+Run with: python benchmarks/bench_palette_index.py
+"""
+
+import random
+import time
+
+from resolume_colour_picker.palette import PaletteIndex
+
+
+def random_hex(rng):
+    return f"#{rng.randrange(0x1000000):06x}"
+
+
+def main(swatch_count=10_000, lookups=2_000, batch=100_000):
+    rng = random.Random(1234)
+    swatches = [(f"Swatch {i}", random_hex(rng)) for i in range(swatch_count)]
+
+    start = time.perf_counter()
+    index = PaletteIndex(swatches)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    queries = [random_hex(rng) for _ in range(lookups)]
+    start = time.perf_counter()
+    for hex_val in queries:
+        index.nearest(hex_val)
+    single = lookups / (time.perf_counter() - start)
+
+    queries = [random_hex(rng) for _ in range(batch)]
+    start = time.perf_counter()
+    index.nearest_many(queries)
+    batched = batch / (time.perf_counter() - start)
+
+    print(f"Palette index @ {swatch_count} swatches")
+    print(f"  build:          {build_ms:8.2f} ms")
+    print(f"  single lookups: {single:10.0f} /s")
+    print(f"  batched:        {batched:10.0f} /s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark how quickly a panic reaches Resolume behind a press storm.
+
+A stand-in server answering each request in 50 ms is sent a storm of presses,
+enough to back the normal lane up for seconds, then a blackout. Times are
+taken from the server's own log of when each request arrived.
+
+Run with: python benchmarks/bench_panic.py
+"""
+
+import json
+import time
+from importlib.resources import files
+
+from PySide6.QtCore import QCoreApplication
+
+from resolume_colour_picker.dispatcher import Dispatcher
+from resolume_colour_picker.replay import ReplayConfig
+from resolume_colour_picker.stand_in_server import StandInResolume
+
+
+def storm_then(server, action, layers=4, presses=200):
+    """Queue a press storm, run action, and return ms until its last request lands"""
+    config = ReplayConfig({
+        "WEBSERVER_IP": "127.0.0.1",
+        "WEBSERVER_PORT": str(server.port),
+        "LAYER_MAP": {f"L{layer}": layer for layer in range(1, layers + 1)},
+    })
+    base_payload = json.loads(files("resolume_colour_picker.data").joinpath("get_colourize.json").read_text())
+    dispatcher = Dispatcher(config, base_payload, panic_colours={"Blackout": "#000000"})
+    channel = dispatcher.hosts["main"]
+    dispatcher.warm_all()
+    time.sleep(0.3)
+
+    colours = ["#ff0000", "#00ff00", "#0000ff"]
+    for i in range(presses):
+        dispatcher.send({("main", 1 + i % layers): colours[i % len(colours)]})
+    server.requests.clear()
+    start = time.perf_counter()
+    colour = action(dispatcher)
+    while True:
+        arrived = [t for t, _, c, _ in list(server.requests) if c == colour]
+        if len(arrived) >= layers:
+            break
+        time.sleep(0.001)
+    elapsed = (max(arrived[:layers]) - start) * 1000
+    channel.close()
+    return elapsed
+
+
+def main():
+    QCoreApplication.instance() or QCoreApplication([])
+    with StandInResolume(latency_ms=50) as server:
+        def normal_lane(dispatcher):
+            dispatcher.send({("main", layer): "#ffffff" for layer in range(1, 5)})
+            return "#ffffff"
+
+        def panic_lane(dispatcher):
+            dispatcher.panic("Blackout")
+            return "#000000"
+
+        normal = storm_then(server, normal_lane)
+        panic = storm_then(server, panic_lane)
+    print("Blackout of 4 layers behind 200 queued presses (50 ms server)")
+    print(f"  normal lane:   {normal:8.1f} ms")
+    print(f"  priority lane: {panic:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
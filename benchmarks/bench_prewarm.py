@@ -0,0 +1,54 @@
+"""
+Benchmark first-press latency with and without connection pre-warming.
+
+Each run builds a fresh host channel against a local stand-in server,
+addressed as 'localhost' so name resolution is part of the cold path, then
+times the first press and the hundredth. The stand-in adds a fixed cost to
+each new connection in place of a LAN handshake; loopback lookups are far
+cheaper than real DNS, so the gap here still understates the saving.
+
+Run with: python benchmarks/bench_prewarm.py
+"""
+
+import statistics
+import time
+
+from resolume_colour_picker.dispatcher import HostChannel
+from resolume_colour_picker.stand_in_server import StandInResolume
+
+
+PAYLOAD = {"video": {"effects": [{"params": {"Color": {"value": "#ff0000"}}}]}}
+
+
+def press(channel):
+    start = time.perf_counter()
+    channel.session.put(f"{channel.api_base_url}/layers/1/clips/1", json=PAYLOAD, timeout=(0.5, 1.0))
+    return (time.perf_counter() - start) * 1000
+
+
+def run(port, warmed):
+    channel = HostChannel("main", "localhost", str(port))
+    if warmed:
+        channel.warm(1).join()
+        time.sleep(0.1)
+    first = press(channel)
+    for _ in range(98):
+        press(channel)
+    hundredth = press(channel)
+    channel.close()
+    return first, hundredth
+
+
+def main(runs=20, connect_latency_ms=5.0):
+    with StandInResolume(connect_latency_ms=connect_latency_ms) as server:
+        for warmed in (False, True):
+            results = [run(server.port, warmed) for _ in range(runs)]
+            first = statistics.median(r[0] for r in results)
+            hundredth = statistics.median(r[1] for r in results)
+            print(f"{'Pre-warmed' if warmed else 'Cold'} ({runs} runs, median)")
+            print(f"  first press:     {first:7.3f} ms")
+            print(f"  hundredth press: {hundredth:7.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
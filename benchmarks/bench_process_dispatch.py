@@ -0,0 +1,97 @@
+"""
+Benchmark send jitter with threaded and isolated (child process) dispatch
+while the GUI thread is busy.
+
+The stand-in server runs in its own process so it doesn't compete for this
+process's GIL either. A press is made every 20 ms; between presses the GUI
+thread restyles a grid of buttons, the same kind of work a palette change or
+layout rebuild does. Latency is from the press to the server receiving it.
+
+Run with: python benchmarks/bench_process_dispatch.py
+"""
+
+import json
+import multiprocessing
+import statistics
+import time
+from importlib.resources import files
+
+from PySide6.QtWidgets import QApplication, QPushButton
+
+from resolume_colour_picker.dispatcher import Dispatcher
+from resolume_colour_picker.replay import ReplayConfig
+from resolume_colour_picker.stand_in_server import StandInResolume
+
+
+def serve(conn):
+    """Run a stand-in server in this process until asked for its request log"""
+    with StandInResolume() as server:
+        conn.send(server.port)
+        conn.recv()
+        conn.send([(t, layer, colour) for t, layer, colour, _ in server.requests])
+
+
+def run(isolated, buttons, presses=150, interval_ms=20):
+    parent, child = multiprocessing.Pipe()
+    server = multiprocessing.get_context("spawn").Process(target=serve, args=(child,), daemon=True)
+    server.start()
+    port = parent.recv()
+
+    config = ReplayConfig({
+        "WEBSERVER_IP": "127.0.0.1",
+        "WEBSERVER_PORT": str(port),
+        "LAYER_MAP": {f"L{layer}": layer for layer in range(1, 5)},
+        "ISOLATED_DISPATCH": isolated,
+    })
+    base_payload = json.loads(files("resolume_colour_picker.data").joinpath("get_colourize.json").read_text())
+    dispatcher = Dispatcher(config, base_payload)
+    dispatcher.warm_all()
+    time.sleep(1.0)  # let the warm-up (and the child process) settle
+
+    sent = {}  # colour -> perf_counter when pressed
+    for i in range(presses):
+        colour = f"#{i:06x}"
+        sent[colour] = time.perf_counter()
+        dispatcher.send({("main", 1 + i % 4): colour})
+        # Busy GUI: restyle buttons until the next press is due
+        deadline = sent[colour] + interval_ms / 1000
+        shade = 0
+        while time.perf_counter() < deadline:
+            for button in buttons:
+                shade = (shade + 7) % 256
+                button.setStyleSheet(f"QPushButton {{ background-color: rgb({shade}, 0, 0); border: 1px solid #444; }}")
+        dispatcher.poll_acks()
+
+    time.sleep(0.5)
+    parent.send("done")
+    arrivals = {colour: t for t, _, colour in parent.recv()}
+    server.join()
+    dispatcher.close()
+    for channel in dispatcher.hosts.values():
+        channel.close()
+
+    latencies = sorted((arrivals[c] - sent[c]) * 1000 for c in sent if c in arrivals)
+    return latencies, presses - len(latencies)
+
+
+def report(name, latencies, missing):
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(f"{name}")
+    print(f"  median: {statistics.median(latencies):7.2f} ms")
+    print(f"  p99:    {p99:7.2f} ms")
+    print(f"  max:    {latencies[-1]:7.2f} ms")
+    print(f"  jitter: {statistics.pstdev(latencies):7.2f} ms (std dev)")
+    if missing:
+        print(f"  missing: {missing}")
+
+
+def main():
+    app = QApplication.instance() or QApplication([])
+    buttons = [QPushButton(str(i)) for i in range(64)]
+    for isolated in (False, True):
+        latencies, missing = run(isolated, buttons)
+        report("Isolated dispatch process" if isolated else "Threaded dispatch", latencies, missing)
+
+
+if __name__ == "__main__":
+    main()
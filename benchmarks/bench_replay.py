@@ -0,0 +1,81 @@
+"""
+Benchmark the dispatch path with a synthetic busking session replayed at
+1x, 10x and 100x against a stand-in server.
+
+The session mimics a busy operator: bursts of live presses across eight
+layers, ALL-column hits on the downbeat, a Scene Master cue every so often
+and one blackout. Pass a real recording instead with --session.
+
+Run with: python benchmarks/bench_replay.py [--session path] [--engine] [--latency-ms 2]
+"""
+
+import argparse
+import json
+import random
+import tempfile
+from pathlib import Path
+
+from resolume_colour_picker import session_recorder
+from resolume_colour_picker.replay import format_report, replay
+
+
+COLOUR_SET = {
+    "Red": "#FF0000", "Orange": "#FF8000", "Yellow": "#FFFF00", "Green": "#00FF00",
+    "Cyan": "#00FFFF", "Blue": "#0000FF", "Magenta": "#FF00FF", "White": "#FFFFFF",
+}
+LAYER_MAP = {"ALL": "ALL", **{f"Layer {i}": i for i in range(1, 9)}}
+
+
+def busking_session(path, seconds=20, seed=7):
+    """Write a synthetic recording of roughly 20 presses a second"""
+    rng = random.Random(seed)
+    colours = list(COLOUR_SET.items())
+    columns = [col for col in LAYER_MAP if col != "ALL"]
+    events = []
+    t = 0.0
+    beat = 0
+    while t < seconds * 1000:
+        beat += 1
+        if beat % 16 == 0:
+            row = rng.randrange(len(colours))
+            events.append([t, session_recorder.PRESS, "ALL", row, colours[row][1]])
+        elif beat % 40 == 0:
+            events.append([t, session_recorder.SCENE_MASTER])
+            for column in rng.sample(columns, 4):
+                row = rng.randrange(len(colours))
+                t += rng.uniform(80, 200)
+                events.append([t, session_recorder.PRESS, column, row, colours[row][1]])
+            t += 300
+            events.append([t, session_recorder.GO])
+        else:
+            # A flurry of quick presses on one or two layers
+            for _ in range(rng.randint(1, 4)):
+                row = rng.randrange(len(colours))
+                events.append([t, session_recorder.PRESS, rng.choice(columns), row, colours[row][1]])
+                t += rng.uniform(10, 60)
+        t += rng.uniform(20, 120)
+    events.insert(len(events) * 3 // 4, [events[len(events) * 3 // 4][0], session_recorder.PANIC, "Blackout"])
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"version": session_recorder.FORMAT_VERSION, "layer_map": LAYER_MAP, "colour_set": COLOUR_SET}) + "\n")
+        for event in events:
+            event[0] = round(event[0], 1)
+            f.write(json.dumps(event, separators=(",", ":")) + "\n")
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--session", help="replay this recording instead of a synthetic one")
+    parser.add_argument("--engine", action="store_true", help="drive the full engine rather than the headless core")
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.session or busking_session(Path(tmp) / "busking.jsonl")
+        for speed in (1, 10, 100):
+            print(format_report(replay(path, speed, headless=not args.engine, latency_ms=args.latency_ms)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark clip thumbnails for the column headers.
+
+A rig of mapped layers is shown twice: on a cold start every thumbnail is
+fetched from a stand-in server that takes a while per image, and on a warm
+start they come from the disk cache and are only revalidated. Then a
+colour batch is sent while the thumbnails load, once with the fetcher
+(its own connections, waiting for dispatch) and once with the thumbnails
+put on the dispatcher's own workers, to show what sharing them would cost.
+
+Run with: python benchmarks/bench_thumbnails.py [--layers 32] [--runs 10]
+"""
+
+import argparse
+import logging
+import statistics
+import tempfile
+import time
+
+from PySide6.QtCore import QCoreApplication
+
+from resolume_colour_picker import CONSTS
+from resolume_colour_picker.replay import HeadlessCore, ReplayConfig
+from resolume_colour_picker.stand_in_server import StandInResolume
+from resolume_colour_picker.thumbnails import ThumbnailFetcher, thumbnail_url
+
+
+def wait_for(app, condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.0005)
+    return condition()
+
+
+def show_ms(app, fetcher, targets):
+    """Time until every target has a thumbnail, and until the revalidation is done"""
+    shown = set()
+    fetcher.thumbnail_ready.connect(lambda target, data: shown.add(target))
+    start = time.perf_counter()
+    fetcher.request(targets)
+    wait_for(app, lambda: len(shown) == len(targets))
+    first = (time.perf_counter() - start) * 1000
+    wait_for(app, lambda: not fetcher.running and not fetcher.pending)
+    return first, (time.perf_counter() - start) * 1000
+
+
+def batch_ms(app, server, dispatcher, targets, colour):
+    server.requests.clear()
+    start = time.perf_counter()
+    dispatcher.send(dict.fromkeys(targets, colour))
+    wait_for(app, lambda: len(server.requests) >= len(targets))
+    return (max(t for t, *_ in server.requests) - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--layers", type=int, default=32)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=10.0, help="server time per request")
+    args = parser.parse_args()
+
+    app = QCoreApplication.instance() or QCoreApplication([])
+    logging.getLogger("resolume_colour_picker").setLevel(logging.ERROR)
+    workers = CONSTS["THUMBNAIL_WORKERS"]
+    with StandInResolume(latency_ms=args.latency_ms) as server, tempfile.TemporaryDirectory() as folder:
+        config = ReplayConfig({
+            "WEBSERVER_IP": "127.0.0.1",
+            "WEBSERVER_PORT": str(server.port),
+            "LAYER_MAP": {"ALL": "ALL", **{f"Layer {i}": i for i in range(1, args.layers + 1)}},
+            "EXTRA_HOSTS": [],
+            "COLUMN_HOSTS": {},
+        })
+        core = HeadlessCore(config, CONSTS)
+        dispatcher = core.dispatcher
+        dispatcher.warm_all()
+        time.sleep(0.3)
+        targets = [("main", layer) for layer in range(1, args.layers + 1)]
+
+        starts = {}
+        for name in ("cold", "warm"):
+            fetcher = ThumbnailFetcher(dispatcher, folder, CONSTS["THUMBNAIL_CACHE_BYTES"], workers)
+            starts[name] = show_ms(app, fetcher, targets)
+            fetcher.close()
+
+        lanes = {"no thumbnails": [], "fetcher": [], "dispatch workers": []}
+        channel = dispatcher.hosts["main"]
+        for i in range(args.runs):
+            colour = "#ff0000" if i % 2 else "#0000ff"
+            lanes["no thumbnails"].append(batch_ms(app, server, dispatcher, targets, colour))
+
+            with tempfile.TemporaryDirectory() as empty:
+                fetcher = ThumbnailFetcher(dispatcher, empty, CONSTS["THUMBNAIL_CACHE_BYTES"], workers)
+                fetcher.request(targets)
+                lanes["fetcher"].append(batch_ms(app, server, dispatcher, targets, colour[::-1]))
+                wait_for(app, lambda: not fetcher.running and not fetcher.pending)
+                fetcher.close()
+
+            for _, layer in targets:
+                channel.submit(channel.session.get, thumbnail_url(channel.api_base_url, layer))
+            lanes["dispatch workers"].append(batch_ms(app, server, dispatcher, targets, colour))
+            wait_for(app, lambda: not channel.pending["normal"])
+            time.sleep(args.latency_ms * 4 / 1000)
+        dispatcher.close()
+
+    print(f"Thumbnails for {args.layers} layers ({args.latency_ms:g} ms server, {workers} workers)")
+    print(f"{'start':>6} {'all shown ms':>13} {'revalidated ms':>15}")
+    for name, (shown, done) in starts.items():
+        print(f"{name:>6} {shown:13.1f} {done:15.1f}")
+    print(f"\nColour batch to {args.layers} layers while thumbnails load, last layer landed after:")
+    for name, times in lanes.items():
+        print(f"  {name:<17} median {statistics.median(times):7.2f} ms  max {max(times):7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
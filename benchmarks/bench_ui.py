@@ -0,0 +1,216 @@
+"""
+Benchmark the widget side of the engine across grid sizes, without a display.
+
+For each grid (colours x layers, 5x8 up to 64x64) this times building the
+engine, rebuilding it for a new colour set and layer map, restyling every
+button, a Scene Master enter/GO/cancel cycle and a storm of clicks. Each
+scenario includes a processEvents() so layout and offscreen painting are
+counted. Times are the median of several runs; peak memory is a separate
+run under tracemalloc, so it covers Python allocations only.
+
+Requests go to a stand-in server so the network isn't part of the picture.
+
+Run with: python benchmarks/bench_ui.py [--sizes 5x8 16x16] [--runs 3] [--json results.json]
+"""
+
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import argparse
+import json
+import logging
+import random
+import statistics
+import time
+import tracemalloc
+
+from PySide6.QtWidgets import QApplication
+
+from resolume_colour_picker import CONSTS
+from resolume_colour_picker.application import ColourPickerEngine
+from resolume_colour_picker.replay import ReplayConfig
+from resolume_colour_picker.stand_in_server import StandInResolume
+
+
+SIZES = ((5, 8), (16, 16), (32, 32), (64, 64))
+CLICKS = 500
+
+
+def colour_set(count, seed=0):
+    rng = random.Random(seed)
+    return {f"{i + 1} - Colour": f"#{rng.randrange(0x1000000):06X}" for i in range(count)}
+
+
+def layer_map(count):
+    return {"ALL": "ALL", **{f"Layer {i}": i for i in range(1, count + 1)}}
+
+
+def make_config(port, colours, layers):
+    return ReplayConfig({
+        "WEBSERVER_IP": "127.0.0.1",
+        "WEBSERVER_PORT": str(port),
+        "COLOUR_SET": colour_set(colours),
+        "LAYER_MAP": layer_map(layers),
+        "EXTRA_HOSTS": [],
+        "COLUMN_HOSTS": {},
+    })
+
+
+def dispose(engine):
+    engine.timer.stop()
+    engine.reconciler.stop()
+    engine.watchdog.stop()
+    engine.dispatcher.close()
+    for channel in engine.dispatcher.hosts.values():
+        channel.close()
+    engine.close()
+    engine.deleteLater()
+
+
+# =========================
+# SCENARIOS
+# =========================
+# Each takes (app, port, colours, layers) and returns a function to time,
+# plus an optional cleanup.
+
+def build(app, port, colours, layers):
+    config = make_config(port, colours, layers)
+    engines = []
+
+    def run():
+        engine = ColourPickerEngine(config, CONSTS)
+        engine.show()
+        app.processEvents()
+        engines.append(engine)
+    return run, lambda: [dispose(e) for e in engines]
+
+
+def _engine(app, port, colours, layers):
+    engine = ColourPickerEngine(make_config(port, colours, layers), CONSTS)
+    engine.show()
+    app.processEvents()
+    return engine
+
+
+def rebuild_colours(app, port, colours, layers):
+    engine = _engine(app, port, colours, layers)
+    seeds = iter(range(1, 1000))
+
+    def run():
+        engine.config["COLOUR_SET"] = colour_set(colours, next(seeds))
+        app.processEvents()  # the change reaches the engine as a queued signal, as in the app
+    return run, lambda: dispose(engine)
+
+
+def rebuild_layers(app, port, colours, layers):
+    engine = _engine(app, port, colours, layers)
+
+    def run():
+        engine.config["LAYER_MAP"] = layer_map(layers)
+        app.processEvents()
+    return run, lambda: dispose(engine)
+
+
+def restyle(app, port, colours, layers):
+    engine = _engine(app, port, colours, layers)
+    buttons = list(engine.buttons)
+
+    def run():
+        for column, row in buttons:
+            engine._set_button_state(column, row, selected=True)
+        app.processEvents()
+        for column, row in buttons:
+            engine._set_button_state(column, row, selected=False)
+        app.processEvents()
+    return run, lambda: dispose(engine)
+
+
+def scene_master(app, port, colours, layers):
+    engine = _engine(app, port, colours, layers)
+    rng = random.Random(1)
+
+    def run():
+        for finish in (engine.send_queued_changes, engine.cancel_scene_master):
+            engine.toggle_scene_master()
+            for column in engine.non_all_columns:
+                engine.on_press(column, rng.randrange(colours), None)
+            app.processEvents()
+            finish()
+            app.processEvents()
+    return run, lambda: dispose(engine)
+
+
+def click_storm(app, port, colours, layers):
+    engine = _engine(app, port, colours, layers)
+    rng = random.Random(2)
+    columns = list(engine.columns)
+
+    def run():
+        for i in range(CLICKS):
+            engine.on_press(rng.choice(columns), rng.randrange(colours), None)
+            if i % 10 == 0:
+                app.processEvents()
+        app.processEvents()
+    return run, lambda: dispose(engine)
+
+
+SCENARIOS = {
+    "build": build,
+    "rebuild colours": rebuild_colours,
+    "rebuild layers": rebuild_layers,
+    "restyle all": restyle,
+    "scene GO+cancel": scene_master,
+    f"{CLICKS} clicks": click_storm,
+}
+
+
+def measure(app, port, scenario, colours, layers, runs):
+    """Median ms over runs, then peak traced KiB over one more"""
+    run, cleanup = scenario(app, port, colours, layers)
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        run()
+        times.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    cleanup()
+    app.processEvents()
+    return statistics.median(times), peak / 1024
+
+
+def parse_size(text):
+    colours, layers = text.lower().split("x")
+    return int(colours), int(layers)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", nargs="+", type=parse_size, default=SIZES, help="colours x layers, e.g. 5x8")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--json", help="also write the results here, for CI to compare")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    # The stall watchdog would otherwise report every scenario that blocks
+    logging.getLogger("resolume_colour_picker").setLevel(logging.ERROR)
+    results = []
+    with StandInResolume() as server:
+        print(f"{'grid':>7}  {'scenario':<16} {'median ms':>10} {'peak KiB':>10}")
+        for colours, layers in args.sizes:
+            for name, scenario in SCENARIOS.items():
+                ms, kib = measure(app, server.port, scenario, colours, layers, args.runs)
+                print(f"{colours:>3}x{layers:<3}  {name:<16} {ms:10.2f} {kib:10.1f}")
+                results.append({"colours": colours, "layers": layers, "scenario": name, "ms": ms, "peak_kib": kib})
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
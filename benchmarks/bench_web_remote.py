@@ -0,0 +1,95 @@
+"""
+Benchmark the web remote's push path with ten browsers connected.
+
+Each client reads /events on its own thread. The GUI side publishes a burst
+of button changes, as a run of presses would, and the time each change takes
+to reach every client is measured. Publishing is timed separately, since it
+runs on the GUI thread.
+
+Run with: python benchmarks/bench_web_remote.py [--clients 10] [--changes 1000]
+"""
+
+import argparse
+import http.client
+import json
+import statistics
+import threading
+import time
+
+from resolume_colour_picker.web_remote import WebRemote, button_key
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def reader(port, sent, arrivals, ready):
+    """Record when each published change reaches this client"""
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    conn.request("GET", "/events")
+    response = conn.getresponse()
+    ready.release()
+    events = 0
+    for line in response:
+        if not line.startswith(b"data: "):
+            continue
+        now = time.perf_counter()
+        data = json.loads(line[6:])
+        for key in data.get("changes", {}):
+            arrivals.append(now - sent[key])
+        events += 1
+        if data.get("changes", {}).get("done"):
+            break
+    conn.close()
+    arrivals.append(events)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=10)
+    parser.add_argument("--changes", type=int, default=1000)
+    parser.add_argument("--interval-ms", type=float, default=1.0, help="time between changes")
+    args = parser.parse_args()
+
+    remote = WebRemote(0, host="127.0.0.1").start()
+    remote.state.reset({"columns": [f"Layer {i}" for i in range(16)], "rows": [["Red", "#ff0000"]] * 16})
+    sent = {}
+    results = [[] for _ in range(args.clients)]
+    ready = threading.Semaphore(0)
+    threads = [
+        threading.Thread(target=reader, args=(remote.port, sent, arrivals, ready), daemon=True) for arrivals in results
+    ]
+    for thread in threads:
+        thread.start()
+    for _ in threads:
+        ready.acquire()
+    time.sleep(0.2)
+
+    publish_us = []
+    for i in range(args.changes):
+        key = button_key(f"Layer {i % 16}", i % 16)
+        sent[key] = time.perf_counter()
+        start = time.perf_counter()
+        remote.state.publish({key: 1 + (i // 16) % 2})
+        publish_us.append((time.perf_counter() - start) * 1e6)
+        time.sleep(args.interval_ms / 1000)
+    sent["done"] = time.perf_counter()
+    remote.state.publish({"done": True})
+    for thread in threads:
+        thread.join(10)
+    remote.stop()
+
+    latencies = [ms * 1000 for arrivals in results for ms in arrivals[:-1]]
+    events = [arrivals[-1] for arrivals in results]
+    print(f"{args.changes} changes, {args.interval_ms:g} ms apart, to {args.clients} clients")
+    print(f"  publish on GUI thread: median {statistics.median(publish_us):.1f} us, max {max(publish_us):.1f} us")
+    print(
+        f"  delivery: p50 {percentile(latencies, 0.5):.2f} ms  p99 {percentile(latencies, 0.99):.2f} ms  "
+        f"max {max(latencies):.2f} ms"
+    )
+    print(f"  events per client: {min(events)}-{max(events)} (deltas merged when a client falls behind)")
+
+
+if __name__ == "__main__":
+    main()
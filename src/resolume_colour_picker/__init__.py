@@ -17,6 +17,7 @@ from PySide6.QtGui import QColor, QPalette
 
 from resolume_colour_picker.application import ColourPickerEngine
 from resolume_colour_picker.config import Config
+from resolume_colour_picker.log import setup_logging, shutdown_logging
 
 # =========================
 # CONFIGURATION
@@ -44,7 +45,21 @@ CONSTS = {
     "WINDOW_SIZE": (900, 700),
     "BUTTON_HEIGHT": 55,
     "DARKEN_FACTOR": 0.65,
-    "HEARTBEAT_INTERVAL": 3000  # 3 seconds in milliseconds
+    "HEARTBEAT_INTERVAL": 3000,  # 3 seconds in milliseconds
+    "RECONCILE_INTERVAL": 1000,  # one read-back per second
+    "KEEPALIVE_INTERVAL": 10000,  # re-warm idle connections every 10 seconds
+    "STALL_PROBE_INTERVAL": 10,  # event-loop lag probe, in milliseconds
+    "STALL_THRESHOLD": 100,  # lag that counts as a stall, in milliseconds
+    "BANK_CACHE_SIZE": 4,  # palette bank grids kept built for instant switching
+    "FILE_RELOAD_DEBOUNCE": 50,  # wait for a watched file's save to settle, in milliseconds
+    "THUMBNAIL_HEIGHT": 48,
+    "THUMBNAIL_WORKERS": 2,  # clip thumbnails fetched at once, on connections of their own
+    "THUMBNAIL_CACHE_BYTES": 32 * 1024 * 1024,  # on-disk thumbnail cache, least recently used deleted first
+    "FADER_STEPS": 1000,  # positions a parameter fader has between its binding's min and max
+    "PANIC_COLOURS": {  # name -> (colour, keyboard shortcut)
+        "Blackout": ("#000000", "Ctrl+Shift+B"),
+        "All White": ("#FFFFFF", "Ctrl+Shift+W"),
+    }
 }
 
 
@@ -141,8 +156,14 @@ def start():
     # Apply dark theme
     apply_dark_theme(app)
     
+    setup_logging()
     config = Config("Colour Picker Engine", defaults=defaults)
+    setup_logging(config.get("LOG_LEVEL", "INFO"))
     window = ColourPickerEngine(config, CONSTS)
     window.show()
     app.aboutToQuit.connect(config.save)
+    app.aboutToQuit.connect(window.dispatcher.close)
+    app.aboutToQuit.connect(window.watchdog.stop)
+    app.aboutToQuit.connect(window.file_watcher.stop)
+    app.aboutToQuit.connect(shutdown_logging)
     sys.exit(app.exec())
\ No newline at end of file
@@ -1,10 +1,13 @@
 from PySide6.QtWidgets import (
     QPushButton, QLabel, QVBoxLayout, QHBoxLayout,
     QDialog, QTableWidget, QLineEdit,
-    QHeaderView, QMessageBox
+    QHeaderView, QMessageBox, QCheckBox
 )
 from PySide6.QtCore import Qt
 
+from resolume_colour_picker.hosts import format_hosts, parse_hosts
+from resolume_colour_picker.discovery_dialogue import DiscoveryDialog
+
 class APISettingsDialog(QDialog):
     """Dialog for changing settings"""
     
@@ -15,6 +18,16 @@ class APISettingsDialog(QDialog):
         self.settings = [
             ("WEBSERVER_IP", "input"), 
             ("WEBSERVER_PORT","input"), 
+            ("EXTRA_HOSTS", "hosts"),
+            ("ISOLATED_DISPATCH", "checkbox"),
+            ("SHOW_THUMBNAILS", "checkbox"),
+            ("METRICS_PORT", "input"),
+            ("METRICS_ALL_INTERFACES", "checkbox"),
+            ("WEB_REMOTE_PORT", "input"),
+            ("WEB_REMOTE_TOKEN", "input"),
+            ("PALETTE_FILE", "input"),
+            ("LAYER_MAP_FILE", "input"),
+            ("CALIBRATION_FILE", "input"),
         ]
         self.setting_val = []
         
@@ -42,6 +55,30 @@ class APISettingsDialog(QDialog):
 
             if setting[1] == "input":
                 value = QLineEdit(self.config[setting[0]])
+                if setting[0] == "METRICS_PORT":
+                    value.setPlaceholderText("Blank to disable, e.g. 9100")
+                elif setting[0] == "WEB_REMOTE_PORT":
+                    value.setPlaceholderText("Blank to disable, e.g. 8000 - then browse to this machine")
+                elif setting[0] == "WEB_REMOTE_TOKEN":
+                    value.setPlaceholderText("Blank to make one up; tablets need it to press anything")
+                elif setting[0] == "PALETTE_FILE":
+                    value.setPlaceholderText("Blank to disable, or a .json/.csv/.gpl palette to follow as it is saved")
+                elif setting[0] == "LAYER_MAP_FILE":
+                    value.setPlaceholderText('Blank to disable, or a JSON file such as {"Outer": "1-4", "DJ": 5}')
+                elif setting[0] == "CALIBRATION_FILE":
+                    value.setPlaceholderText('Blank to disable, or a JSON file such as {"main:3": {"lut": "wall.cube"}}')
+            elif setting[1] == "hosts":
+                value = QLineEdit(format_hosts(self.config.get(setting[0], [])))
+                value.setPlaceholderText("backup=192.168.1.11:8080, side=192.168.1.12:8080")
+            elif setting[1] == "checkbox":
+                value = QCheckBox()
+                value.setChecked(bool(self.config.get(setting[0], False)))
+                if setting[0] == "ISOLATED_DISPATCH":
+                    value.setToolTip("Send to Resolume from a separate process, so a busy UI can't delay sends")
+                elif setting[0] == "SHOW_THUMBNAILS":
+                    value.setToolTip("Show the clip each column drives above its header")
+                elif setting[0] == "METRICS_ALL_INTERFACES":
+                    value.setToolTip("Serve metrics to other machines, not just this one")
             elif setting[1] == "button":
                 value = QPushButton("...")
                 value.clicked.connect(lambda checked, fn=setting[2]: fn())
@@ -60,6 +97,10 @@ class APISettingsDialog(QDialog):
         
         # Buttons
         button_layout = QHBoxLayout()
+        discover_btn = QPushButton("Discover...")
+        discover_btn.clicked.connect(self.discover)
+        button_layout.addWidget(discover_btn)
+
         save_btn = QPushButton("Save")
         cancel_btn = QPushButton("Cancel")
         
@@ -73,17 +114,36 @@ class APISettingsDialog(QDialog):
         layout.addLayout(button_layout)
         self.setLayout(layout)
     
+    def discover(self):
+        """Fill the main host from a network scan"""
+        dialog = DiscoveryDialog(self)
+        if dialog.exec() and dialog.selected:
+            ip, port = dialog.selected
+            for row, setting in enumerate(self.settings):
+                if setting[0] == "WEBSERVER_IP":
+                    self.setting_val[row].setText(ip)
+                elif setting[0] == "WEBSERVER_PORT":
+                    self.setting_val[row].setText(port)
+    
     def save_changes(self):
         """Save changes"""
 
+        changes = {}
         for row in range(len(self.settings)):
+            val_widget = self.setting_val[row]
+            key = self.settings[row][0]
             if self.settings[row][1] == "input":
-                val_widget = self.setting_val[row]
-
-
-                key = self.settings[row][0]
-                setting_val = val_widget.text().strip()
+                changes[key] = val_widget.text().strip()
+            elif self.settings[row][1] == "hosts":
+                try:
+                    changes[key] = parse_hosts(val_widget.text())
+                except ValueError as e:
+                    QMessageBox.critical(self, "Error", str(e))
+                    return
+            elif self.settings[row][1] == "checkbox":
+                changes[key] = val_widget.isChecked()
 
-                self.config[key] = setting_val
+        for key, setting_val in changes.items():
+            self.config[key] = setting_val
 
         self.accept()
\ No newline at end of file
@@ -1,27 +1,50 @@
-import copy
 import json
-import requests
+import logging
+import time
 from importlib.resources import files
-from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
 from PySide6.QtWidgets import (
     QWidget, QPushButton,
-    QGridLayout, QLabel, QVBoxLayout, QHBoxLayout,
+    QLabel, QVBoxLayout, QHBoxLayout, QGridLayout, QSlider, QStackedWidget,
 )
-from PySide6.QtCore import Qt, QTimer
-from PySide6.QtGui import QColor
+from PySide6.QtCore import Qt, QTimer, Signal
+from PySide6.QtGui import QColor, QKeySequence, QPixmap, QShortcut
 
 from resolume_colour_picker.status_heartbeat import StatusHeartbeat
 from resolume_colour_picker.colour_dialogue import ColourConfigDialog
 from resolume_colour_picker.api_settings_dialogue import APISettingsDialog
 from resolume_colour_picker.layer_map_dialogue import LayerMapDialog
+from resolume_colour_picker.gradient_dialogue import GradientDialog
+from resolume_colour_picker.dispatcher import Dispatcher
+from resolume_colour_picker.file_watch import FileWatcher
+from resolume_colour_picker.reconciler import Reconciler
+from resolume_colour_picker.hosts import MAIN_HOST
+from resolume_colour_picker.layers import group_index
+from resolume_colour_picker.metrics import GRID_REBUILDS, PRESSES, MetricsServer
+from resolume_colour_picker.log import set_level
+from resolume_colour_picker.log_dialogue import LogDialog
+from resolume_colour_picker.parameter_bindings_dialogue import ParameterBindingsDialog
+from resolume_colour_picker.palette import gradient
+from resolume_colour_picker.palette_banks import GridPage, PageCache
+from resolume_colour_picker.stall_watchdog import StallWatchdog
+from resolume_colour_picker.thumbnails import ThumbnailFetcher
+from resolume_colour_picker import session_recorder
+from resolume_colour_picker.session_recorder import SessionRecorder
+from resolume_colour_picker.web_remote import WebRemote, button_key, new_token
+
+
+logger = logging.getLogger(__name__)
+
 
 class ColourPickerEngine(QWidget):
+    # Remote inputs trigger a panic by name by emitting this, from any thread
+    panic_requested = Signal(str)
+
     def __init__(self, config, consts):
         self.config = config
         self.config.value_changed.connect(self.config_callback, Qt.ConnectionType.QueuedConnection)
-        
-        self.api_base_url = f"http://{self.config["WEBSERVER_IP"]}:{self.config["WEBSERVER_PORT"]}/api/v1/composition"
+
         self.colour_rows = list(self.config["COLOUR_SET"].items())
         self.columns = self.config["LAYER_MAP"].keys()
         self.all_columns = []
@@ -40,25 +63,38 @@ class ColourPickerEngine(QWidget):
             .read_text(encoding="utf-8")
         )
 
-        self.executor = ThreadPoolExecutor(max_workers=4)
-        self.session = requests.Session()
+        panic_colours = {name: colour for name, (colour, _) in consts["PANIC_COLOURS"].items()}
+        self.dispatcher = Dispatcher(self.config, self.BASE_PAYLOAD, consts["KEEPALIVE_INTERVAL"], panic_colours)
 
         super().__init__()
+        self.panic_requested.connect(self.panic)
 
         self.setWindowTitle("Colour Picker Engine")
         self.resize(*consts["WINDOW_SIZE"])
 
-        self.layout = QGridLayout(self)
-
         self.selected_in_column = {}
+        # Each palette bank's grid is built on first use and kept; the grid
+        # attributes below always belong to the page on screen
+        self.pages = PageCache(consts["BANK_CACHE_SIZE"])
+        self.page = None
+        self.layout = None
         self.buttons = {}
+        self.header_labels = {}
+        self.thumbnail_labels = {}
         self.base_colours = {}
+        self.button_states = {}  # (column, row) -> 1 selected, 2 standby, as mirrored to the web remote
+        self.carried_live = {}  # column -> live colour the bank on screen has no button for
+        self.parameter_controls = {}  # (column, binding name) -> control; column None for an ID binding
         
         # Scene Master Mode
         self.scene_master_mode = False
         self.queued_changes = []  # List of (column, colour_hex) tuples
         self.standby_selections = {}  # Tracks which buttons are selected in standby mode
         self.live_selections = {}  # Tracks which buttons are actually live
+
+        # Gradients spread across the layers, as column -> {(host, layer): colour}
+        self.live_gradients = {}
+        self.standby_gradients = {}  # queued in Scene Master mode
         
         # Status heartbeat components
         self.heartbeat = StatusHeartbeat(self.config)
@@ -66,54 +102,219 @@ class ColourPickerEngine(QWidget):
         self.status_square = QLabel()
         self.latency_label = QLabel("-- ms")
         self.scene_mode_label = QLabel("Live Mode")
+        self.held_label = QLabel("")
+        self.hosts_label = QLabel("")
+        self.panic_label = QLabel("")
+        self.stall_label = QLabel("")
+        self.reload_label = QLabel("")
+        self.remote_label = QLabel("")
+        self.host_statuses = {}  # extra host name -> (status, latency, colour)
         self.timer = QTimer()
         self.timer.timeout.connect(self.heartbeat.check_status)
+        self.timer.timeout.connect(self.dispatcher.check_heartbeats)
+
+        # Read-back reconciliation
+        self.reconciler = Reconciler(self.dispatcher, consts["RECONCILE_INTERVAL"])
+        self.reconciler.layer_diverged.connect(self.update_divergence_display)
+
+        # Event-loop stall watchdog, started once the loop is actually running
+        self.watchdog = StallWatchdog(consts["STALL_PROBE_INTERVAL"], consts["STALL_THRESHOLD"], parent=self)
+        self.watchdog.stall_detected.connect(self.update_stall_display)
+        self.stall_clear_timer = QTimer(self)
+        self.stall_clear_timer.setSingleShot(True)
+        self.stall_clear_timer.timeout.connect(lambda: self.stall_label.setText(""))
+        QTimer.singleShot(0, self.watchdog.start)
+
+        # Operator session recording, for replaying shows as benchmarks
+        self.recorder = None
+
+        # Optional Prometheus endpoint
+        self.metrics_server = None
+        self.metrics_port = ""  # METRICS_PORT the endpoint was started for
+        self.metrics_host = ""  # address it was bound to
+        self.apply_metrics_port()
+
+        # Optional browser remote, mirroring the grid to tablets
+        self.remote = None
+        self.remote_port = ""  # WEB_REMOTE_PORT the remote was started for
+        self.last_status = None  # (status, latency, colour) from the main heartbeat
+        self.apply_remote_port()
+
+        # Clip thumbnails in the column headers, as (host, layer) -> QPixmap
+        self.thumbnails = None
+        self.thumbnail_pixmaps = {}
+        self.apply_thumbnails()
 
         self.build_ui()
         self.setup_heartbeat()
+        self.reconciler.start()
+
+        # Palette and layer-map files edited outside the app, applied as they are saved
+        self.file_watcher = FileWatcher(self.config, consts["FILE_RELOAD_DEBOUNCE"])
+        self.file_watcher.reloaded.connect(lambda key, changed: self.update_reload_display())
+        self.file_watcher.reload_failed.connect(self.update_reload_display)
 
     def config_callback(self, key, value):
-        if key == "WEBSERVER_IP" or key == "WEBSERVER_PORT":
-            self.api_base_url = f"http://{self.config["WEBSERVER_IP"]}:{self.config["WEBSERVER_PORT"]}/api/v1/composition"
-
-        elif key == "COLOUR_SET":
-            self.colour_rows = list(self.config["COLOUR_SET"].items())
-
-            # Clear and rebuild the button grid
-            while self.layout.count():
-                item = self.layout.takeAt(0)
-                if item.widget():
-                    item.widget().deleteLater()
-            
-            self.buttons.clear()
-            self.base_colours.clear()
-            self.selected_in_column.clear()
-            
-            self._add_headers()
-            self._add_buttons()
+        if key == "COLOUR_SET":
+            if self.page.matches(self.config["COLOUR_SET"], self.columns):
+                return  # a bank switch has already flipped to this grid
+            GRID_REBUILDS.inc(reason="reload")
+            self._restyle_rows(self.config["COLOUR_SET"])
+            self.reset_remote()
+            self._save_bank()
         
         elif key == "LAYER_MAP":
+            GRID_REBUILDS.inc(reason="reload")
+            self._remap_columns()
 
-            self.columns = self.config["LAYER_MAP"].keys()
-            self.all_columns = []
-            self.non_all_columns = []
-            for col in self.columns:
-                if self.config["LAYER_MAP"][col] == "ALL":
-                    self.all_columns.append(col)
-                else:
-                    self.non_all_columns.append(col)
-            # Clear and rebuild the button grid
-            while self.layout.count():
-                item = self.layout.takeAt(0)
-                if item.widget():
-                    item.widget().deleteLater()
-            
-            self.buttons.clear()
-            self.base_colours.clear()
-            self.selected_in_column.clear()
-            
-            self._add_headers()
-            self._add_buttons()
+        elif key == "PALETTE_BANKS":
+            banks = self.config.get("PALETTE_BANKS") or {}
+            for page in self.pages.pages():
+                if page is not self.page and not page.matches(banks.get(page.bank), self.columns):
+                    self._discard_page(self.pages.pop(page.bank))
+            if self.page.bank is not None and self.page.bank not in banks:
+                # The bank on screen was deleted; its colours stay up as an unsaved palette
+                self.pages.pop(self.page.bank)
+                self.page.bank = None
+                for evicted in self.pages.put(self.page):
+                    self._discard_page(evicted)
+            elif self.page.bank in banks and banks[self.page.bank] != self.page.colours:
+                # The bank on screen was edited elsewhere
+                self.config["COLOUR_SET"] = dict(banks[self.page.bank])
+            self._build_bank_bar()
+
+        elif key == "ACTIVE_BANK":
+            # Read it back rather than trust the queued value, which a quicker switch may have replaced
+            bank = self.config.get("ACTIVE_BANK")
+            if bank and bank != self.page.bank:
+                self.switch_bank(bank)
+
+        elif key == "EXTRA_HOSTS":
+            self.host_statuses = {
+                name: status for name, status in self.host_statuses.items() if name in self.dispatcher.hosts
+            }
+            self.update_hosts_display()
+            QTimer.singleShot(0, self.show_thumbnails)
+
+        elif key in ("WEBSERVER_IP", "WEBSERVER_PORT", "COLUMN_HOSTS"):
+            # After the dispatcher has caught up with the new hosts
+            QTimer.singleShot(0, self.show_thumbnails)
+
+        elif key == "SHOW_THUMBNAILS":
+            self.apply_thumbnails()
+            self.show_thumbnails()
+
+        elif key == "PARAMETER_BINDINGS":
+            self.build_parameter_strip()
+
+        elif key in ("METRICS_PORT", "METRICS_ALL_INTERFACES"):
+            self.apply_metrics_port()
+
+        elif key in ("WEB_REMOTE_PORT", "WEB_REMOTE_TOKEN"):
+            self.apply_remote_port()
+
+        elif key == "LOG_LEVEL":
+            set_level(value)
+
+    def apply_metrics_port(self):
+        """
+        Start, move or stop the metrics endpoint to match METRICS_PORT (blank is
+        off). It only listens locally unless METRICS_ALL_INTERFACES is ticked.
+        """
+        port = str(self.config.get("METRICS_PORT") or "").strip()
+        host = "0.0.0.0" if self.config.get("METRICS_ALL_INTERFACES", False) else "127.0.0.1"
+        if self.metrics_server is not None and port == self.metrics_port and host == self.metrics_host:
+            return  # rebinding would leave a gap in the scrapes and could lose the port
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+            self.metrics_server = None
+        if not port:
+            return
+        try:
+            self.metrics_server = MetricsServer(port, host=host).start()
+            self.metrics_port = port
+            self.metrics_host = host
+            logger.info("Metrics available on %s:%s at /metrics", host, self.metrics_server.port)
+        except (OSError, ValueError, OverflowError) as e:
+            logger.error("Couldn't start metrics endpoint on port %s: %s", port, e)
+
+    # =========================
+    # WEB REMOTE
+    # =========================
+
+    def apply_remote_port(self):
+        """
+        Start, move or stop the browser remote to match WEB_REMOTE_PORT (blank
+        is off) and WEB_REMOTE_TOKEN, which is made up the first time it's needed
+        """
+        port = str(self.config.get("WEB_REMOTE_PORT") or "").strip()
+        token = str(self.config.get("WEB_REMOTE_TOKEN") or "").strip()
+        if self.remote is not None and port == self.remote_port and token == self.remote.token:
+            return  # a settings save that left the port alone mustn't drop the tablets
+        if self.remote is not None:
+            self.remote.stop()
+            self.remote.deleteLater()
+            self.remote = None
+            self.update_remote_display()
+        if not port:
+            return
+        if not token:
+            token = new_token()
+            self.config["WEB_REMOTE_TOKEN"] = token
+        try:
+            self.remote = WebRemote(port, token=token)
+        except (OSError, ValueError, OverflowError) as e:
+            logger.error("Couldn't start web remote on port %s: %s", port, e)
+            return
+        self.remote.press_requested.connect(self.remote_press)
+        self.remote.scene_requested.connect(self.remote_scene)
+        self.remote.panic_requested.connect(self.panic)
+        self.remote_port = port
+        self.reset_remote()
+        self.remote.start()
+        self.update_remote_display()
+        logger.info("Web remote available on port %s", self.remote.port)
+
+    def update_remote_display(self):
+        """Show the address tablets open, token included, while the remote is running"""
+        if self.remote is None:
+            self.remote_label.setText("")
+            self.remote_label.setToolTip("")
+            return
+        address = f":{self.remote.port}/?token={self.remote.token}"
+        self.remote_label.setText(f"Remote {address}")
+        self.remote_label.setToolTip(f"Open http://<this machine>{address} on a tablet to use the remote")
+
+    def reset_remote(self):
+        """Send every remote client the whole grid, e.g. after it was rebuilt"""
+        if self.remote is None:
+            return
+        state = {
+            "columns": list(self.columns),
+            "rows": [list(entry) for entry in self.colour_rows],
+            "panics": {name: colour for name, (colour, _) in self.consts["PANIC_COLOURS"].items()},
+            "scene_master": self.scene_master_mode,
+            "held": self.dispatcher.held_count,
+        }
+        if self.last_status is not None:
+            state["status"] = list(self.last_status)
+        state.update({button_key(column, row): look for (column, row), look in self.button_states.items()})
+        self.remote.state.reset(state)
+
+    def _publish(self, changes: dict):
+        if self.remote is not None:
+            self.remote.state.publish(changes)
+
+    def remote_press(self, column, row):
+        # The grid may have been rebuilt since the remote checked the press
+        if column in self.columns and row < len(self.colour_rows):
+            self.on_press(column, row, self.colour_rows[row][1])
+
+    def remote_scene(self, action):
+        if action == "toggle":
+            self.toggle_scene_master()
+        elif self.scene_master_mode:
+            self.send_queued_changes() if action == "go" else self.cancel_scene_master()
 
     # =========================
     # STYLE HELPERS
@@ -179,6 +380,16 @@ class ColourPickerEngine(QWidget):
         # Add scene mode indicator
         self.scene_mode_label.setStyleSheet("font-weight: bold; color: #00AA00;")
         status_layout.addWidget(self.scene_mode_label)
+
+        # Shows how many layers are waiting for Resolume to come back
+        self.held_label.setStyleSheet("font-weight: bold; color: #FF0000;")
+        status_layout.addWidget(self.held_label)
+        self.dispatcher.held_changed.connect(self.update_held_display)
+
+        # Extra hosts, their latency and cross-host skew
+        status_layout.addWidget(self.hosts_label)
+        self.dispatcher.host_status.connect(self.update_host_status)
+        self.dispatcher.batch_completed.connect(self.update_hosts_display)
         
         # Add buttons
         colour_btn = QPushButton("Configure Colours")
@@ -193,19 +404,82 @@ class ColourPickerEngine(QWidget):
         layers_btn.clicked.connect(self.open_layer_map_settings)
         status_layout.addWidget(layers_btn)
 
+        gradient_btn = QPushButton("Gradient")
+        gradient_btn.setToolTip("Spread a gradient across every mapped layer")
+        gradient_btn.clicked.connect(self.open_gradient)
+        status_layout.addWidget(gradient_btn)
+
+        parameters_btn = QPushButton("Parameters")
+        parameters_btn.setToolTip("Bind faders, toggles and buttons to other Resolume parameters")
+        parameters_btn.clicked.connect(self.open_parameter_bindings)
+        status_layout.addWidget(parameters_btn)
+
+        self.record_btn = QPushButton("Record")
+        self.record_btn.setCheckable(True)
+        self.record_btn.setToolTip("Record every press to a session file for replay")
+        self.record_btn.toggled.connect(self.set_recording)
+        status_layout.addWidget(self.record_btn)
+
+        log_btn = QPushButton("Log")
+        log_btn.clicked.connect(self.open_log)
+        status_layout.addWidget(log_btn)
+
+        resend_btn = QPushButton("Force Resend")
+        resend_btn.setToolTip("Resend every live colour, even if Resolume already shows it")
+        resend_btn.clicked.connect(self.force_resend)
+        status_layout.addWidget(resend_btn)
+
         reset_btn = QPushButton("!RESET!")
         reset_btn.clicked.connect(self.reset)
         status_layout.addWidget(reset_btn)
+
+        # Panic buttons and their shortcuts, which work even while a dialog has focus
+        for name, (colour, shortcut) in self.consts["PANIC_COLOURS"].items():
+            panic_btn = QPushButton(f"{name} ({shortcut})")
+            text_colour = "black" if QColor(colour).lightness() > 120 else "white"
+            panic_btn.setStyleSheet(
+                f"background-color: {colour}; color: {text_colour}; font-weight: bold; border: 2px solid #FF0000;"
+            )
+            panic_btn.clicked.connect(lambda _, n=name: self.panic(n))
+            status_layout.addWidget(panic_btn)
+
+            panic_shortcut = QShortcut(QKeySequence(shortcut), self)
+            panic_shortcut.setContext(Qt.ApplicationShortcut)
+            panic_shortcut.activated.connect(lambda n=name: self.panic(n))
+
+        status_layout.addWidget(self.panic_label)
+        self.dispatcher.panic_completed.connect(self.update_panic_display)
+
+        # Lights up for a while after the GUI thread stalls
+        self.stall_label.setStyleSheet("font-weight: bold; color: #FF6600;")
+        status_layout.addWidget(self.stall_label)
+
+        # Shows a watched palette or layer-map file that didn't parse
+        self.reload_label.setStyleSheet("font-weight: bold; color: #FF6600;")
+        status_layout.addWidget(self.reload_label)
+
+        # The browser remote's address and token, while it runs
+        self.remote_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        status_layout.addWidget(self.remote_label)
         
 
         status_layout.addStretch()
         
         main_layout.addLayout(status_layout)
         
-        # Add colour picker grid
-        grid_widget = QWidget()
-        grid_widget.setLayout(self.layout)
-        main_layout.addWidget(grid_widget)
+        # Palette banks, one click to switch
+        self.bank_bar = QHBoxLayout()
+        self.bank_buttons = {}
+        main_layout.addLayout(self.bank_bar)
+
+        # Add colour picker grid, one page per palette bank
+        self.grid_stack = QStackedWidget()
+        main_layout.addWidget(self.grid_stack)
+
+        # Bound parameter controls, a row per binding
+        self.parameter_layout = QGridLayout()
+        main_layout.addLayout(self.parameter_layout)
+        self.build_parameter_strip()
         
         # Add scene control buttons at bottom
         scene_control_layout = QHBoxLayout()
@@ -234,35 +508,457 @@ class ColourPickerEngine(QWidget):
         
         # Set the main layout
         self.setLayout(main_layout)
-        
-        self._add_headers()
-        self._add_buttons()
+
+        bank = self.config.get("ACTIVE_BANK") or None
+        if (self.config.get("PALETTE_BANKS") or {}).get(bank) != self.config["COLOUR_SET"]:
+            bank = None  # COLOUR_SET was edited without a bank
+        self._build_page(bank, self.config["COLOUR_SET"])
+        self._build_bank_bar()
+
+    def _remove_grid_widget(self, widget):
+        # removeWidget() frees the layout item too; takeAt() leaves it to us, and it leaks
+        self.layout.removeWidget(widget)
+        widget.deleteLater()
 
     def _add_headers(self):
+        self.header_labels.clear()
+        self.thumbnail_labels.clear()
         for col, name in enumerate(self.columns):
-            label = QLabel(name)
-            label.setAlignment(Qt.AlignCenter)
-            label.setStyleSheet("font-weight: bold;font-size: 32px;")
-            self.layout.addWidget(label, 0, col)
+            self._add_header(col, name)
+        self.show_thumbnails()
+
+    def _add_header(self, col, name):
+        header = QWidget()
+        header_layout = QVBoxLayout(header)
+        header_layout.setContentsMargins(0, 0, 0, 0)
+        thumbnail = QLabel()
+        thumbnail.setAlignment(Qt.AlignCenter)
+        thumbnail.hide()  # until its clip's thumbnail arrives
+        header_layout.addWidget(thumbnail)
+        label = QLabel(name)
+        label.setAlignment(Qt.AlignCenter)
+        header_layout.addWidget(label)
+        self.layout.addWidget(header, 0, col)
+        self.header_labels[name] = label
+        self.thumbnail_labels[name] = thumbnail
+        self._style_header(name)
+
+    def _style_header(self, column):
+        if column in self.non_all_columns and any(
+            target in self.reconciler.diverged for target in self.dispatcher.targets_for(column)
+        ):
+            self.header_labels[column].setText(f"{column} \u26a0")
+            self.header_labels[column].setToolTip("Resolume doesn't show the last colour sent - resending")
+            self.header_labels[column].setStyleSheet(
+                "font-weight: bold;font-size: 32px;color: #FF0000;" + self._gradient_style(column, text=False)
+            )
+        else:
+            self.header_labels[column].setText(column)
+            self.header_labels[column].setToolTip("")
+            self.header_labels[column].setStyleSheet("font-weight: bold;font-size: 32px;" + self._gradient_style(column))
+
+    def _gradient_style(self, column, text=True) -> str:
+        """Header background for a column on a gradient: solid border when live, dashed when queued"""
+        standby = column in self.standby_gradients
+        layer_colours = (self.standby_gradients if standby else self.live_gradients).get(column)
+        if not layer_colours:
+            return ""
+        colours = list(dict.fromkeys(layer_colours.values()))
+        if len(colours) == 1:
+            style = f"background-color: {colours[0]};"
+        else:
+            stops = ", ".join(f"stop:{i / (len(colours) - 1):.3f} {colour}" for i, colour in enumerate(colours))
+            style = f"background: qlineargradient(x1:0, y1:0, x2:1, y2:0, {stops});"
+        style += "border: 3px dashed #999;" if standby else "border: 3px solid black;"
+        if text:
+            style += "color: black;" if QColor(colours[len(colours) // 2]).lightness() > 120 else "color: white;"
+        return style
 
     def _add_buttons(self):
         for row, entry in enumerate(self.colour_rows):
-            colour = QColor(entry[1])  # hex is second element
-            label = entry[0]  # label is first element
-
             for col, column_name in enumerate(self.columns):
-                btn = QPushButton(label)
-                btn.setFixedHeight(self.consts["BUTTON_HEIGHT"])
-                btn.setStyleSheet(self.button_stylesheet(colour))
+                self._add_button(row, entry, col, column_name)
+
+    def _add_button(self, row, entry, col, column_name):
+        colour = QColor(entry[1])  # hex is second element
+        btn = QPushButton(entry[0])  # label is first element
+        btn.setFixedHeight(self.consts["BUTTON_HEIGHT"])
+        btn.setStyleSheet(self.button_stylesheet(colour))
+
+        btn.clicked.connect(
+            lambda _, c=column_name, r=row, h=entry[1]: self.on_press(c, r, h)
+        )
+
+        self.layout.addWidget(btn, row + 1, col)
+
+        self.buttons[(column_name, row)] = btn
+        self.base_colours[(column_name, row)] = colour
+
+    def _release_button(self, column, row, colour):
+        """
+        Let go of a button whose colour is changing or going: a column live on
+        it keeps that colour on Resolume, carried like a bank switch carries
+        it; one queued on it loses its queued change.
+        """
+        if self.live_selections.pop((column, row), None) is not None:
+            self.carried_live[column] = colour
+            if self.selected_in_column.get(column) == row:
+                del self.selected_in_column[column]
+        if (column, row) in self.standby_selections:
+            self._unqueue_column(column)
+
+    def _restyle_rows(self, colours):
+        """
+        Apply a palette edit, touching only the buttons of rows that changed
+        and adding or removing the buttons of rows past the shorter palette.
+        """
+        old_rows = self.colour_rows
+        self.page.set_colours(colours)
+        self.colour_rows = self.page.colour_rows
+        for row, (old, new) in enumerate(zip(old_rows, self.colour_rows)):
+            if old == new:
+                continue
+            recoloured = old[1].lower() != new[1].lower()
+            for column in self.columns:
+                self.buttons[(column, row)].setText(new[0])
+                if not recoloured:
+                    continue
+                self._release_button(column, row, old[1])
+                self.base_colours[(column, row)] = QColor(new[1])
+                self._set_button_state(column, row, selected=False)
+
+        for row in range(len(self.colour_rows), len(old_rows)):
+            for column in self.columns:
+                self._release_button(column, row, old_rows[row][1])
+                self.button_states.pop((column, row), None)
+                self.base_colours.pop((column, row))
+                self._remove_grid_widget(self.buttons.pop((column, row)))
+        for row in range(len(old_rows), len(self.colour_rows)):
+            for col, column in enumerate(self.columns):
+                self._add_button(row, self.colour_rows[row], col, column)
+
+    def _remap_columns(self):
+        """
+        Apply a layer map, keeping the widgets and selections of the columns
+        it keeps. Columns that go, or turn into or out of ALL, are removed
+        with their selections; new ones get fresh widgets; kept ones that
+        changed place are moved.
+        """
+        layer_map = self.config["LAYER_MAP"]
+        old_columns = {column: col for col, column in enumerate(self.columns)}
+        all_columns = [col for col in layer_map if layer_map[col] == "ALL"]
+        kept = {
+            column for column in old_columns
+            if column in layer_map and (column in all_columns) == (column in self.all_columns)
+        }
+        for column in old_columns:
+            if column not in kept:
+                self._remove_column(column)
+
+        self.columns = layer_map.keys()
+        self.all_columns = all_columns
+        self.non_all_columns = [col for col in self.columns if col not in self.all_columns]
+        # Gradients are spread by layer position, which has moved
+        self.live_gradients.clear()
+        self.standby_gradients.clear()
+        for col, column in enumerate(self.columns):
+            if column not in kept:
+                self._add_header(col, column)
+                for row, entry in enumerate(self.colour_rows):
+                    self._add_button(row, entry, col, column)
+                continue
+            if old_columns[column] != col:
+                widgets = [self.header_labels[column].parentWidget()]
+                widgets += [self.buttons[(column, row)] for row in range(len(self.colour_rows))]
+                for grid_row, widget in enumerate(widgets):
+                    self.layout.removeWidget(widget)
+                    self.layout.addWidget(widget, grid_row, col)
+            self._style_header(column)
+        self.show_thumbnails()
+        if list(self.columns) == list(old_columns):
+            return
+
+        self.page.columns = list(self.columns)
+        self.build_parameter_strip()
+        self.reset_remote()
+        # Other banks' grids have the old columns
+        for page in self.pages.pages():
+            if page is not self.page:
+                self._discard_page(self.pages.pop(page.bank))
+
+    def _remove_column(self, column):
+        """Take a column's selections back out, then delete its widgets"""
+        self._unqueue_column(column)
+        self._deselect_live(column)
+        for row in range(len(self.colour_rows)):
+            self.button_states.pop((column, row), None)
+            self.base_colours.pop((column, row))
+            self._remove_grid_widget(self.buttons.pop((column, row)))
+        self._remove_grid_widget(self.header_labels.pop(column).parentWidget())
+        self.thumbnail_labels.pop(column)
+
+    # =========================
+    # THUMBNAILS
+    # =========================
+
+    def apply_thumbnails(self):
+        """Start or stop fetching clip thumbnails to match SHOW_THUMBNAILS"""
+        if self.config.get("SHOW_THUMBNAILS") and self.thumbnails is None:
+            self.thumbnails = ThumbnailFetcher(
+                self.dispatcher,
+                self.config.cache_dir / "thumbnails",
+                self.consts["THUMBNAIL_CACHE_BYTES"],
+                self.consts["THUMBNAIL_WORKERS"],
+            )
+            self.thumbnails.thumbnail_ready.connect(self.update_thumbnail)
+        elif not self.config.get("SHOW_THUMBNAILS") and self.thumbnails is not None:
+            self.thumbnails.close()
+            self.thumbnails.deleteLater()
+            self.thumbnails = None
+            self.thumbnail_pixmaps.clear()
+
+    def _thumbnail_target(self, column):
+        """The first clip a column drives; layer groups have no clip to show"""
+        for target in self.dispatcher.targets_for(column):
+            if group_index(target[1]) is None:
+                return target
+        return None
+
+    def _shown_pages(self) -> list:
+        """Every built grid, including one still being built"""
+        pages = self.pages.pages()
+        return pages if self.page in pages else pages + [self.page]
+
+    def show_thumbnails(self):
+        """Show each column's clip thumbnail, known ones at once and the rest once fetched"""
+        targets = {column: self._thumbnail_target(column) for column in self.non_all_columns}
+        for page in self._shown_pages():
+            for column, label in page.thumbnail_labels.items():
+                pixmap = self.thumbnail_pixmaps.get(targets.get(column))
+                if pixmap is None:
+                    label.hide()
+                else:
+                    label.setPixmap(pixmap)
+                    label.show()
+        if self.thumbnails is not None:
+            self.thumbnails.request([target for target in targets.values() if target is not None])
+
+    def update_thumbnail(self, target, data):
+        pixmap = QPixmap()
+        if not pixmap.loadFromData(data):
+            return
+        pixmap = pixmap.scaledToHeight(self.consts["THUMBNAIL_HEIGHT"], Qt.SmoothTransformation)
+        self.thumbnail_pixmaps[target] = pixmap
+        for page in self._shown_pages():
+            for column, label in page.thumbnail_labels.items():
+                if column in self.non_all_columns and self._thumbnail_target(column) == target:
+                    label.setPixmap(pixmap)
+                    label.show()
+
+    # =========================
+    # PARAMETER BINDINGS
+    # =========================
+
+    def build_parameter_strip(self):
+        """A row per parameter binding, with a control per column or one for a binding set by ID"""
+        while self.parameter_layout.count():
+            widget = self.parameter_layout.itemAt(0).widget()
+            self.parameter_layout.removeWidget(widget)
+            widget.deleteLater()
+        self.parameter_controls.clear()
+        for row, binding in enumerate(self.dispatcher.bindings):
+            self.parameter_layout.addWidget(QLabel(binding.name), row, 0)
+            columns = [None] if binding.target is not None else list(self.columns)
+            for col, column in enumerate(columns, start=1):
+                control = self._parameter_control(column, binding)
+                self.parameter_layout.addWidget(control, row, col)
+                self.parameter_controls[(column, binding.name)] = control
+
+    def _parameter_control(self, column, binding):
+        name = binding.name
+        if binding.control == "fader":
+            control = QSlider(Qt.Horizontal)
+            control.setRange(0, self.consts["FADER_STEPS"])
+            # Start at the top, where opacity and the like leave the output as it is, so the
+            # first nudge doesn't jump the layers to the bottom of the range
+            control.setValue(self.consts["FADER_STEPS"])
+            control.valueChanged.connect(
+                lambda step: self.set_parameter(column, name, self._fader_value(binding, step))
+            )
+        elif binding.control == "toggle":
+            control = QPushButton(name)
+            control.setCheckable(True)
+            control.toggled.connect(lambda checked: self.set_parameter(column, name, checked))
+        else:
+            control = QPushButton(name)
+            control.clicked.connect(lambda: self.set_parameter(column, name, binding.value))
+        control.setToolTip(name if column is None else f"{name}: {column}")
+        return control
+
+    def _fader_value(self, binding, step) -> float:
+        return binding.minimum + (binding.maximum - binding.minimum) * step / self.consts["FADER_STEPS"]
+
+    def set_parameter(self, column, name, value):
+        """
+        Send a bound control's value to the layers behind a column, or to its
+        parameter for a binding set by ID. Parameters go out at once, even in
+        Scene Master mode, like a desk's faders.
+        """
+        binding = self.dispatcher.bindings.get(name)
+        if binding is None:
+            return
+        self._record(session_recorder.PARAMETER, column, name, value)
+        if binding.target is not None:
+            self.dispatcher.set_parameters({binding.target: {name: value}})
+            return
+        columns = self.non_all_columns if column in self.all_columns else [column]
+        self.dispatcher.set_parameters({
+            target: {name: value} for col in columns for target in self.dispatcher.targets_for(col)
+        })
+        if column in self.all_columns:
+            # The columns' own controls follow the ALL control
+            for col in columns:
+                self._show_parameter(self.parameter_controls.get((col, name)), binding, value)
+
+    def _show_parameter(self, control, binding, value):
+        if control is None or binding.control == "button":
+            return
+        control.blockSignals(True)
+        if binding.control == "fader":
+            span = binding.maximum - binding.minimum
+            control.setValue(round((value - binding.minimum) / span * self.consts["FADER_STEPS"]))
+        else:
+            control.setChecked(bool(value))
+        control.blockSignals(False)
+
+    # =========================
+    # PALETTE BANKS
+    # =========================
+
+    def _bind_page(self, page):
+        """Point the grid attributes at a page's widgets and state"""
+        self.page = page
+        self.layout = page.layout
+        self.buttons = page.buttons
+        self.base_colours = page.base_colours
+        self.header_labels = page.header_labels
+        self.thumbnail_labels = page.thumbnail_labels
+        self.button_states = page.button_states
+        self.colour_rows = page.colour_rows
+
+    def _build_page(self, bank, colours) -> GridPage:
+        page = GridPage(bank, colours, self.columns)
+        self.grid_stack.addWidget(page.widget)
+        self._bind_page(page)
+        self._add_headers()
+        self._add_buttons()
+        self.grid_stack.setCurrentWidget(page.widget)
+        for evicted in self.pages.put(page):
+            self._discard_page(evicted)
+        return page
+
+    def _discard_page(self, page):
+        self.grid_stack.removeWidget(page.widget)
+        page.widget.deleteLater()
+
+    def _build_bank_bar(self):
+        while self.bank_bar.count():
+            widget = self.bank_bar.itemAt(0).widget()
+            if widget is None:
+                self.bank_bar.takeAt(0)
+                continue
+            self.bank_bar.removeWidget(widget)
+            widget.deleteLater()
+        self.bank_buttons = {}
+        banks = self.config.get("PALETTE_BANKS") or {}
+        if not banks:
+            return
+        self.bank_bar.addWidget(QLabel("Bank:"))
+        for name in banks:
+            btn = QPushButton(name)
+            btn.setCheckable(True)
+            btn.setChecked(name == self.page.bank)
+            btn.clicked.connect(lambda _, n=name: self.switch_bank(n))
+            self.bank_bar.addWidget(btn)
+            self.bank_buttons[name] = btn
+        self.bank_bar.addStretch()
+
+    def _save_bank(self):
+        """Keep the bank on screen in step with an edited COLOUR_SET"""
+        banks = self.config.get("PALETTE_BANKS") or {}
+        if self.page.bank is not None and banks.get(self.page.bank) != self.page.colours:
+            self.config["PALETTE_BANKS"] = {**banks, self.page.bank: dict(self.page.colours)}
+
+    def switch_bank(self, name):
+        """
+        Show another palette bank. Its grid is built the first time and then
+        kept, so switching back is a page flip. What is live or queued on
+        each column stays selected wherever the new bank has the same colour.
+        """
+        banks = self.config.get("PALETTE_BANKS") or {}
+        if name not in banks:
+            logger.warning("No palette bank named %r", name)
+            return
+        if name == self.page.bank and self.page.matches(banks[name], self.columns):
+            self._update_bank_bar()
+            return
+        self._record(session_recorder.BANK, name)
+
+        # Selections by colour, as row numbers differ between banks
+        if self.scene_master_mode:
+            live = {column: self.colour_rows[row][1] for column, row in self.live_selections}
+        else:
+            live = {column: self.colour_rows[row][1] for column, row in self.selected_in_column.items()}
+        live = {**self.carried_live, **live}
+        standby = {column: self.colour_rows[row][1] for column, row in self.standby_selections}
+
+        page = self.pages.get(name)
+        if page is not None and page.matches(banks[name], self.columns):
+            self._bind_page(page)
+            self.grid_stack.setCurrentWidget(page.widget)
+        else:
+            if page is not None:
+                self._discard_page(self.pages.pop(name))
+            GRID_REBUILDS.inc(reason="bank")
+            page = self._build_page(name, banks[name])
+
+        self._restore_selections(live, standby)
+        for column in self.columns:
+            self._style_header(column)
+        self._update_bank_bar()
+        self.config["ACTIVE_BANK"] = name
+        self.config["COLOUR_SET"] = dict(banks[name])
+        self.reset_remote()
 
-                btn.clicked.connect(
-                    lambda _, c=column_name, r=row: self.on_press(c, r, entry[1])
-                )
+    def _restore_selections(self, live, standby):
+        """Select each column's live and standby colour on the page now shown, restyling only what differs"""
+        self.live_selections = {}
+        self.standby_selections = {}
+        self.selected_in_column = {}
+        self.carried_live = {}
+        for column, colour in live.items():
+            row = self.page.row_for(colour)
+            if row is None:
+                self.carried_live[column] = colour
+            else:
+                self.live_selections[(column, row)] = True
+                self.selected_in_column[column] = row
+        for column, colour in standby.items():
+            row = self.page.row_for(colour)
+            if row is not None and (column, row) not in self.live_selections:
+                self.standby_selections[(column, row)] = True
+                self.selected_in_column[column] = row
 
-                self.layout.addWidget(btn, row + 1, col)
+        looks = {key: 2 for key in self.standby_selections}
+        looks.update({key: 1 for key in self.live_selections})
+        for column, row in set(self.button_states) | set(looks):
+            look = looks.get((column, row))
+            if self.button_states.get((column, row)) != look:
+                self._set_button_state(column, row, selected=look is not None, standby=look == 2)
 
-                self.buttons[(column_name, row)] = btn
-                self.base_colours[(column_name, row)] = colour
+    def _update_bank_bar(self):
+        for name, btn in self.bank_buttons.items():
+            btn.setChecked(name == self.page.bank)
 
     # =========================
     # INTERACTION LOGIC
@@ -271,7 +967,9 @@ class ColourPickerEngine(QWidget):
     def on_press(self, column, row, colour):
         colour_name = self.colour_rows[row][0]
         colour_hex = self.config["COLOUR_SET"][colour_name]
-        print(f"{column} → {self.colour_rows[row][0]}")
+        logger.debug("Press %s", colour_name, extra={"column": column, "colour": colour_hex})
+        self._record(session_recorder.PRESS, column, row, colour_hex)
+        PRESSES.inc(mode="scene" if self.scene_master_mode else "live")
 
         if self.scene_master_mode:
             # Queue the change
@@ -290,7 +988,7 @@ class ColourPickerEngine(QWidget):
                 # Add new change
                 self.queued_changes.append((column, colour_hex))
                 self.select_single(column, row)
-            print(f"Queued: {len(self.queued_changes)} changes pending")
+            logger.debug("Queued changes pending", extra={"count": len(self.queued_changes)})
         else:
             # Live mode - send immediately
             if column in self.all_columns:
@@ -316,6 +1014,9 @@ class ColourPickerEngine(QWidget):
                         self.selected_in_column[column] = r
                         break
             return
+
+        # A button replaces any gradient on the column, queued or live as the button will be
+        self._drop_gradient(column)
         
         if column in self.selected_in_column:
             prev_row = self.selected_in_column[column]
@@ -347,43 +1048,113 @@ class ColourPickerEngine(QWidget):
             self._set_button_state(column, row, selected=True, standby=False)
             self.live_selections[(column, row)] = True
             self.standby_selections.pop((column, row), None)
+            self.carried_live.pop(column, None)
         
         self.selected_in_column[column] = row
     def apply_row(self, row):
         for column in self.non_all_columns:
             self.select_single(column, row)
 
+    def apply_gradient(self, start, end, middle=None):
+        """
+        Spread a gradient from start to end, through middle if given, across
+        every mapped layer in column order. Live, it goes out as one batch; in
+        Scene Master mode it is queued for GO. Raises ValueError for a bad stop.
+        """
+        slots = self.dispatcher.layer_slots(self.non_all_columns)
+        colours = gradient([start, end] if middle is None else [start, middle, end], len(slots))
+        column_gradients = {column: {} for column in self.non_all_columns}
+        for (column, targets), colour in zip(slots, colours):
+            column_gradients[column].update(dict.fromkeys(targets, colour))
+        self._record(session_recorder.GRADIENT, start, end, middle)
+        logger.debug("Gradient across %s layer(s)", len(slots), extra={"colour": start})
+
+        if self.scene_master_mode:
+            for column in column_gradients:
+                self._unqueue_column(column)
+            self.standby_gradients = column_gradients
+        else:
+            for column in column_gradients:
+                self._deselect_live(column)
+            self.live_gradients = column_gradients
+            self.dispatcher.send(self._gradient_targets(column_gradients))
+        for column in column_gradients:
+            self._style_header(column)
+
+    def _gradient_targets(self, column_gradients: dict) -> dict:
+        return {target: colour for targets in column_gradients.values() for target, colour in targets.items()}
+
+    def _drop_gradient(self, column):
+        gradients = self.standby_gradients if self.scene_master_mode else self.live_gradients
+        if gradients.pop(column, None) is not None:
+            self._style_header(column)
+
+    def _deselect_live(self, column):
+        """Clear a column's live button, e.g. once a gradient is sent over it"""
+        for (col, row) in list(self.live_selections.keys()):
+            if col == column:
+                self.live_selections.pop((col, row))
+                self._set_button_state(col, row, selected=False)
+        self.selected_in_column.pop(column, None)
+        self.carried_live.pop(column, None)
+
+    def _unqueue_column(self, column):
+        """Take a column's standby button and queued change back out, leaving its live button"""
+        self.queued_changes = [(c, clr) for c, clr in self.queued_changes if c != column]
+        for (col, row) in list(self.standby_selections.keys()):
+            if col == column:
+                self.standby_selections.pop((col, row))
+                self._set_button_state(col, row, selected=False, standby=False)
+        self.selected_in_column.pop(column, None)
+        for (col, row) in self.live_selections.keys():
+            if col == column:
+                self.selected_in_column[column] = row
+
     # =========================
     # API HANDLING
     # =========================
 
-    def send_api_request(self, column, colour):
-        payload = copy.deepcopy(self.BASE_PAYLOAD)
-        payload["video"]["effects"][0]["params"]["Color"]["value"] = colour
-        layer = self.config["LAYER_MAP"][column]
-        url = f"{self.api_base_url}/layers/{layer}/clips/1"
-        print(payload)
-        def task():
-            try:
-                self.session.put(url, json=payload, timeout=(0.05, 0.2))
-            except Exception as e:
-                print(f"API error: {e}")
+    def _targets(self, column_colours: dict) -> dict:
+        """Expand {column: colour} into {(host, layer): colour} for the dispatcher"""
+        return {
+            target: colour
+            for column, colour in column_colours.items()
+            for target in self.dispatcher.targets_for(column)
+        }
 
-        self.executor.submit(task)
+    def send_api_request(self, column, colour, force=False):
+        self.dispatcher.send(self._targets({column: colour}), force=force)
 
+    def send_all_api_requests(self, colour, force=False):
+        column_colours = {col: colour for col in self.non_all_columns}
+        self.dispatcher.send(self._targets(column_colours), force=force)
 
-    def send_all_api_requests(self, colour):
-        def task(layer):
-            url = f"{self.api_base_url}/layers/{layer}/clips/1"
-            payload = copy.deepcopy(self.BASE_PAYLOAD)
-            payload["video"]["effects"][0]["params"]["Color"]["value"] = colour
-            try:
-                self.session.put(url, json=payload, timeout=(0.05, 0.2))
-            except Exception as e:
-                print(f"API error: {e}")
+    def panic(self, name):
+        """Send a panic colour to every layer, ahead of anything already queued"""
+        self._record(session_recorder.PANIC, name)
+        self.dispatcher.panic(name)
+        # No grid button or gradient shows the panic colour any more
+        self.carried_live.clear()
+        for column in list(self.live_gradients):
+            self.live_gradients.pop(column)
+            self._style_header(column)
+        for (column, row) in list(self.live_selections.keys()):
+            self.live_selections.pop((column, row))
+            if (column, row) not in self.standby_selections:
+                self._set_button_state(column, row, selected=False)
+                if self.selected_in_column.get(column) == row:
+                    del self.selected_in_column[column]
 
-        for col in self.non_all_columns:
-            self.executor.submit(task, self.config["LAYER_MAP"][col])
+    def force_resend(self):
+        """Resend the live colour of every column, bypassing the layer state cache"""
+        self._record(session_recorder.FORCE_RESEND)
+        column_colours = dict(self.carried_live)
+        for (column, row) in self.live_selections.keys():
+            if column in self.non_all_columns:
+                column_colours[column] = self.colour_rows[row][1]
+        targets = self._gradient_targets(self.live_gradients)
+        targets.update(self._targets(column_colours))
+        self.dispatcher.send(targets, force=True)
 
 
     # =========================
@@ -401,22 +1172,92 @@ class ColourPickerEngine(QWidget):
             colour = base_colour
         
         btn.setStyleSheet(self.button_stylesheet(colour, selected, standby=standby))
+        look = 2 if standby else 1 if selected else None
+        if look is None:
+            self.button_states.pop((column, row), None)
+        else:
+            self.button_states[(column, row)] = look
+        self._publish({button_key(column, row): look})
     
     def setup_heartbeat(self):
         """Set up the status heartbeat polling"""
         self.heartbeat.status_updated.connect(self.update_status_display)
+        self.heartbeat.reachable.connect(self.on_main_reachable)
         self.timer.start(self.consts["HEARTBEAT_INTERVAL"])
         # Perform initial check immediately
         self.heartbeat.check_status()
+        self.dispatcher.check_heartbeats()
+
+    def on_main_reachable(self, reachable: bool):
+        self.dispatcher.on_heartbeat(MAIN_HOST, reachable)
     
     def update_status_display(self, status: str, latency: float, colour: str):
         """Update the status display with new information"""
         self.status_label.setText(status)
         self.latency_label.setText(f"{latency:.1f} ms" if latency > 0 else "-- ms")
         self.status_square.setStyleSheet(f"background-color: {colour}; border: 2px solid #333;")
+        self.last_status = (status, round(latency, 1), colour)
+        self._publish({"status": list(self.last_status)})
     
+    def update_divergence_display(self, target, diverged: bool):
+        """Mark the columns driving a layer that doesn't match its desired colour"""
+        for column in self.non_all_columns:
+            if target in self.dispatcher.targets_for(column):
+                self._style_header(column)
+
+    def update_host_status(self, host: str, status: str, latency: float, colour: str):
+        """Record a heartbeat result for one of the extra hosts"""
+        self.host_statuses[host] = (status, latency, colour)
+        self.update_hosts_display()
+
+    def update_hosts_display(self, latencies=None, skew=None):
+        """Summarise extra host health, per-host request latency and cross-host skew"""
+        if len(self.dispatcher.hosts) < 2:
+            self.hosts_label.setText("")
+            return
+        parts = []
+        for name, channel in self.dispatcher.hosts.items():
+            if name == MAIN_HOST:
+                continue
+            status, _, colour = self.host_statuses.get(name, ("--", 0, "#CCCCCC"))
+            if channel.breaker.is_open:
+                text = "offline"
+            elif channel.latency_ms:
+                text = f"{channel.latency_ms:.1f} ms"
+            else:
+                text = status.split(" ")[0]
+            parts.append(f"<span style='color: {colour};'>\u25cf</span> {name}: {text}")
+        parts.append(f"skew {self.dispatcher.last_skew_ms:.1f} ms")
+        self.hosts_label.setText(" | ".join(parts))
+
+    def update_panic_display(self, name: str, latencies: dict, worst: float):
+        """Show how long the last panic took to reach every layer"""
+        self.panic_label.setText(f"{name}: {worst:.1f} ms")
+
+    def update_stall_display(self, stall):
+        """Warn that the GUI stopped responding, with the tail of the stack that was running"""
+        self.stall_label.setText(f"\u26a0 UI stalled {stall.duration_ms:.0f} ms")
+        frames = stall.stack.rstrip().splitlines()[-6:]
+        self.stall_label.setToolTip("\n".join(frames) + "\n\nFull stack in the Log window" if frames else "")
+        self.stall_clear_timer.start(10000)
+
+    def update_reload_display(self, path=None, error=None):
+        """Flag a watched file that failed to reload, until one reloads cleanly"""
+        if path is None:
+            self.reload_label.setText("")
+            self.reload_label.setToolTip("")
+        else:
+            self.reload_label.setText(f"\u26a0 {Path(path).name} not loaded")
+            self.reload_label.setToolTip(error)
+
+    def update_held_display(self, count: int):
+        """Show the number of layers held while Resolume is unreachable"""
+        self.held_label.setText(f"Holding {count} layer(s)" if count else "")
+        self._publish({"held": count})
+
     def toggle_scene_master(self):
         """Toggle scene master mode on/off"""
+        self._record(session_recorder.SCENE_MASTER)
         self.scene_master_mode = not self.scene_master_mode
         
         if self.scene_master_mode:
@@ -425,6 +1266,7 @@ class ColourPickerEngine(QWidget):
             self.go_btn.show()
             self.cancel_btn.show()
             self.queued_changes = []
+            self.standby_gradients = {}
             # Save current live selections from selected_in_column
             self.live_selections = {}
             for column, row in self.selected_in_column.items():
@@ -433,7 +1275,7 @@ class ColourPickerEngine(QWidget):
             self.standby_selections = {}
             for (column, row) in self.live_selections.keys():
                 self._set_button_state(column, row, selected=True, standby=False)
-            print("Scene Master Mode: ACTIVE")
+            logger.info("Scene Master Mode: ACTIVE")
         else:
             self.scene_mode_label.setText("Live Mode")
             self.scene_mode_label.setStyleSheet("font-weight: bold; color: #00AA00;")
@@ -441,25 +1283,29 @@ class ColourPickerEngine(QWidget):
             self.cancel_btn.hide()
             self.queued_changes = []
             self.standby_selections = {}
-            print("Scene Master Mode: INACTIVE")
+            self._clear_standby_gradients()
+            logger.info("Scene Master Mode: INACTIVE")
+        self._publish({"scene_master": self.scene_master_mode})
     
     def send_queued_changes(self):
         """Send all queued changes to Resolume"""
-        print(f"Sending {len(self.queued_changes)} queued changes...")
+        self._record(session_recorder.GO)
+        logger.info("Sending queued changes", extra={"count": len(self.queued_changes)})
         
         # Group changes by column
         changes_by_column = {}
         for column, colour in self.queued_changes:
             changes_by_column[column] = colour
         
-        # Send each change
-        for column, colour in changes_by_column.items():
-            self.send_api_request(column, colour)
+        # Send every change, queued gradients included, as one batch
+        targets = self._gradient_targets(self.standby_gradients)
+        targets.update(self._targets(changes_by_column))
+        self.dispatcher.send(targets)
         
         # Deselect old live selections that are being replaced by standby selections
         for (column, row) in list(self.live_selections.keys()):
-            # If this column has a new standby selection, deselect the old live one
-            if any(col == column for col, _ in self.standby_selections.keys()):
+            # If this column has a new standby selection or gradient, deselect the old live one
+            if column in self.standby_gradients or any(col == column for col, _ in self.standby_selections.keys()):
                 self._set_button_state(column, row, selected=False, standby=False)
                 self.live_selections.pop((column, row), None)
         
@@ -471,8 +1317,18 @@ class ColourPickerEngine(QWidget):
             # Track as live selection
             self.live_selections[(column, row)] = True
             self.selected_in_column[column] = row
-        
-        print("All queued changes sent!")
+
+        # Queued gradients go live, and columns given a button leave theirs
+        for column, _ in self.standby_selections.keys():
+            self.live_gradients.pop(column, None)
+            self.carried_live.pop(column, None)
+        for column in self.standby_gradients:
+            self.selected_in_column.pop(column, None)
+            self.carried_live.pop(column, None)
+        self.live_gradients.update(self.standby_gradients)
+        self.standby_gradients = {}
+        for column in self.non_all_columns:
+            self._style_header(column)
         
         # Clear state and exit scene master mode
         self.queued_changes = []
@@ -482,10 +1338,12 @@ class ColourPickerEngine(QWidget):
         self.scene_mode_label.setStyleSheet("font-weight: bold; color: #00AA00;")
         self.go_btn.hide()
         self.cancel_btn.hide()
+        self._publish({"scene_master": False})
     
     def cancel_scene_master(self):
         """Cancel scene master mode without sending changes"""
-        print(f"Cancelled {len(self.queued_changes)} queued changes")
+        self._record(session_recorder.CANCEL)
+        logger.info("Cancelled queued changes", extra={"count": len(self.queued_changes)})
         
         # Reset all buttons that were in standby mode to unselected
         for (column, row) in list(self.standby_selections.keys()):
@@ -499,6 +1357,7 @@ class ColourPickerEngine(QWidget):
         # Clear standby selections
         self.standby_selections = {}
         self.queued_changes = []
+        self._clear_standby_gradients()
         
         # Exit scene master mode
         self.scene_master_mode = False
@@ -506,21 +1365,71 @@ class ColourPickerEngine(QWidget):
         self.scene_mode_label.setStyleSheet("font-weight: bold; color: #00AA00;")
         self.go_btn.hide()
         self.cancel_btn.hide()
+        self._publish({"scene_master": False})
     
+    def _clear_standby_gradients(self):
+        columns = list(self.standby_gradients)
+        self.standby_gradients = {}
+        for column in columns:
+            self._style_header(column)
+
+    def open_gradient(self):
+        """Open the gradient dialog"""
+        dialog = GradientDialog(self.config, self)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        dialog.exec()
+
     def open_colour_config(self):
         """Open the colour configuration dialog"""
         dialog = ColourConfigDialog(self.config, self)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
         dialog.exec()
 
     def open_api_settings(self):
         """Open the colour configuration dialog"""
         dialog = APISettingsDialog(self.config, self)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
         dialog.exec()
     
     def open_layer_map_settings(self):
         """Open the colour configuration dialog"""
         dialog = LayerMapDialog(self.config, self)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        dialog.exec()
+
+    def open_parameter_bindings(self):
+        """Open the parameter bindings dialog"""
+        dialog = ParameterBindingsDialog(self.config, self)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
         dialog.exec()
     
+    # =========================
+    # SESSION RECORDING
+    # =========================
+
+    def set_recording(self, recording: bool):
+        """Start a new session file, or close the current one"""
+        if self.recorder is not None:
+            logger.info("Recorded %s events to %s", self.recorder.event_count, self.recorder.path)
+            self.recorder.close()
+            self.recorder = None
+        if recording:
+            path = self.config.cache_dir / "sessions" / time.strftime("session-%Y%m%d-%H%M%S.jsonl")
+            self.recorder = SessionRecorder(
+                path, self.config["LAYER_MAP"], self.config["COLOUR_SET"], self.config.get("PALETTE_BANKS"),
+                parameter_bindings=self.config.get("PARAMETER_BINDINGS"),
+            )
+            logger.info("Recording session to %s", path)
+
+    def _record(self, kind, *args):
+        if self.recorder is not None:
+            self.recorder.record(kind, *args)
+
+    def open_log(self):
+        """Open the log window"""
+        dialog = LogDialog(self.config, self)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        dialog.exec()
+
     def reset(self):
         self.config.reset(broadcast=True)
\ No newline at end of file
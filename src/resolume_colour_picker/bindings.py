@@ -0,0 +1,223 @@
+"""
+Parameter bindings: UI controls wired to any Resolume parameter.
+
+PARAMETER_BINDINGS maps a control's name to the parameter it drives, either
+by path under the clip or layer group a column colours, or by parameter ID:
+
+    {"path": "video/opacity", "control": "fader", "min": 0, "max": 1}
+    {"path": "video/effects/0/bypassed", "control": "toggle"}
+    {"path": "video/effects/1/params/Hue Rotate", "control": "fader"}
+    {"id": 1234567890, "control": "button", "value": 0.5, "host": "main"}
+
+Each path is compiled once into a setter that builds the request body for a
+value directly, so a fader move costs neither a walk of the path nor a deep
+copy of a template. Bodies for several parameters of one layer are merged,
+so they go out as a single request.
+"""
+
+import copy
+import logging
+
+from resolume_colour_picker.hosts import MAIN_HOST
+
+
+CONTROLS = ("fader", "toggle", "button")
+PARAMETER_PREFIX = "P"
+
+logger = logging.getLogger(__name__)
+
+
+def parameter_target(param_id) -> str:
+    """The target key for a parameter set by ID, kept apart from layers and groups"""
+    return f"{PARAMETER_PREFIX}{param_id}"
+
+
+def parameter_id(target):
+    """The parameter ID of a parameter target, or None for a layer or layer group"""
+    if isinstance(target, str) and target.startswith(PARAMETER_PREFIX):
+        return int(target[len(PARAMETER_PREFIX):])
+    return None
+
+
+def parameter_url(api_base_url, param_id) -> str:
+    return api_base_url.replace("/composition", f"/parameter/by-id/{param_id}")
+
+
+# =========================
+# SETTERS
+# =========================
+
+def parse_path(text) -> tuple:
+    """
+    Split 'video/effects/0/params/Color' into its keys, with list positions as
+    ints. Raises ValueError.
+    """
+    parts = [part.strip() for part in str(text).strip().strip("/").split("/")]
+    if not parts or not all(parts):
+        raise ValueError(f"Expected a parameter path such as video/opacity, got {text!r}")
+    return tuple(int(part) if part.isdigit() else part for part in parts)
+
+
+def _leaf(value):
+    return {"value": value}
+
+
+def _key(key, inner):
+    return lambda value: {key: inner(value)}
+
+
+def _index(index, inner):
+    return lambda value: [{} for _ in range(index)] + [inner(value)]
+
+
+def compile_setter(path):
+    """
+    A function building a fresh {...: {"value": value}} body for a path, with
+    earlier list entries left as {} so Resolume leaves them alone
+    """
+    build = _leaf
+    for key in reversed(path):
+        build = _index(key, build) if isinstance(key, int) else _key(key, build)
+    return build
+
+
+def _value_path(payload, path=()) -> list:
+    """Paths to every {"value": ...} leaf in a payload"""
+    if isinstance(payload, dict):
+        if "value" in payload:
+            return [path]
+        return [found for key, item in payload.items() for found in _value_path(item, path + (key,))]
+    if isinstance(payload, list):
+        return [found for i, item in enumerate(payload) for found in _value_path(item, path + (i,))]
+    return []
+
+
+def compile_template(payload):
+    """
+    A setter for a request template with one {"value": ...} leaf, such as
+    get_colourize.json. A template holding more than the path to its leaf is
+    deep copied per value instead. Raises ValueError.
+    """
+    paths = _value_path(payload)
+    if len(paths) != 1:
+        raise ValueError(f"Expected one value in the request template, found {len(paths)}")
+    path = paths[0]
+    build = compile_setter(path)
+    leaf = payload
+    for key in path:
+        leaf = leaf[key]
+    if build(leaf["value"]) == payload:
+        return build
+
+    def deep_copy(value):
+        body = copy.deepcopy(payload)
+        node = body
+        for key in path:
+            node = node[key]
+        node["value"] = value
+        return body
+    return deep_copy
+
+
+def merge_bodies(bodies):
+    """Merge request bodies into one; lists are merged entry by entry"""
+    merged = None
+    for body in bodies:
+        merged = body if merged is None else _merge(merged, body)
+    return merged
+
+
+def _merge(a, b):
+    if isinstance(a, dict) and isinstance(b, dict):
+        merged = dict(a)
+        for key, value in b.items():
+            merged[key] = _merge(merged[key], value) if key in merged else value
+        return merged
+    if isinstance(a, list) and isinstance(b, list):
+        return [
+            _merge(a[i], b[i]) if i < len(a) and i < len(b) else (a[i] if i < len(a) else b[i])
+            for i in range(max(len(a), len(b)))
+        ]
+    return b
+
+
+# =========================
+# BINDINGS
+# =========================
+
+class Binding:
+    """One control and the parameter it drives, with its setter compiled"""
+
+    def __init__(self, name, control, path=None, param_id=None, host=None, minimum=0.0, maximum=1.0, value=None):
+        self.name = name
+        self.control = control
+        self.path = path  # tuple of keys under the column's clip or group, or None
+        self.param_id = param_id  # int, or None for a path binding
+        self.host = host  # host an ID binding's parameter lives on, None for a path binding
+        self.minimum = minimum
+        self.maximum = maximum
+        self.value = value  # what a button sends
+        self.build = compile_setter(path or ())
+
+    @property
+    def target(self):
+        """(host, target) an ID binding is sent to; path bindings go to their column's layers"""
+        if self.param_id is None:
+            return None
+        return (self.host, parameter_target(self.param_id))
+
+
+def compile_binding(name, spec) -> Binding:
+    """Validate a PARAMETER_BINDINGS entry and compile it. Raises ValueError."""
+    if not isinstance(spec, dict):
+        raise ValueError(f"Expected a binding object, got {spec!r}")
+    control = spec.get("control", "fader")
+    if control not in CONTROLS:
+        raise ValueError(f"Control must be one of {', '.join(CONTROLS)}, got {control!r}")
+    if ("path" in spec) == ("id" in spec):
+        raise ValueError("Give either a parameter path or a parameter id")
+    path = param_id = None
+    if "path" in spec:
+        path = parse_path(spec["path"])
+    else:
+        try:
+            param_id = int(spec["id"])
+        except (TypeError, ValueError):
+            raise ValueError(f"Parameter ids are numbers, got {spec['id']!r}") from None
+    try:
+        minimum = float(spec.get("min", 0.0))
+        maximum = float(spec.get("max", 1.0))
+    except (TypeError, ValueError):
+        raise ValueError("min and max must be numbers") from None
+    if maximum <= minimum:
+        raise ValueError(f"max must be above min, got {minimum:g} to {maximum:g}")
+    host = (spec.get("host") or MAIN_HOST) if param_id is not None else None
+    return Binding(name, control, path, param_id, host, minimum, maximum, spec.get("value", maximum))
+
+
+class BindingTable:
+    """Every configured binding, compiled once; ones that don't compile are logged and left out"""
+
+    def __init__(self, specs=None):
+        self.bindings = {}  # name -> Binding, in config order
+        for name, spec in (specs or {}).items():
+            try:
+                self.bindings[name] = compile_binding(name, spec)
+            except ValueError as e:
+                logger.warning("Ignoring parameter binding", extra={"binding": name, "error": str(e)})
+
+    def __contains__(self, name):
+        return name in self.bindings
+
+    def __iter__(self):
+        return iter(self.bindings.values())
+
+    def __len__(self):
+        return len(self.bindings)
+
+    def get(self, name):
+        return self.bindings.get(name)
+
+    def body(self, values: dict):
+        """One request body setting every {binding name: value} given"""
+        return merge_bodies(self.bindings[name].build(value) for name, value in values.items() if name in self.bindings)
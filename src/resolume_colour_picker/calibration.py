@@ -0,0 +1,262 @@
+"""
+Per-layer colour calibration, so one palette entry looks the same on an LED
+wall, a projector and the DJ booth screens.
+
+LAYER_CALIBRATION maps a host's layer ("backup:3", or "main:G2" for a layer
+group; a bare "3" is the main host's) to a correction:
+
+    {"gain": [1.0, 0.92, 0.85], "gamma": 1.1}   # out = gain * in ** gamma, per channel
+    {"lut": "/path/to/wall.cube"}                # 3D LUT, trilinear
+    {"lut": "wall.cube", "gain": 0.9}            # LUT first, then gain/gamma
+
+CALIBRATION_FILE names a JSON file of the same entries, followed as it is
+saved like PALETTE_FILE; relative LUT paths in it are relative to the file.
+
+Corrected colours are precomputed per palette entry, so a press only looks
+its colour up.
+"""
+
+import json
+import logging
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from resolume_colour_picker.hosts import MAIN_HOST
+from resolume_colour_picker.palette import hex_to_rgb_array, normalise_hex, rgb_array_to_hex
+
+
+# Colours outside the palette (e.g. gradients) cached per layer on top of the palette's
+EXTRA_CACHE = 4096
+
+logger = logging.getLogger(__name__)
+
+
+# =========================
+# CURVES
+# =========================
+
+def _per_channel(value, name) -> np.ndarray:
+    """A scalar or [r, g, b] spec value as a 3-vector"""
+    array = np.asarray(value, dtype=np.float64).reshape(-1)
+    if array.size == 1:
+        array = np.repeat(array, 3)
+    if array.size != 3 or not np.all(np.isfinite(array)) or np.any(array < 0):
+        raise ValueError(f"{name} must be a non-negative number or [r, g, b], got {value!r}")
+    return array
+
+
+def parse_cube(text: str) -> tuple:
+    """
+    Parse a .cube 3D LUT. Returns (table, domain_min, domain_max), with the
+    table shaped (N, N, N, 3) and indexed [blue, green, red], as red varies
+    fastest in the file. Raises ValueError.
+    """
+    size = None
+    domain_min, domain_max = np.zeros(3), np.ones(3)
+    rows = []
+    for line_no, line in enumerate(text.splitlines(), start=1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        keyword, _, rest = line.partition(" ")
+        try:
+            if keyword == "LUT_3D_SIZE":
+                size = int(rest)
+            elif keyword == "DOMAIN_MIN":
+                domain_min = np.array([float(v) for v in rest.split()])
+            elif keyword == "DOMAIN_MAX":
+                domain_max = np.array([float(v) for v in rest.split()])
+            elif keyword == "LUT_3D_INPUT_RANGE":
+                low, high = (float(v) for v in rest.split())
+                domain_min, domain_max = np.full(3, low), np.full(3, high)
+            elif keyword == "LUT_1D_SIZE":
+                raise ValueError("1D LUTs aren't supported; use gain and gamma")
+            elif keyword == "TITLE":
+                continue
+            else:
+                rows.append([float(v) for v in line.split()])
+        except ValueError as e:
+            raise ValueError(f"Line {line_no}: {e}") from None
+    if size is None or size < 2:
+        raise ValueError("Missing or invalid LUT_3D_SIZE")
+    if len(rows) != size ** 3 or any(len(row) != 3 for row in rows):
+        raise ValueError(f"Expected {size ** 3} RGB rows for a {size}^3 LUT, found {len(rows)}")
+    if domain_min.shape != (3,) or domain_max.shape != (3,) or np.any(domain_max <= domain_min):
+        raise ValueError("Invalid DOMAIN_MIN / DOMAIN_MAX")
+    return np.array(rows).reshape(size, size, size, 3), domain_min, domain_max
+
+
+def apply_cube(rgb: np.ndarray, table: np.ndarray, domain_min, domain_max) -> np.ndarray:
+    """Trilinear lookup of (N, 3) colours in 0..1 through a parsed 3D LUT"""
+    size = table.shape[0]
+    scaled = np.clip((rgb - domain_min) / (domain_max - domain_min), 0.0, 1.0) * (size - 1)
+    low = np.minimum(np.floor(scaled).astype(np.intp), size - 2)
+    frac = scaled - low
+    r0, g0, b0 = low[:, 0], low[:, 1], low[:, 2]
+    fr, fg, fb = frac[:, 0:1], frac[:, 1:2], frac[:, 2:3]
+
+    def corner(db, dg, dr):
+        return table[b0 + db, g0 + dg, r0 + dr]
+
+    # Blend along red, then green, then blue
+    c00 = corner(0, 0, 0) * (1 - fr) + corner(0, 0, 1) * fr
+    c01 = corner(0, 1, 0) * (1 - fr) + corner(0, 1, 1) * fr
+    c10 = corner(1, 0, 0) * (1 - fr) + corner(1, 0, 1) * fr
+    c11 = corner(1, 1, 0) * (1 - fr) + corner(1, 1, 1) * fr
+    c0 = c00 * (1 - fg) + c01 * fg
+    c1 = c10 * (1 - fg) + c11 * fg
+    return c0 * (1 - fb) + c1 * fb
+
+
+class Curve:
+    """One layer's correction, built once from its LAYER_CALIBRATION entry"""
+
+    def __init__(self, spec: dict):
+        if not isinstance(spec, dict):
+            raise ValueError(f"Expected an object with gain, gamma or lut, got {spec!r}")
+        unknown = set(spec) - {"gain", "gamma", "lut"}
+        if unknown:
+            raise ValueError(f"Unknown calibration setting(s): {', '.join(sorted(unknown))}")
+        self.gain = _per_channel(spec.get("gain", 1.0), "gain")
+        self.gamma = _per_channel(spec.get("gamma", 1.0), "gamma")
+        self.cube = None
+        if spec.get("lut"):
+            try:
+                text = Path(spec["lut"]).expanduser().read_text(encoding="utf-8")
+            except OSError as e:
+                raise ValueError(f"Couldn't read LUT: {e}") from None
+            self.cube = parse_cube(text)
+
+    def apply(self, rgb: np.ndarray) -> np.ndarray:
+        """Correct (N, 3) colours in 0..1"""
+        if self.cube is not None:
+            rgb = apply_cube(rgb, *self.cube)
+        return np.clip(self.gain * np.clip(rgb, 0.0, 1.0) ** self.gamma, 0.0, 1.0)
+
+
+def parse_target_key(key) -> tuple:
+    """
+    A LAYER_CALIBRATION key as a dispatcher target: ("backup", 3) for
+    "backup:3", ("main", "G2") for "G2". Raises ValueError.
+    """
+    host, _, text = str(key).rpartition(":")
+    host, text = host.strip() or MAIN_HOST, text.strip()
+    if text.isdigit():
+        return (host, int(text))
+    if text[:1].upper() == "G" and text[1:].isdigit():
+        return (host, "G" + text[1:])
+    raise ValueError(
+        f"Calibration keys are layer numbers or G<n> for a layer group, after host: for other hosts, got {key!r}"
+    )
+
+
+def parse_calibration_file(path) -> dict:
+    """
+    A JSON file of LAYER_CALIBRATION entries, validated, with relative LUT
+    paths made relative to the file. Raises ValueError.
+    """
+    path = Path(path)
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(data, dict):
+        raise ValueError('Calibration must be a JSON object such as {"main:3": {"gain": 0.9}}')
+    calibration = {}
+    for key, spec in data.items():
+        try:
+            parse_target_key(key)
+            if isinstance(spec, dict) and spec.get("lut"):
+                lut = Path(spec["lut"]).expanduser()
+                spec = {**spec, "lut": str(lut if lut.is_absolute() else path.parent / lut)}
+            Curve(spec)
+        except ValueError as e:
+            raise ValueError(f"{key}: {e}") from None
+        calibration[str(key).strip()] = spec
+    return calibration
+
+
+# =========================
+# LOOKUP TABLES
+# =========================
+
+class CalibrationTable:
+    """
+    Corrected colour for every ((host, layer), palette colour), kept up to
+    date incrementally: a palette change only computes the new colours, and a
+    calibration change only rebuilds the layers whose entry changed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.specs = {}  # (host, layer) -> calibration entry the table was built from
+        self.curves = {}  # (host, layer) -> Curve
+        self.tables = {}  # (host, layer) -> {colour: corrected '#rrggbb'}
+        self.colours = []  # palette colours, as dispatched
+        self.computed = 0  # corrected colours worked out so far, for tests and benchmarks
+
+    def _compute(self, target, colours) -> dict:
+        valid = [c for c in colours if normalise_hex(c)]
+        if not valid:
+            return {}
+        corrected = rgb_array_to_hex(self.curves[target].apply(hex_to_rgb_array(normalise_hex(c) for c in valid)))
+        self.computed += len(valid)
+        return dict(zip(valid, corrected))
+
+    def update(self, calibration: dict, colours) -> set:
+        """
+        Bring the tables in line with LAYER_CALIBRATION and the palette colours.
+        Returns the (host, layer) targets whose correction changed. Bad entries
+        are logged and leave their layer uncorrected.
+        """
+        wanted = {}
+        for key, spec in (calibration or {}).items():
+            try:
+                wanted[parse_target_key(key)] = spec
+            except ValueError as e:
+                logger.error("Ignoring calibration: %s", e)
+
+        colours = list(dict.fromkeys(colours))
+        with self._lock:
+            changed = {target for target in self.specs if target not in wanted}
+            for target in changed:
+                del self.specs[target], self.curves[target], self.tables[target]
+
+            previous = set(self.colours)
+            added = [c for c in colours if c not in previous]
+            removed = previous - set(colours)
+            self.colours = colours
+            for target, spec in wanted.items():
+                if self.specs.get(target) == spec:
+                    # Same correction; only colours new to the palette need working out
+                    table = {c: v for c, v in self.tables[target].items() if c not in removed}
+                    table.update(self._compute(target, added))
+                    self.tables[target] = table
+                    continue
+                try:
+                    curve = Curve(spec)
+                except ValueError as e:
+                    logger.error("Ignoring calibration: %s", e, extra={"host": target[0], "layer": target[1]})
+                    if target in self.specs:
+                        del self.specs[target], self.curves[target], self.tables[target]
+                        changed.add(target)
+                    continue
+                self.specs[target] = spec
+                self.curves[target] = curve
+                self.tables[target] = self._compute(target, colours)
+                changed.add(target)
+        return changed
+
+    def correct(self, target, colour) -> str:
+        """The colour to send to a (host, layer). A dict lookup for palette colours; others are worked out once."""
+        table = self.tables.get(target)
+        if table is None:
+            return colour
+        corrected = table.get(colour)
+        if corrected is None:
+            with self._lock:
+                if target not in self.curves or not normalise_hex(colour):
+                    return colour
+                corrected = self._compute(target, [colour])[colour]
+                if len(table) < len(self.colours) + EXTRA_CACHE:
+                    table[colour] = corrected
+        return corrected
@@ -0,0 +1,49 @@
+import threading
+
+
+class CircuitBreaker:
+    """
+    Stops requests going out while Resolume is unreachable.
+
+    Opens after `failure_threshold` consecutive connection failures, or
+    immediately when the heartbeat reports the host offline. Only a successful
+    heartbeat closes it again, so a single lucky request can't flap it shut.
+    """
+
+    def __init__(self, failure_threshold=3):
+        self.failure_threshold = failure_threshold
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._open = False
+
+    @property
+    def is_open(self):
+        return self._open
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+
+    def record_failure(self) -> bool:
+        """Count a connection failure. Returns True if this opened the breaker."""
+        with self._lock:
+            self._failures += 1
+            if not self._open and self._failures >= self.failure_threshold:
+                self._open = True
+                return True
+            return False
+
+    def trip(self) -> bool:
+        """Open the breaker. Returns True if it was closed."""
+        with self._lock:
+            was_open = self._open
+            self._open = True
+            return not was_open
+
+    def reset(self) -> bool:
+        """Close the breaker. Returns True if it was open."""
+        with self._lock:
+            was_open = self._open
+            self._open = False
+            self._failures = 0
+            return was_open
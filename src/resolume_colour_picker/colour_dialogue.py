@@ -1,10 +1,14 @@
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QTableView, QStyledItemDelegate, QColorDialog, QLineEdit, QMessageBox
+    QTableView, QStyledItemDelegate, QColorDialog, QLineEdit, QMessageBox,
+    QFileDialog, QInputDialog
 )
 from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
 from PySide6.QtGui import QColor
 
+from resolume_colour_picker.palette_browser_dialogue import PaletteBrowserDialog
+from resolume_colour_picker.image_palette import extract_palette
+
 
 class ColourTableModel(QAbstractTableModel):
     """Model for storing colour labels and hex values."""
@@ -93,7 +97,7 @@ class ColourConfigDialog(QDialog):
         self.resize(600, 400)
         
         layout = QVBoxLayout()
-        info_label = QLabel("Edit colour labels and pick hex values. Must have exactly 8 colours.")
+        info_label = QLabel("Edit colour labels and pick hex values, or add swatches from a library.")
         layout.addWidget(info_label)
         
         # Table
@@ -108,18 +112,30 @@ class ColourConfigDialog(QDialog):
         # Buttons
         btn_layout = QHBoxLayout()
         new_btn = QPushButton("New")
+        library_btn = QPushButton("Library...")
+        image_btn = QPushButton("From Image...")
         delete_btn = QPushButton("Delete")
+        bank_btn = QPushButton("Save as Bank...")
+        delete_bank_btn = QPushButton("Delete Bank...")
         save_btn = QPushButton("Save")
         cancel_btn = QPushButton("Cancel")
         
         new_btn.clicked.connect(self.add_row)
+        library_btn.clicked.connect(self.add_from_library)
+        image_btn.clicked.connect(self.load_from_image)
         delete_btn.clicked.connect(self.delete_row)
+        bank_btn.clicked.connect(self.save_as_bank)
+        delete_bank_btn.clicked.connect(self.delete_bank)
         save_btn.clicked.connect(self.save_changes)
         cancel_btn.clicked.connect(self.reject)
         
         btn_layout.addStretch()
         btn_layout.addWidget(new_btn)
+        btn_layout.addWidget(library_btn)
+        btn_layout.addWidget(image_btn)
         btn_layout.addWidget(delete_btn)
+        btn_layout.addWidget(bank_btn)
+        btn_layout.addWidget(delete_bank_btn)
         btn_layout.addWidget(save_btn)
         btn_layout.addWidget(cancel_btn)
         
@@ -134,6 +150,38 @@ class ColourConfigDialog(QDialog):
             index += 1
         self.model.insertRow(row, label=f"new colour ({index})")
 
+    def add_from_library(self):
+        dialog = PaletteBrowserDialog(self.config, self)
+        if not dialog.exec():
+            return
+        labels = {label for label, _ in self.model._data}
+        for name, hex_val in dialog.selected_swatches():
+            # COLOUR_SET is keyed by label, so duplicate swatch names get a suffix
+            label, index = name, 1
+            while label in labels:
+                label = f"{name} ({index})"
+                index += 1
+            labels.add(label)
+            self.model.insertRow(self.model.rowCount(), label=label, hex_val=hex_val)
+
+    def load_from_image(self):
+        """Replace the palette with the dominant colours of an image"""
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Extract Palette From Image", "", "Images (*.png *.jpg *.jpeg *.bmp *.gif *.webp)"
+        )
+        if not path:
+            return
+        count, ok = QInputDialog.getInt(self, "Extract Palette", "Number of colours:", 8, 1, 64)
+        if not ok:
+            return
+        try:
+            palette = extract_palette(path, count)
+        except ValueError as e:
+            QMessageBox.critical(self, "Error", str(e))
+            return
+        self.config["COLOUR_SET"] = palette
+        self.accept()
+
     def delete_row(self):
         selected = self.table.selectionModel().selectedRows()
         for index in sorted([r.row() for r in selected], reverse=True):
@@ -142,3 +190,31 @@ class ColourConfigDialog(QDialog):
     def save_changes(self):
         self.config["COLOUR_SET"] = self.model.get_all_colours()
         self.accept()
+
+    def save_as_bank(self):
+        """Save the palette as a named bank and switch to it"""
+        name, ok = QInputDialog.getText(
+            self, "Save as Bank", "Bank name:", text=self.config.get("ACTIVE_BANK") or ""
+        )
+        name = name.strip()
+        if not ok or not name:
+            return
+        colours = self.model.get_all_colours()
+        self.config["PALETTE_BANKS"] = {**(self.config.get("PALETTE_BANKS") or {}), name: colours}
+        self.config["ACTIVE_BANK"] = name
+        self.config["COLOUR_SET"] = colours
+        self.accept()
+
+    def delete_bank(self):
+        """Remove a saved bank; the colours on screen stay as they are"""
+        banks = dict(self.config.get("PALETTE_BANKS") or {})
+        if not banks:
+            QMessageBox.information(self, "Delete Bank", "No palette banks have been saved.")
+            return
+        name, ok = QInputDialog.getItem(self, "Delete Bank", "Bank:", list(banks), 0, False)
+        if not ok:
+            return
+        del banks[name]
+        self.config["PALETTE_BANKS"] = banks
+        if self.config.get("ACTIVE_BANK") == name:
+            self.config["ACTIVE_BANK"] = ""
@@ -1,10 +1,13 @@
 import json
+import logging
 from pathlib import Path
 
 from platformdirs import user_cache_dir
 from PySide6.QtCore import Signal, QObject
 
-        
+
+logger = logging.getLogger(__name__)
+
 
 class Config(QObject):
     """
@@ -40,7 +43,7 @@ class Config(QObject):
                 with open(self.cache_file, "r", encoding="utf-8") as f:
                     self._data = json.load(f)
             except (json.JSONDecodeError, IOError):
-                print(f"Warning: cache file corrupted, starting fresh: {self.cache_file}")
+                logger.warning("Cache file corrupted, starting fresh: %s", self.cache_file)
                 self._data = {}
         else:
             self._data = {}
@@ -51,7 +54,7 @@ class Config(QObject):
             with open(self.cache_file, "w", encoding="utf-8") as f:
                 json.dump(self._data, f, indent=4)
         except IOError as e:
-            print(f"Failed to save cache: {e}")
+            logger.error("Failed to save cache: %s", e)
 
     def get(self, key, default=None):
         """Retrieve a value from the cache."""
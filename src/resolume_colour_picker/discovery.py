@@ -0,0 +1,156 @@
+import http.client
+import ipaddress
+import json
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import NamedTuple
+
+
+PRODUCT_PATH = "/api/v1/product"
+COMPOSITION_PATH = "/api/v1/composition"
+# Widest subnet a scan accepts; a /16 would be 65k probes per port
+MIN_PREFIX = 22
+
+
+class DiscoveredServer(NamedTuple):
+    ip: str
+    port: int
+    latency_ms: float
+    product: str
+
+
+class LayerGroup(NamedTuple):
+    index: int  # 1-based position, as used in /layergroups/{index}
+    name: str
+    layers: list  # 1-based positions of the layers in the group
+
+
+def parse_layer_groups(composition: dict) -> list:
+    """Pull the layer groups, and which layers each holds, out of a /composition reply"""
+    positions = {layer.get("id"): i for i, layer in enumerate(composition.get("layers") or [], 1)}
+    groups = []
+    for i, group in enumerate(composition.get("layergroups") or [], 1):
+        name = (group.get("name") or {}).get("value") or f"Layer Group {i}"
+        members = [positions[layer.get("id")] for layer in group.get("layers") or [] if layer.get("id") in positions]
+        groups.append(LayerGroup(i, name, members))
+    return groups
+
+
+def fetch_layer_groups(ip: str, port: int, timeout: float = 1.0):
+    """
+    Read a host's layer groups from its composition.
+    Returns a list of LayerGroup, or None if the composition couldn't be read.
+    """
+    conn = http.client.HTTPConnection(ip, port, timeout=timeout)
+    try:
+        conn.request("GET", COMPOSITION_PATH)
+        response = conn.getresponse()
+        body = response.read()
+        if response.status != 200:
+            return None
+        return parse_layer_groups(json.loads(body))
+    except (OSError, http.client.HTTPException, ValueError, AttributeError):
+        return None
+    finally:
+        conn.close()
+
+
+def parse_ports(text: str) -> list:
+    """Parse '8080, 8090-8092' into [8080, 8090, 8091, 8092]. Raises ValueError."""
+    ports = []
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        start, sep, end = part.partition("-")
+        first = int(start)
+        last = int(end) if sep else first
+        if not (0 < first <= last <= 65535):
+            raise ValueError(f"Invalid port range {part!r}")
+        ports.extend(range(first, last + 1))
+    if not ports:
+        raise ValueError("No ports given")
+    return ports
+
+
+def subnet_hosts(cidr: str) -> list:
+    """Every host address in a subnet, e.g. '192.168.1.0/24'. Raises ValueError."""
+    network = ipaddress.ip_network(cidr.strip(), strict=False)
+    if network.num_addresses > 2 ** (32 - MIN_PREFIX):
+        raise ValueError(f"Subnets wider than /{MIN_PREFIX} take too long to scan, got {cidr.strip()}")
+    hosts = [str(ip) for ip in network.hosts()]
+    return hosts or [str(network.network_address)]
+
+
+def local_subnet() -> str:
+    """Best guess at the /24 this machine is on"""
+    try:
+        # No packets are sent; connecting a UDP socket just picks the outgoing interface
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.connect(("10.255.255.255", 1))
+            ip = s.getsockname()[0]
+    except OSError:
+        ip = "127.0.0.1"
+    return str(ipaddress.ip_network(f"{ip}/24", strict=False))
+
+
+def describe_product(body: bytes) -> str:
+    try:
+        product = json.loads(body)
+        version = ".".join(str(product[k]) for k in ("major", "minor", "micro") if k in product)
+        return f"{product.get('name', 'Resolume')} {version}".strip()
+    except (ValueError, AttributeError):
+        return "Resolume"
+
+
+def probe(ip: str, port: int, timeout: float = 0.3):
+    """
+    Ask one address for the Resolume product endpoint.
+    Returns a DiscoveredServer, or None if nothing Resolume-like answered.
+    """
+    start = time.perf_counter()
+    # A raw connect fails fast on closed ports, before any HTTP machinery is set up
+    try:
+        sock = socket.create_connection((ip, port), timeout=timeout)
+    except OSError:
+        return None
+    conn = http.client.HTTPConnection(ip, port, timeout=timeout)
+    conn.sock = sock
+    try:
+        conn.request("GET", PRODUCT_PATH)
+        response = conn.getresponse()
+        body = response.read()
+        if response.status != 200:
+            return None
+    except (OSError, http.client.HTTPException):
+        return None
+    finally:
+        conn.close()
+    latency = (time.perf_counter() - start) * 1000
+    return DiscoveredServer(ip, port, latency, describe_product(body))
+
+
+def scan(hosts, ports, timeout=0.3, workers=256, on_found=None, stop=None) -> list:
+    """
+    Probe every host/port pair concurrently. With enough workers a /24 sweep
+    takes roughly one timeout, since unanswered probes all wait in parallel.
+    Returns responders sorted by latency; on_found is called as each arrives.
+    Setting the `stop` Event abandons the probes not yet started.
+    """
+    found = []
+    targets = [(ip, port) for ip in hosts for port in ports]
+    executor = ThreadPoolExecutor(max_workers=min(workers, max(1, len(targets))))
+    try:
+        futures = [executor.submit(probe, ip, port, timeout) for ip, port in targets]
+        for future in as_completed(futures):
+            if stop is not None and stop.is_set():
+                break
+            server = future.result()
+            if server is not None:
+                found.append(server)
+                if on_found is not None:
+                    on_found(server)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return sorted(found, key=lambda s: s.latency_ms)
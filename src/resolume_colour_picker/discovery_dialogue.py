@@ -0,0 +1,122 @@
+import threading
+
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+    QTableWidget, QTableWidgetItem, QLineEdit, QHeaderView, QMessageBox
+)
+from PySide6.QtCore import Signal
+
+from resolume_colour_picker.discovery import local_subnet, parse_ports, scan, subnet_hosts
+
+
+class DiscoveryDialog(QDialog):
+    """Scan the local network for Resolume webservers"""
+    server_found = Signal(object)  # DiscoveredServer
+    scan_finished = Signal(int)  # number of probes
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Discover Resolume")
+        self.resize(600, 400)
+        self.servers = []
+        self.selected = None  # (ip, port) once the user picks one
+        self.stop = threading.Event()  # set once the dialog closes, to end a scan still running
+
+        layout = QVBoxLayout()
+
+        form = QHBoxLayout()
+        form.addWidget(QLabel("Subnet:"))
+        self.subnet_edit = QLineEdit(local_subnet())
+        form.addWidget(self.subnet_edit)
+        form.addWidget(QLabel("Ports:"))
+        self.ports_edit = QLineEdit("8080")
+        self.ports_edit.setToolTip("Comma separated ports or ranges, e.g. 8080, 8090-8092")
+        form.addWidget(self.ports_edit)
+        self.scan_btn = QPushButton("Scan")
+        self.scan_btn.clicked.connect(self.start_scan)
+        form.addWidget(self.scan_btn)
+        layout.addLayout(form)
+
+        self.info_label = QLabel("Press Scan to look for Resolume on the network.")
+        layout.addWidget(self.info_label)
+
+        self.table = QTableWidget(0, 4)
+        self.table.setHorizontalHeaderLabels(["IP", "Port", "Latency", "Product"])
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.cellDoubleClicked.connect(self.use_selected)
+        layout.addWidget(self.table)
+
+        btn_layout = QHBoxLayout()
+        use_btn = QPushButton("Use")
+        cancel_btn = QPushButton("Cancel")
+        use_btn.clicked.connect(self.use_selected)
+        cancel_btn.clicked.connect(self.reject)
+        btn_layout.addStretch()
+        btn_layout.addWidget(use_btn)
+        btn_layout.addWidget(cancel_btn)
+        layout.addLayout(btn_layout)
+        self.setLayout(layout)
+
+        self.server_found.connect(self.add_server)
+        self.scan_finished.connect(self.on_scan_finished)
+
+    def start_scan(self):
+        try:
+            hosts = subnet_hosts(self.subnet_edit.text())
+            ports = parse_ports(self.ports_edit.text())
+        except ValueError as e:
+            QMessageBox.critical(self, "Error", str(e))
+            return
+
+        self.servers = []
+        self.table.setRowCount(0)
+        self.scan_btn.setEnabled(False)
+        self.info_label.setText(f"Scanning {len(hosts) * len(ports)} addresses...")
+
+        stop = self.stop
+
+        def found(server):
+            if not stop.is_set():
+                self.server_found.emit(server)
+
+        def task():
+            scan(hosts, ports, on_found=found, stop=stop)
+            if not stop.is_set():
+                self.scan_finished.emit(len(hosts) * len(ports))
+
+        threading.Thread(target=task, daemon=True).start()
+
+    def done(self, result):
+        # Accept, reject and closing the window all end here, before the dialog can be deleted
+        self.stop.set()
+        super().done(result)
+
+    def closeEvent(self, event):
+        self.stop.set()
+        super().closeEvent(event)
+
+    def add_server(self, server):
+        """Insert a responder, keeping the table sorted by latency"""
+        self.servers.append(server)
+        self.servers.sort(key=lambda s: s.latency_ms)
+        self.table.setRowCount(len(self.servers))
+        for row, s in enumerate(self.servers):
+            values = (s.ip, str(s.port), f"{s.latency_ms:.1f} ms", s.product)
+            for col, value in enumerate(values):
+                self.table.setItem(row, col, QTableWidgetItem(value))
+
+    def on_scan_finished(self, probes):
+        self.scan_btn.setEnabled(True)
+        self.info_label.setText(f"Found {len(self.servers)} Resolume server(s) in {probes} addresses.")
+        if self.servers:
+            self.table.selectRow(0)
+
+    def use_selected(self, *args):
+        rows = self.table.selectionModel().selectedRows()
+        if not rows:
+            return
+        server = self.servers[rows[0].row()]
+        self.selected = (server.ip, str(server.port))
+        self.accept()
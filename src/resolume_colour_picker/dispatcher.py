@@ -0,0 +1,951 @@
+import json
+import logging
+import socket
+import threading
+import time
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+
+from PySide6.QtCore import QObject, Qt, QTimer, Signal
+
+from resolume_colour_picker.bindings import BindingTable, compile_template, parameter_id, parameter_url
+from resolume_colour_picker.calibration import CalibrationTable
+from resolume_colour_picker.circuit_breaker import CircuitBreaker
+from resolume_colour_picker.discovery import fetch_layer_groups
+from resolume_colour_picker.hosts import MAIN_HOST, column_hosts, configured_hosts
+from resolume_colour_picker.layers import ALL, GroupRef, group_index, group_target, parse_group, parse_layers, target_path
+from resolume_colour_picker.metrics import (
+    QUEUE_DEPTH, REQUEST_LATENCY, REQUESTS_DROPPED, REQUESTS_FAILED, REQUESTS_SENT
+)
+from resolume_colour_picker.process_transport import (
+    CONNECTION_ERROR, DROPPED, ERROR, GROUP, HTTP_ERROR, OK, PANIC, DispatchProcess
+)
+from resolume_colour_picker.status_heartbeat import StatusHeartbeat
+
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+logger = logging.getLogger(__name__)
+
+
+class LayerStateCache:
+    """
+    Tracks the colour Resolume last confirmed for each layer, so presses that
+    would not change anything can be dropped before they reach the network.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.confirmed = {}  # layer -> colour from the last successful response
+        self.in_flight = {}  # layer -> colour of the newest request not yet answered
+        self.sent_count = 0
+        self.skipped_count = 0
+
+    def claim(self, layer, colour, force=False) -> bool:
+        """Return True if a request should be sent, and mark it as in flight"""
+        with self._lock:
+            if not force:
+                pending = self.in_flight.get(layer)
+                if pending == colour or (pending is None and self.confirmed.get(layer) == colour):
+                    self.skipped_count += 1
+                    return False
+            self.in_flight[layer] = colour
+            self.sent_count += 1
+            return True
+
+    def confirm(self, layer, colour):
+        with self._lock:
+            self.confirmed[layer] = colour
+            if self.in_flight.get(layer) == colour:
+                del self.in_flight[layer]
+
+    def fail(self, layer, colour):
+        with self._lock:
+            # The layer may or may not have changed, so the next press must go out
+            self.confirmed.pop(layer, None)
+            if self.in_flight.get(layer) == colour:
+                del self.in_flight[layer]
+
+    def abandon(self, layer, colour):
+        """Forget a request that was dropped before it was sent"""
+        with self._lock:
+            if self.in_flight.get(layer) == colour:
+                del self.in_flight[layer]
+
+    def invalidate(self):
+        with self._lock:
+            self.confirmed.clear()
+            self.in_flight.clear()
+
+
+class HostChannel:
+    """Connection pool, layer state and circuit breaker for one Resolume host"""
+
+    def __init__(self, name, ip, port, workers=4):
+        self.name = name
+        self.ip = ip
+        self.port = port
+        self.workers = workers
+        self.address = ip  # resolved address, once warm() has run
+        self.api_base_url = self._build_base_url(ip)
+        self.last_used = 0.0  # monotonic time of the last request
+        self.warmed = 0  # connections the last warm() left in the pool
+
+        # Each host gets its own pool and workers so a slow host can't hold up the others
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=workers))
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"dispatch-{name}")
+        self.state = LayerStateCache()
+        # Bumped by a panic; queued requests from an older generation are dropped unsent
+        self.generation = 0
+
+        # Panic lane: its own pool and workers, so it never waits behind queued presses
+        self.priority_session = requests.Session()
+        self.priority_session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=workers))
+        self.priority_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"panic-{name}")
+        self.priority_latency_ms = 0.0  # latency of the last panic request
+
+        # Tasks submitted and not yet finished, per lane
+        self._pending_lock = threading.Lock()
+        self.pending = {"normal": 0, "panic": 0}
+
+        # While the breaker is open only the latest wanted colour per layer is kept
+        self.breaker = CircuitBreaker()
+        self._held_lock = threading.Lock()
+        self.held = {}  # layer -> colour
+
+        # Bound parameter values waiting to go out, merged per layer or parameter ID
+        self._parameters_lock = threading.Lock()
+        self.parameters = {}  # target -> {binding name: value}
+        self.parameters_busy = set()  # targets a worker is sending for
+
+        self.latency_ms = 0.0  # smoothed request latency
+        self.heartbeat = None  # extra hosts only; the main host's lives in the UI
+        self._heartbeat_busy = False
+
+    def submit(self, fn, *args, priority=False, **kwargs):
+        """Run a task on the channel's workers, or its panic lane, counting it until it finishes"""
+        lane = "panic" if priority else "normal"
+        with self._pending_lock:
+            self.pending[lane] += 1
+        executor = self.priority_executor if priority else self.executor
+        future = executor.submit(fn, *args, **kwargs)
+        future.add_done_callback(lambda _: self._finished(lane))
+        return future
+
+    def _finished(self, lane):
+        with self._pending_lock:
+            self.pending[lane] -= 1
+
+    def _build_base_url(self, address):
+        host = f"[{address}]" if ":" in address else address  # IPv6 literal
+        return f"http://{host}:{self.port}/api/v1/composition"
+
+    def resolve(self):
+        """
+        Resolve the host name once and address requests by IP from then on, so a
+        new connection never pays for DNS inside the 50 ms connect timeout.
+        IPv4 is preferred: 'localhost' resolving to ::1 first while Resolume only
+        listens on IPv4 costs a failed connect per new connection.
+        """
+        try:
+            infos = socket.getaddrinfo(self.ip, self.port, type=socket.SOCK_STREAM)
+        except (socket.gaierror, UnicodeError):
+            return  # leave it to requests to report on the next press
+        infos.sort(key=lambda info: info[0] != socket.AF_INET)
+        self.address = infos[0][4][0]
+        self.api_base_url = self._build_base_url(self.address)
+
+    def warm(self, connections):
+        """
+        Resolve the host then open `connections` keep-alive connections in the
+        pool, so the first press reuses a connection like every later one does.
+        Runs on threads of its own, so presses queued on the channel's workers
+        never wait behind it. Returns the thread, for callers that wait.
+        """
+        connections = max(1, min(connections, self.workers))
+        barrier = threading.Barrier(connections)
+        opened = []
+
+        def open_connection():
+            try:
+                url = self.api_base_url.replace("/composition", "/product")
+                # Streaming holds the connection until the body is read, so
+                # waiting for the others first makes each use its own connection
+                response = self.session.get(url, timeout=(0.5, 1.0), stream=True)
+            except requests.RequestException:
+                barrier.abort()
+                return  # the heartbeat and breaker report unreachable hosts
+            try:
+                barrier.wait(timeout=0.5)
+            except threading.BrokenBarrierError:
+                pass  # another connection failed; warm what we can
+            try:
+                response.content  # reading it all hands the connection back to the pool
+                opened.append(response)
+            except requests.RequestException:
+                pass
+
+        def task():
+            self.resolve()
+            openers = [
+                threading.Thread(target=open_connection, name=f"warm-{self.name}", daemon=True)
+                for _ in range(connections)
+            ]
+            for opener in openers:
+                opener.start()
+            for opener in openers:
+                opener.join()
+            self.warmed = len(opened)
+
+        def warm_priority():
+            try:
+                self.priority_session.get(self.api_base_url.replace("/composition", "/product"), timeout=(0.5, 1.0))
+            except requests.RequestException:
+                pass
+
+        thread = threading.Thread(target=task, name=f"warm-{self.name}", daemon=True)
+        thread.start()
+        self.submit(warm_priority, priority=True)
+        return thread
+
+    def record_latency(self, latency_ms):
+        self.latency_ms = latency_ms if not self.latency_ms else 0.8 * self.latency_ms + 0.2 * latency_ms
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.priority_executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+        self.priority_session.close()
+
+
+class _Batch:
+    """Collects completion times of one send() across hosts to measure skew"""
+
+    def __init__(self, panic=None):
+        self._lock = threading.Lock()
+        self.panic = panic  # name of the panic this batch carries, if any
+        self.start = time.perf_counter()
+        self.pending = 0
+        self.sealed = False
+        self.finished = {}  # host -> perf_counter of its last response
+
+    def add(self):
+        with self._lock:
+            self.pending += 1
+
+    def finish(self, host) -> bool:
+        """Record a response. Returns True once every request in the batch is done."""
+        with self._lock:
+            self.finished[host] = time.perf_counter()
+            self.pending -= 1
+            return self.sealed and self.pending == 0
+
+    def seal(self) -> bool:
+        """Mark submission complete. Returns True if everything already finished."""
+        with self._lock:
+            self.sealed = True
+            return self.pending == 0 and bool(self.finished)
+
+    def summary(self):
+        latencies = {host: (done - self.start) * 1000 for host, done in self.finished.items()}
+        skew = max(latencies.values()) - min(latencies.values())
+        return latencies, skew
+
+
+class Dispatcher(QObject):
+    """Sends layer colour changes to every configured Resolume host"""
+    connection_changed = Signal(str, bool)  # host, reachable
+    held_changed = Signal(int)  # number of layers waiting for their host to return
+    host_status = Signal(str, str, float, str)  # host, status, latency, colour
+    batch_completed = Signal(object, float)  # {host: latency ms}, cross-host skew ms
+    panic_completed = Signal(str, object, float)  # panic name, {host: latency ms}, worst latency ms
+    _groups_found = Signal(str, object)  # host, [LayerGroup] read from its composition
+
+    def __init__(self, config, base_payload, keepalive_ms=10000, panic_colours=None):
+        super().__init__()
+        self.config = config
+        self.base_payload = base_payload
+        self.colour_body = compile_template(base_payload)  # colour -> fresh request body
+        self.keepalive_ms = keepalive_ms
+        self.panic_colours = panic_colours or {}  # name -> colour
+        self.panic_payloads = {}  # name -> {host: [(layer, path, body)]}
+        self.last_panic_ms = 0.0
+
+        # Optional child process doing the HTTP work; see ISOLATED_DISPATCH
+        self.transport = None
+        self.transport_hosts = []  # (name, ip, port) the dispatch process was started with
+        self._pending = {}  # command seq -> (channel, layer, colour, batch, panic)
+        self.ack_timer = QTimer(self)
+        self.ack_timer.setTimerType(Qt.PreciseTimer)
+        self.ack_timer.setInterval(2)
+        self.ack_timer.timeout.connect(self.poll_acks)
+        QUEUE_DEPTH.add_callback(self.queue_depths)
+
+        self.hosts = {}  # name -> HostChannel
+        # Column targets, expanded once per LAYER_MAP / COLUMN_HOSTS / host change
+        self._targets = {}  # column -> [(host, layer)]
+        self._targets_source = None
+        # Named layer groups per host, from composition discovery
+        self.layer_groups = {}  # host -> {casefolded name: LayerGroup}
+        self._groups_found.connect(self._on_groups_found)
+        # The colour each (host, layer) should end up on, whether or not it was sent yet
+        self.desired = {}
+        self.last_skew_ms = 0.0
+        # Per-layer colour correction on each host, looked up from tables built per palette entry
+        self.calibration = CalibrationTable()
+        # Controls bound to other parameters, compiled once per PARAMETER_BINDINGS change
+        self._bindings = None
+        self._bindings_source = None
+        self.heartbeat_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="heartbeat")
+
+        self._build_hosts()
+        self.calibration.update(self.config.get("LAYER_CALIBRATION"), self._palette_colours())
+        self._build_panic_payloads()
+        self.config.value_changed.connect(self.config_callback, Qt.ConnectionType.QueuedConnection)
+
+        # Keep pooled connections open between presses; idle sockets get closed
+        # by the server and the next press would pay for a fresh connect
+        self.keepalive_timer = QTimer(self)
+        self.keepalive_timer.setInterval(keepalive_ms)
+        self.keepalive_timer.timeout.connect(self.keep_alive)
+        self.keepalive_timer.start()
+        # Warm up as soon as the event loop starts rather than on the first press
+        QTimer.singleShot(0, self.warm_all)
+        QTimer.singleShot(0, self.discover_groups)
+
+        if self.config.get("ISOLATED_DISPATCH", False):
+            self.start_transport()
+
+    def _build_hosts(self):
+        """Create, keep or drop host channels to match the config. Returns new channels."""
+        wanted = configured_hosts(self.config)
+        new_channels = []
+        for name in list(self.hosts):
+            channel = self.hosts[name]
+            if wanted.get(name) != (channel.ip, channel.port):
+                # Nothing is known about a new address's layers, so start fresh
+                channel.close()
+                del self.hosts[name]
+                self.layer_groups.pop(name, None)
+                self.desired = {t: c for t, c in self.desired.items() if t[0] != name}
+
+        self._targets_source = None
+        widest = self._widest_columns()
+        for name, (ip, port) in wanted.items():
+            if name in self.hosts:
+                continue
+            # Enough workers that the widest column goes out in a single round
+            channel = HostChannel(name, ip, port, workers=max(4, widest.get(name, 0)))
+            if name != MAIN_HOST:
+                channel.heartbeat = StatusHeartbeat(self.config, host=(name, ip, port))
+                channel.heartbeat.status_updated.connect(self._on_extra_status)
+                channel.heartbeat.reachable.connect(self._on_extra_reachable)
+            self.hosts[name] = channel
+            new_channels.append(channel)
+        return new_channels
+
+    def config_callback(self, key, value):
+        if key in ("WEBSERVER_IP", "WEBSERVER_PORT", "EXTRA_HOSTS"):
+            for channel in self._build_hosts():
+                self.warm(channel)
+            self._build_panic_payloads()
+            self.discover_groups()
+            if self.transport is not None and self._transport_hosts() != self.transport_hosts:
+                # The dispatch process only knows the hosts it was started with
+                self.stop_transport()
+                self.start_transport()
+        elif key in ("LAYER_MAP", "COLUMN_HOSTS"):
+            # The number of layers per host may have changed
+            self.warm_all(missing_only=True)
+            self._build_panic_payloads()
+            self.discover_groups()
+        elif key in ("LAYER_CALIBRATION", "COLOUR_SET"):
+            self.update_calibration()
+        elif key == "ISOLATED_DISPATCH":
+            if value and self.transport is None:
+                self.start_transport()
+            elif not value and self.transport is not None:
+                self.stop_transport()
+
+    # =========================
+    # CALIBRATION
+    # =========================
+
+    def _palette_colours(self) -> list:
+        """Every colour a press or panic can send, so each gets a precomputed correction"""
+        return list((self.config.get("COLOUR_SET") or {}).values()) + list(self.panic_colours.values())
+
+    def update_calibration(self):
+        """
+        Rebuild the correction tables for whatever changed, then resend the
+        layers whose correction changed so they pick it up straight away
+        """
+        changed = self.calibration.update(self.config.get("LAYER_CALIBRATION"), self._palette_colours())
+        if not changed:
+            return
+        self._build_panic_payloads()
+        resend = {target: colour for target, colour in self.desired.items() if target in changed}
+        if resend:
+            logger.info("Calibration changed - resending", extra={"count": len(resend)})
+            self.send(resend, force=True)
+
+    def output_colour(self, target, colour) -> str:
+        """The colour actually sent to a (host, layer), after its calibration"""
+        return self.calibration.correct(target, colour)
+
+    # =========================
+    # CONNECTION PRE-WARMING
+    # =========================
+
+    def mapped_layers(self) -> dict:
+        """The distinct layers mapped on each host"""
+        layers = {name: set() for name in self.hosts}
+        for column in self.config["LAYER_MAP"]:
+            for host, target_layer in self.targets_for(column):
+                layers[host].add(target_layer)
+        return layers
+
+    def mapped_layer_counts(self) -> dict:
+        """Number of distinct layers mapped on each host"""
+        return {name: len(host_layers) for name, host_layers in self.mapped_layers().items()}
+
+    def warm(self, channel):
+        channel.warm(self.mapped_layer_counts().get(channel.name, 1))
+
+    def warm_all(self, missing_only=False):
+        """Warm every host, or with missing_only just those whose pool is smaller than they now need"""
+        counts = self.mapped_layer_counts()
+        for channel in self.hosts.values():
+            wanted = min(max(1, counts.get(channel.name, 1)), channel.workers)
+            if not missing_only or channel.warmed < wanted:
+                channel.warm(wanted)
+
+    def keep_alive(self):
+        """Re-warm hosts that have been idle for a whole keep-alive interval"""
+        if self.transport is not None:
+            return  # the dispatch process keeps its own connections alive
+        idle_since = time.monotonic() - self.keepalive_ms / 1000
+        counts = self.mapped_layer_counts()
+        for channel in self.hosts.values():
+            if channel.last_used < idle_since and not channel.breaker.is_open:
+                channel.warm(counts.get(channel.name, 1))
+
+    # =========================
+    # PANIC LANE
+    # =========================
+
+    def _build_panic_payloads(self):
+        """Serialise every panic request up front so triggering one does no work but sending"""
+        layers = self.mapped_layers()
+        bodies = {}  # colour as sent -> body, shared by layers with the same correction
+        self.panic_payloads = {}
+        for name, colour in self.panic_colours.items():
+            self.panic_payloads[name] = {
+                host: [
+                    (layer, target_path(layer), self._panic_body(bodies, self.output_colour((host, layer), colour)))
+                    for layer in sorted(host_layers, key=str)
+                ]
+                for host, host_layers in layers.items()
+            }
+
+    def _panic_body(self, bodies, colour):
+        if colour not in bodies:
+            bodies[colour] = json.dumps(self.colour_body(colour)).encode()
+        return bodies[colour]
+
+    def panic(self, name) -> int:
+        """
+        Send a panic colour to every mapped layer through the priority lane.
+        Requests still queued on the normal lane are dropped unsent, so nothing
+        queued before the panic can land after it. Safe to call from any thread.
+        Returns the number of requests submitted.
+        """
+        colour = self.panic_colours[name]
+        batch = _Batch(panic=name)
+        submitted = 0
+        for host, requests_ in self.panic_payloads.get(name, {}).items():
+            channel = self.hosts.get(host)
+            if channel is None:
+                continue  # host removed; payloads are rebuilt once the change is processed
+            channel.generation += 1
+            layer_colours = {layer: colour for layer, _, _ in requests_}
+            self.desired.update({(host, layer): colour for layer in layer_colours})
+            if channel.breaker.is_open:
+                self._hold(channel, layer_colours)
+                continue
+            for layer, path, body in requests_:
+                channel.state.claim(layer, colour, force=True)
+                REQUESTS_SENT.inc(host=host, lane="panic")
+                batch.add()
+                if self.transport is not None:
+                    self._push(channel, layer, colour, batch, panic=True)
+                else:
+                    channel.submit(self._put_priority, channel, layer, colour, path, body, batch, priority=True)
+                submitted += 1
+        logger.warning("Panic: %s", name, extra={"colour": colour, "count": submitted})
+        if batch.seal():
+            self._finish_batch(batch)
+        return submitted
+
+    def _put_priority(self, channel, layer, colour, path, body, batch):
+        start = time.perf_counter()
+        try:
+            response = channel.priority_session.put(
+                channel.api_base_url + path, data=body, headers=JSON_HEADERS, timeout=(0.05, 0.5)
+            )
+            outcome = OK if response.ok else HTTP_ERROR
+            self._record_result(
+                channel, layer, colour, outcome, response.status_code, (time.perf_counter() - start) * 1000, panic=True
+            )
+        except (requests.ConnectionError, requests.Timeout) as e:
+            self._record_result(channel, layer, colour, CONNECTION_ERROR, e, panic=True)
+        except Exception as e:
+            self._record_result(channel, layer, colour, ERROR, e, panic=True)
+        finally:
+            if batch.finish(channel.name):
+                self._finish_batch(batch)
+
+    @property
+    def sent_count(self):
+        return sum(channel.state.sent_count for channel in self.hosts.values())
+
+    @property
+    def skipped_count(self):
+        return sum(channel.state.skipped_count for channel in self.hosts.values())
+
+    def targets_for(self, column) -> list:
+        """Return the (host, layer) targets a column drives; a layer group is one "G<n>" target"""
+        source = (self.config["LAYER_MAP"], self.config.get("COLUMN_HOSTS"))
+        if self._targets_source is None or any(a is not b for a, b in zip(source, self._targets_source)):
+            self._targets = {
+                name: [
+                    (host, layer)
+                    for host in column_hosts(self.config, name) if host in self.hosts
+                    for layer in self._host_layers(host, layers)
+                ]
+                for name, layers in self._column_layers(source[0]).items()
+            }
+            self._targets_source = source
+        return self._targets.get(column, [])
+
+    def layer_slots(self, columns) -> list:
+        """
+        Order the layers driven by `columns` for spreading colours across them:
+        one (column, [targets]) slot per layer, in column order, with the same
+        layer on each of a column's hosts sharing a slot. A layer already
+        driven by an earlier column isn't repeated.
+        """
+        slots = {}
+        seen = set()
+        for column in columns:
+            for target in self.targets_for(column):
+                if target not in seen:
+                    seen.add(target)
+                    slots.setdefault((column, target[1]), []).append(target)
+        return [(column, targets) for (column, _), targets in slots.items()]
+
+    def _host_layers(self, host, layers) -> list:
+        """Resolve a group column to its target on one host; a group not found there drives nothing"""
+        if not isinstance(layers, GroupRef):
+            return layers
+        if isinstance(layers.ref, int):
+            return [group_target(layers.ref)]
+        group = self.layer_groups.get(host, {}).get(layers.ref.casefold())
+        return [] if group is None else [group_target(group.index)]
+
+    def _column_layers(self, layer_map) -> dict:
+        """
+        Expand each column's layer list or range, e.g. "5-10,12", or its GroupRef
+        for "group:Stage Left"; ALL columns drive nothing themselves
+        """
+        expanded = {}
+        for column, value in layer_map.items():
+            if value == ALL:
+                continue
+            try:
+                group = parse_group(value)
+                expanded[column] = parse_layers(value) if group is None else group
+            except ValueError as e:
+                logger.error("Ignoring layer mapping: %s", e, extra={"column": column})
+                expanded[column] = []
+        return expanded
+
+    def _widest_columns(self) -> dict:
+        """The most layers any one column drives on each host"""
+        widest = {}
+        for column, layers in self._column_layers(self.config["LAYER_MAP"]).items():
+            for host in column_hosts(self.config, column):
+                widest[host] = max(widest.get(host, 0), 1 if isinstance(layers, GroupRef) else len(layers))
+        return widest
+
+    # =========================
+    # LAYER GROUP DISCOVERY
+    # =========================
+
+    def discover_groups(self):
+        """
+        Read each host's layer groups from its composition, off the GUI thread,
+        when any column names a group. Columns addressing a group by position
+        don't need this.
+        """
+        if not any(
+            isinstance(layers, GroupRef) and isinstance(layers.ref, str)
+            for layers in self._column_layers(self.config["LAYER_MAP"]).values()
+        ):
+            return
+        for channel in self.hosts.values():
+            self.heartbeat_executor.submit(self._fetch_groups, channel)
+
+    def _fetch_groups(self, channel):
+        groups = fetch_layer_groups(channel.address, channel.port)
+        if groups is None:
+            logger.warning("Couldn't read layer groups from the composition", extra={"host": channel.name})
+            return
+        self._groups_found.emit(channel.name, groups)
+
+    def _on_groups_found(self, host, groups):
+        if host not in self.hosts:
+            return  # removed while the composition was being read
+        self.layer_groups[host] = {group.name.casefold(): group for group in groups}
+        self._targets_source = None
+        self._build_panic_payloads()
+        for column, layers in self._column_layers(self.config["LAYER_MAP"]).items():
+            if host in column_hosts(self.config, column) and layers and not self._host_layers(host, layers):
+                logger.warning("Layer group not in composition", extra={"host": host, "column": column, "group": layers.ref})
+
+    def send(self, target_colours: dict, force=False) -> int:
+        """
+        Send {(host, layer): colour} changes, skipping layers already showing that
+        colour unless force is set. Each host's requests go to its own workers, so
+        hosts are updated concurrently. Returns the number of requests submitted.
+        """
+        self.desired.update(target_colours)
+        batch = _Batch()
+        submitted = 0
+        for (host, layer), colour in target_colours.items():
+            channel = self.hosts[host]
+            if channel.breaker.is_open:
+                self._hold(channel, {layer: colour})
+            elif channel.state.claim(layer, colour, force):
+                REQUESTS_SENT.inc(host=host, lane="normal")
+                batch.add()
+                if self.transport is not None:
+                    self._push(channel, layer, colour, batch)
+                else:
+                    channel.submit(self._put_colour, channel, layer, colour, batch, channel.generation)
+                submitted += 1
+            else:
+                REQUESTS_DROPPED.inc(host=host, reason="unchanged")
+        if batch.seal():
+            self._finish_batch(batch)
+        return submitted
+
+    def _finish_batch(self, batch):
+        latencies, skew = batch.summary()
+        if batch.panic:
+            self.last_panic_ms = max(latencies.values())
+            self.panic_completed.emit(batch.panic, latencies, self.last_panic_ms)
+        else:
+            self.last_skew_ms = skew
+            self.batch_completed.emit(latencies, skew)
+
+    # =========================
+    # HEARTBEATS AND CIRCUIT BREAKERS
+    # =========================
+
+    def check_heartbeats(self):
+        """Poll the extra hosts concurrently, off the GUI thread"""
+        for channel in self.hosts.values():
+            if channel.heartbeat is not None and not channel._heartbeat_busy:
+                channel._heartbeat_busy = True
+                self.heartbeat_executor.submit(self._check_heartbeat, channel)
+
+    def _check_heartbeat(self, channel):
+        try:
+            channel.heartbeat.check_status()
+        finally:
+            channel._heartbeat_busy = False
+
+    def _on_extra_status(self, status, latency, colour):
+        self.host_status.emit(self.sender().host_name, status, latency, colour)
+
+    def _on_extra_reachable(self, reachable):
+        self.on_heartbeat(self.sender().host_name, reachable)
+
+    @property
+    def held_count(self):
+        return sum(len(channel.held) for channel in self.hosts.values())
+
+    def _hold(self, channel, layer_colours: dict, replace=True):
+        with channel._held_lock:
+            for layer, colour in layer_colours.items():
+                # Work left over from before the outage must not override newer presses
+                if replace or layer not in channel.held:
+                    channel.held[layer] = colour
+        self.held_changed.emit(self.held_count)
+
+    def on_heartbeat(self, host, reachable: bool):
+        """Open or close a host's breaker from the heartbeat's view of it"""
+        channel = self.hosts.get(host)
+        if channel is None:
+            return
+        if not reachable:
+            if channel.breaker.trip():
+                self._on_opened(channel)
+        elif channel.breaker.reset():
+            self.connection_changed.emit(host, True)
+            self.replay(host)
+
+    def _on_opened(self, channel):
+        logger.warning("Resolume unreachable - holding changes until it returns", extra={"host": channel.name})
+        # Whatever was confirmed before the outage can't be trusted afterwards
+        channel.state.invalidate()
+        self.connection_changed.emit(channel.name, False)
+
+    def replay(self, host) -> int:
+        """Send the converged colour of every layer held for a host as one batch"""
+        channel = self.hosts[host]
+        with channel._held_lock:
+            held, channel.held = channel.held, {}
+        self.held_changed.emit(self.held_count)
+        if held:
+            logger.info("Resolume reconnected - replaying held layers", extra={"host": host, "count": len(held)})
+        return self.send({(host, layer): colour for layer, colour in held.items()}, force=True)
+
+    # =========================
+    # TRANSPORT
+    # =========================
+
+    def queue_depths(self) -> dict:
+        """Requests queued or in flight, per host and lane; read when metrics are scraped"""
+        depths = {}
+        for name, channel in list(self.hosts.items()):
+            with channel._pending_lock:
+                depths[(name, "normal")] = channel.pending["normal"]
+                depths[(name, "panic")] = channel.pending["panic"]
+        transport = self.transport
+        if transport is not None:
+            depths[("all", "process")] = len(transport.commands)
+        return depths
+
+    def _put_colour(self, channel, layer, colour, batch, generation=0):
+        try:
+            if generation != channel.generation:
+                # Queued before a panic; sending it now would undo the panic
+                channel.state.abandon(layer, colour)
+                return
+            self._request_colour(channel, layer, colour)
+        finally:
+            if batch.finish(channel.name):
+                self._finish_batch(batch)
+
+    def _request_colour(self, channel, layer, colour):
+        if channel.breaker.is_open:
+            # Queued before the breaker opened; don't burn a timeout on it
+            channel.state.fail(layer, colour)
+            self._hold(channel, {layer: colour}, replace=False)
+            return
+
+        payload = self.colour_body(self.output_colour((channel.name, layer), colour))
+        url = channel.api_base_url + target_path(layer)
+        channel.last_used = time.monotonic()
+        start = time.perf_counter()
+        try:
+            response = channel.session.put(url, json=payload, timeout=(0.05, 0.2))
+        except (requests.ConnectionError, requests.Timeout) as e:
+            self._record_result(channel, layer, colour, CONNECTION_ERROR, e)
+            return
+        except Exception as e:
+            self._record_result(channel, layer, colour, ERROR, e)
+            return
+        outcome = OK if response.ok else HTTP_ERROR
+        self._record_result(channel, layer, colour, outcome, response.status_code, (time.perf_counter() - start) * 1000)
+
+    def _record_result(self, channel, layer, colour, outcome, detail=None, latency_ms=0.0, panic=False):
+        """Update layer state and the host's breaker from the outcome of one request"""
+        if outcome == DROPPED:
+            channel.state.abandon(layer, colour)
+            REQUESTS_DROPPED.inc(host=channel.name, reason="flushed")
+        elif outcome == CONNECTION_ERROR:
+            channel.state.fail(layer, colour)
+            REQUESTS_FAILED.inc(host=channel.name, reason="connection")
+            if channel.breaker.record_failure():
+                self._on_opened(channel)
+            if channel.breaker.is_open:
+                # A panic is the newest thing wanted; anything else mustn't override newer presses
+                self._hold(channel, {layer: colour}, replace=panic)
+            else:
+                logger.warning("API error: %s", detail, extra={"host": channel.name, "layer": layer, "colour": colour})
+        elif outcome == ERROR:
+            channel.state.fail(layer, colour)
+            REQUESTS_FAILED.inc(host=channel.name, reason="error")
+            logger.error("API error: %s", detail, extra={"host": channel.name, "layer": layer, "colour": colour})
+        else:
+            # Any HTTP response means the host is reachable
+            REQUEST_LATENCY.observe(latency_ms / 1000, host=channel.name, layer=layer)
+            if panic:
+                channel.priority_latency_ms = latency_ms
+            else:
+                channel.record_latency(latency_ms)
+            channel.breaker.record_success()
+            if outcome == OK:
+                channel.state.confirm(layer, colour)
+                logger.debug("Sent", extra={"host": channel.name, "layer": layer, "colour": colour, "latency_ms": latency_ms})
+            else:
+                channel.state.fail(layer, colour)
+                REQUESTS_FAILED.inc(host=channel.name, reason="http")
+                logger.warning(
+                    "API error: Resolume returned %s", detail,
+                    extra={"host": channel.name, "layer": layer, "colour": colour, "latency_ms": latency_ms},
+                )
+
+    # =========================
+    # PARAMETERS
+    # =========================
+
+    @property
+    def bindings(self) -> BindingTable:
+        """The compiled PARAMETER_BINDINGS, recompiled whenever the setting is replaced"""
+        specs = self.config.get("PARAMETER_BINDINGS")
+        if self._bindings is None or specs is not self._bindings_source:
+            self._bindings = BindingTable(specs)
+            self._bindings_source = specs
+        return self._bindings
+
+    def set_parameters(self, target_values: dict) -> int:
+        """
+        Set bound parameters, as {(host, target): {binding name: value}}, where a
+        target is a layer, a layer group or an ID binding's parameter target.
+        Values for one target go out as a single request, and values set while
+        its request is in flight are merged into the next, so a fader drag sends
+        its latest position rather than every step. Parameters always go through
+        the in-process workers, even with ISOLATED_DISPATCH. Returns the number
+        of requests submitted.
+        """
+        submitted = 0
+        for (host, target), values in target_values.items():
+            channel = self.hosts.get(host)
+            if channel is None:
+                continue
+            if channel.breaker.is_open:
+                # Unlike a colour, a fader position isn't worth holding for the host's return
+                REQUESTS_DROPPED.inc(host=host, reason="host_down")
+                continue
+            with channel._parameters_lock:
+                channel.parameters.setdefault(target, {}).update(values)
+                if target in channel.parameters_busy:
+                    continue
+                channel.parameters_busy.add(target)
+            channel.submit(self._put_parameters, channel, target)
+            submitted += 1
+        return submitted
+
+    def _put_parameters(self, channel, target):
+        while True:
+            with channel._parameters_lock:
+                values = channel.parameters.pop(target, None)
+                if values is None:
+                    channel.parameters_busy.discard(target)
+                    return
+            self._request_parameters(channel, target, values)
+
+    def _request_parameters(self, channel, target, values):
+        body = self.bindings.body(values)
+        if body is None:
+            return  # every binding was removed since
+        index = parameter_id(target)
+        if index is None:
+            url = channel.api_base_url + target_path(target)
+        else:
+            url = parameter_url(channel.api_base_url, index)
+        REQUESTS_SENT.inc(host=channel.name, lane="parameter")
+        channel.last_used = time.monotonic()
+        start = time.perf_counter()
+        try:
+            response = channel.session.put(url, json=body, timeout=(0.05, 0.2))
+        except (requests.ConnectionError, requests.Timeout) as e:
+            REQUESTS_FAILED.inc(host=channel.name, reason="connection")
+            if channel.breaker.record_failure():
+                self._on_opened(channel)
+            logger.warning("API error: %s", e, extra={"host": channel.name, "layer": target, "parameters": values})
+            return
+        except Exception as e:
+            REQUESTS_FAILED.inc(host=channel.name, reason="error")
+            logger.error("API error: %s", e, extra={"host": channel.name, "layer": target, "parameters": values})
+            return
+        channel.breaker.record_success()
+        if response.ok:
+            logger.debug(
+                "Sent", extra={
+                    "host": channel.name, "layer": target, "parameters": values,
+                    "latency_ms": (time.perf_counter() - start) * 1000,
+                },
+            )
+        else:
+            REQUESTS_FAILED.inc(host=channel.name, reason="http")
+            logger.warning(
+                "API error: Resolume returned %s", response.status_code,
+                extra={"host": channel.name, "layer": target, "parameters": values},
+            )
+
+    # =========================
+    # DISPATCH PROCESS
+    # =========================
+
+    def _transport_hosts(self) -> list:
+        return [(name, channel.ip, channel.port) for name, channel in self.hosts.items()]
+
+    def start_transport(self):
+        """Move HTTP transport into a child process"""
+        hosts = self.transport_hosts = self._transport_hosts()
+        self.transport = DispatchProcess(hosts, self.base_payload, self.mapped_layer_counts(), self.keepalive_ms)
+        self.ack_timer.start()
+
+    def stop_transport(self):
+        """Bring HTTP transport back into this process"""
+        self.ack_timer.stop()
+        self.poll_acks()
+        self.transport.stop()
+        self.transport = None
+        # Whatever wasn't acknowledged may or may not have been sent
+        pending, self._pending = self._pending, {}
+        for channel, layer, colour, batch, _ in pending.values():
+            channel.state.fail(layer, colour)
+            if batch.finish(channel.name):
+                self._finish_batch(batch)
+
+    def close(self):
+        self.keepalive_timer.stop()
+        if self.transport is not None:
+            self.stop_transport()
+
+    def _push(self, channel, layer, colour, batch, panic=False):
+        index = group_index(layer)
+        flags = (PANIC if panic else 0) | (0 if index is None else GROUP)
+        sent = self.output_colour((channel.name, layer), colour)
+        seq = self.transport.push(channel.name, layer if index is None else index, sent, flags)
+        if seq is None:
+            logger.error("Dispatch process queue full - dropped", extra={"host": channel.name, "layer": layer, "colour": colour})
+            channel.state.fail(layer, colour)
+            REQUESTS_DROPPED.inc(host=channel.name, reason="queue_full")
+            if batch.finish(channel.name):
+                self._finish_batch(batch)
+            return
+        channel.last_used = time.monotonic()
+        self._pending[seq] = (channel, layer, colour, batch, panic)
+
+    def poll_acks(self):
+        """Apply acknowledgements from the dispatch process"""
+        if self.transport is None:
+            return
+        for seq, outcome, status, latency_ms in self.transport.drain_acks():
+            pending = self._pending.pop(seq, None)
+            if pending is None:
+                continue  # sent before a restart
+            channel, layer, colour, batch, panic = pending
+            detail = status if outcome == HTTP_ERROR else "request failed in dispatch process"
+            self._record_result(channel, layer, colour, outcome, detail, latency_ms, panic)
+            if batch.finish(channel.name):
+                self._finish_batch(batch)
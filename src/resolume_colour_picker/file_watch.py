@@ -0,0 +1,165 @@
+"""
+Hot reload of palette, layer-map and calibration files kept outside the app.
+
+PALETTE_FILE, LAYER_MAP_FILE and CALIBRATION_FILE name files (blank is off) that are watched
+through the OS change notification QFileSystemWatcher wraps, rather than
+polled. A save is parsed and validated on a worker thread, and only a value
+that actually changed is written back through Config, where the grid
+applies it in place.
+"""
+
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from PySide6.QtCore import QFileSystemWatcher, QObject, Qt, QTimer, Signal
+
+from resolume_colour_picker.calibration import parse_calibration_file
+from resolume_colour_picker.layers import normalise_layers
+from resolume_colour_picker.palette import load_swatches
+
+
+logger = logging.getLogger(__name__)
+
+
+def parse_palette_file(path) -> dict:
+    """A .json/.csv/.gpl swatch file as a COLOUR_SET {label: hex}. Raises ValueError."""
+    colours = dict(load_swatches(path))
+    if not colours:
+        raise ValueError("No colours in the palette")
+    return colours
+
+
+def parse_layer_map_file(path) -> dict:
+    """A JSON {column: layers} file as a validated LAYER_MAP. Raises ValueError."""
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    if not isinstance(data, dict) or not data:
+        raise ValueError("Layer map must be a JSON object of column: layers")
+    layer_map = {}
+    for column, value in data.items():
+        try:
+            layer_map[str(column).strip()] = normalise_layers(value)
+        except ValueError as e:
+            raise ValueError(f"{column}: {e}") from None
+    return layer_map
+
+
+# Setting naming the file -> (Config key it reloads, parser)
+WATCHED = {
+    "PALETTE_FILE": ("COLOUR_SET", parse_palette_file),
+    "LAYER_MAP_FILE": ("LAYER_MAP", parse_layer_map_file),
+    "CALIBRATION_FILE": ("LAYER_CALIBRATION", parse_calibration_file),
+}
+
+
+class FileWatcher(QObject):
+    """
+    Keeps COLOUR_SET, LAYER_MAP and LAYER_CALIBRATION in step with the files
+    named by PALETTE_FILE, LAYER_MAP_FILE and CALIBRATION_FILE. Saves are debounced, as editors often
+    write a file in several steps, and a file that fails to parse leaves the
+    running values alone.
+    """
+    reloaded = Signal(str, bool)  # Config key, whether its value changed
+    reload_failed = Signal(str, str)  # path, error
+    _parsed = Signal(str, str, object, object)  # setting, path, value, error
+
+    def __init__(self, config, debounce_ms=50):
+        super().__init__()
+        self.config = config
+        self.paths = {}  # setting -> absolute path being watched
+        # One worker: reloads of a file apply in the order it was saved
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="file-watch")
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self._file_changed)
+        self.watcher.directoryChanged.connect(self._directory_changed)
+        self._parsed.connect(self._apply)
+
+        self.timers = {}
+        for setting in WATCHED:
+            timer = QTimer(self)
+            timer.setSingleShot(True)
+            timer.setInterval(debounce_ms)
+            timer.timeout.connect(lambda s=setting: self.reload(s))
+            self.timers[setting] = timer
+
+        self.config.value_changed.connect(self.config_callback, Qt.ConnectionType.QueuedConnection)
+        self.apply_paths()
+
+    def config_callback(self, key, value):
+        if key in WATCHED:
+            self.apply_paths()
+
+    def apply_paths(self):
+        """Watch the files the settings name now, loading any newly named one"""
+        for setting in WATCHED:
+            text = str(self.config.get(setting) or "").strip()
+            path = str(Path(text).expanduser().resolve()) if text else None
+            if path == self.paths.get(setting):
+                continue
+            self.paths.pop(setting, None)
+            if path is None:
+                continue
+            self.paths[setting] = path
+            logger.info("Watching %s for %s", path, WATCHED[setting][0])
+            self.reload(setting)
+        self._update_watches()
+
+    def _update_watches(self):
+        """Watch each file, and its directory so a file replaced on save is picked up again"""
+        wanted = set(self.paths.values())
+        wanted |= {str(Path(path).parent) for path in self.paths.values()}
+        watched = set(self.watcher.files()) | set(self.watcher.directories())
+        if watched - wanted:
+            self.watcher.removePaths(list(watched - wanted))
+        missing = [path for path in wanted - watched if Path(path).exists()]
+        if missing:
+            self.watcher.addPaths(missing)
+
+    def _file_changed(self, path):
+        self._update_watches()  # an atomic save replaces the file, which drops its watch
+        for setting, watched in self.paths.items():
+            if watched == path:
+                self.timers[setting].start()
+
+    def _directory_changed(self, directory):
+        for setting, path in self.paths.items():
+            if str(Path(path).parent) == directory and path not in self.watcher.files() and Path(path).exists():
+                self.timers[setting].start()
+        self._update_watches()
+
+    def reload(self, setting):
+        """Parse the setting's file off the GUI thread; the result is applied on it"""
+        path = self.paths.get(setting)
+        if path is not None:
+            self.executor.submit(self._parse, setting, path)
+
+    def _parse(self, setting, path):
+        try:
+            value, error = WATCHED[setting][1](path), None
+        except (OSError, UnicodeDecodeError, ValueError) as e:
+            value, error = None, str(e)
+        self._parsed.emit(setting, path, value, error)
+
+    def _apply(self, setting, path, value, error):
+        if self.paths.get(setting) != path:
+            return  # the setting has moved to another file since
+        if error is not None:
+            logger.warning("Couldn't reload %s: %s", path, error)
+            self.reload_failed.emit(path, error)
+            return
+        key = WATCHED[setting][0]
+        # Compare in order: the order of rows and columns is part of the grid
+        changed = list((self.config.get(key) or {}).items()) != list(value.items())
+        if changed:
+            logger.info("Reloaded %s from %s", key, path)
+            self.config[key] = value
+        self.reloaded.emit(key, changed)
+
+    def stop(self):
+        for timer in self.timers.values():
+            timer.stop()
+        if self.watcher.files() or self.watcher.directories():
+            self.watcher.removePaths(self.watcher.files() + self.watcher.directories())
+        self.paths.clear()
+        self.executor.shutdown(wait=False)
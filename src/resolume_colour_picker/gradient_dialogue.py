@@ -0,0 +1,108 @@
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QLabel, QPushButton, QComboBox
+)
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QColor, QPixmap, QIcon
+
+from resolume_colour_picker.palette import gradient, normalise_hex
+
+
+NO_MIDDLE = "(none)"
+
+
+class GradientDialog(QDialog):
+    """Pick start, end and an optional middle colour to spread across the mapped layers"""
+
+    def __init__(self, config, engine):
+        super().__init__(engine)
+        self.config = config
+        self.engine = engine
+
+        self.setWindowTitle("Gradient")
+        layout = QVBoxLayout()
+
+        form = QFormLayout()
+        names = list(self.config["COLOUR_SET"])
+        self.start_combo = self._colour_combo(names[0] if names else "#ff0000")
+        self.middle_combo = self._colour_combo(NO_MIDDLE, optional=True)
+        self.end_combo = self._colour_combo(names[-1] if names else "#0000ff")
+        form.addRow("Start:", self.start_combo)
+        form.addRow("Through:", self.middle_combo)
+        form.addRow("End:", self.end_combo)
+        layout.addLayout(form)
+
+        self.preview = QLabel()
+        self.preview.setFixedHeight(40)
+        layout.addWidget(self.preview)
+        self.info_label = QLabel("")
+        layout.addWidget(self.info_label)
+
+        buttons = QHBoxLayout()
+        mode = "Queue" if self.engine.scene_master_mode else "Send"
+        self.apply_btn = QPushButton(f"{mode} Gradient")
+        self.apply_btn.clicked.connect(self.apply)
+        buttons.addWidget(self.apply_btn)
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.reject)
+        buttons.addWidget(close_btn)
+        layout.addLayout(buttons)
+        self.setLayout(layout)
+
+        for combo in (self.start_combo, self.middle_combo, self.end_combo):
+            combo.currentTextChanged.connect(self.update_preview)
+        self.update_preview()
+
+    def _colour_combo(self, current, optional=False) -> QComboBox:
+        """Palette colours to pick from; a hex value can be typed in too"""
+        combo = QComboBox()
+        combo.setEditable(True)
+        combo.setInsertPolicy(QComboBox.NoInsert)
+        if optional:
+            combo.addItem(NO_MIDDLE, None)
+        for name, hex_val in self.config["COLOUR_SET"].items():
+            swatch = QPixmap(16, 16)
+            swatch.fill(QColor(hex_val))
+            combo.addItem(QIcon(swatch), name, hex_val)
+        combo.setCurrentText(current)
+        return combo
+
+    def _value(self, combo):
+        """The combo's colour as '#rrggbb', None for no middle stop; raises ValueError"""
+        text = combo.currentText().strip()
+        index = combo.findText(text, Qt.MatchExactly)
+        if index >= 0:
+            return combo.itemData(index)
+        if not text and combo is self.middle_combo:
+            return None
+        hex_val = normalise_hex(text)
+        if hex_val is None:
+            raise ValueError(f"{text!r} isn't a palette colour or #rrggbb")
+        return hex_val
+
+    def stops(self) -> tuple:
+        return self._value(self.start_combo), self._value(self.end_combo), self._value(self.middle_combo)
+
+    def update_preview(self):
+        """Show the colour each layer would get, left to right"""
+        try:
+            start, end, middle = self.stops()
+        except ValueError as e:
+            self.info_label.setText(str(e))
+            self.apply_btn.setEnabled(False)
+            return
+        count = len(self.engine.dispatcher.layer_slots(self.engine.non_all_columns))
+        colours = gradient([start, end] if middle is None else [start, middle, end], max(count, 2))
+        stops = ", ".join(f"stop:{i / (len(colours) - 1):.3f} {colour}" for i, colour in enumerate(colours))
+        self.preview.setStyleSheet(
+            f"background: qlineargradient(x1:0, y1:0, x2:1, y2:0, {stops}); border: 1px solid #444;"
+        )
+        self.info_label.setText(f"Across {count} layer(s)")
+        self.apply_btn.setEnabled(count > 0)
+
+    def apply(self):
+        try:
+            self.engine.apply_gradient(*self.stops())
+        except ValueError as e:
+            self.info_label.setText(str(e))
+            return
+        self.accept()
@@ -0,0 +1,45 @@
+MAIN_HOST = "main"
+
+
+def configured_hosts(config) -> dict:
+    """
+    Return {name: (ip, port)} for every Resolume host. The main host comes from
+    WEBSERVER_IP / WEBSERVER_PORT, any others from EXTRA_HOSTS.
+    """
+    hosts = {MAIN_HOST: (config["WEBSERVER_IP"], str(config["WEBSERVER_PORT"]))}
+    for host in config.get("EXTRA_HOSTS", []):
+        hosts[host["name"]] = (host["ip"], str(host["port"]))
+    return hosts
+
+
+def column_hosts(config, column) -> list:
+    """Hosts a column drives. Columns without an entry in COLUMN_HOSTS drive every host."""
+    names = config.get("COLUMN_HOSTS", {}).get(column)
+    if not names:
+        return list(configured_hosts(config).keys())
+    return names
+
+
+def format_hosts(hosts: list) -> str:
+    """Format EXTRA_HOSTS as 'name=ip:port, name=ip:port' for editing"""
+    return ", ".join(f"{h['name']}={h['ip']}:{h['port']}" for h in hosts)
+
+
+def parse_hosts(text: str) -> list:
+    """Parse 'name=ip:port, ...' into an EXTRA_HOSTS list. Raises ValueError."""
+    hosts = []
+    names = {MAIN_HOST}
+    for entry in text.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        name, sep, address = entry.partition("=")
+        ip, colon, port = address.strip().rpartition(":")
+        name = name.strip()
+        if not sep or not colon or not name or not ip or not port.isdigit():
+            raise ValueError(f"Expected name=ip:port, got {entry!r}")
+        if name in names:
+            raise ValueError(f"Duplicate host name {name!r}")
+        names.add(name)
+        hosts.append({"name": name, "ip": ip.strip(), "port": port})
+    return hosts
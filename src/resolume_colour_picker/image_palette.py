@@ -0,0 +1,110 @@
+import numpy as np
+
+from PySide6.QtCore import QSize
+from PySide6.QtGui import QImage, QImageReader
+
+from resolume_colour_picker.palette import oklab_to_srgb, rgb_array_to_hex, srgb_to_oklab
+
+
+DEFAULT_SAMPLE_PIXELS = 20_000
+
+
+# =========================
+# IMAGE LOADING
+# =========================
+
+def image_to_array(image: QImage) -> np.ndarray:
+    """Return the pixels of a QImage as an (N, 3) float array in 0..1"""
+    image = image.convertToFormat(QImage.Format_RGB888)
+    width, height, stride = image.width(), image.height(), image.bytesPerLine()
+    # Rows are padded to 4 bytes, so view with the real stride then drop the padding
+    buffer = np.frombuffer(image.constBits(), dtype=np.uint8, count=stride * height)
+    pixels = buffer.reshape(height, stride)[:, :width * 3].reshape(-1, 3)
+    return pixels.astype(np.float32) / 255.0
+
+
+def load_image_samples(path, max_pixels: int = DEFAULT_SAMPLE_PIXELS) -> np.ndarray:
+    """
+    Read an image from disk at reduced resolution and return roughly max_pixels
+    samples. Asking the reader for a scaled size lets JPEG decode skip most of the
+    work on multi-megapixel images instead of decoding and then shrinking.
+    """
+    reader = QImageReader(str(path))
+    size = reader.size()
+    if size.isValid() and size.width() * size.height() > max_pixels:
+        scale = (max_pixels / (size.width() * size.height())) ** 0.5
+        reader.setScaledSize(QSize(max(1, int(size.width() * scale)), max(1, int(size.height() * scale))))
+    image = reader.read()
+    if image.isNull():
+        raise ValueError(f"Could not read image {path}: {reader.errorString()}")
+    return image_to_array(image)
+
+
+# =========================
+# K-MEANS CLUSTERING
+# =========================
+
+def _squared_distances(points: np.ndarray, centres: np.ndarray) -> np.ndarray:
+    """(N, K) squared distances via |p|^2 - 2pc + |c|^2 as one matrix product"""
+    p_sq = np.einsum("ij,ij->i", points, points)[:, None]
+    c_sq = np.einsum("ij,ij->i", centres, centres)[None, :]
+    return np.maximum(p_sq - 2.0 * (points @ centres.T) + c_sq, 0.0)
+
+
+def _kmeans_plus_plus(points: np.ndarray, k: int, rng) -> np.ndarray:
+    centres = [points[rng.integers(len(points))]]
+    closest = _squared_distances(points, centres[0][None, :])[:, 0]
+    for _ in range(1, k):
+        total = closest.sum()
+        if total <= 0:
+            break  # fewer distinct colours than clusters
+        centre = points[rng.choice(len(points), p=closest / total)]
+        centres.append(centre)
+        closest = np.minimum(closest, _squared_distances(points, centre[None, :])[:, 0])
+    return np.array(centres)
+
+
+def kmeans(points: np.ndarray, k: int, max_iter: int = 30, tol: float = 1e-6, seed: int = 0):
+    """
+    Cluster (N, D) points into at most k groups.
+    Returns (centres, counts) sorted by cluster size, largest first.
+    """
+    rng = np.random.default_rng(seed)
+    centres = _kmeans_plus_plus(points, k, rng)
+    k = len(centres)
+
+    for _ in range(max_iter):
+        labels = _squared_distances(points, centres).argmin(axis=1)
+        counts = np.bincount(labels, minlength=k)
+        sums = np.zeros_like(centres)
+        np.add.at(sums, labels, points)
+        # Empty clusters keep their previous centre
+        occupied = counts > 0
+        new_centres = centres.copy()
+        new_centres[occupied] = sums[occupied] / counts[occupied, None]
+        shift = np.abs(new_centres - centres).max()
+        centres = new_centres
+        if shift < tol:
+            break
+
+    labels = _squared_distances(points, centres).argmin(axis=1)
+    counts = np.bincount(labels, minlength=k)
+    order = np.argsort(-counts, kind="stable")
+    keep = order[counts[order] > 0]
+    return centres[keep], counts[keep]
+
+
+def dominant_colours(pixels: np.ndarray, n: int, seed: int = 0) -> list:
+    """Return the n dominant colours of (N, 3) sRGB pixels as hex, most common first"""
+    if len(pixels) == 0:
+        raise ValueError("Image has no pixels")
+    # Cluster in OKLab so the groups match perceived colour differences
+    lab = srgb_to_oklab(pixels.astype(np.float64))
+    centres, _ = kmeans(lab, n, seed=seed)
+    return rgb_array_to_hex(oklab_to_srgb(centres))
+
+
+def extract_palette(path, n: int = 8, max_pixels: int = DEFAULT_SAMPLE_PIXELS) -> dict:
+    """Extract a COLOUR_SET style {label: hex} palette from an image file"""
+    colours = dominant_colours(load_image_samples(path, max_pixels), n)
+    return {f"{i} - {hex_val}": hex_val for i, hex_val in enumerate(colours, start=1)}
@@ -5,39 +5,45 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
 
+from resolume_colour_picker.hosts import configured_hosts
+from resolume_colour_picker.layers import normalise_layers
+
 
 class LayerMapModel(QAbstractTableModel):
-    """Model for Layer Map: stores (name, value) pairs."""
+    """Model for Layer Map: stores (name, value, hosts) rows."""
     
-    def __init__(self, layer_map: dict, parent=None):
+    def __init__(self, layer_map: dict, column_hosts: dict = None, parent=None):
         super().__init__(parent)
-        self._data = [(k, str(v)) for k,v in layer_map.items()]
+        column_hosts = column_hosts or {}
+        self._data = [(k, str(v), ", ".join(column_hosts.get(k, []))) for k,v in layer_map.items()]
 
     def rowCount(self, parent=QModelIndex()):
         return len(self._data)
 
     def columnCount(self, parent=QModelIndex()):
-        return 2  # Name, Value
+        return 3  # Name, Value, Hosts
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return ("Column", "Layer(s)", "Hosts (blank = all)")[section]
+        return super().headerData(section, orientation, role)
 
     def data(self, index, role=Qt.DisplayRole):
         if not index.isValid():
             return None
         row, col = index.row(), index.column()
-        name, value = self._data[row]
         if role in (Qt.DisplayRole, Qt.EditRole):
-            return name if col == 0 else str(value)
+            return str(self._data[row][col])
         return None
 
     def setData(self, index, value, role=Qt.EditRole):
         if not index.isValid() or role != Qt.EditRole:
             return False
         row, col = index.row(), index.column()
-        name, val = self._data[row]
         value = value.strip() if isinstance(value, str) else str(value)
-        if col == 0:
-            self._data[row] = (value, val)
-        else:
-            self._data[row] = (name, value)
+        entry = list(self._data[row])
+        entry[col] = value
+        self._data[row] = tuple(entry)
         self.dataChanged.emit(index, index)
         return True
 
@@ -48,7 +54,7 @@ class LayerMapModel(QAbstractTableModel):
 
     def insertRow(self, row, parent=QModelIndex(), name="new layer", value="0"):
         self.beginInsertRows(parent, row, row)
-        self._data.insert(row, (name, value))
+        self._data.insert(row, (name, value, ""))
         self.endInsertRows()
         return True
 
@@ -62,7 +68,7 @@ class LayerMapModel(QAbstractTableModel):
 
     def get_all_layers(self):
         """Return current layer map as dict, preserving order."""
-        return dict(self._data)
+        return {name: value for name, value, _ in self._data}
 
 
 class LayerDelegate(QStyledItemDelegate):
@@ -85,7 +91,7 @@ class LayerMapDialog(QDialog):
         layout.addWidget(QLabel("Edit layers:"))
         
         # Model + View
-        self.model = LayerMapModel(self.config.get("LAYER_MAP"))
+        self.model = LayerMapModel(self.config.get("LAYER_MAP"), self.config.get("COLUMN_HOSTS", {}))
         self.table = QTableView()
         self.table.setModel(self.model)
         self.table.setItemDelegate(LayerDelegate())
@@ -118,7 +124,7 @@ class LayerMapDialog(QDialog):
         row = self.model.rowCount()
         index = 0
         # generate unique layer name
-        while any(f"new layer ({index})" == name for name, _ in self.model._data):
+        while any(f"new layer ({index})" == name for name, _, _ in self.model._data):
             index += 1
         self.model.insertRow(row, name=f"new layer ({index})")
 
@@ -130,19 +136,33 @@ class LayerMapDialog(QDialog):
     def save_changes(self):
         """Validate and save layer map."""
         new_layer_map = {}
-        for name, value in self.model._data:
+        new_column_hosts = {}
+        known_hosts = configured_hosts(self.config)
+        for name, value, hosts in self.model._data:
             name_clean = name.strip()
-            val_clean = value.strip().upper()
-            if val_clean != "ALL":
-                try:
-                    val_clean = int(val_clean)
-                except ValueError:
-                    QMessageBox.critical(
-                        self,
-                        "Error",
-                        'Layer map can be a number or "ALL"'
-                    )
-                    return
+            try:
+                val_clean = normalise_layers(value)
+            except ValueError as e:
+                QMessageBox.critical(
+                    self,
+                    "Error",
+                    f'{name_clean}: {e}.\nLayers can be a number, a list or range such as "5-10,12", "group:Stage Left" or "ALL"'
+                )
+                return
             new_layer_map[name_clean] = val_clean
+
+            host_names = [h.strip() for h in hosts.split(",") if h.strip()]
+            unknown = [h for h in host_names if h not in known_hosts]
+            if unknown:
+                QMessageBox.critical(
+                    self,
+                    "Error",
+                    f"Unknown host(s) {', '.join(unknown)}. Known hosts: {', '.join(known_hosts)}"
+                )
+                return
+            if host_names:
+                new_column_hosts[name_clean] = host_names
+
+        self.config["COLUMN_HOSTS"] = new_column_hosts
         self.config["LAYER_MAP"] = new_layer_map
         self.accept()
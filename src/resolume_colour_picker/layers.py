@@ -0,0 +1,111 @@
+from typing import NamedTuple
+
+
+ALL = "ALL"
+GROUP_PREFIX = "group:"
+# Far more layers than any composition has, so a typo like 1-1000000 is refused
+MAX_LAYER = 1000
+
+
+class GroupRef(NamedTuple):
+    """A column driving a whole Resolume layer group, by position (2) or by name"""
+    ref: object  # int position, or name as shown in the composition
+
+
+def parse_group(value):
+    """
+    The layer group a 'group:Stage Left' or 'group:2' LAYER_MAP value names,
+    or None if the value is plain layers. Raises ValueError.
+    """
+    text = str(value).strip()
+    if text[:len(GROUP_PREFIX)].lower() != GROUP_PREFIX:
+        return None
+    ref = text[len(GROUP_PREFIX):].strip()
+    if not ref:
+        raise ValueError("No layer group given")
+    if ref.isdigit():
+        if int(ref) < 1:
+            raise ValueError(f"Layer groups start at 1, got {ref}")
+        return GroupRef(int(ref))
+    return GroupRef(ref)
+
+
+def group_target(index) -> str:
+    """The target key for a whole layer group, kept apart from plain layer numbers"""
+    return f"G{index}"
+
+
+def group_index(target):
+    """The group position of a group target, or None for a plain layer"""
+    if isinstance(target, str) and target.startswith("G"):
+        return int(target[1:])
+    return None
+
+
+def target_path(target) -> str:
+    """API path, under /composition, that a layer or layer group target is coloured through"""
+    index = group_index(target)
+    if index is not None:
+        return f"/layergroups/{index}"
+    return f"/layers/{target}/clips/1"
+
+
+def parse_layers(value) -> list:
+    """
+    Expand a LAYER_MAP value into the layer numbers it drives, in order and
+    without repeats. Accepts a single layer (3 or "3") or a list of layers
+    and inclusive ranges ("5-10,12"). Raises ValueError.
+    """
+    if isinstance(value, int) and not isinstance(value, bool):
+        if value < 1:
+            raise ValueError(f"Layer numbers start at 1, got {value}")
+        if value > MAX_LAYER:
+            raise ValueError(f"Layer numbers go up to {MAX_LAYER}, got {value}")
+        return [value]
+
+    layers = {}  # ordered, without repeats
+    for part in str(value).split(","):
+        part = part.strip()
+        if not part:
+            continue
+        first, dash, last = part.partition("-")
+        try:
+            start = int(first)
+            end = int(last) if dash else start
+        except ValueError:
+            raise ValueError(f"Expected a layer number or range such as 5-10, got {part!r}") from None
+        if start < 1 or end < start:
+            raise ValueError(f"Invalid layer range {part!r}")
+        if end > MAX_LAYER:
+            raise ValueError(f"Layer numbers go up to {MAX_LAYER}, got {part!r}")
+        layers.update(dict.fromkeys(range(start, end + 1)))
+    if not layers:
+        raise ValueError("No layers given")
+    return list(layers)
+
+
+def format_layers(layers: list) -> str:
+    """Collapse layer numbers back into the shortest 'a-b,c' form"""
+    runs = []
+    for layer in layers:
+        if runs and layer == runs[-1][1] + 1:
+            runs[-1][1] = layer
+        else:
+            runs.append([layer, layer])
+    return ",".join(f"{start}-{end}" if end > start else str(start) for start, end in runs)
+
+
+def normalise_layers(value):
+    """
+    Validate a LAYER_MAP value as typed in the layer map dialog. Returns "ALL",
+    a single layer as an int (as older configs store it), a normalised "a-b,c"
+    string for several layers or "group:<name or position>". Raises ValueError.
+    """
+    text = str(value).strip()
+    if text.upper() == ALL:
+        return ALL
+    group = parse_group(text)
+    if group is not None:
+        return f"{GROUP_PREFIX}{group.ref}"
+    layers = parse_layers(text)
+    return layers[0] if len(layers) == 1 else format_layers(layers)
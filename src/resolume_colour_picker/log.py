@@ -0,0 +1,118 @@
+import collections
+import itertools
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+
+
+PACKAGE_LOGGER = "resolume_colour_picker"
+# Structured fields passed with extra={...}, shown after the message when present
+FIELDS = (
+    "host", "column", "layer", "group", "colour", "latency_ms", "count", "parameters", "binding", "error",
+)
+
+
+class StructuredFormatter(logging.Formatter):
+    """Formats the message followed by any structured fields as key=value pairs"""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-7s %(name)s: %(message)s", "%H:%M:%S")
+
+    def format(self, record):
+        text = super().format(record)
+        fields = []
+        for field in FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                fields.append(f"{field}={value:.1f}" if isinstance(value, float) else f"{field}={value}")
+        return f"{text} [{' '.join(fields)}]" if fields else text
+
+
+class RingBufferHandler(logging.Handler):
+    """Keeps the most recent formatted records in memory for the log window"""
+
+    def __init__(self, capacity=2000):
+        super().__init__()
+        self.entries = collections.deque(maxlen=capacity)  # (sequence, levelno, text)
+        self._sequence = itertools.count(1)
+        self.setFormatter(StructuredFormatter())
+
+    def emit(self, record):
+        try:
+            self.entries.append((next(self._sequence), record.levelno, self.format(record)))
+        except Exception:
+            self.handleError(record)
+
+    def since(self, sequence=0) -> list:
+        """Entries newer than the given sequence number, oldest first"""
+        return [entry for entry in list(self.entries) if entry[0] > sequence]
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Puts the record on the queue as-is. The stock handler formats the message
+    in the calling thread first, which is the very cost we are moving off the
+    GUI and worker threads; the listener is in-process, so nothing has to be
+    pickled.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+# Always present so the log window can be opened before or without setup_logging()
+RING = RingBufferHandler()
+
+_listener = None
+_lock = threading.Lock()
+
+
+def setup_logging(level="INFO", stream=None):
+    """
+    Route the package's logging through a queue to a background thread that
+    writes to the console and the in-memory ring. Logging calls then only cost
+    a level check, plus a queue put when the level is enabled.
+    """
+    global _listener
+    with _lock:
+        if _listener is not None:
+            set_level(level)
+            return _listener
+        log_queue = queue.SimpleQueue()
+        console = logging.StreamHandler(stream or sys.stderr)
+        console.setFormatter(StructuredFormatter())
+        _listener = logging.handlers.QueueListener(log_queue, console, RING, respect_handler_level=True)
+        _listener.start()
+
+        logger = logging.getLogger(PACKAGE_LOGGER)
+        logger.addHandler(_DeferredQueueHandler(log_queue))
+        logger.propagate = False  # keep the root logger's synchronous handlers off the hot path
+        set_level(level)
+        return _listener
+
+
+def set_level(level):
+    """Set the package's verbosity from a level name such as 'DEBUG' or 'INFO'"""
+    logger = logging.getLogger(PACKAGE_LOGGER)
+    try:
+        logger.setLevel(str(level or "INFO").upper())
+    except ValueError:
+        logger.setLevel(logging.INFO)
+        logger.warning("Unknown log level %r, using INFO", level)
+
+
+def shutdown_logging():
+    """Flush anything still queued and stop the background thread"""
+    global _listener
+    with _lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        logger = logging.getLogger(PACKAGE_LOGGER)
+        for handler in list(logger.handlers):
+            if isinstance(handler, _DeferredQueueHandler):
+                logger.removeHandler(handler)
+        logger.propagate = True
+        _listener = None
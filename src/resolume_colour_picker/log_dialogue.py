@@ -0,0 +1,71 @@
+import logging
+
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+    QPlainTextEdit, QComboBox
+)
+from PySide6.QtCore import QTimer
+from PySide6.QtGui import QFontDatabase
+
+from resolume_colour_picker.log import RING
+
+
+LEVELS = ["DEBUG", "INFO", "WARNING", "ERROR"]
+
+
+class LogDialog(QDialog):
+    """Shows recent log entries from the in-memory ring buffer"""
+
+    def __init__(self, config, parent=None, ring=RING):
+        super().__init__(parent)
+        self.config = config
+        self.ring = ring
+        self.last_sequence = 0
+
+        self.setWindowTitle("Log")
+        self.resize(900, 500)
+        layout = QVBoxLayout()
+
+        controls = QHBoxLayout()
+        controls.addWidget(QLabel("Record level:"))
+        self.level_combo = QComboBox()
+        self.level_combo.addItems(LEVELS)
+        self.level_combo.setCurrentText(str(self.config.get("LOG_LEVEL", "INFO")).upper())
+        self.level_combo.setToolTip("DEBUG records every request, with its latency")
+        self.level_combo.currentTextChanged.connect(self.set_level)
+        controls.addWidget(self.level_combo)
+        controls.addStretch()
+        clear_btn = QPushButton("Clear")
+        clear_btn.clicked.connect(self.clear)
+        controls.addWidget(clear_btn)
+        layout.addLayout(controls)
+
+        self.text = QPlainTextEdit()
+        self.text.setReadOnly(True)
+        self.text.setMaximumBlockCount(self.ring.entries.maxlen)
+        self.text.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        layout.addWidget(self.text)
+
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.accept)
+        layout.addWidget(close_btn)
+        self.setLayout(layout)
+
+        self.refresh()
+        # Poll rather than signal per record, so logging never touches the GUI thread
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(250)
+
+    def refresh(self):
+        entries = self.ring.since(self.last_sequence)
+        if not entries:
+            return
+        self.last_sequence = entries[-1][0]
+        self.text.appendPlainText("\n".join(text for _, _, text in entries))
+
+    def set_level(self, level):
+        self.config["LOG_LEVEL"] = level
+
+    def clear(self):
+        self.text.clear()
@@ -0,0 +1,228 @@
+import bisect
+import threading
+import weakref
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class _Metric:
+    """
+    Base for metrics that are updated from many threads. Each thread writes to
+    its own shard, so updates never take a lock; shards are only summed when
+    the metrics are scraped.
+    """
+    kind = ""
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self._local = threading.local()
+        self._shards = []
+        self._shards_lock = threading.Lock()  # taken once per thread, on its first update
+
+    def _shard(self) -> dict:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._shards_lock:
+                self._shards.append(shard)
+        return shard
+
+    def _key(self, labels: dict) -> tuple:
+        # Values are kept as given and only turned into text when scraped
+        return tuple([labels[label] for label in self.labels])
+
+    def _snapshots(self) -> list:
+        with self._shards_lock:
+            shards = list(self._shards)
+        # dict() copies in one step under the GIL, so a shard can't change mid-copy
+        return [dict(shard) for shard in shards]
+
+    def _label_text(self, key, extra=None) -> str:
+        pairs = list(zip(self.labels, key))
+        if extra:
+            pairs.append(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{label}="{_escape(str(value))}"' for label, value in pairs) + "}"
+
+    def render(self) -> list:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+
+class Counter(_Metric):
+    """A count that only goes up"""
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        shard = self._shard()
+        key = self._key(labels)
+        shard[key] = shard.get(key, 0) + amount
+
+    def value(self, **labels):
+        key = self._key(labels)
+        return sum(shard.get(key, 0) for shard in self._snapshots())
+
+    def _samples(self):
+        totals = {}
+        for shard in self._snapshots():
+            for key, count in shard.items():
+                totals[key] = totals.get(key, 0) + count
+        return [f"{self.name}{self._label_text(key)} {count}" for key, count in sorted(totals.items(), key=str)]
+
+
+class Histogram(_Metric):
+    """Counts observations into cumulative buckets, e.g. request latency in seconds"""
+    kind = "histogram"
+    DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        shard = self._shard()
+        key = self._key(labels)
+        series = shard.get(key)
+        if series is None:
+            # Per-bucket counts, then the +Inf bucket, sum and count
+            series = shard[key] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def count(self, **labels):
+        key = self._key(labels)
+        return sum(shard[key][-1] for shard in self._snapshots() if key in shard)
+
+    def _samples(self):
+        totals = {}
+        for shard in self._snapshots():
+            for key, series in shard.items():
+                total = totals.setdefault(key, [0] * len(series))
+                for i, value in enumerate(list(series)):
+                    total[i] += value
+        lines = []
+        for key, series in sorted(totals.items(), key=str):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{self.name}_bucket{self._label_text(key, ('le', le))} {cumulative}")
+            lines.append(f"{self.name}_sum{self._label_text(key)} {series[-2]}")
+            lines.append(f"{self.name}_count{self._label_text(key)} {series[-1]}")
+        return lines
+
+
+class Gauge(_Metric):
+    """A value read from a callback when scraped, so nothing is paid until then"""
+    kind = "gauge"
+
+    def __init__(self, name, help_text, labels=()):
+        super().__init__(name, help_text, labels)
+        self._callbacks = []
+
+    def add_callback(self, method):
+        """
+        method() returns {label tuple: value}. Only a weak reference is kept, so
+        registering doesn't keep the owner alive.
+        """
+        self._callbacks.append(weakref.WeakMethod(method))
+
+    def _samples(self):
+        lines = []
+        for ref in list(self._callbacks):
+            method = ref()
+            if method is None:
+                continue  # owner has gone
+            for key, value in sorted(method().items(), key=str):
+                lines.append(f"{self.name}{self._label_text(key)} {value}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# =========================
+# APPLICATION METRICS
+# =========================
+
+REGISTRY = Registry()
+
+PRESSES = REGISTRY.register(Counter(
+    "picker_presses_total", "Grid button presses", ["mode"]))
+REQUESTS_SENT = REGISTRY.register(Counter(
+    "picker_requests_sent_total", "Colour requests handed to the transport", ["host", "lane"]))
+REQUESTS_FAILED = REGISTRY.register(Counter(
+    "picker_requests_failed_total", "Colour requests that failed", ["host", "reason"]))
+REQUESTS_DROPPED = REGISTRY.register(Counter(
+    "picker_requests_dropped_total", "Colour requests not sent", ["host", "reason"]))
+REQUEST_LATENCY = REGISTRY.register(Histogram(
+    "picker_request_latency_seconds", "Colour request latency", ["host", "layer"]))
+HEARTBEAT_LATENCY = REGISTRY.register(Histogram(
+    "picker_heartbeat_latency_seconds", "Heartbeat latency to the Resolume product endpoint", ["host"]))
+HEARTBEAT_FAILURES = REGISTRY.register(Counter(
+    "picker_heartbeat_failures_total", "Heartbeats that got no usable answer", ["host", "reason"]))
+QUEUE_DEPTH = REGISTRY.register(Gauge(
+    "picker_dispatch_queue_depth", "Requests waiting for a dispatch worker", ["host", "lane"]))
+REMOTE_CLIENTS = REGISTRY.register(Gauge(
+    "picker_remote_clients", "Browsers connected to the web remote"))
+GRID_REBUILDS = REGISTRY.register(Counter(
+    "picker_grid_rebuilds_total", "Button grid rebuilds and in-place reloads", ["reason"]))
+EVENT_LOOP_LAG = REGISTRY.register(Histogram(
+    "picker_event_loop_lag_seconds", "How late the GUI thread's probe timer fired"))
+EVENT_LOOP_STALLS = REGISTRY.register(Counter(
+    "picker_event_loop_stalls_total", "GUI event loop stalls over the watchdog threshold"))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass  # scrapes every few seconds would flood the console
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = self.server.registry.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class MetricsServer:
+    """Serves a registry at /metrics for Prometheus to scrape; local only unless given another host"""
+
+    def __init__(self, port, host="127.0.0.1", registry=REGISTRY):
+        self.httpd = ThreadingHTTPServer((host, int(port)), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.registry = registry
+        self.port = self.httpd.server_address[1]
+
+    def start(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True, name="metrics").start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
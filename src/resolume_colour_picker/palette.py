@@ -0,0 +1,234 @@
+import csv
+import json
+import re
+from pathlib import Path
+
+import numpy as np
+
+
+HEX_PATTERN = re.compile(r"^#?([0-9a-fA-F]{6})$")
+
+
+def normalise_hex(value: str):
+    """Return a '#rrggbb' string, or None if value is not a 6 digit hex colour"""
+    match = HEX_PATTERN.match(value.strip())
+    if match is None:
+        return None
+    return "#" + match.group(1).lower()
+
+
+# =========================
+# SWATCH LIBRARY IMPORT
+# =========================
+
+def _rgb_to_hex(r, g, b) -> str:
+    for channel in (r, g, b):
+        if not 0 <= channel <= 255:
+            raise ValueError(f"RGB value out of range: {channel}")
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+def parse_gpl(text: str) -> list:
+    """Parse a GIMP .gpl palette into a list of (name, hex) tuples"""
+    lines = text.splitlines()
+    if not lines or not lines[0].strip().startswith("GIMP Palette"):
+        raise ValueError("Not a GIMP palette (missing 'GIMP Palette' header)")
+
+    swatches = []
+    for line_no, line in enumerate(lines[1:], start=2):
+        line = line.strip()
+        if not line or line.startswith("#") or ":" in line.split()[0]:
+            continue  # blank, comment, or "Name:" / "Columns:" header
+
+        parts = line.split(None, 3)
+        try:
+            r, g, b = (int(p) for p in parts[:3])
+        except ValueError:
+            raise ValueError(f"Line {line_no}: expected 'R G B name'")
+        hex_val = _rgb_to_hex(r, g, b)
+        name = parts[3].strip() if len(parts) > 3 else hex_val
+        swatches.append((name, hex_val))
+    return swatches
+
+
+def parse_csv(text: str) -> list:
+    """
+    Parse a CSV swatch list. Accepts rows of (name, hex), (name, r, g, b),
+    or a bare hex column. A header row is skipped if present.
+    """
+    swatches = []
+    for line_no, row in enumerate(csv.reader(text.splitlines()), start=1):
+        row = [cell.strip() for cell in row if cell.strip()]
+        if not row:
+            continue
+
+        if len(row) == 1:
+            hex_val = normalise_hex(row[0])
+            name = hex_val
+        elif len(row) == 2:
+            name, hex_val = row[0], normalise_hex(row[1])
+        else:
+            try:
+                hex_val = _rgb_to_hex(*(int(v) for v in row[-3:]))
+            except ValueError:
+                hex_val = None
+            name = row[0] if len(row) > 3 else hex_val
+
+        if hex_val is None:
+            if line_no == 1:
+                continue  # header
+            raise ValueError(f"Line {line_no}: no colour found in {row}")
+        swatches.append((name, hex_val))
+    return swatches
+
+
+def parse_json(text: str) -> list:
+    """
+    Parse a JSON swatch list. Accepts a {name: hex} object (the COLOUR_SET
+    format), a list of {"name": ..., "hex": ...} objects, or a list of hex strings.
+    """
+    data = json.loads(text)
+    if isinstance(data, dict):
+        items = list(data.items())
+    elif isinstance(data, list):
+        items = []
+        for entry in data:
+            if isinstance(entry, str):
+                items.append((entry, entry))
+            elif isinstance(entry, dict):
+                hex_val = entry.get("hex", entry.get("colour", entry.get("color")))
+                items.append((entry.get("name", hex_val), hex_val))
+            else:
+                raise ValueError(f"Unsupported swatch entry: {entry!r}")
+    else:
+        raise ValueError("JSON palette must be an object or a list")
+
+    swatches = []
+    for name, hex_val in items:
+        clean = normalise_hex(hex_val) if isinstance(hex_val, str) else None
+        if clean is None:
+            raise ValueError(f"Invalid hex value for {name!r}: {hex_val!r}")
+        swatches.append((str(name), clean))
+    return swatches
+
+
+PARSERS = {
+    ".gpl": parse_gpl,
+    ".csv": parse_csv,
+    ".json": parse_json,
+}
+
+
+def load_swatches(path) -> list:
+    """Load a swatch library from disk, choosing the parser by file extension"""
+    path = Path(path)
+    parser = PARSERS.get(path.suffix.lower())
+    if parser is None:
+        raise ValueError(f"Unsupported palette format: {path.suffix}")
+    return parser(path.read_text(encoding="utf-8"))
+
+
+# =========================
+# PERCEPTUAL COLOUR SPACE
+# =========================
+
+def hex_to_rgb_array(hex_values) -> np.ndarray:
+    """Convert an iterable of '#rrggbb' strings to an (N, 3) float array in 0..1"""
+    packed = "".join(h.lstrip("#") for h in hex_values)
+    raw = np.frombuffer(bytes.fromhex(packed), dtype=np.uint8)
+    return raw.reshape(-1, 3).astype(np.float64) / 255.0
+
+
+def rgb_array_to_hex(rgb: np.ndarray) -> list:
+    """Convert an (N, 3) float array in 0..1 to '#rrggbb' strings"""
+    values = np.clip(np.rint(rgb * 255.0), 0, 255).astype(np.uint8)
+    return ["#" + row.tobytes().hex() for row in values]
+
+
+def srgb_to_oklab(rgb: np.ndarray) -> np.ndarray:
+    """Convert (N, 3) sRGB values in 0..1 to OKLab"""
+    linear = np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+    lms = linear @ _SRGB_TO_LMS.T
+    return np.cbrt(lms) @ _LMS_TO_OKLAB.T
+
+
+def oklab_to_srgb(lab: np.ndarray) -> np.ndarray:
+    """Convert (N, 3) OKLab values to sRGB in 0..1 (clipped to gamut)"""
+    lms = (lab @ _OKLAB_TO_LMS.T) ** 3
+    linear = np.clip(lms @ _LMS_TO_SRGB.T, 0.0, 1.0)
+    return np.where(linear <= 0.0031308, linear * 12.92, 1.055 * linear ** (1 / 2.4) - 0.055)
+
+
+def gradient(stops, count: int) -> list:
+    """
+    Spread `count` colours evenly from the first stop to the last, passing
+    through any stops in between, blended in OKLab in one vectorised pass.
+    Raises ValueError.
+    """
+    hex_stops = [normalise_hex(stop) for stop in stops]
+    if len(hex_stops) < 2 or None in hex_stops:
+        raise ValueError(f"A gradient needs two or more hex colour stops, got {list(stops)!r}")
+    lab = srgb_to_oklab(hex_to_rgb_array(hex_stops))
+    positions = np.linspace(0.0, len(lab) - 1, count)
+    segment = np.minimum(positions.astype(np.intp), len(lab) - 2)
+    frac = (positions - segment)[:, None]
+    return rgb_array_to_hex(oklab_to_srgb(lab[segment] * (1 - frac) + lab[segment + 1] * frac))
+
+
+_SRGB_TO_LMS = np.array([
+    [0.4122214708, 0.5363325363, 0.0514459929],
+    [0.2119034982, 0.6806995451, 0.1073969566],
+    [0.0883024619, 0.2817188376, 0.6299787005],
+])
+_LMS_TO_OKLAB = np.array([
+    [0.2104542553, 0.7936177850, -0.0040720468],
+    [1.9779984951, -2.4285922050, 0.4505937099],
+    [0.0259040371, 0.7827717662, -0.8086757660],
+])
+_OKLAB_TO_LMS = np.linalg.inv(_LMS_TO_OKLAB)
+_LMS_TO_SRGB = np.linalg.inv(_SRGB_TO_LMS)
+
+
+# =========================
+# NEAREST COLOUR INDEX
+# =========================
+
+class PaletteIndex:
+    """Nearest-swatch lookup in OKLab over a whole swatch library at once"""
+
+    def __init__(self, swatches: list):
+        self.swatches = list(swatches)
+        if self.swatches:
+            lab = srgb_to_oklab(hex_to_rgb_array(h for _, h in self.swatches))
+        else:
+            lab = np.empty((0, 3))
+        # |a - b|^2 = |a|^2 - 2ab + |b|^2. |a|^2 is constant per query so argmin
+        # only needs |b|^2 - 2ab, which is a single matrix product. float32 and a
+        # (3, N) layout halve the memory traffic of that product.
+        self._lab_t = np.ascontiguousarray(lab.T, dtype=np.float32)
+        self._lab_sq = np.einsum("ij,ij->i", lab, lab).astype(np.float32)
+
+    def __len__(self):
+        return len(self.swatches)
+
+    def nearest(self, hex_val: str) -> int:
+        """Return the index of the swatch perceptually closest to hex_val"""
+        if not self.swatches:
+            raise ValueError("Palette index is empty")
+        target = srgb_to_oklab(hex_to_rgb_array([hex_val])).astype(np.float32)
+        return int((self._lab_sq - (target * 2.0) @ self._lab_t).argmin())
+
+    def nearest_many(self, hex_values, chunk: int = 1024) -> np.ndarray:
+        """Return nearest swatch indices for many colours, chunked to bound memory"""
+        if not self.swatches:
+            raise ValueError("Palette index is empty")
+        targets = srgb_to_oklab(hex_to_rgb_array(hex_values)).astype(np.float32) * 2.0
+        result = np.empty(len(targets), dtype=np.intp)
+        for start in range(0, len(targets), chunk):
+            dist = self._lab_sq - targets[start:start + chunk] @ self._lab_t
+            result[start:start + chunk] = dist.argmin(axis=1)
+        return result
+
+    def snap(self, hex_val: str):
+        """Return the (name, hex) swatch closest to hex_val"""
+        return self.swatches[self.nearest(hex_val)]
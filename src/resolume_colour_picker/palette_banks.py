@@ -0,0 +1,89 @@
+"""
+Named palette banks and the grids built for them.
+
+PALETTE_BANKS maps a bank name to a COLOUR_SET-style {label: hex} dict, and
+ACTIVE_BANK names the bank on screen. COLOUR_SET always holds the active
+bank's colours, so everything that reads the palette keeps reading
+COLOUR_SET. Each bank's grid is built the first time it is shown and kept,
+hidden, so switching back is a page flip rather than a rebuild.
+"""
+
+from collections import OrderedDict
+
+from PySide6.QtWidgets import QGridLayout, QWidget
+
+
+class GridPage:
+    """One bank's button grid, with the per-button state the engine works on while it is shown"""
+
+    def __init__(self, bank, colours: dict, columns):
+        self.bank = bank  # None for a palette that isn't saved as a bank
+        self.set_colours(colours)
+        self.columns = list(columns)
+        self.widget = QWidget()
+        self.layout = QGridLayout(self.widget)
+        self.buttons = {}
+        self.base_colours = {}
+        self.header_labels = {}
+        self.thumbnail_labels = {}
+        self.button_states = {}  # (column, row) -> 1 selected, 2 standby, as last shown
+
+    def set_colours(self, colours: dict):
+        self.colours = dict(colours)
+        self.colour_rows = list(self.colours.items())
+        self._rows = {}  # lower-case hex -> first row showing it
+        for row, (_, hex_val) in enumerate(self.colour_rows):
+            self._rows.setdefault(hex_val.lower(), row)
+
+    def row_for(self, colour):
+        """The first row showing a colour, or None if this bank doesn't have it"""
+        return self._rows.get(colour.lower())
+
+    def matches(self, colours: dict, columns) -> bool:
+        """Whether this grid still shows these colours, in this order, under these columns"""
+        return (
+            colours is not None
+            and list(self.colours.items()) == list(colours.items())
+            and self.columns == list(columns)
+        )
+
+
+class PageCache:
+    """
+    Built grids by bank name, most recently shown last. Holding more than
+    `size` evicts the least recently shown; the caller deletes their widgets.
+    """
+
+    def __init__(self, size: int):
+        self.size = max(1, size)
+        self._pages = OrderedDict()
+
+    def __len__(self):
+        return len(self._pages)
+
+    def __contains__(self, bank):
+        return bank in self._pages
+
+    def get(self, bank):
+        """The cached page for a bank, marked as just used, or None"""
+        page = self._pages.get(bank)
+        if page is not None:
+            self._pages.move_to_end(bank)
+        return page
+
+    def put(self, page) -> list:
+        """Cache a page as just used. Returns the pages evicted to make room, or replaced."""
+        evicted = []
+        old = self._pages.pop(page.bank, None)
+        if old is not None and old is not page:
+            evicted.append(old)
+        self._pages[page.bank] = page
+        while len(self._pages) > self.size:
+            evicted.append(self._pages.popitem(last=False)[1])
+        return evicted
+
+    def pop(self, bank):
+        return self._pages.pop(bank, None)
+
+    def pages(self) -> list:
+        return list(self._pages.values())
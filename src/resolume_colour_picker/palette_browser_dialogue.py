@@ -0,0 +1,164 @@
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+    QTableView, QLineEdit, QHeaderView, QColorDialog, QFileDialog, QMessageBox
+)
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+from PySide6.QtGui import QColor
+
+from resolume_colour_picker.palette import PaletteIndex, load_swatches, normalise_hex
+
+
+class SwatchTableModel(QAbstractTableModel):
+    """Read-only model over an imported swatch library."""
+
+    def __init__(self, swatches: list, parent=None):
+        super().__init__(parent)
+        self._data = list(swatches)
+
+    def rowCount(self, parent=QModelIndex()):
+        return len(self._data)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 2  # Name, Hex
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        name, hex_val = self._data[index.row()]
+        if role == Qt.DisplayRole:
+            return name if index.column() == 0 else hex_val
+        if role == Qt.BackgroundRole and index.column() == 1:
+            return QColor(hex_val)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return ("Name", "Hex")[section]
+        return super().headerData(section, orientation, role)
+
+    def set_swatches(self, swatches: list):
+        self.beginResetModel()
+        self._data = list(swatches)
+        self.endResetModel()
+
+    def swatch(self, row):
+        return self._data[row]
+
+
+class PaletteBrowserDialog(QDialog):
+    """
+    Browse a large swatch library. Typing a name filters the list; typing a hex
+    value (or sampling one) jumps to the perceptually closest swatch.
+    """
+
+    def __init__(self, config, parent=None):
+        super().__init__(parent)
+        self.config = config
+        self.index = PaletteIndex([])
+        self.setWindowTitle("Swatch Library")
+        self.resize(600, 600)
+
+        layout = QVBoxLayout()
+        self.info_label = QLabel("No swatch library loaded.")
+        layout.addWidget(self.info_label)
+
+        search_layout = QHBoxLayout()
+        self.search = QLineEdit()
+        self.search.setPlaceholderText("Filter by name, or type a hex value to snap to the closest swatch")
+        self.search.textChanged.connect(self.on_search)
+        search_layout.addWidget(self.search)
+        sample_btn = QPushButton("Sample...")
+        sample_btn.clicked.connect(self.sample_colour)
+        search_layout.addWidget(sample_btn)
+        layout.addLayout(search_layout)
+
+        # Table - QTableView only creates painters for visible rows, so fixed
+        # row heights keep scrolling cheap with thousands of swatches
+        self.model = SwatchTableModel([])
+        self.proxy = QSortFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.proxy.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self.proxy.setFilterKeyColumn(-1)
+        self.table = QTableView()
+        self.table.setModel(self.proxy)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(22)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.table)
+
+        # Buttons
+        btn_layout = QHBoxLayout()
+        import_btn = QPushButton("Import...")
+        add_btn = QPushButton("Add Selected")
+        cancel_btn = QPushButton("Cancel")
+
+        import_btn.clicked.connect(self.import_library)
+        add_btn.clicked.connect(self.accept)
+        cancel_btn.clicked.connect(self.reject)
+
+        btn_layout.addWidget(import_btn)
+        btn_layout.addStretch()
+        btn_layout.addWidget(add_btn)
+        btn_layout.addWidget(cancel_btn)
+
+        layout.addLayout(btn_layout)
+        self.setLayout(layout)
+
+        path = self.config.get("SWATCH_LIBRARY_PATH", "")
+        if path:
+            try:
+                self.set_swatches(load_swatches(path), path)
+            except (OSError, ValueError) as e:
+                self.info_label.setText(f"Could not load {path}: {e}")
+
+    def set_swatches(self, swatches: list, source: str = ""):
+        self.model.set_swatches(swatches)
+        self.index = PaletteIndex(swatches)
+        self.info_label.setText(f"{len(swatches)} swatches from {source}")
+
+    def import_library(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Import Swatch Library", "", "Palettes (*.gpl *.csv *.json)"
+        )
+        if not path:
+            return
+        try:
+            swatches = load_swatches(path)
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Error", f"Could not import palette:\n{e}")
+            return
+        self.set_swatches(swatches, path)
+        self.config["SWATCH_LIBRARY_PATH"] = path
+
+    def on_search(self, text):
+        hex_val = normalise_hex(text)
+        if hex_val is None:
+            self.proxy.setFilterFixedString(text.strip())
+        else:
+            self.proxy.setFilterFixedString("")
+            self.snap_to(hex_val)
+
+    def snap_to(self, hex_val):
+        """Select the swatch closest to hex_val. Returns the row, or None if empty."""
+        if not len(self.index):
+            return None
+        row = self.index.nearest(hex_val)
+        proxy_index = self.proxy.mapFromSource(self.model.index(row, 0))
+        self.table.selectRow(proxy_index.row())
+        self.table.scrollTo(proxy_index, QTableView.PositionAtCenter)
+        return row
+
+    def sample_colour(self):
+        # Non-native so the screen colour picker is available on every platform
+        dlg = QColorDialog(self)
+        dlg.setOption(QColorDialog.DontUseNativeDialog, True)
+        if dlg.exec():
+            self.search.setText(dlg.currentColor().name())
+
+    def selected_swatches(self) -> list:
+        rows = sorted(
+            self.proxy.mapToSource(index).row()
+            for index in self.table.selectionModel().selectedRows()
+        )
+        return [self.model.swatch(row) for row in rows]
@@ -0,0 +1,194 @@
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel,
+    QPushButton, QTableView, QStyledItemDelegate,
+    QLineEdit, QComboBox, QMessageBox
+)
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+from resolume_colour_picker.bindings import CONTROLS, compile_binding
+from resolume_colour_picker.hosts import configured_hosts
+
+
+HEADERS = ("Name", "Path or ID", "Control", "Min", "Max", "Button value", "Host (ID only)")
+CONTROL_COLUMN = 2
+
+
+def _number(value) -> str:
+    return "" if value is None else f"{value:g}" if isinstance(value, float) else str(value)
+
+
+class BindingsModel(QAbstractTableModel):
+    """Model for Parameter Bindings: stores one row of strings per binding."""
+
+    def __init__(self, bindings: dict, parent=None):
+        super().__init__(parent)
+        self._data = [
+            [
+                name,
+                spec.get("path", _number(spec.get("id"))),
+                spec.get("control", "fader"),
+                _number(spec.get("min", 0)),
+                _number(spec.get("max", 1)),
+                _number(spec.get("value")),
+                spec.get("host", ""),
+            ]
+            for name, spec in bindings.items()
+        ]
+
+    def rowCount(self, parent=QModelIndex()):
+        return len(self._data)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return self._data[index.row()][index.column()]
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        self._data[index.row()][index.column()] = value.strip() if isinstance(value, str) else str(value)
+        self.dataChanged.emit(index, index)
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsEditable
+
+    def insertRow(self, row, parent=QModelIndex(), name="new binding"):
+        self.beginInsertRows(parent, row, row)
+        self._data.insert(row, [name, "video/opacity", "fader", "0", "1", "", ""])
+        self.endInsertRows()
+        return True
+
+    def removeRow(self, row, parent=QModelIndex()):
+        if 0 <= row < len(self._data):
+            self.beginRemoveRows(parent, row, row)
+            self._data.pop(row)
+            self.endRemoveRows()
+            return True
+        return False
+
+
+class BindingDelegate(QStyledItemDelegate):
+    """Line edits, with a drop-down for the control type."""
+
+    def createEditor(self, parent, option, index):
+        if index.column() == CONTROL_COLUMN:
+            editor = QComboBox(parent)
+            editor.addItems(CONTROLS)
+            return editor
+        return QLineEdit(parent)
+
+    def setEditorData(self, editor, index):
+        if isinstance(editor, QComboBox):
+            editor.setCurrentText(index.data(Qt.EditRole))
+        else:
+            super().setEditorData(editor, index)
+
+    def setModelData(self, editor, model, index):
+        if isinstance(editor, QComboBox):
+            model.setData(index, editor.currentText())
+        else:
+            super().setModelData(editor, model, index)
+
+
+def row_spec(target, control, minimum, maximum, value, host) -> dict:
+    """A PARAMETER_BINDINGS entry from one row of the dialog, before validation"""
+    spec = {"id": int(target)} if target.isdigit() else {"path": target}
+    spec["control"] = control
+    for key, text in (("min", minimum), ("max", maximum), ("value", value)):
+        if text:
+            try:
+                spec[key] = float(text)
+            except ValueError:
+                spec[key] = text  # left for compile_binding to report
+    if host:
+        spec["host"] = host
+    return spec
+
+
+class ParameterBindingsDialog(QDialog):
+    """Parameter Bindings dialog using QTableView and model/delegate."""
+
+    def __init__(self, config, parent=None):
+        super().__init__(parent)
+        self.config = config
+        self.setWindowTitle("Parameter Bindings")
+        self.resize(800, 400)
+
+        layout = QVBoxLayout()
+        layout.addWidget(QLabel(
+            "Bind faders, toggles and buttons to any parameter, by path under each column's clip "
+            "(e.g. video/opacity) or by parameter ID:"
+        ))
+
+        self.model = BindingsModel(self.config.get("PARAMETER_BINDINGS") or {})
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setItemDelegate(BindingDelegate())
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.table)
+
+        btn_layout = QHBoxLayout()
+        new_btn = QPushButton("New")
+        delete_btn = QPushButton("Delete")
+        save_btn = QPushButton("Save")
+        cancel_btn = QPushButton("Cancel")
+
+        new_btn.clicked.connect(self.add_row)
+        delete_btn.clicked.connect(self.delete_row)
+        save_btn.clicked.connect(self.save_changes)
+        cancel_btn.clicked.connect(self.reject)
+
+        btn_layout.addStretch()
+        btn_layout.addWidget(new_btn)
+        btn_layout.addWidget(delete_btn)
+        btn_layout.addWidget(save_btn)
+        btn_layout.addWidget(cancel_btn)
+
+        layout.addLayout(btn_layout)
+        self.setLayout(layout)
+
+    def add_row(self):
+        index = 0
+        while any(f"new binding ({index})" == row[0] for row in self.model._data):
+            index += 1
+        self.model.insertRow(self.model.rowCount(), name=f"new binding ({index})")
+
+    def delete_row(self):
+        selected = self.table.selectionModel().selectedRows()
+        for index in sorted([r.row() for r in selected], reverse=True):
+            self.model.removeRow(index)
+
+    def save_changes(self):
+        """Validate and save the bindings."""
+        bindings = {}
+        known_hosts = configured_hosts(self.config)
+        for name, *fields in self.model._data:
+            spec = row_spec(*fields)
+            try:
+                compile_binding(name, spec)
+            except ValueError as e:
+                QMessageBox.critical(self, "Error", f"{name}: {e}")
+                return
+            if spec.get("host") and spec["host"] not in known_hosts:
+                QMessageBox.critical(
+                    self, "Error", f"{name}: unknown host {spec['host']}. Known hosts: {', '.join(known_hosts)}"
+                )
+                return
+            bindings[name.strip()] = spec
+
+        self.config["PARAMETER_BINDINGS"] = bindings
+        self.accept()
@@ -0,0 +1,222 @@
+import json
+import multiprocessing
+import struct
+import threading
+import time
+from multiprocessing import shared_memory
+
+import requests
+
+from resolume_colour_picker.bindings import compile_template
+from resolume_colour_picker.layers import group_target, target_path
+
+
+# Command flags
+PANIC = 1  # send on the priority lane and drop queued normal commands
+STOP = 2  # shut the dispatch process down
+GROUP = 4  # the layer field is a layer group position
+
+# Outcomes reported back for each command
+OK = 0
+HTTP_ERROR = 1  # Resolume answered with an error status
+CONNECTION_ERROR = 2  # couldn't connect, or timed out
+ERROR = 3  # anything else
+DROPPED = 4  # queued before a panic, never sent
+
+# seq, host index, layer, red, green, blue, flags, perf_counter when pushed
+COMMAND = struct.Struct("<IHHBBBBd")
+# seq, outcome, HTTP status, request latency in ms
+ACK = struct.Struct("<IBxHf")
+
+
+class Ring:
+    """
+    Single-producer, single-consumer ring of fixed-size records in shared
+    memory. The producer only ever writes the head index and the consumer only
+    the tail, and a record is written before the head moves past it, so the two
+    processes never need a lock between them.
+    """
+    HEADER = struct.Struct("<QQ")  # head (records written), tail (records read)
+
+    def __init__(self, record: struct.Struct, capacity=1024, name=None):
+        self.record = record
+        self.capacity = capacity
+        size = self.HEADER.size + capacity * record.size
+        self.owner = name is None
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+            self.HEADER.pack_into(self.shm.buf, 0, 0, 0)
+        else:
+            # A spawned child shares the parent's resource tracker, so attaching
+            # doesn't hand ownership over; only the creator unlinks
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+
+    def __len__(self):
+        head, tail = self.HEADER.unpack_from(self.shm.buf, 0)
+        return head - tail
+
+    def push(self, *values) -> bool:
+        """Append a record. Returns False if the ring is full."""
+        head, tail = self.HEADER.unpack_from(self.shm.buf, 0)
+        if head - tail >= self.capacity:
+            return False
+        offset = self.HEADER.size + (head % self.capacity) * self.record.size
+        self.record.pack_into(self.shm.buf, offset, *values)
+        struct.pack_into("<Q", self.shm.buf, 0, head + 1)  # publish
+        return True
+
+    def pop(self):
+        """Take the oldest record, or None if the ring is empty"""
+        head, tail = self.HEADER.unpack_from(self.shm.buf, 0)
+        if tail == head:
+            return None
+        offset = self.HEADER.size + (tail % self.capacity) * self.record.size
+        values = self.record.unpack_from(self.shm.buf, offset)
+        struct.pack_into("<Q", self.shm.buf, 8, tail + 1)
+        return values
+
+    def close(self):
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def _rgb(colour: str) -> tuple:
+    value = int(colour.lstrip("#")[:6], 16)
+    return value >> 16, (value >> 8) & 0xFF, value & 0xFF
+
+
+class DispatchProcess:
+    """
+    GUI-side handle on a child process that does all HTTP transport, so
+    stylesheet parsing and layout work in the GUI can't hold the HTTP threads
+    up on the GIL. Commands and acknowledgements cross in shared-memory rings.
+    """
+
+    def __init__(self, hosts, base_payload, warm_counts=None, keepalive_ms=10000, capacity=1024):
+        # hosts: [(name, ip, port)]
+        self.host_index = {name: i for i, (name, _, _) in enumerate(hosts)}
+        self.commands = Ring(COMMAND, capacity)
+        self.acks = Ring(ACK, capacity)
+        self._seq = 0
+
+        warm_counts = warm_counts or {}
+        context = multiprocessing.get_context("spawn")
+        self.process = context.Process(
+            target=run_transport,
+            args=(
+                self.commands.name, self.acks.name, capacity, list(hosts), base_payload,
+                [warm_counts.get(name, 1) for name, _, _ in hosts], keepalive_ms,
+            ),
+            name="resolume-dispatch",
+            daemon=True,
+        )
+        self.process.start()
+
+    def push(self, host, layer, colour, flags=0):
+        """Queue one command for the child. Returns its sequence number, or None if the ring is full."""
+        self._seq = (self._seq + 1) & 0xFFFFFFFF
+        if not self.commands.push(self._seq, self.host_index[host], int(layer), *_rgb(colour), flags, time.perf_counter()):
+            return None
+        return self._seq
+
+    def drain_acks(self) -> list:
+        """Every (seq, outcome, status, latency_ms) acknowledged since the last call"""
+        acks = []
+        ack = self.acks.pop()
+        while ack is not None:
+            acks.append(ack)
+            ack = self.acks.pop()
+        return acks
+
+    def stop(self, timeout=1.0):
+        while not self.commands.push(0, 0, 0, 0, 0, 0, STOP, time.perf_counter()) and self.process.is_alive():
+            time.sleep(0.001)
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout)
+        self.commands.close()
+        self.acks.close()
+
+
+# =========================
+# CHILD PROCESS
+# =========================
+
+def run_transport(command_name, ack_name, capacity, hosts, base_payload, warm_counts, keepalive_ms):
+    """Entry point of the dispatch process"""
+    # Imported here so the GUI side of this module doesn't depend on the dispatcher
+    from resolume_colour_picker.dispatcher import JSON_HEADERS, HostChannel
+
+    commands = Ring(COMMAND, capacity, name=command_name)
+    acks = Ring(ACK, capacity, name=ack_name)
+    ack_lock = threading.Lock()  # the ring has one producer; the workers take turns
+
+    channels = [HostChannel(name, ip, port) for name, ip, port in hosts]
+    for channel, count in zip(channels, warm_counts):
+        channel.warm(count)
+    colour_body = compile_template(base_payload)
+    bodies = {}  # colour -> serialised payload
+
+    def acknowledge(seq, outcome, status=0, latency_ms=0.0):
+        with ack_lock:
+            while not acks.push(seq, outcome, status, latency_ms):
+                time.sleep(0.0005)  # the GUI drains acks every few ms
+
+    def put(channel, session, seq, url, body, generation=None):
+        if generation is not None and generation != channel.generation:
+            acknowledge(seq, DROPPED)
+            return
+        channel.last_used = time.monotonic()
+        start = time.perf_counter()
+        try:
+            response = session.put(url, data=body, headers=JSON_HEADERS, timeout=(0.05, 0.2))
+        except (requests.ConnectionError, requests.Timeout):
+            acknowledge(seq, CONNECTION_ERROR)
+            return
+        except Exception:
+            acknowledge(seq, ERROR)
+            return
+        latency = (time.perf_counter() - start) * 1000
+        acknowledge(seq, OK if response.ok else HTTP_ERROR, response.status_code, latency)
+
+    next_keepalive = time.monotonic() + keepalive_ms / 1000
+    idle_spins = 0
+    while True:
+        command = commands.pop()
+        if command is None:
+            # Spin briefly for low latency on bursts, then back off to spare the CPU
+            idle_spins += 1
+            if idle_spins > 200:
+                time.sleep(0.0005)
+            if time.monotonic() > next_keepalive:
+                next_keepalive = time.monotonic() + keepalive_ms / 1000
+                idle_since = time.monotonic() - keepalive_ms / 1000
+                for channel, count in zip(channels, warm_counts):
+                    if channel.last_used < idle_since:
+                        channel.warm(count)
+            continue
+        idle_spins = 0
+
+        seq, host, layer, red, green, blue, flags, _ = command
+        if flags & STOP:
+            break
+        colour = f"#{red:02x}{green:02x}{blue:02x}"
+        body = bodies.get(colour)
+        if body is None:
+            body = bodies[colour] = json.dumps(colour_body(colour)).encode()
+
+        channel = channels[host]
+        url = channel.api_base_url + target_path(group_target(layer) if flags & GROUP else layer)
+        if flags & PANIC:
+            channel.generation += 1
+            channel.submit(put, channel, channel.priority_session, seq, url, body, priority=True)
+        else:
+            channel.submit(put, channel, channel.session, seq, url, body, channel.generation)
+
+    for channel in channels:
+        channel.close()
+    commands.close()
+    acks.close()
@@ -0,0 +1,114 @@
+import logging
+import requests
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from resolume_colour_picker.layers import target_path
+
+
+logger = logging.getLogger(__name__)
+
+
+def reported_colour(clip: dict):
+    """Pull the Colorize colour out of a clip read-back, normalised to '#rrggbb'"""
+    try:
+        value = clip["video"]["effects"][0]["params"]["Color"]["value"]
+    except (KeyError, IndexError, TypeError):
+        return None
+    # Resolume may report an alpha channel; only the RGB part is ours
+    return value[:7].lower() if isinstance(value, str) else None
+
+
+class Reconciler(QObject):
+    """
+    Periodically reads back one layer from Resolume and re-sends it if it
+    doesn't show the colour last asked for.
+
+    Reads are round-robin, one per tick and never more than one outstanding,
+    so the load on the webserver is bounded at 1 / interval no matter how many
+    layers are mapped. Re-sends only happen for layers found to have diverged.
+    """
+    layer_diverged = Signal(object, bool)  # (host, layer), diverged
+    _read_finished = Signal(object, object, object)  # (host, layer), expected colour, reported colour
+
+    def __init__(self, dispatcher, interval_ms=1000):
+        super().__init__()
+        self.dispatcher = dispatcher
+        self.session = requests.Session()
+        # One worker: reads must never pile up behind a slow host
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.diverged = set()
+        self.read_count = 0
+        self.resend_count = 0
+
+        self._cursor = 0
+        self._reading = False
+        self._read_finished.connect(self._compare)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.tick)
+
+    def start(self):
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+
+    def _is_busy(self, target):
+        """True if the target's host is unreachable or a request to it is in flight"""
+        channel = self.dispatcher.hosts.get(target[0])
+        return channel is None or channel.breaker.is_open or target[1] in channel.state.in_flight
+
+    def _next_target(self):
+        """Pick the next (host, layer) with a known desired colour that can be read"""
+        targets = list(self.dispatcher.desired.keys())
+        for _ in range(len(targets)):
+            target = targets[self._cursor % len(targets)]
+            self._cursor += 1
+            if not self._is_busy(target):
+                return target
+        return None
+
+    def tick(self):
+        if self._reading:
+            return
+        target = self._next_target()
+        if target is None:
+            return
+        self._reading = True
+        self.read_count += 1
+        expected = self.dispatcher.desired[target]
+        url = self.dispatcher.hosts[target[0]].api_base_url + target_path(target[1])
+        self.executor.submit(self._read, target, expected, url)
+
+    def _read(self, target, expected, url):
+        try:
+            response = self.session.get(url, timeout=(0.05, 0.5))
+            reported = reported_colour(response.json()) if response.ok else None
+        except (requests.RequestException, ValueError):
+            reported = None
+        self._read_finished.emit(target, expected, reported)
+
+    def _compare(self, target, expected, reported):
+        self._reading = False
+        if reported is None:
+            return  # couldn't tell; the breaker deals with unreachable hosts
+        # A press since the read started makes the read-back stale
+        if self.dispatcher.desired.get(target) != expected or self._is_busy(target):
+            return
+
+        if reported == self.dispatcher.output_colour(target, expected).lower():
+            if target in self.diverged:
+                self.diverged.discard(target)
+                self.layer_diverged.emit(target, False)
+            return
+
+        if target not in self.diverged:
+            self.diverged.add(target)
+            self.layer_diverged.emit(target, True)
+        host, layer = target
+        logger.warning("Layer shows %s - resending", reported, extra={"host": host, "layer": layer, "colour": expected})
+        self.resend_count += 1
+        self.dispatcher.send({target: expected}, force=True)
@@ -0,0 +1,358 @@
+"""
+Replay a recorded operator session against a local stand-in Resolume and
+report how the dispatch path held up.
+
+    python -m resolume_colour_picker.replay session.jsonl --speed 1 10 100
+    python -m resolume_colour_picker.replay session.jsonl --headless --latency-ms 5
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from importlib.resources import files
+from pathlib import Path
+
+from PySide6.QtCore import QCoreApplication, QObject, Signal
+
+from resolume_colour_picker import session_recorder
+from resolume_colour_picker.dispatcher import Dispatcher
+from resolume_colour_picker.palette import gradient
+from resolume_colour_picker.session_recorder import load_session
+from resolume_colour_picker.stand_in_server import StandInResolume
+
+
+class ReplayConfig(QObject):
+    """An in-memory Config for replays, so nothing touches the operator's saved settings"""
+    value_changed = Signal(str, object)
+
+    def __init__(self, data):
+        super().__init__()
+        self._data = dict(data)
+        self.cache_dir = Path(tempfile.mkdtemp(prefix="colour-picker-replay-"))
+
+    def get(self, key, default=None):
+        return self._data.get(key, default)
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __setitem__(self, key, value):
+        self._data[key] = value
+        self.value_changed.emit(key, value)
+
+    def __contains__(self, key):
+        return key in self._data
+
+
+def _base_payload():
+    return json.loads(files("resolume_colour_picker.data").joinpath("get_colourize.json").read_text(encoding="utf-8"))
+
+
+class HeadlessCore:
+    """The engine's press, Scene Master and panic behaviour without any widgets"""
+
+    def __init__(self, config, consts):
+        self.config = config
+        panic_colours = {name: colour for name, (colour, _) in consts["PANIC_COLOURS"].items()}
+        self.dispatcher = Dispatcher(config, _base_payload(), consts["KEEPALIVE_INTERVAL"], panic_colours)
+        layer_map = config["LAYER_MAP"]
+        self.all_columns = [col for col, layer in layer_map.items() if layer == "ALL"]
+        self.non_all_columns = [col for col, layer in layer_map.items() if layer != "ALL"]
+        self.scene_master_mode = False
+        self.queued = {}  # column -> (row, colour)
+        self.live = {}  # column -> colour
+        self.queued_gradient = {}  # (host, layer) -> colour
+        self.live_gradient = {}
+
+    def _targets(self, column_colours):
+        return {
+            target: colour
+            for column, colour in column_colours.items()
+            for target in self.dispatcher.targets_for(column)
+        }
+
+    def _send(self, column_colours, force=False):
+        self.dispatcher.send(self._targets(column_colours), force=force)
+
+    def _drop_gradient(self, gradient, columns):
+        """A button replaces any gradient on its columns, as in the grid"""
+        for target in self._targets(dict.fromkeys(columns)):
+            gradient.pop(target, None)
+
+    def on_press(self, column, row, colour):
+        columns = self.non_all_columns if column in self.all_columns else [column]
+        if self.scene_master_mode:
+            for col in columns:
+                # Pressing a queued button again takes it back out, as in the grid
+                if self.queued.get(col, (None,))[0] == row:
+                    self.queued.pop(col)
+                else:
+                    self.queued[col] = (row, colour)
+                    self._drop_gradient(self.queued_gradient, [col])
+        else:
+            self._drop_gradient(self.live_gradient, columns)
+            self.live.update({col: colour for col in columns})
+            self._send({col: colour for col in columns})
+
+    def apply_gradient(self, start, end, middle=None):
+        slots = self.dispatcher.layer_slots(self.non_all_columns)
+        colours = gradient([start, end] if middle is None else [start, middle, end], len(slots))
+        targets = {target: colour for (_, slot), colour in zip(slots, colours) for target in slot}
+        if self.scene_master_mode:
+            self.queued = {}
+            self.queued_gradient = targets
+        else:
+            self.live = {}
+            self.live_gradient = targets
+            self.dispatcher.send(targets)
+
+    def set_parameter(self, column, name, value):
+        binding = self.dispatcher.bindings.get(name)
+        if binding is None:
+            return
+        if binding.target is not None:
+            self.dispatcher.set_parameters({binding.target: {name: value}})
+            return
+        columns = self.non_all_columns if column in self.all_columns else [column]
+        self.dispatcher.set_parameters({
+            target: {name: value} for col in columns for target in self.dispatcher.targets_for(col)
+        })
+
+    def switch_bank(self, name):
+        """Nothing to do: recorded presses carry their colour, whichever bank they came from"""
+
+    def toggle_scene_master(self):
+        self.scene_master_mode = not self.scene_master_mode
+        self.queued = {}
+        self.queued_gradient = {}
+
+    def send_queued_changes(self):
+        changes = {col: colour for col, (_, colour) in self.queued.items()}
+        if self.queued_gradient:
+            self.live = {}
+            self.live_gradient = self.queued_gradient
+        self._drop_gradient(self.live_gradient, changes)
+        targets = dict(self.queued_gradient)
+        targets.update(self._targets(changes))
+        self.dispatcher.send(targets)
+        self.live.update(changes)
+        self.cancel_scene_master()
+
+    def cancel_scene_master(self):
+        self.scene_master_mode = False
+        self.queued = {}
+        self.queued_gradient = {}
+
+    def panic(self, name):
+        self.dispatcher.panic(name)
+        self.live = {}
+        self.live_gradient = {}
+
+    def force_resend(self):
+        targets = dict(self.live_gradient)
+        targets.update(self._targets(self.live))
+        self.dispatcher.send(targets, force=True)
+
+
+def apply_event(target, kind, args):
+    """Feed one recorded event to an engine or HeadlessCore"""
+    if kind == session_recorder.PRESS:
+        target.on_press(*args)
+    elif kind == session_recorder.SCENE_MASTER:
+        target.toggle_scene_master()
+    elif kind == session_recorder.GO:
+        target.send_queued_changes()
+    elif kind == session_recorder.CANCEL:
+        target.cancel_scene_master()
+    elif kind == session_recorder.PANIC:
+        target.panic(*args)
+    elif kind == session_recorder.FORCE_RESEND:
+        target.force_resend()
+    elif kind == session_recorder.GRADIENT:
+        target.apply_gradient(*args)
+    elif kind == session_recorder.BANK:
+        target.switch_bank(*args)
+    elif kind == session_recorder.PARAMETER:
+        target.set_parameter(*args)
+
+
+def _idle(dispatcher):
+    return not any(channel.state.in_flight or channel.parameters_busy for channel in dispatcher.hosts.values())
+
+
+def replay(path, speed=1.0, headless=False, latency_ms=0.0, consts=None):
+    """
+    Replay a recording at the given speed and return a report dict. Every
+    change to a layer's wanted colour is matched to the request that delivered
+    it at the stand-in server.
+    """
+    if consts is None:
+        from resolume_colour_picker import CONSTS as consts
+    header, events = load_session(path)
+
+    if headless:
+        app = QCoreApplication.instance() or QCoreApplication([])
+    else:
+        from PySide6.QtWidgets import QApplication
+        app = QApplication.instance() or QApplication([])
+
+    with StandInResolume(latency_ms=latency_ms) as server:
+        config = ReplayConfig({
+            "WEBSERVER_IP": "127.0.0.1",
+            "WEBSERVER_PORT": str(server.port),
+            "LAYER_MAP": header["layer_map"],
+            "COLOUR_SET": header["colour_set"],
+            "PALETTE_BANKS": header.get("palette_banks", {}),
+            "PARAMETER_BINDINGS": header.get("parameter_bindings", {}),
+            "EXTRA_HOSTS": [],
+            "COLUMN_HOSTS": {},
+        })
+        if headless:
+            target = HeadlessCore(config, consts)
+        else:
+            from resolume_colour_picker.application import ColourPickerEngine
+            target = ColourPickerEngine(config, consts)
+        dispatcher = target.dispatcher
+        dispatcher.warm_all()
+        time.sleep(0.2)
+        server.requests.clear()
+
+        # The headless core needs no event loop, and leaving it unpumped keeps
+        # the schedule clear of anything else that shares the process
+        pump = (lambda: None) if headless else app.processEvents
+
+        changes = []  # (issued at, layer, colour)
+        wanted = dict(dispatcher.desired)
+        start = time.perf_counter()
+        for elapsed_ms, kind, args in events:
+            due = start + elapsed_ms / 1000 / speed
+            while time.perf_counter() < due:
+                pump()
+                time.sleep(min(0.001, max(0.0, due - time.perf_counter())))
+            issued = time.perf_counter()
+            apply_event(target, kind, args)
+            for (host, layer), colour in dispatcher.desired.items():
+                if wanted.get((host, layer)) != colour:
+                    changes.append((issued, layer, colour.lower()))
+            wanted = dict(dispatcher.desired)
+        duration = time.perf_counter() - start
+
+        deadline = time.perf_counter() + 5
+        while not _idle(dispatcher) and time.perf_counter() < deadline:
+            pump()
+            time.sleep(0.005)
+        arrivals = [(t, layer, (colour or "").lower()) for t, layer, colour, _ in list(server.requests)]
+        final = {layer: colour.lower() for layer, colour in server.colours.items()}
+
+        if not headless:
+            target.reconciler.stop()
+            target.watchdog.stop()
+            target.timer.stop()
+        dispatcher.close()
+        for channel in dispatcher.hosts.values():
+            channel.close()
+
+    report = analyse(changes, arrivals, final)
+    report.update({"speed": speed, "events": len(events), "duration_s": duration, "requests": len(arrivals)})
+    return report
+
+
+def analyse(changes, arrivals, final):
+    """
+    Match each wanted change to the first request that delivered it.
+    Undelivered changes count as dropped, split into those a later change to
+    the same layer superseded and those that were the layer's last word.
+    Arrivals of an older change after a newer one are stale.
+    """
+    per_layer = {}
+    for issued, layer, colour in changes:
+        per_layer.setdefault(layer, []).append((issued, colour))
+
+    latencies = []
+    delivered = {layer: set() for layer in per_layer}
+    newest_delivered = {}
+    stale = 0
+    for arrived, layer, colour in arrivals:
+        layer_changes = per_layer.get(layer, [])
+        # The latest change with this colour that had been issued when it arrived
+        match = None
+        for i in range(len(layer_changes) - 1, -1, -1):
+            issued, wanted = layer_changes[i]
+            if wanted == colour and issued <= arrived:
+                match = i
+                break
+        if match is None:
+            continue  # a resend of something already delivered, or a read-back repair
+        if match < newest_delivered.get(layer, -1):
+            stale += 1
+        newest_delivered[layer] = max(newest_delivered.get(layer, -1), match)
+        if match not in delivered[layer]:
+            delivered[layer].add(match)
+            latencies.append((arrived - layer_changes[match][0]) * 1000)
+
+    superseded = final_dropped = 0
+    for layer, layer_changes in per_layer.items():
+        for i in range(len(layer_changes)):
+            if i not in delivered[layer]:
+                if i == len(layer_changes) - 1:
+                    final_dropped += 1
+                else:
+                    superseded += 1
+    mismatched = sum(
+        1 for layer, layer_changes in per_layer.items() if final.get(layer) != layer_changes[-1][1]
+    )
+
+    latencies.sort()
+    report = {
+        "changes": len(changes),
+        "delivered": len(latencies),
+        "dropped_superseded": superseded,
+        "dropped_final": final_dropped,
+        "stale_arrivals": stale,
+        "mismatched_layers": mismatched,
+    }
+    if latencies:
+        report.update({
+            "p50_ms": statistics.median(latencies),
+            "p90_ms": latencies[int(0.9 * (len(latencies) - 1))],
+            "p99_ms": latencies[int(0.99 * (len(latencies) - 1))],
+            "max_ms": latencies[-1],
+        })
+    return report
+
+
+def format_report(report) -> str:
+    lines = [
+        f"{report['speed']:g}x: {report['events']} events in {report['duration_s']:.2f} s, "
+        f"{report['changes']} layer changes, {report['requests']} requests",
+    ]
+    if "p50_ms" in report:
+        lines.append(
+            f"  latency  p50 {report['p50_ms']:.2f} ms  p90 {report['p90_ms']:.2f} ms  "
+            f"p99 {report['p99_ms']:.2f} ms  max {report['max_ms']:.2f} ms"
+        )
+    lines.append(
+        f"  dropped  {report['dropped_final']} final, {report['dropped_superseded']} superseded  |  "
+        f"stale arrivals {report['stale_arrivals']}  |  mismatched layers at end {report['mismatched_layers']}"
+    )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a recorded session against a stand-in Resolume")
+    parser.add_argument("session", help="a session-*.jsonl recording")
+    parser.add_argument("--speed", type=float, nargs="+", default=[1.0], help="replay speed(s), e.g. 1 10 100")
+    parser.add_argument("--headless", action="store_true", help="skip the UI and drive the dispatcher directly")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="stand-in server response delay")
+    args = parser.parse_args(argv)
+
+    for speed in args.speed:
+        print(format_report(replay(args.session, speed, args.headless, args.latency_ms)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
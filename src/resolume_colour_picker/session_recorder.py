@@ -0,0 +1,67 @@
+import json
+import time
+from pathlib import Path
+
+
+# Event kinds, kept to one character so long shows stay small on disk
+PRESS = "p"  # column, row, colour
+SCENE_MASTER = "s"  # toggled
+GO = "g"
+CANCEL = "c"
+PANIC = "x"  # panic name
+FORCE_RESEND = "f"
+GRADIENT = "r"  # start, end, middle or null
+BANK = "b"  # palette bank name
+PARAMETER = "v"  # column, binding name, value
+
+FORMAT_VERSION = 1
+
+
+class SessionRecorder:
+    """
+    Appends every operator action to a JSON-lines file: a header describing
+    the grid, then one compact [ms since start, kind, *args] array per event.
+    Lines are only ever appended, so a crash loses at most the unflushed tail.
+    """
+
+    def __init__(self, path, layer_map, colour_set, palette_banks=None, flush_every=20, parameter_bindings=None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_every = flush_every
+        self.event_count = 0
+        self._start = time.perf_counter()
+        self._file = open(self.path, "a", encoding="utf-8")
+        header = {
+            "version": FORMAT_VERSION,
+            "started": time.time(),
+            "layer_map": layer_map,
+            "colour_set": colour_set,
+            "palette_banks": palette_banks or {},
+            "parameter_bindings": parameter_bindings or {},
+        }
+        self._file.write(json.dumps(header, separators=(",", ":")) + "\n")
+        self._file.flush()
+
+    def record(self, kind, *args):
+        elapsed_ms = round((time.perf_counter() - self._start) * 1000, 1)
+        self._file.write(json.dumps([elapsed_ms, kind, *args], separators=(",", ":")) + "\n")
+        self.event_count += 1
+        if self.event_count % self.flush_every == 0:
+            self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def load_session(path):
+    """Read a recording. Returns (header, [(ms, kind, args)]); a torn last line is ignored."""
+    with open(path, encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        events = []
+        for line in f:
+            try:
+                elapsed_ms, kind, *args = json.loads(line)
+            except ValueError:
+                break  # the recorder was killed mid-write
+            events.append((elapsed_ms, kind, args))
+    return header, events
@@ -0,0 +1,233 @@
+"""
+Memory soak harness: thousands of config rebuilds, dialog opens and Scene
+Master cycles against an offscreen engine, tracking RSS, Python object
+counts and live QObjects. Exits non-zero when growth passes the budget and
+lists the types that grew.
+
+    python -m resolume_colour_picker.soak --cycles 2000
+"""
+
+import argparse
+import collections
+import gc
+import json
+import os
+import sys
+import time
+from importlib.resources import files
+from typing import NamedTuple
+
+from PySide6.QtCore import QCoreApplication, QEvent, QObject, QTimer
+
+from resolume_colour_picker.replay import ReplayConfig
+from resolume_colour_picker.stand_in_server import StandInResolume
+
+
+class Snapshot(NamedTuple):
+    rss_kib: int
+    widgets: int
+    qobjects: int
+    types: collections.Counter  # Python type name -> live instances
+
+
+def _windows_rss_kib() -> int:
+    """Current working set, from GetProcessMemoryInfo"""
+    import ctypes
+    from ctypes import wintypes
+
+    class ProcessMemoryCounters(ctypes.Structure):
+        _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [
+            (name, ctypes.c_size_t) for name in (
+                "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage", "QuotaPagedPoolUsage",
+                "QuotaPeakNonPagedPoolUsage", "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage",
+            )
+        ]
+
+    kernel32 = ctypes.WinDLL("kernel32")
+    kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+    kernel32.K32GetProcessMemoryInfo.argtypes = [wintypes.HANDLE, ctypes.POINTER(ProcessMemoryCounters), wintypes.DWORD]
+    counters = ProcessMemoryCounters()
+    counters.cb = ctypes.sizeof(counters)
+    if not kernel32.K32GetProcessMemoryInfo(kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb):
+        raise ctypes.WinError()
+    return counters.WorkingSetSize // 1024
+
+
+def rss_kib() -> int:
+    """Current resident set size; peak RSS on Unixes without /proc"""
+    if sys.platform == "win32":
+        return _windows_rss_kib()
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except OSError:
+        import resource  # Unix only
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def settle(app):
+    """Run pending events and deleteLater()s, then collect garbage"""
+    for _ in range(3):
+        app.processEvents()
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+    gc.collect()
+
+
+def snapshot(app, engine) -> Snapshot:
+    settle(app)
+    return Snapshot(
+        rss_kib(),
+        len(app.allWidgets()),
+        len(engine.findChildren(QObject)),
+        collections.Counter(type(obj).__name__ for obj in gc.get_objects()),
+    )
+
+
+class Soak:
+    """Drives one engine through the edits an operator makes over a long day"""
+
+    def __init__(self, app, engine):
+        self.app = app
+        self.engine = engine
+        self.config = engine.config
+        self.palettes = [
+            dict(engine.config["COLOUR_SET"]),
+            {f"{i} - Grey": f"#{i * 20:02x}{i * 20:02x}{i * 20:02x}" for i in range(1, 11)},
+        ]
+        # Three banks through a two-page cache, so grids are built, flipped to and evicted
+        self.config["PALETTE_BANKS"] = {
+            "Warm": {"Red": "#ff0000", "Orange": "#ffa500", "Amber": "#ffbf00"},
+            "Cool": {"Blue": "#0000ff", "Cyan": "#00ffff", "Red": "#ff0000"},
+            "Mono": {"White": "#ffffff", "Grey": "#808080"},
+        }
+        engine.pages.size = 2
+        self.layer_maps = [
+            dict(engine.config["LAYER_MAP"]),
+            {"ALL": "ALL", **{f"Layer {i}": i for i in range(1, 7)}},
+        ]
+
+    def _close_dialog(self):
+        dialog = self.app.activeModalWidget()
+        if dialog is not None:
+            dialog.reject()
+
+    def open_dialog(self, opener):
+        QTimer.singleShot(0, self._close_dialog)
+        opener()
+
+    def cycle(self, i):
+        # One save at a time, as from the dialogs
+        self.config["COLOUR_SET"] = self.palettes[i % 2]
+        self.app.processEvents()
+        self.config["LAYER_MAP"] = self.layer_maps[i % 2]
+        self.app.processEvents()
+
+        for opener in (
+            self.engine.open_colour_config, self.engine.open_api_settings,
+            self.engine.open_layer_map_settings, self.engine.open_log,
+        ):
+            self.open_dialog(opener)
+
+        for bank in ("Warm", "Cool", "Warm", "Mono"):
+            self.engine.switch_bank(bank)
+        self.app.processEvents()
+
+        column = self.engine.non_all_columns[0]
+        for finish in (self.engine.send_queued_changes, self.engine.cancel_scene_master):
+            self.engine.toggle_scene_master()
+            self.engine.on_press(column, i % len(self.engine.colour_rows), None)
+            finish()
+        self.app.processEvents()
+
+
+def growth(before: Snapshot, after: Snapshot, top=10) -> dict:
+    types = after.types.copy()
+    types.subtract(before.types)
+    return {
+        "rss_kib": after.rss_kib - before.rss_kib,
+        "widgets": after.widgets - before.widgets,
+        "qobjects": after.qobjects - before.qobjects,
+        "objects": sum(types.values()),
+        "top_types": [(name, count) for name, count in types.most_common(top) if count > 0],
+    }
+
+
+def run(cycles=2000, warmup=50, report_every=500, out=sys.stdout):
+    """Soak an offscreen engine and return (growth per checkpoint, final growth)"""
+    from PySide6.QtWidgets import QApplication
+
+    from resolume_colour_picker import CONSTS
+    from resolume_colour_picker.application import ColourPickerEngine
+
+    app = QApplication.instance() or QApplication([])
+    defaults = json.loads(files("resolume_colour_picker.data").joinpath("defaults.json").read_text(encoding="utf-8"))
+    with StandInResolume() as server:
+        config = ReplayConfig({**defaults, "WEBSERVER_IP": "127.0.0.1", "WEBSERVER_PORT": str(server.port)})
+        engine = ColourPickerEngine(config, CONSTS)
+        engine.show()
+        soak = Soak(app, engine)
+
+        for i in range(warmup):
+            soak.cycle(i)
+        server.requests.clear()  # the stand-in's own request log would otherwise count as growth
+        baseline = snapshot(app, engine)
+        checkpoints = []
+        start = time.perf_counter()
+        for i in range(1, cycles + 1):
+            soak.cycle(i)
+            if i % report_every == 0 or i == cycles:
+                server.requests.clear()
+                result = growth(baseline, snapshot(app, engine))
+                checkpoints.append((i, result))
+                print(
+                    f"{i:6d} cycles  {time.perf_counter() - start:6.1f} s  "
+                    f"RSS {result['rss_kib'] / 1024:+7.1f} MiB  widgets {result['widgets']:+6d}  "
+                    f"QObjects {result['qobjects']:+6d}  Python objects {result['objects']:+7d}",
+                    file=out,
+                )
+
+        engine.timer.stop()
+        engine.reconciler.stop()
+        engine.watchdog.stop()
+        engine.dispatcher.close()
+        engine.close()
+        engine.deleteLater()
+        settle(app)
+    return checkpoints
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Soak the engine with config rebuilds and dialog opens")
+    parser.add_argument("--cycles", type=int, default=2000)
+    parser.add_argument("--rss-budget-mb", type=float, default=16.0, help="allowed RSS growth")
+    parser.add_argument("--object-budget", type=int, default=2000, help="allowed growth in live Python objects")
+    args = parser.parse_args(argv)
+
+    import logging
+    logging.getLogger("resolume_colour_picker").setLevel(logging.ERROR)
+
+    checkpoints = run(args.cycles)
+    final = checkpoints[-1][1]
+    failures = []
+    if final["rss_kib"] > args.rss_budget_mb * 1024:
+        failures.append(f"RSS grew {final['rss_kib'] / 1024:.1f} MiB (budget {args.rss_budget_mb} MiB)")
+    if final["objects"] > args.object_budget:
+        failures.append(f"{final['objects']} more Python objects (budget {args.object_budget})")
+    if final["widgets"] > 0 or final["qobjects"] > 0:
+        failures.append(f"{final['widgets']} more widgets, {final['qobjects']} more QObjects under the engine")
+
+    if failures:
+        print("\nFAIL: " + "; ".join(failures))
+        print("Types that grew the most:")
+        for name, count in final["top_types"]:
+            print(f"  {name:<32} {count:+d}")
+        return 1
+    print("\nOK: growth within budget")
+    return 0
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    sys.exit(main())
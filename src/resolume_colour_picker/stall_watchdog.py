@@ -0,0 +1,95 @@
+import collections
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import NamedTuple
+
+from PySide6.QtCore import QObject, Qt, QTimer, Signal
+
+from resolume_colour_picker.metrics import EVENT_LOOP_LAG, EVENT_LOOP_STALLS
+
+
+logger = logging.getLogger(__name__)
+
+
+class Stall(NamedTuple):
+    started: float  # wall-clock time the event loop stopped turning
+    duration_ms: float
+    stack: str  # the main thread's stack part-way through the stall, if one was caught
+
+
+class StallWatchdog(QObject):
+    """
+    Measures how late a high-frequency timer fires on the GUI thread. A
+    background thread watches for the probe going quiet and, once it has been
+    quiet for longer than the threshold, samples the main thread's stack so
+    the stall can be pinned on whatever was running at the time.
+    """
+    stall_detected = Signal(object)  # Stall
+
+    def __init__(self, probe_ms=10, threshold_ms=100, history=50, parent=None):
+        super().__init__(parent)
+        self.probe_ms = probe_ms
+        self.threshold_ms = threshold_ms
+        self.stalls = collections.deque(maxlen=history)
+        self.last_lag_ms = 0.0
+
+        self._main_ident = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._sample = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self._beat)
+
+    def start(self):
+        self._main_ident = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self.timer.start(self.probe_ms)
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._monitor, name="stall-watchdog", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self.timer.stop()
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    def _beat(self):
+        now = time.perf_counter()
+        lag_ms = max(0.0, (now - self._last_beat) * 1000 - self.probe_ms)
+        self._last_beat = now
+        self.last_lag_ms = lag_ms
+        EVENT_LOOP_LAG.observe(lag_ms / 1000)
+        with self._lock:
+            sample, self._sample = self._sample, None
+        if lag_ms < self.threshold_ms:
+            return
+
+        stall = Stall(time.time() - lag_ms / 1000, lag_ms, sample or "")
+        self.stalls.append(stall)
+        EVENT_LOOP_STALLS.inc()
+        logger.warning("GUI event loop stalled for %.0f ms\n%s", lag_ms, stall.stack.rstrip() or "(no stack caught)")
+        self.stall_detected.emit(stall)
+
+    def _monitor(self):
+        # Check twice per threshold, so a stall is sampled by about 1.5x the threshold
+        while not self._stop.wait(self.threshold_ms / 2000):
+            quiet_ms = (time.perf_counter() - self._last_beat) * 1000 - self.probe_ms
+            if quiet_ms < self.threshold_ms or self._sample is not None:
+                continue
+            frame = sys._current_frames().get(self._main_ident)
+            if frame is None:
+                continue
+            stack = "".join(traceback.format_stack(frame))
+            del frame
+            with self._lock:
+                self._sample = stack
@@ -0,0 +1,186 @@
+import hashlib
+import json
+import re
+import socket
+import struct
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from resolume_colour_picker.bindings import parameter_target
+from resolume_colour_picker.layers import group_target
+
+
+CLIP_PATH = re.compile(r"^/api/v1/composition/layers/(\d+)/clips/(\d+)$")
+GROUP_PATH = re.compile(r"^/api/v1/composition/layergroups/(\d+)$")
+PARAMETER_PATH = re.compile(r"^/api/v1/parameter/by-id/(\d+)$")
+THUMBNAIL_PATH = re.compile(r"^/api/v1/composition/layers/(\d+)/clips/(\d+)/thumbnail$")
+
+
+def solid_png(colour="#808080", width=64, height=36) -> bytes:
+    """A PNG of one colour, standing in for a clip thumbnail"""
+    pixel = bytes.fromhex(colour.lstrip("#"))
+    raw = (b"\x00" + pixel * width) * height
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw)) + chunk(b"IEND", b"")
+
+
+def _target(path):
+    """The layer number, group or parameter target a PUT path addresses, or None"""
+    match = CLIP_PATH.match(path)
+    if match:
+        return int(match.group(1))
+    match = GROUP_PATH.match(path)
+    if match:
+        return group_target(int(match.group(1)))
+    match = PARAMETER_PATH.match(path)
+    if match:
+        return parameter_target(int(match.group(1)))
+    return None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # Keep-alive, like the real webserver
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass  # keep test and benchmark output clean
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out as separate writes; don't let Nagle hold the body for an ACK
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        # Once per connection, standing in for the handshake round trip on a real network
+        self.server.stand_in.pause(self.server.stand_in.connect_latency_ms)
+
+    def _reply(self, status, body=None):
+        data = json.dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        server = self.server.stand_in
+        server.pause()
+        if self.path == "/api/v1/product":
+            self._reply(200, server.product)
+            return
+        if self.path == "/api/v1/composition":
+            self._reply(200, server.composition())
+            return
+        match = THUMBNAIL_PATH.match(self.path)
+        if match:
+            self._thumbnail(int(match.group(1)))
+            return
+        target = _target(self.path)
+        if target is not None:
+            colour = server.colours.get(target, "#000000")
+            self._reply(200, {"video": {"effects": [{"params": {"Color": {"value": colour}}}]}})
+            return
+        self._reply(404)
+
+    def _thumbnail(self, layer):
+        server = self.server.stand_in
+        data = server.thumbnails.get(layer)
+        if data is None:
+            data = server.thumbnails[layer] = solid_png(f"#{(layer * 0x3b5d7) % 0x1000000:06x}")
+        etag = '"' + hashlib.sha1(data).hexdigest() + '"'
+        not_modified = self.headers.get("If-None-Match") == etag
+        server.thumbnail_requests.append((layer, not_modified))
+        self.send_response(304 if not_modified else 200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Type", "image/png")
+        self.send_header("Content-Length", "0" if not_modified else str(len(data)))
+        self.end_headers()
+        if not not_modified:
+            self.wfile.write(data)
+
+    def do_PUT(self):
+        server = self.server.stand_in
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        server.pause()
+        layer = _target(self.path)
+        if layer is None:
+            self._reply(404)
+            return
+        try:
+            colour = body["video"]["effects"][0]["params"]["Color"]["value"]
+        except (KeyError, IndexError, TypeError):
+            colour = None
+        server.record(layer, colour, body)
+        self._reply(204)
+
+
+class StandInResolume:
+    """
+    A tiny local stand-in for the Resolume webserver, for tests, benchmarks and
+    session replays. Answers /api/v1/product and /api/v1/composition, accepts
+    clip, layer group and parameter-by-ID PUTs and reports the last colour written to each layer
+    or group back on GET. Groups are recorded under their "G<n>" target and
+    parameters set by ID under "P<id>".
+    Clip thumbnails are a PNG per layer, with an ETag for revalidation.
+    """
+
+    def __init__(
+        self, host="127.0.0.1", port=0, latency_ms=0.0, product=None, connect_latency_ms=0.0, layer_groups=None
+    ):
+        self.latency_ms = latency_ms
+        self.connect_latency_ms = connect_latency_ms
+        self.product = product or {"name": "Arena", "major": 7, "minor": 0, "micro": 0}
+        self.layer_groups = layer_groups or {}  # group name -> layer numbers, in composition order
+        self.colours = {}  # layer or group target -> last colour written
+        self.requests = []  # (perf_counter, layer, colour, body) per PUT
+        self.thumbnails = {}  # layer -> PNG bytes, made up on first request
+        self.thumbnail_requests = []  # (layer, answered 304) per thumbnail GET
+        self._lock = threading.Lock()
+
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.stand_in = self
+        self.host, self.port = self.httpd.server_address[:2]
+        self._thread = None
+
+    def pause(self, latency_ms=None):
+        latency_ms = self.latency_ms if latency_ms is None else latency_ms
+        if latency_ms:
+            time.sleep(latency_ms / 1000)
+
+    def composition(self) -> dict:
+        """Just the parts of a /composition reply that describe layers and layer groups"""
+        count = max((max(layers) for layers in self.layer_groups.values() if layers), default=0)
+        return {
+            "layers": [{"id": 1000 + i, "name": {"value": f"Layer {i}"}} for i in range(1, count + 1)],
+            "layergroups": [
+                {"id": 2000 + i, "name": {"value": name}, "layers": [{"id": 1000 + layer} for layer in layers]}
+                for i, (name, layers) in enumerate(self.layer_groups.items(), 1)
+            ],
+        }
+
+    def record(self, layer, colour, body):
+        with self._lock:
+            if colour is not None:
+                self.colours[layer] = colour
+            self.requests.append((time.perf_counter(), layer, colour, body))
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
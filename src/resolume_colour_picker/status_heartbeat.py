@@ -3,23 +3,40 @@ import time
 
 from PySide6.QtCore import Signal, QObject, Qt
 
+from resolume_colour_picker.hosts import MAIN_HOST
+from resolume_colour_picker.metrics import HEARTBEAT_FAILURES, HEARTBEAT_LATENCY
+
 
 class StatusHeartbeat(QObject):
     """Emits status updates for the Resolume connection"""
     status_updated = Signal(str, float, str)  # status, latency, colour
+    reachable = Signal(bool)  # whether the last check got a response
     
-    def __init__(self, config):
+    def __init__(self, config, host=None):
+        """
+        Watches the main WEBSERVER_IP/PORT host, or a fixed (name, ip, port)
+        host when one is given.
+        """
         super().__init__()
         self.session = requests.Session()
         self.running = False
         self.config = config
 
-        self.resolume_product_url = f"http://{self.config["WEBSERVER_IP"]}:{self.config["WEBSERVER_PORT"]}/api/v1/product"
-        self.config.value_changed.connect(self.config_callback, Qt.ConnectionType.QueuedConnection)
+        if host is None:
+            self.host_name = MAIN_HOST
+            self.ip, self.port = self.config["WEBSERVER_IP"], self.config["WEBSERVER_PORT"]
+            self.config.value_changed.connect(self.config_callback, Qt.ConnectionType.QueuedConnection)
+        else:
+            self.host_name, self.ip, self.port = host
+        self.resolume_product_url = self._build_url()
+
+    def _build_url(self):
+        return f"http://{self.ip}:{self.port}/api/v1/product"
 
     def config_callback(self, key, value):
         if key == "WEBSERVER_IP" or key == "WEBSERVER_PORT":
-            self.resolume_product_url = f"http://{self.config["WEBSERVER_IP"]}:{self.config["WEBSERVER_PORT"]}/api/v1/product"
+            self.ip, self.port = self.config["WEBSERVER_IP"], self.config["WEBSERVER_PORT"]
+            self.resolume_product_url = self._build_url()
 
     def check_status(self):
         """Poll the Resolume /product endpoint"""
@@ -27,6 +44,7 @@ class StatusHeartbeat(QObject):
             start_time = time.time()
             response = self.session.get(self.resolume_product_url, timeout=2)
             latency = (time.time() - start_time) * 1000  # Convert to milliseconds
+            HEARTBEAT_LATENCY.observe(latency / 1000, host=self.host_name)
             
             if response.status_code == 200:
                 if latency < 100:
@@ -38,16 +56,24 @@ class StatusHeartbeat(QObject):
                 else:
                     colour = "#FF6600"  # Orange-red - slow
                     status = "Slow"
-                status += " to Resolume @ " + self.config["WEBSERVER_IP"] 
+                status += " to Resolume @ " + self.ip
             else:
                 colour = "#FF0000"  # Red - error
                 status = f"Error {response.status_code}"
                 latency = 0
+                HEARTBEAT_FAILURES.inc(host=self.host_name, reason="http")
                 
             self.status_updated.emit(status, latency, colour)
+            self.reachable.emit(True)
         except requests.Timeout:
+            HEARTBEAT_FAILURES.inc(host=self.host_name, reason="timeout")
             self.status_updated.emit("Timeout", 0, "#FF0000")
+            self.reachable.emit(False)
         except requests.ConnectionError:
+            HEARTBEAT_FAILURES.inc(host=self.host_name, reason="offline")
             self.status_updated.emit("Offline", 0, "#FF0000")
+            self.reachable.emit(False)
         except Exception as e:
-            self.status_updated.emit(f"Error", 0, "#FF0000")
\ No newline at end of file
+            HEARTBEAT_FAILURES.inc(host=self.host_name, reason="error")
+            self.status_updated.emit(f"Error", 0, "#FF0000")
+            self.reachable.emit(False)
@@ -0,0 +1,228 @@
+"""
+Clip thumbnails for the column headers.
+
+Each column shows the thumbnail of the clip its colour goes to, read from
+Resolume's /clips/<n>/thumbnail endpoint. Images are kept in a size-capped
+LRU on disk under the config cache dir, so a launch shows the last known
+thumbnails straight away and revalidates them in the background.
+Thumbnails have their own connections and a couple of workers, and wait
+while any colour request is in flight, so they never hold up dispatch.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from resolume_colour_picker.layers import group_index, target_path
+
+
+logger = logging.getLogger(__name__)
+
+
+def thumbnail_url(api_base_url, layer) -> str:
+    return api_base_url + target_path(layer) + "/thumbnail"
+
+
+class ThumbnailCache:
+    """
+    Images on disk by URL, with the validators they were served with. Holding
+    more than max_bytes deletes the least recently used. Safe to use from the
+    fetch workers.
+    """
+    INDEX = "index.json"
+
+    def __init__(self, directory, max_bytes):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = self._load_index()  # url -> {"file", "size", "used", "etag", "last_modified"}
+
+    def _load_index(self) -> dict:
+        try:
+            entries = json.loads((self.directory / self.INDEX).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(entries, dict):
+            return {}
+        # An entry whose file has gone can't be served
+        return {url: entry for url, entry in entries.items() if (self.directory / entry["file"]).exists()}
+
+    def _save_index(self):
+        temp = self.directory / (self.INDEX + ".tmp")
+        try:
+            temp.write_text(json.dumps(self._entries), encoding="utf-8")
+            os.replace(temp, self.directory / self.INDEX)
+        except OSError as e:
+            logger.warning("Couldn't save the thumbnail cache index: %s", e)
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(entry["size"] for entry in self._entries.values())
+
+    def __contains__(self, url):
+        return url in self._entries
+
+    def get(self, url):
+        """(image bytes, validators) for a URL, marked as just used, or None"""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                return None
+            try:
+                data = (self.directory / entry["file"]).read_bytes()
+            except OSError:
+                del self._entries[url]
+                return None
+            entry["used"] = time.time()
+            return data, {key: entry[key] for key in ("etag", "last_modified") if entry.get(key)}
+
+    def put(self, url, data: bytes, etag=None, last_modified=None):
+        with self._lock:
+            name = hashlib.sha1(url.encode()).hexdigest() + ".img"
+            try:
+                (self.directory / name).write_bytes(data)
+            except OSError as e:
+                logger.warning("Couldn't cache thumbnail: %s", e)
+                return
+            self._entries[url] = {
+                "file": name, "size": len(data), "used": time.time(), "etag": etag, "last_modified": last_modified,
+            }
+            self._evict()
+            self._save_index()
+
+    def validators(self, url) -> dict:
+        """The ETag and Last-Modified a URL's image was served with, for a conditional fetch"""
+        with self._lock:
+            entry = self._entries.get(url) or {}
+            return {key: entry[key] for key in ("etag", "last_modified") if entry.get(key)}
+
+    def touch(self, url):
+        """Mark a URL's image as still current"""
+        with self._lock:
+            if url in self._entries:
+                self._entries[url]["used"] = time.time()
+
+    def _evict(self):
+        total = self.total_bytes
+        for url, entry in sorted(self._entries.items(), key=lambda item: item[1]["used"]):
+            if total <= self.max_bytes:
+                break
+            try:
+                (self.directory / entry["file"]).unlink()
+            except OSError:
+                pass
+            del self._entries[url]
+            total -= entry["size"]
+
+    def close(self):
+        with self._lock:
+            self._save_index()
+
+
+class ThumbnailFetcher(QObject):
+    """
+    Fetches clip thumbnails for (host, layer) targets. A cached image is
+    handed over at once and revalidated once per run; anything else is
+    fetched. At most `workers` fetches run at a time, and none start while
+    the dispatcher has a colour request in flight.
+    """
+    thumbnail_ready = Signal(object, bytes)  # (host, layer), image data
+    _fetched = Signal(object, str, object, bool)  # (host, layer), url, new image data or None, answered
+
+    def __init__(self, dispatcher, directory, max_bytes, workers=2, retry_ms=50):
+        super().__init__()
+        self.dispatcher = dispatcher
+        self.cache = ThumbnailCache(directory, max_bytes)
+        self.workers = workers
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=workers))
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="thumbnails")
+        self.pending = deque()  # (target, url) waiting for a worker
+        self.running = 0
+        self.validated = set()  # URLs fetched or revalidated this run
+        self.fetch_count = 0
+        self._fetched.connect(self._on_fetched)
+
+        self.retry_timer = QTimer(self)
+        self.retry_timer.setSingleShot(True)
+        self.retry_timer.setInterval(retry_ms)
+        self.retry_timer.timeout.connect(self._pump)
+
+    def request(self, targets):
+        """Show thumbnails for these targets; layer groups have no clip and are skipped"""
+        queued = {url for _, url in self.pending}
+        for target in targets:
+            channel = self.dispatcher.hosts.get(target[0])
+            if channel is None or group_index(target[1]) is not None:
+                continue
+            url = thumbnail_url(channel.api_base_url, target[1])
+            cached = self.cache.get(url)
+            if cached is not None:
+                self.thumbnail_ready.emit(target, cached[0])
+            if url not in self.validated and url not in queued:
+                self.pending.append((target, url))
+                queued.add(url)
+        self._pump()
+
+    def _dispatch_busy(self) -> bool:
+        return any(channel.state.in_flight for channel in self.dispatcher.hosts.values())
+
+    def _pump(self):
+        while self.pending and self.running < self.workers:
+            if self._dispatch_busy():
+                self.retry_timer.start()
+                return
+            target, url = self.pending.popleft()
+            self.running += 1
+            self.fetch_count += 1
+            self.executor.submit(self._fetch, target, url, self.cache.validators(url))
+
+    def _fetch(self, target, url, validators):
+        headers = {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+        data, answered = None, False
+        try:
+            response = self.session.get(url, headers=headers, timeout=(0.5, 2.0))
+            answered = True
+            if response.status_code == 304:
+                self.cache.touch(url)
+            elif response.ok and response.content:
+                cached = self.cache.get(url)
+                # Servers that ignore the validators send the same image again
+                if cached is None or cached[0] != response.content:
+                    data = response.content
+                self.cache.put(url, response.content, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+            else:
+                logger.debug("No thumbnail at %s (%s)", url, response.status_code)
+        except requests.RequestException as e:
+            logger.debug("Couldn't fetch thumbnail %s: %s", url, e)
+        self._fetched.emit(target, url, data, answered)
+
+    def _on_fetched(self, target, url, data, answered):
+        self.running -= 1
+        if answered:
+            self.validated.add(url)  # an unreachable host is tried again next time
+        if data is not None:
+            self.thumbnail_ready.emit(target, data)
+        self._pump()
+
+    def close(self):
+        self.retry_timer.stop()
+        self.pending.clear()
+        self.executor.shutdown(wait=False)
+        self.cache.close()
+        self.session.close()
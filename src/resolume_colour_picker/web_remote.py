@@ -0,0 +1,264 @@
+"""
+Browser control surface for tablets on the local network.
+
+The page at / mirrors the button grid, Scene Master state and heartbeat
+status. State reaches browsers as server-sent events from /events: a
+snapshot on connect, then only the keys that changed. Presses are POSTed
+back and handed to the engine on the GUI thread, so they go through the
+same dispatch path as a click.
+
+The remote listens on every interface, so a POST is only acted on when it
+is JSON, comes from the remote's own page, and carries the token shown in
+the app (the page picks it up from ?token= in its address). Any other page
+open on the show network can't send a press or a panic.
+"""
+
+import collections
+import hmac
+import json
+import logging
+import secrets
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from importlib.resources import files
+from urllib.parse import urlsplit
+
+from PySide6.QtCore import QObject, Signal
+
+from resolume_colour_picker.metrics import REMOTE_CLIENTS
+
+
+SCENE_ACTIONS = ("toggle", "go", "cancel")
+KEEPALIVE_S = 15.0  # comment line on idle streams, so dead clients are noticed
+TOKEN_HEADER = "X-Remote-Token"
+
+logger = logging.getLogger(__name__)
+
+
+def button_key(column, row) -> str:
+    """State key for one grid button; the row comes first as column names may hold ':'"""
+    return f"b{row}:{column}"
+
+
+def new_token() -> str:
+    """A remote token short enough to type into a tablet"""
+    return secrets.token_hex(4)
+
+
+class RemoteState:
+    """
+    Versioned key/value state shared by every client. publish() keeps only the
+    keys whose value changed; a client that wakes up late gets everything it
+    missed merged into one delta, or a fresh snapshot if it fell too far behind.
+    """
+
+    def __init__(self, history=256):
+        self._cond = threading.Condition()
+        self.version = 0
+        self.values = {}
+        self._deltas = collections.deque(maxlen=history)  # (version, {key: value, None to remove})
+        self.closed = False
+
+    def publish(self, changes: dict) -> int:
+        """Apply {key: value}, where None removes the key. Returns the number of keys that changed."""
+        with self._cond:
+            delta = {key: value for key, value in changes.items() if self.values.get(key) != value}
+            if not delta:
+                return 0
+            for key, value in delta.items():
+                if value is None:
+                    self.values.pop(key, None)
+                else:
+                    self.values[key] = value
+            self.version += 1
+            self._deltas.append((self.version, delta))
+            self._cond.notify_all()
+            return len(delta)
+
+    def reset(self, values: dict):
+        """Replace the whole state, e.g. after a grid rebuild; every client gets a snapshot"""
+        with self._cond:
+            self.values = dict(values)
+            self.version += 1
+            self._deltas.clear()
+            self._cond.notify_all()
+
+    def snapshot(self) -> tuple:
+        with self._cond:
+            return self.version, dict(self.values)
+
+    def wait(self, since, timeout) -> tuple:
+        """
+        Block until the state moves past version `since`. Returns (version,
+        merged changes), (version, None) when only a snapshot will do, or
+        (since, {}) on timeout or close.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self.version != since or self.closed, timeout) or self.closed:
+                return since, {}
+            if not self._deltas or self._deltas[0][0] > since + 1:
+                return self.version, None
+            merged = {}
+            for version, delta in self._deltas:
+                if version > since:
+                    merged.update(delta)
+            return self.version, merged
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass  # every press and reconnect would flood the console
+
+    def _reply(self, status, body=b"", content_type="application/json"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        remote = self.server.remote
+        path = self.path.split("?")[0]
+        if path == "/":
+            self._reply(200, remote.page, "text/html; charset=utf-8")
+        elif path == "/state":
+            version, values = remote.state.snapshot()
+            self._reply(200, json.dumps({"version": version, "state": values}).encode())
+        elif path == "/events":
+            self._stream(remote)
+        else:
+            self._reply(404)
+
+    def _event(self, name, data):
+        self.wfile.write(f"event: {name}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode())
+        self.wfile.flush()
+
+    def _stream(self, remote):
+        self.close_connection = True
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        state = remote.state
+        remote.client_changed(1)
+        try:
+            version, values = state.snapshot()
+            self._event("snapshot", {"version": version, "state": values})
+            while not state.closed:
+                latest, changes = state.wait(version, KEEPALIVE_S)
+                if changes is None:
+                    version, values = state.snapshot()
+                    self._event("snapshot", {"version": version, "state": values})
+                elif latest != version:
+                    version = latest
+                    self._event("delta", {"version": version, "changes": changes})
+                elif not state.closed:
+                    self.wfile.write(b": keepalive\n\n")
+                    self.wfile.flush()
+        except OSError:
+            pass  # the browser went away
+        finally:
+            remote.client_changed(-1)
+
+    def _refusal(self, remote):
+        """(status, reason) for a POST that mustn't be acted on, or None"""
+        if self.headers.get_content_type() != "application/json":
+            # A cross-origin form or text/plain fetch can't send JSON without a preflight
+            return 415, "Expected application/json"
+        origin = self.headers.get("Origin")
+        if origin is not None and urlsplit(origin).netloc != self.headers.get("Host"):
+            return 403, "Requests must come from the remote's own page"
+        if not hmac.compare_digest(self.headers.get(TOKEN_HEADER, "").encode(), remote.token.encode()):
+            return 403, "Missing or wrong remote token - open the address shown in the app"
+        return None
+
+    def do_POST(self):
+        remote = self.server.remote
+        refusal = self._refusal(remote)
+        if refusal is not None:
+            self.close_connection = True  # the body is left unread
+            logger.warning("Refused web remote request to %s: %s", self.path, refusal[1])
+            self._reply(refusal[0], json.dumps({"error": refusal[1]}).encode())
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+            handled = remote.handle(self.path.split("?")[0], body)
+        except (KeyError, ValueError, TypeError, AttributeError) as e:
+            self._reply(400, json.dumps({"error": str(e)}).encode())
+            return
+        if handled:
+            self._reply(204)
+        else:
+            self._reply(404)
+
+
+class WebRemote(QObject):
+    """
+    Serves the browser remote. Requests arrive on server threads and are
+    emitted as signals, so the engine acts on them on the GUI thread.
+    """
+    press_requested = Signal(str, int)  # column, row
+    scene_requested = Signal(str)  # one of SCENE_ACTIONS
+    panic_requested = Signal(str)  # panic name
+
+    def __init__(self, port, host="0.0.0.0", token=None):
+        super().__init__()
+        self.token = token or new_token()
+        self.state = RemoteState()
+        self.page = files("resolume_colour_picker.data").joinpath("remote.html").read_bytes()
+        self.clients = 0
+        self._clients_lock = threading.Lock()
+        REMOTE_CLIENTS.add_callback(self.client_counts)
+
+        self.httpd = ThreadingHTTPServer((host, int(port)), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.remote = self
+        self.port = self.httpd.server_address[1]
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True, name="web-remote")
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.state.close()
+        if self._thread is not None:
+            self.httpd.shutdown()  # blocks forever unless serve_forever() is running
+        self.httpd.server_close()
+
+    def client_changed(self, delta):
+        with self._clients_lock:
+            self.clients += delta
+            logger.debug("Web remote clients: %s", self.clients)
+
+    def client_counts(self) -> dict:
+        return {(): self.clients}
+
+    def handle(self, path, body) -> bool:
+        """Check a POSTed action against the current state and pass it on. Raises ValueError."""
+        values = self.state.values
+        if path == "/press":
+            column, row = body["column"], int(body["row"])
+            if column not in values.get("columns", []) or not 0 <= row < len(values.get("rows", [])):
+                raise ValueError(f"No button {column!r} row {row}")
+            self.press_requested.emit(column, row)
+        elif path == "/scene":
+            if body.get("action") not in SCENE_ACTIONS:
+                raise ValueError(f"Scene action must be one of {', '.join(SCENE_ACTIONS)}")
+            self.scene_requested.emit(body["action"])
+        elif path == "/panic":
+            if body.get("name") not in values.get("panics", {}):
+                raise ValueError(f"No panic named {body.get('name')!r}")
+            self.panic_requested.emit(body["name"])
+        else:
+            return False
+        return True
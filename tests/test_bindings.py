@@ -0,0 +1,171 @@
+"""
+Tests for parameter bindings: compiled setters, merged requests and the parameter strip
+"""
+
+import unittest
+from unittest.mock import MagicMock
+
+from resolume_colour_picker.bindings import BindingTable, compile_binding, compile_setter, compile_template, parse_path
+from test_dispatcher import BASE_PAYLOAD, create_dispatcher, create_mock_config, queue_into
+from test_scene_master import TestSceneMasterBase
+
+
+BINDINGS = {
+    "Opacity": {"path": "video/opacity", "control": "fader", "min": 0, "max": 1},
+    "Bypass": {"path": "video/effects/0/bypassed", "control": "toggle"},
+    "Hue": {"path": "video/effects/1/params/Hue Rotate", "control": "fader"},
+    "Speed": {"id": 42, "control": "button", "value": 0.5},
+}
+
+
+class TestSetters(unittest.TestCase):
+    """Test paths compile into setters that build the same bodies a template would"""
+
+    def test_parse_path(self):
+        """Test list positions become ints and stray slashes are ignored"""
+        self.assertEqual(parse_path("/video/effects/0/params/Color/"), ("video", "effects", 0, "params", "Color"))
+        with self.assertRaises(ValueError):
+            parse_path("video//opacity")
+
+    def test_setter_pads_earlier_effects(self):
+        """Test a later effect is reached through empty entries for the ones before it"""
+        build = compile_setter(parse_path("video/effects/2/bypassed"))
+        self.assertEqual(build(True), {"video": {"effects": [{}, {}, {"bypassed": {"value": True}}]}})
+
+    def test_template_matches_deep_copy(self):
+        """Test the colour template compiles to fresh bodies identical to editing a copy"""
+        build = compile_template(BASE_PAYLOAD)
+        body = build("#123456")
+        self.assertEqual(body, {"video": {"effects": [{"params": {"Color": {"value": "#123456"}}}]}})
+        self.assertIsNot(body, build("#123456"))
+        self.assertEqual(BASE_PAYLOAD["video"]["effects"][0]["params"]["Color"]["value"], "#FFFFFF")
+
+    def test_template_with_more_is_copied(self):
+        """Test anything else in the template still goes out with each value"""
+        template = {"video": {"effects": [{"params": {"Color": {"value": "#FFFFFF"}}, "bypassed": False}]}}
+        body = compile_template(template)("#000000")
+        self.assertEqual(body["video"]["effects"][0], {"params": {"Color": {"value": "#000000"}}, "bypassed": False})
+
+    def test_invalid_bindings(self):
+        """Test a binding needs exactly one of path and id, a known control and a range"""
+        for spec in ({}, {"path": "video/opacity", "id": 3}, {"path": "video/opacity", "control": "knob"},
+                     {"path": "video/opacity", "min": 1, "max": 0}, {"id": "abc"}):
+            with self.assertRaises(ValueError):
+                compile_binding("Bad", spec)
+
+    def test_bad_binding_is_left_out(self):
+        """Test one broken binding doesn't take the others with it"""
+        table = BindingTable({**BINDINGS, "Broken": {"control": "fader"}})
+        self.assertEqual([binding.name for binding in table], list(BINDINGS))
+
+    def test_body_merges_parameters(self):
+        """Test several parameters of one layer make a single body"""
+        body = BindingTable(BINDINGS).body({"Opacity": 0.5, "Bypass": True, "Hue": 0.25})
+        self.assertEqual(body, {"video": {
+            "opacity": {"value": 0.5},
+            "effects": [{"bypassed": {"value": True}}, {"params": {"Hue Rotate": {"value": 0.25}}}],
+        }})
+
+
+class TestParameterDispatch(unittest.TestCase):
+    """Test bound parameters reach Resolume as few, merged requests"""
+
+    def setUp(self):
+        self.dispatcher = create_dispatcher(config_values={"PARAMETER_BINDINGS": BINDINGS})
+        self.addCleanup(self.dispatcher.close)
+        self.channel = self.dispatcher.hosts["main"]
+
+    def test_one_request_per_layer(self):
+        """Test parameters changed together for a layer go out as one PUT"""
+        self.dispatcher.set_parameters({("main", 1): {"Opacity": 0.5, "Bypass": True}, ("main", 2): {"Opacity": 1.0}})
+        self.assertEqual(self.channel.session.put.call_count, 2)
+        url, kwargs = self.channel.session.put.call_args_list[0][0][0], self.channel.session.put.call_args_list[0][1]
+        self.assertTrue(url.endswith("/composition/layers/1/clips/1"))
+        self.assertEqual(kwargs["json"]["video"]["opacity"], {"value": 0.5})
+        self.assertEqual(kwargs["json"]["video"]["effects"], [{"bypassed": {"value": True}}])
+
+    def test_id_binding_url(self):
+        """Test a binding by parameter ID goes to the by-id endpoint"""
+        self.dispatcher.set_parameters({self.dispatcher.bindings.get("Speed").target: {"Speed": 0.5}})
+        args, kwargs = self.channel.session.put.call_args
+        self.assertTrue(args[0].endswith("/api/v1/parameter/by-id/42"))
+        self.assertEqual(kwargs["json"], {"value": 0.5})
+
+    def test_values_coalesce_while_in_flight(self):
+        """Test a fader drag sends only the newest value once the layer's request is back"""
+        tasks = []
+        self.channel.executor.submit = MagicMock(side_effect=queue_into(tasks))
+        for value in (0.1, 0.2, 0.3):
+            self.dispatcher.set_parameters({("main", 1): {"Opacity": value}})
+        self.dispatcher.set_parameters({("main", 1): {"Bypass": False}})
+        self.assertEqual(len(tasks), 1)
+        fn, args = tasks[0]
+        fn(*args)
+        self.assertEqual(self.channel.session.put.call_count, 1)
+        body = self.channel.session.put.call_args[1]["json"]
+        self.assertEqual(body["video"]["opacity"], {"value": 0.3})
+        self.assertEqual(body["video"]["effects"], [{"bypassed": {"value": False}}])
+        self.assertEqual(self.channel.parameters_busy, set())
+
+    def test_colour_request_unchanged(self):
+        """Test colour requests still carry the template, now built without a deep copy"""
+        self.dispatcher.send({("main", 1): "#ff0000"})
+        self.assertEqual(self.channel.session.put.call_args[1]["json"], {
+            "video": {"effects": [{"params": {"Color": {"value": "#ff0000"}}}]}
+        })
+
+
+class TestParameterStrip(TestSceneMasterBase):
+    """Test the controls under the grid drive their bound parameters"""
+
+    def _create_mock_config(self):
+        config = create_mock_config({
+            "COLOUR_SET": {"Red": "#FF0000", "Blue": "#0000FF"},
+            "LAYER_MAP": {"ALL": "ALL", "Outer": 1, "Inner": 2},
+            "PARAMETER_BINDINGS": dict(BINDINGS),
+        })
+        self.data = config.data
+        return config
+
+    def setUp(self):
+        super().setUp()
+        self.sent = []
+        self.engine.dispatcher.set_parameters = lambda targets: self.sent.append(targets)
+
+    def test_controls_per_column(self):
+        """Test path bindings get a control per column and an ID binding just one"""
+        controls = self.engine.parameter_controls
+        self.assertIn(("Outer", "Opacity"), controls)
+        self.assertIn(("ALL", "Bypass"), controls)
+        self.assertIn((None, "Speed"), controls)
+        self.assertNotIn(("Outer", "Speed"), controls)
+
+    def test_faders_start_at_maximum(self):
+        """Test a new fader sits at its maximum and a first nudge sends a value near it"""
+        fader = self.engine.parameter_controls[("Outer", "Opacity")]
+        self.assertEqual(fader.value(), fader.maximum())
+        self.assertEqual(self.sent, [])
+        fader.setValue(fader.maximum() - 10)
+        self.assertEqual(self.sent, [{("main", 1): {"Opacity": 0.99}}])
+
+    def test_all_fader_moves_every_column(self):
+        """Test the ALL fader sets every layer and the columns' faders follow it"""
+        self.engine.parameter_controls[("ALL", "Opacity")].setValue(250)
+        self.assertEqual(self.sent, [{("main", 1): {"Opacity": 0.25}, ("main", 2): {"Opacity": 0.25}}])
+        self.assertEqual(self.engine.parameter_controls[("Inner", "Opacity")].value(), 250)
+
+    def test_toggle_and_button(self):
+        """Test a toggle sends its state and a button its value"""
+        self.engine.parameter_controls[("Inner", "Bypass")].click()
+        self.engine.parameter_controls[(None, "Speed")].click()
+        self.assertEqual(self.sent, [{("main", 2): {"Bypass": True}}, {("main", "P42"): {"Speed": 0.5}}])
+
+    def test_new_bindings_rebuild_strip(self):
+        """Test editing the bindings replaces the controls"""
+        self.data["PARAMETER_BINDINGS"] = {"Opacity": BINDINGS["Opacity"]}
+        self.engine.config_callback("PARAMETER_BINDINGS", self.data["PARAMETER_BINDINGS"])
+        self.assertEqual({name for _, name in self.engine.parameter_controls}, {"Opacity"})
+
+
+if __name__ == '__main__':
+    unittest.main()
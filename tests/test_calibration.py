@@ -0,0 +1,219 @@
+"""
+Tests for per-layer colour calibration and its precomputed lookup tables
+"""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+import numpy as np
+from PySide6.QtWidgets import QApplication
+
+from resolume_colour_picker.calibration import (
+    CalibrationTable, Curve, parse_calibration_file, parse_cube, parse_target_key
+)
+from resolume_colour_picker.reconciler import Reconciler
+from test_dispatcher import create_dispatcher, main
+from test_reconciler import clip_with_colour
+
+
+def write_cube(body, size=2):
+    """Write a .cube file and return its path; removed at exit by the caller"""
+    handle, path = tempfile.mkstemp(suffix=".cube")
+    with os.fdopen(handle, "w") as f:
+        f.write(f"TITLE \"test\"\nLUT_3D_SIZE {size}\n{body}")
+    return path
+
+
+# Red varies fastest: rows are (r, g, b) for b, g, r in 0..1
+IDENTITY = "\n".join(f"{r} {g} {b}" for b in (0, 1) for g in (0, 1) for r in (0, 1))
+SWAP_RED_BLUE = "\n".join(f"{b} {g} {r}" for b in (0, 1) for g in (0, 1) for r in (0, 1))
+
+
+class TestCurves(unittest.TestCase):
+    """Test the gain/gamma maths and .cube LUTs"""
+
+    def test_gain_and_gamma(self):
+        """Test out = gain * in ** gamma per channel, clipped to 0..1"""
+        curve = Curve({"gain": [1.0, 0.5, 2.0], "gamma": 2.0})
+        out = curve.apply(np.array([[0.5, 1.0, 0.5]]))
+        np.testing.assert_allclose(out, [[0.25, 0.5, 0.5]])
+        np.testing.assert_allclose(Curve({"gain": 2.0}).apply(np.array([[0.8, 0.1, 0.0]])), [[1.0, 0.2, 0.0]])
+
+    def test_cube_files(self):
+        """Test an identity cube leaves colours alone and a channel swap swaps them"""
+        paths = [write_cube(IDENTITY), write_cube(SWAP_RED_BLUE)]
+        self.addCleanup(lambda: [os.remove(path) for path in paths])
+        colours = np.array([[1.0, 0.5, 0.0], [0.2, 0.4, 0.6]])
+        np.testing.assert_allclose(Curve({"lut": paths[0]}).apply(colours), colours)
+        np.testing.assert_allclose(Curve({"lut": paths[1]}).apply(colours), colours[:, ::-1])
+        # LUT first, then gain
+        np.testing.assert_allclose(Curve({"lut": paths[1], "gain": 0.5}).apply(colours[:1]), [[0.0, 0.25, 0.5]])
+
+    def test_bad_specs(self):
+        """Test malformed cubes and settings are refused"""
+        with self.assertRaisesRegex(ValueError, "LUT_3D_SIZE"):
+            parse_cube(IDENTITY)
+        with self.assertRaisesRegex(ValueError, "Expected 8 RGB rows"):
+            parse_cube("LUT_3D_SIZE 2\n0 0 0\n")
+        with self.assertRaisesRegex(ValueError, "1D"):
+            parse_cube("LUT_1D_SIZE 2\n0 0 0\n1 1 1\n")
+        with self.assertRaisesRegex(ValueError, "Unknown"):
+            Curve({"brightness": 2})
+        with self.assertRaisesRegex(ValueError, "gain"):
+            Curve({"gain": [1, 2]})
+        with self.assertRaisesRegex(ValueError, "Couldn't read LUT"):
+            Curve({"lut": "/nonexistent/wall.cube"})
+
+    def test_target_keys(self):
+        """Test keys name a host's layers or layer groups, the main host's when no host is given"""
+        self.assertEqual(parse_target_key("3"), ("main", 3))
+        self.assertEqual(parse_target_key("g2"), ("main", "G2"))
+        self.assertEqual(parse_target_key("backup:3"), ("backup", 3))
+        with self.assertRaises(ValueError):
+            parse_target_key("Outer")
+        with self.assertRaises(ValueError):
+            parse_target_key("backup:Outer")
+
+    def test_calibration_file(self):
+        """Test a calibration file is validated and its relative LUT paths follow the file"""
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "calibration.json")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write('{"main:1": {"gain": 0.5}, "backup:1": {"lut": "wall.cube"}}')
+            with open(os.path.join(folder, "wall.cube"), "w", encoding="utf-8") as f:
+                f.write(f"LUT_3D_SIZE 2\n{IDENTITY}")
+            calibration = parse_calibration_file(path)
+            self.assertEqual(calibration["main:1"], {"gain": 0.5})
+            self.assertEqual(calibration["backup:1"]["lut"], os.path.join(folder, "wall.cube"))
+
+            with open(path, "w", encoding="utf-8") as f:
+                f.write('{"backup:1": {"lut": "missing.cube"}}')
+            with self.assertRaisesRegex(ValueError, "backup:1: Couldn't read LUT"):
+                parse_calibration_file(path)
+
+
+class TestCalibrationTable(unittest.TestCase):
+    """Test the lookup tables are built once and updated incrementally"""
+
+    def setUp(self):
+        self.table = CalibrationTable()
+        self.colours = ["#FF0000", "#00FF00", "#808080"]
+
+    def test_palette_colours_are_precomputed(self):
+        """Test every palette colour is corrected up front and looked up afterwards"""
+        changed = self.table.update({"1": {"gain": [1.0, 0.5, 1.0]}}, self.colours)
+        self.assertEqual(changed, {("main", 1)})
+        self.assertEqual(self.table.computed, 3)
+        self.assertEqual(self.table.correct(("main", 1), "#00FF00"), "#008000")
+        self.assertEqual(self.table.correct(("main", 1), "#FF0000"), "#ff0000")
+        self.assertEqual(self.table.computed, 3)
+        # Uncalibrated layers, the same layer on other hosts, and unknown colours pass through untouched
+        self.assertEqual(self.table.correct(("main", 2), "#00FF00"), "#00FF00")
+        self.assertEqual(self.table.correct(("backup", 1), "#00FF00"), "#00FF00")
+        self.assertEqual(self.table.correct(("main", 1), "not a colour"), "not a colour")
+
+    def test_off_palette_colours_are_cached(self):
+        """Test a colour outside the palette is worked out once"""
+        self.table.update({"1": {"gamma": 2.0}}, self.colours)
+        self.assertEqual(self.table.correct(("main", 1), "#ffffff"), "#ffffff")
+        self.table.correct(("main", 1), "#ffffff")
+        self.assertEqual(self.table.computed, 4)
+
+    def test_palette_change_only_computes_new_colours(self):
+        """Test adding a colour computes just that colour on each calibrated layer"""
+        self.table.update({"1": {"gamma": 2.0}, "G2": {"gain": 0.5}}, self.colours)
+        self.assertEqual(self.table.computed, 6)
+        changed = self.table.update({"1": {"gamma": 2.0}, "G2": {"gain": 0.5}}, self.colours[1:] + ["#0000FF"])
+        self.assertEqual(changed, set())
+        self.assertEqual(self.table.computed, 8)
+        self.assertNotIn("#FF0000", self.table.tables[("main", 1)])
+        self.assertEqual(self.table.correct(("main", "G2"), "#0000FF"), "#000080")
+
+    def test_calibration_change_only_rebuilds_that_layer(self):
+        """Test editing one layer's entry rebuilds only that layer's table"""
+        self.table.update({"1": {"gamma": 2.0}, "2": {"gain": 0.5}}, self.colours)
+        changed = self.table.update({"1": {"gamma": 2.0}, "2": {"gain": 0.25}}, self.colours)
+        self.assertEqual(changed, {("main", 2)})
+        self.assertEqual(self.table.computed, 9)
+        changed = self.table.update({"1": {"gamma": 2.0}}, self.colours)
+        self.assertEqual(changed, {("main", 2)})
+        self.assertEqual(self.table.correct(("main", 2), "#FF0000"), "#FF0000")
+
+    def test_bad_entries_are_ignored(self):
+        """Test a bad key or spec leaves its layer uncorrected without affecting the rest"""
+        with self.assertLogs("resolume_colour_picker.calibration", "ERROR"):
+            changed = self.table.update({"Outer": {"gain": 0.5}, "1": {"gain": "lots"}, "2": {"gain": 0.5}}, self.colours)
+        self.assertEqual(changed, {("main", 2)})
+        self.assertEqual(self.table.correct(("main", 1), "#FF0000"), "#FF0000")
+
+
+class TestDispatchCalibration(unittest.TestCase):
+    """Test the dispatcher sends corrected colours and the reconciler expects them"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.dispatcher = create_dispatcher(config_values={
+            "COLOUR_SET": {"Red": "#FF0000"},
+            "LAYER_CALIBRATION": {"1": {"gain": 0.5}},
+        })
+
+    def _sent(self, call):
+        return call.kwargs["json"]["video"]["effects"][0]["params"]["Color"]["value"]
+
+    def test_press_sends_corrected_colour(self):
+        """Test the calibrated layer gets the corrected colour and others the palette colour"""
+        self.dispatcher.send(main({1: "#FF0000", 2: "#FF0000"}))
+        sent = {call.args[0].rsplit("/layers/")[1][0]: self._sent(call) for call in self.dispatcher.session.put.call_args_list}
+        self.assertEqual(sent, {"1": "#800000", "2": "#FF0000"})
+        self.assertEqual(self.dispatcher.desired[("main", 1)], "#FF0000")
+
+    def test_calibration_is_per_host(self):
+        """Test a layer calibrated on one host is sent uncorrected to the same layer on another"""
+        dispatcher = create_dispatcher(config_values={
+            "COLOUR_SET": {"Red": "#FF0000"},
+            "EXTRA_HOSTS": [{"name": "backup", "ip": "10.0.0.2", "port": "8080"}],
+            "LAYER_CALIBRATION": {"backup:1": {"gain": 0.5}},
+        })
+        dispatcher.send({("main", 1): "#FF0000", ("backup", 1): "#FF0000"})
+        self.assertEqual(self._sent(dispatcher.hosts["main"].session.put.call_args), "#FF0000")
+        self.assertEqual(self._sent(dispatcher.hosts["backup"].session.put.call_args), "#800000")
+
+    def test_panic_payloads_are_corrected(self):
+        """Test prebuilt panic bodies carry each layer's correction"""
+        self.dispatcher.config["LAYER_CALIBRATION"] = {"1": {"lut": "", "gain": 1.0, "gamma": 1.0}, "2": {"gain": [0, 0, 0]}}
+        self.dispatcher.panic_colours["Blackout"] = "#FFFFFF"
+        self.dispatcher.update_calibration()
+        bodies = {layer: body for layer, _, body in self.dispatcher.panic_payloads["Blackout"]["main"]}
+        self.assertIn(b"#ffffff", bodies[1])
+        self.assertIn(b"#000000", bodies[2])
+
+    def test_calibration_change_resends(self):
+        """Test changing a layer's calibration resends what it should be showing"""
+        self.dispatcher.send(main({1: "#FF0000", 2: "#FF0000"}))
+        self.dispatcher.session.put.reset_mock()
+        self.dispatcher.config["LAYER_CALIBRATION"] = {"1": {"gain": 0.25}}
+        self.dispatcher.config_callback("LAYER_CALIBRATION", None)
+        calls = self.dispatcher.session.put.call_args_list
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(self._sent(calls[0]), "#400000")
+
+    def test_reconciler_expects_corrected_colour(self):
+        """Test a read-back showing the corrected colour is not a divergence"""
+        reconciler = Reconciler(self.dispatcher)
+        reconciler.executor = MagicMock()
+        reconciler.executor.submit = MagicMock(side_effect=lambda fn, *args: fn(*args))
+        reconciler.session = MagicMock()
+        reconciler.session.get.return_value = MagicMock(ok=True, json=lambda: clip_with_colour("#800000"))
+        self.dispatcher.send(main({1: "#FF0000"}))
+        reconciler.tick()
+        self.assertEqual(self.dispatcher.session.put.call_count, 1)
+        self.assertEqual(reconciler.diverged, set())
+
+
+if __name__ == '__main__':
+    unittest.main()
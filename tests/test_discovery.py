@@ -0,0 +1,127 @@
+"""
+Tests for LAN discovery of Resolume webservers
+"""
+
+import socket
+import threading
+import time
+import unittest
+
+from resolume_colour_picker.discovery import (
+    LayerGroup, fetch_layer_groups, parse_layer_groups, parse_ports, probe, scan, subnet_hosts
+)
+from resolume_colour_picker.stand_in_server import StandInResolume
+
+
+def unused_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class TestParsing(unittest.TestCase):
+    """Test subnet and port range parsing"""
+
+    def test_parse_ports(self):
+        """Test single ports and ranges"""
+        self.assertEqual(parse_ports("8080, 8090-8092"), [8080, 8090, 8091, 8092])
+
+    def test_parse_ports_rejects_bad_ranges(self):
+        """Test empty, reversed and out of range input"""
+        for text in ("", "9000-8000", "70000", "http"):
+            with self.assertRaises(ValueError):
+                parse_ports(text)
+
+    def test_subnet_hosts(self):
+        """Test a /24 yields 254 hosts and a single address yields itself"""
+        self.assertEqual(len(subnet_hosts("192.168.1.0/24")), 254)
+        self.assertEqual(subnet_hosts("10.0.0.7/32"), ["10.0.0.7"])
+
+    def test_wide_subnets_are_refused(self):
+        """Test a subnet wider than a /22 is refused rather than scanned"""
+        self.assertEqual(len(subnet_hosts("10.0.0.0/22")), 1022)
+        with self.assertRaisesRegex(ValueError, "/22"):
+            subnet_hosts("10.0.0.0/16")
+
+
+class TestScan(unittest.TestCase):
+    """Test scanning against local stand-in servers on several ports"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.servers = [
+            StandInResolume(product={"name": "Arena", "major": 7, "minor": 19, "micro": 1}).start(),
+            StandInResolume().start(),
+            StandInResolume(latency_ms=20).start(),
+        ]
+
+    @classmethod
+    def tearDownClass(cls):
+        for server in cls.servers:
+            server.stop()
+
+    def test_probe_reports_product(self):
+        """Test a probe describes the responder"""
+        server = self.servers[0]
+        result = probe("127.0.0.1", server.port)
+        self.assertEqual(result.product, "Arena 7.19.1")
+        self.assertGreater(result.latency_ms, 0)
+
+    def test_probe_closed_port(self):
+        """Test a closed port is not reported"""
+        self.assertIsNone(probe("127.0.0.1", unused_port()))
+
+    def test_scan_finds_every_responder_sorted_by_latency(self):
+        """Test a mixed port list finds each stand-in and nothing else"""
+        ports = [s.port for s in self.servers] + [unused_port()]
+        found = scan(["127.0.0.1"], ports)
+        self.assertEqual({s.port for s in found}, {s.port for s in self.servers})
+        self.assertEqual(found[-1].port, self.servers[2].port)
+
+    def test_subnet_sweep_is_concurrent(self):
+        """Test a /24 sweep over several ports finishes in about one timeout"""
+        ports = [s.port for s in self.servers]
+        start = time.perf_counter()
+        found = scan(subnet_hosts("127.0.0.0/24"), ports, timeout=0.3)
+        elapsed = time.perf_counter() - start
+        self.assertEqual({(s.ip, s.port) for s in found}, {("127.0.0.1", p) for p in ports})
+        self.assertLess(elapsed, 5.0)
+
+    def test_stopped_scan_reports_nothing(self):
+        """Test a scan whose stop flag is set abandons its probes and calls back no more"""
+        stop = threading.Event()
+        stop.set()
+        found = []
+        start = time.perf_counter()
+        result = scan(subnet_hosts("127.0.0.0/24"), [s.port for s in self.servers], on_found=found.append, stop=stop)
+        self.assertEqual((result, found), ([], []))
+        self.assertLess(time.perf_counter() - start, 2.0)
+
+
+class TestLayerGroups(unittest.TestCase):
+    """Test reading layer groups from a composition"""
+
+    def test_fetch_names_groups_and_their_layers(self):
+        """Test each group comes back with its position, name and member layers"""
+        groups = {"Stage Left": [1, 2, 3], "Stage Right": [4, 5], "DJ Booth": [6]}
+        with StandInResolume(layer_groups=groups) as server:
+            found = fetch_layer_groups("127.0.0.1", server.port)
+        self.assertEqual(found, [
+            LayerGroup(1, "Stage Left", [1, 2, 3]),
+            LayerGroup(2, "Stage Right", [4, 5]),
+            LayerGroup(3, "DJ Booth", [6]),
+        ])
+
+    def test_unnamed_groups_and_unknown_layers(self):
+        """Test a group without a name gets Resolume's default and stray layer ids are skipped"""
+        composition = {"layers": [{"id": 7}], "layergroups": [{"id": 9, "layers": [{"id": 7}, {"id": 8}]}]}
+        self.assertEqual(parse_layer_groups(composition), [LayerGroup(1, "Layer Group 1", [1])])
+        self.assertEqual(parse_layer_groups({}), [])
+
+    def test_unreachable_host(self):
+        """Test a host that can't be read gives None rather than no groups"""
+        self.assertIsNone(fetch_layer_groups("127.0.0.1", unused_port(), timeout=0.3))
+
+
+if __name__ == '__main__':
+    unittest.main()
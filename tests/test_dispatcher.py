@@ -0,0 +1,530 @@
+"""
+Tests for the dispatcher and its per-layer colour state cache
+"""
+
+import time
+import unittest
+from concurrent.futures import Future
+from unittest.mock import MagicMock
+
+import requests
+
+from resolume_colour_picker.config import Config
+from resolume_colour_picker.dispatcher import Dispatcher, HostChannel, LayerStateCache
+from resolume_colour_picker.stand_in_server import StandInResolume
+
+
+BASE_PAYLOAD = {"video": {"effects": [{"params": {"Color": {"value": "#FFFFFF"}}}]}}
+
+
+def create_mock_config(values=None):
+    """Create a mock config object backed by a dict, kept as its .data for tests to edit"""
+    data = {
+        "WEBSERVER_IP": "localhost",
+        "WEBSERVER_PORT": 8080,
+        "LAYER_MAP": {"ALL": "ALL", "Inner": 1, "Outer": 2},
+    }
+    data.update(values or {})
+    config = MagicMock(spec=Config)
+    config.__getitem__ = MagicMock(side_effect=lambda key: data[key])
+    config.__setitem__ = MagicMock(side_effect=lambda key, value: data.__setitem__(key, value))
+    config.get = MagicMock(side_effect=lambda key, default=None: data.get(key, default))
+    config.value_changed = MagicMock()
+    config.data = data
+    return config
+
+
+def run_inline(fn, *args):
+    """Stand-in for executor.submit that runs the task at once"""
+    future = Future()
+    future.set_result(fn(*args))
+    return future
+
+
+def queue_into(tasks):
+    """Stand-in for executor.submit that keeps tasks for the test to run"""
+    def submit(fn, *args):
+        tasks.append((fn, args))
+        return Future()
+    return submit
+
+
+def mock_channel(channel, status_code=200):
+    """Make a host channel run tasks inline against a mock session"""
+    channel.executor = MagicMock()
+    channel.executor.submit = MagicMock(side_effect=run_inline)
+    channel.session = MagicMock()
+    channel.session.put.return_value = MagicMock(ok=200 <= status_code < 300, status_code=status_code)
+    channel.priority_executor = MagicMock()
+    channel.priority_executor.submit = MagicMock(side_effect=run_inline)
+    channel.priority_session = MagicMock()
+    channel.priority_session.put.return_value = MagicMock(ok=200 <= status_code < 300, status_code=status_code)
+    # Warming holds connections open on parallel workers, which inline tasks would block on
+    channel.warm = MagicMock()
+    return channel
+
+
+def create_dispatcher(status_code=200, config_values=None):
+    """Create a Dispatcher whose hosts run tasks inline against mock sessions"""
+    dispatcher = Dispatcher(create_mock_config(config_values), BASE_PAYLOAD, panic_colours={"Blackout": "#000000"})
+    for channel in dispatcher.hosts.values():
+        mock_channel(channel, status_code)
+    # Keep-alives are driven by hand in the tests that want them
+    dispatcher.keepalive_timer.stop()
+    # Convenience handles on the main host
+    dispatcher.session = dispatcher.hosts["main"].session
+    dispatcher.breaker = dispatcher.hosts["main"].breaker
+    return dispatcher
+
+
+def main(layer_colours):
+    """Address {layer: colour} at the main host"""
+    return {("main", layer): colour for layer, colour in layer_colours.items()}
+
+
+class TestLayerStateCache(unittest.TestCase):
+    """Test the skip decisions of the layer state cache"""
+
+    def setUp(self):
+        self.cache = LayerStateCache()
+
+    def test_confirmed_colour_is_skipped(self):
+        """Test a colour already confirmed on a layer is not resent"""
+        self.assertTrue(self.cache.claim(1, "#ff0000"))
+        self.cache.confirm(1, "#ff0000")
+        self.assertFalse(self.cache.claim(1, "#ff0000"))
+        self.assertEqual(self.cache.skipped_count, 1)
+
+    def test_force_bypasses_cache(self):
+        """Test force always sends"""
+        self.cache.claim(1, "#ff0000")
+        self.cache.confirm(1, "#ff0000")
+        self.assertTrue(self.cache.claim(1, "#ff0000", force=True))
+
+    def test_duplicate_in_flight_is_skipped(self):
+        """Test a second identical press while the first is in flight is dropped"""
+        self.assertTrue(self.cache.claim(1, "#ff0000"))
+        self.assertFalse(self.cache.claim(1, "#ff0000"))
+
+    def test_return_to_confirmed_colour_while_other_in_flight(self):
+        """Test red -> blue (in flight) -> red still sends red"""
+        self.cache.claim(1, "#ff0000")
+        self.cache.confirm(1, "#ff0000")
+        self.assertTrue(self.cache.claim(1, "#0000ff"))
+        self.assertTrue(self.cache.claim(1, "#ff0000"))
+
+    def test_failure_forgets_layer(self):
+        """Test a failed request means the next press is sent"""
+        self.cache.claim(1, "#ff0000")
+        self.cache.confirm(1, "#ff0000")
+        self.cache.claim(1, "#0000ff")
+        self.cache.fail(1, "#0000ff")
+        self.assertTrue(self.cache.claim(1, "#ff0000"))
+
+
+class TestDispatcher(unittest.TestCase):
+    """Test dispatch filtering end to end with a mocked session"""
+
+    def test_only_changed_layers_are_sent(self):
+        """Test a batch only sends layers whose colour differs"""
+        dispatcher = create_dispatcher()
+        dispatcher.send(main({1: "#ff0000", 2: "#ff0000", 3: "#ff0000"}))
+        self.assertEqual(dispatcher.session.put.call_count, 3)
+
+        submitted = dispatcher.send(main({1: "#ff0000", 2: "#0000ff", 3: "#ff0000"}))
+        self.assertEqual(submitted, 1)
+        self.assertEqual(dispatcher.session.put.call_count, 4)
+        self.assertEqual(dispatcher.skipped_count, 2)
+        self.assertEqual(dispatcher.sent_count, 4)
+
+    def test_payload_and_url(self):
+        """Test the request targets the layer's first clip with the colour set"""
+        dispatcher = create_dispatcher()
+        dispatcher.send(main({2: "#00ff00"}))
+        args, kwargs = dispatcher.session.put.call_args
+        self.assertEqual(args[0], "http://localhost:8080/api/v1/composition/layers/2/clips/1")
+        self.assertEqual(kwargs["json"]["video"]["effects"][0]["params"]["Color"]["value"], "#00ff00")
+        self.assertEqual(BASE_PAYLOAD["video"]["effects"][0]["params"]["Color"]["value"], "#FFFFFF")
+
+    def test_error_response_is_not_cached(self):
+        """Test a non-2xx response does not mark the layer as confirmed"""
+        dispatcher = create_dispatcher(status_code=500)
+        dispatcher.send(main({1: "#ff0000"}))
+        dispatcher.send(main({1: "#ff0000"}))
+        self.assertEqual(dispatcher.session.put.call_count, 2)
+
+    def test_exception_is_not_cached(self):
+        """Test a connection error does not mark the layer as confirmed"""
+        dispatcher = create_dispatcher()
+        dispatcher.session.put.side_effect = requests.ConnectionError("down")
+        dispatcher.send(main({1: "#ff0000"}))
+        dispatcher.send(main({1: "#ff0000"}))
+        self.assertEqual(dispatcher.session.put.call_count, 2)
+
+    def test_host_change_invalidates_cache(self):
+        """Test changing the webserver forgets confirmed colours"""
+        dispatcher = create_dispatcher()
+        dispatcher.send(main({1: "#ff0000"}))
+        dispatcher.config["WEBSERVER_IP"] = "10.0.0.2"
+        dispatcher.config_callback("WEBSERVER_IP", "10.0.0.2")
+        channel = mock_channel(dispatcher.hosts["main"])
+        self.assertEqual(channel.api_base_url, "http://10.0.0.2:8080/api/v1/composition")
+        dispatcher.send(main({1: "#ff0000"}))
+        self.assertEqual(channel.session.put.call_count, 1)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Test that an unreachable host stops sends and replays on reconnect"""
+
+    def setUp(self):
+        self.dispatcher = create_dispatcher()
+        self.dispatcher.session.put.side_effect = requests.ConnectionError("down")
+
+    def test_opens_after_consecutive_failures(self):
+        """Test connection failures open the breaker and stop further sends"""
+        threshold = self.dispatcher.breaker.failure_threshold
+        for layer in range(1, threshold + 1):
+            self.dispatcher.send(main({layer: "#ff0000"}))
+        self.assertTrue(self.dispatcher.breaker.is_open)
+
+        self.dispatcher.send(main({9: "#00ff00"}))
+        self.assertEqual(self.dispatcher.session.put.call_count, threshold)
+
+    def test_http_error_does_not_open(self):
+        """Test error responses count as reachable"""
+        self.dispatcher.session.put.side_effect = None
+        self.dispatcher.session.put.return_value = MagicMock(ok=False, status_code=404)
+        for layer in range(1, 10):
+            self.dispatcher.send(main({layer: "#ff0000"}))
+        self.assertFalse(self.dispatcher.breaker.is_open)
+
+    def test_holds_only_final_colour_per_layer(self):
+        """Test presses while open keep only the latest colour per layer"""
+        self.dispatcher.on_heartbeat("main", False)
+        self.dispatcher.send(main({1: "#ff0000", 2: "#ff0000"}))
+        self.dispatcher.send(main({1: "#0000ff"}))
+        self.assertEqual(self.dispatcher.hosts["main"].held, {1: "#0000ff", 2: "#ff0000"})
+        self.dispatcher.session.put.assert_not_called()
+
+    def test_replays_held_state_on_reconnect(self):
+        """Test a reachable heartbeat closes the breaker and replays held layers"""
+        self.dispatcher.on_heartbeat("main", False)
+        self.dispatcher.send(main({1: "#ff0000", 2: "#00ff00"}))
+        self.dispatcher.send(main({1: "#0000ff"}))
+
+        self.dispatcher.session.put.side_effect = None
+        self.dispatcher.on_heartbeat("main", True)
+
+        self.assertFalse(self.dispatcher.breaker.is_open)
+        self.assertEqual(self.dispatcher.hosts["main"].held, {})
+        sent = {
+            call.args[0].split("/layers/")[1]: call.kwargs["json"]["video"]["effects"][0]["params"]["Color"]["value"]
+            for call in self.dispatcher.session.put.call_args_list
+        }
+        self.assertEqual(sent, {"1/clips/1": "#0000ff", "2/clips/1": "#00ff00"})
+
+    def test_failed_request_is_held_when_breaker_opens(self):
+        """Test the request that trips the breaker is replayed later"""
+        threshold = self.dispatcher.breaker.failure_threshold
+        for layer in range(1, threshold + 1):
+            self.dispatcher.send(main({layer: "#ff0000"}))
+        self.assertIn(threshold, self.dispatcher.hosts["main"].held)
+
+
+class TestMultiHost(unittest.TestCase):
+    """Test fan-out to several Resolume hosts"""
+
+    def setUp(self):
+        self.dispatcher = create_dispatcher(config_values={
+            "LAYER_MAP": {"ALL": "ALL", "Inner": 1, "Side": 5},
+            "EXTRA_HOSTS": [
+                {"name": "backup", "ip": "10.0.0.2", "port": "8080"},
+                {"name": "side", "ip": "10.0.0.3", "port": "9000"},
+            ],
+            "COLUMN_HOSTS": {"Inner": ["main", "backup"], "Side": ["side"]},
+        })
+
+    def test_each_host_has_its_own_pool_and_heartbeat(self):
+        """Test every configured host gets a channel, extra hosts a heartbeat"""
+        self.assertEqual(set(self.dispatcher.hosts), {"main", "backup", "side"})
+        self.assertIsNone(self.dispatcher.hosts["main"].heartbeat)
+        self.assertEqual(self.dispatcher.hosts["side"].heartbeat.resolume_product_url, "http://10.0.0.3:9000/api/v1/product")
+        sessions = {id(channel.session) for channel in self.dispatcher.hosts.values()}
+        self.assertEqual(len(sessions), 3)
+
+    def test_targets_follow_column_hosts(self):
+        """Test columns fan out to the hosts listed in COLUMN_HOSTS"""
+        self.assertEqual(self.dispatcher.targets_for("Inner"), [("main", 1), ("backup", 1)])
+        self.assertEqual(self.dispatcher.targets_for("Side"), [("side", 5)])
+
+    def test_send_reaches_each_host(self):
+        """Test a fanned-out press goes to each host's own session and URL"""
+        self.dispatcher.send({("main", 1): "#ff0000", ("backup", 1): "#ff0000", ("side", 5): "#00ff00"})
+        self.assertEqual(
+            self.dispatcher.hosts["backup"].session.put.call_args.args[0],
+            "http://10.0.0.2:8080/api/v1/composition/layers/1/clips/1",
+        )
+        self.assertEqual(
+            self.dispatcher.hosts["side"].session.put.call_args.args[0],
+            "http://10.0.0.3:9000/api/v1/composition/layers/5/clips/1",
+        )
+
+    def test_offline_host_does_not_block_others(self):
+        """Test one host's open breaker only holds that host's layers"""
+        self.dispatcher.on_heartbeat("backup", False)
+        self.dispatcher.send({("main", 1): "#ff0000", ("backup", 1): "#ff0000"})
+        self.assertEqual(self.dispatcher.hosts["main"].session.put.call_count, 1)
+        self.dispatcher.hosts["backup"].session.put.assert_not_called()
+        self.assertEqual(self.dispatcher.hosts["backup"].held, {1: "#ff0000"})
+
+    def test_batch_reports_latency_and_skew(self):
+        """Test a completed fan-out reports per-host latency and skew"""
+        results = []
+        self.dispatcher.batch_completed.connect(lambda latencies, skew: results.append((latencies, skew)))
+        self.dispatcher.send({("main", 1): "#ff0000", ("backup", 1): "#ff0000"})
+        self.assertEqual(len(results), 1)
+        latencies, skew = results[0]
+        self.assertEqual(set(latencies), {"main", "backup"})
+        self.assertGreaterEqual(skew, 0.0)
+
+    def test_removed_host_is_dropped(self):
+        """Test removing a host from EXTRA_HOSTS closes its channel"""
+        self.dispatcher.config["EXTRA_HOSTS"] = []
+        self.dispatcher.config_callback("EXTRA_HOSTS", [])
+        self.assertEqual(set(self.dispatcher.hosts), {"main"})
+
+
+class TestMultiLayerColumns(unittest.TestCase):
+    """Test columns mapped to lists and ranges of layers"""
+
+    def setUp(self):
+        self.dispatcher = create_dispatcher(config_values={
+            "LAYER_MAP": {"ALL": "ALL", "Strips": "5-10,12", "Inner": 1},
+        })
+
+    def test_range_expands_to_every_layer(self):
+        """Test a column drives each listed layer"""
+        self.assertEqual(
+            self.dispatcher.targets_for("Strips"),
+            [("main", layer) for layer in (5, 6, 7, 8, 9, 10, 12)],
+        )
+        self.assertEqual(self.dispatcher.targets_for("ALL"), [])
+
+    def test_press_is_one_batch(self):
+        """Test every layer of the column goes out together and completes as one batch"""
+        results = []
+        self.dispatcher.batch_completed.connect(lambda latencies, skew: results.append(latencies))
+        submitted = self.dispatcher.send({target: "#ff0000" for target in self.dispatcher.targets_for("Strips")})
+        self.assertEqual(submitted, 7)
+        self.assertEqual(self.dispatcher.session.put.call_count, 7)
+        self.assertEqual(len(results), 1)
+        self.assertEqual(self.dispatcher.hosts["main"].state.confirmed[12], "#ff0000")
+
+    def test_expansion_is_cached_until_the_map_changes(self):
+        """Test the map is parsed once, then again only when it is replaced"""
+        first = self.dispatcher.targets_for("Strips")
+        self.assertIs(self.dispatcher.targets_for("Strips"), first)
+        self.dispatcher.config["LAYER_MAP"] = {"ALL": "ALL", "Strips": "2-3"}
+        self.assertEqual(self.dispatcher.targets_for("Strips"), [("main", 2), ("main", 3)])
+        self.assertEqual(self.dispatcher.targets_for("Inner"), [])
+
+    def test_workers_cover_the_widest_column(self):
+        """Test a host gets enough workers to send a wide column in one round"""
+        self.assertEqual(self.dispatcher.hosts["main"].workers, 7)
+
+    def test_layer_slots_follow_column_order(self):
+        """Test every layer gets one slot, in column order, and shared layers aren't repeated"""
+        self.dispatcher.config["LAYER_MAP"] = {"ALL": "ALL", "Inner": 1, "Strips": "1-3", "Outer": 4}
+        slots = self.dispatcher.layer_slots(["Inner", "Strips", "Outer"])
+        self.assertEqual(slots, [
+            ("Inner", [("main", 1)]),
+            ("Strips", [("main", 2)]),
+            ("Strips", [("main", 3)]),
+            ("Outer", [("main", 4)]),
+        ])
+
+    def test_invalid_mapping_drives_nothing(self):
+        """Test a hand-edited bad mapping is ignored rather than crashing presses"""
+        self.dispatcher.config["LAYER_MAP"] = {"Strips": "10-5", "Inner": 1}
+        self.assertEqual(self.dispatcher.targets_for("Strips"), [])
+        self.assertEqual(self.dispatcher.targets_for("Inner"), [("main", 1)])
+
+
+class TestLayerGroups(unittest.TestCase):
+    """Test columns mapped to whole Resolume layer groups"""
+
+    def setUp(self):
+        self.dispatcher = create_dispatcher(config_values={
+            "LAYER_MAP": {"ALL": "ALL", "Booth": "group:3", "Left": "group:stage left", "Inner": 1},
+        })
+
+    def test_group_by_position_is_one_request(self):
+        """Test a group column sends a single request to the group itself"""
+        self.assertEqual(self.dispatcher.targets_for("Booth"), [("main", "G3")])
+        self.assertEqual(self.dispatcher.send({("main", "G3"): "#ff0000"}), 1)
+        args, kwargs = self.dispatcher.session.put.call_args
+        self.assertEqual(args[0], "http://localhost:8080/api/v1/composition/layergroups/3")
+        self.assertEqual(kwargs["json"]["video"]["effects"][0]["params"]["Color"]["value"], "#ff0000")
+        self.assertEqual(self.dispatcher.hosts["main"].state.confirmed["G3"], "#ff0000")
+
+    def test_group_by_name_waits_for_discovery(self):
+        """Test a named group drives nothing until the composition is read, then its position"""
+        self.assertEqual(self.dispatcher.targets_for("Left"), [])
+        channel = self.dispatcher.hosts["main"]
+        with StandInResolume(layer_groups={"DJ Booth": [1], "Stage Left": [2, 3]}) as server:
+            channel.address, channel.port = "127.0.0.1", server.port
+            self.dispatcher._fetch_groups(channel)
+        self.assertEqual(self.dispatcher.targets_for("Left"), [("main", "G2")])
+        self.assertIn(("G2", "/layergroups/2"), [r[:2] for r in self.dispatcher.panic_payloads["Blackout"]["main"]])
+
+    def test_missing_group_drives_nothing(self):
+        """Test a name the composition doesn't have is reported and ignored"""
+        with self.assertLogs("resolume_colour_picker.dispatcher", "WARNING") as logs:
+            self.dispatcher._on_groups_found("main", [])
+        self.assertEqual(self.dispatcher.targets_for("Left"), [])
+        self.assertEqual(self.dispatcher.targets_for("Inner"), [("main", 1)])
+        self.assertEqual(logs.records[0].group, "stage left")
+
+
+class TestPreWarming(unittest.TestCase):
+    """Test DNS resolution and connection pre-warming"""
+
+    def test_resolve_prefers_ipv4_and_keeps_port(self):
+        """Test a host name is swapped for its IPv4 address in the URL"""
+        channel = HostChannel("main", "localhost", "8080")
+        channel.resolve()
+        self.assertEqual(channel.address, "127.0.0.1")
+        self.assertEqual(channel.api_base_url, "http://127.0.0.1:8080/api/v1/composition")
+        channel.close()
+
+    def test_unresolvable_host_is_left_alone(self):
+        """Test a name that doesn't resolve keeps the configured address"""
+        channel = HostChannel("main", "no-such-host.invalid", "8080")
+        channel.resolve()
+        self.assertEqual(channel.api_base_url, "http://no-such-host.invalid:8080/api/v1/composition")
+        channel.close()
+
+    def test_warm_opens_pooled_connections(self):
+        """Test warming opens one connection per mapped layer before any press"""
+        with StandInResolume() as server:
+            channel = HostChannel("main", "localhost", str(server.port))
+            channel.warm(3)
+            pools = channel.session.get_adapter("http://").poolmanager.pools
+            deadline = time.monotonic() + 2
+            while time.monotonic() < deadline and self._idle_connections(pools) != 3:
+                time.sleep(0.01)
+            idle = self._idle_connections(pools)
+            channel.close()
+        self.assertEqual(idle, 3)
+
+    def test_warm_leaves_workers_free(self):
+        """Test warming runs off the channel's workers, so queued presses don't wait behind it"""
+        with StandInResolume() as server:
+            channel = HostChannel("main", "localhost", str(server.port))
+            channel.executor = MagicMock()
+            channel.warm(2).join(timeout=2)
+            warmed = channel.warmed
+            channel.close()
+        channel.executor.submit.assert_not_called()
+        self.assertEqual(warmed, 2)
+
+    def test_layer_map_change_skips_warm_hosts(self):
+        """Test a layer map change only warms hosts whose pool is now too small"""
+        dispatcher = create_dispatcher()
+        channel = dispatcher.hosts["main"]
+        channel.warmed = 2
+        dispatcher.warm_all(missing_only=True)
+        channel.warm.assert_not_called()
+
+        dispatcher.config["LAYER_MAP"] = {"ALL": "ALL", "Inner": 1, "Outer": 2, "Ring": 3}
+        dispatcher.warm_all(missing_only=True)
+        channel.warm.assert_called_once_with(3)
+
+    @staticmethod
+    def _idle_connections(pools):
+        return sum(pools[key].pool.qsize() - pools[key].pool.queue.count(None) for key in pools.keys())
+
+    def test_mapped_layer_counts_per_host(self):
+        """Test the connections to warm follow the layers each host drives"""
+        dispatcher = create_dispatcher(config_values={
+            "LAYER_MAP": {"ALL": "ALL", "Inner": 1, "Outer": 2, "Ring": 2},
+            "EXTRA_HOSTS": [{"name": "backup", "ip": "10.0.0.2", "port": "8080"}],
+            "COLUMN_HOSTS": {"Outer": ["main"]},
+        })
+        self.assertEqual(dispatcher.mapped_layer_counts(), {"main": 2, "backup": 2})
+
+    def test_keep_alive_skips_busy_and_offline_hosts(self):
+        """Test only idle, reachable hosts are re-warmed"""
+        dispatcher = create_dispatcher()
+        channel = dispatcher.hosts["main"]
+        channel.warm = MagicMock()
+        channel.last_used = time.monotonic()
+        dispatcher.keep_alive()
+        channel.warm.assert_not_called()
+
+        channel.last_used = 0.0
+        dispatcher.on_heartbeat("main", False)
+        dispatcher.keep_alive()
+        channel.warm.assert_not_called()
+
+        dispatcher.on_heartbeat("main", True)
+        dispatcher.keep_alive()
+        channel.warm.assert_called_once_with(2)
+
+
+
+class TestPanicLane(unittest.TestCase):
+    """Test the priority lane for panic colours"""
+
+    def setUp(self):
+        self.dispatcher = create_dispatcher()
+        self.channel = self.dispatcher.hosts["main"]
+
+    def test_panic_uses_prebuilt_payloads_on_priority_lane(self):
+        """Test a panic sends the pre-serialised payload to every mapped layer"""
+        self.assertEqual(self.dispatcher.panic("Blackout"), 2)
+        self.channel.session.put.assert_not_called()
+        urls = [call.args[0] for call in self.channel.priority_session.put.call_args_list]
+        self.assertEqual(urls, [f"{self.channel.api_base_url}/layers/{layer}/clips/1" for layer in (1, 2)])
+        body = self.channel.priority_session.put.call_args.kwargs["data"]
+        self.assertIn(b'"#000000"', body)
+        self.assertEqual(self.dispatcher.desired, main({1: "#000000", 2: "#000000"}))
+
+    def test_panic_flushes_queued_presses(self):
+        """Test presses queued before a panic are dropped instead of undoing it"""
+        queued = []
+        self.channel.executor.submit = MagicMock(side_effect=queue_into(queued))
+        self.dispatcher.send(main({1: "#ff0000", 2: "#00ff00"}))
+        self.dispatcher.panic("Blackout")
+        for fn, args in queued:
+            fn(*args)
+        self.channel.session.put.assert_not_called()
+        self.assertEqual(self.channel.state.confirmed, {1: "#000000", 2: "#000000"})
+        self.assertEqual(self.channel.state.in_flight, {})
+
+    def test_presses_after_panic_are_sent(self):
+        """Test the lane only flushes what was queued before the panic"""
+        self.dispatcher.panic("Blackout")
+        self.dispatcher.send(main({1: "#ff0000"}))
+        self.assertEqual(self.channel.session.put.call_count, 1)
+
+    def test_panic_reports_its_own_latency(self):
+        """Test a panic reports latency separately from normal batches"""
+        panics, batches = [], []
+        self.dispatcher.panic_completed.connect(lambda name, latencies, worst: panics.append((name, worst)))
+        self.dispatcher.batch_completed.connect(lambda latencies, skew: batches.append(skew))
+        self.dispatcher.panic("Blackout")
+        self.assertEqual(len(panics), 1)
+        self.assertEqual(panics[0][0], "Blackout")
+        self.assertEqual(batches, [])
+
+    def test_panic_is_held_while_offline(self):
+        """Test a panic for an unreachable host is replayed when it returns"""
+        self.dispatcher.on_heartbeat("main", False)
+        self.dispatcher.panic("Blackout")
+        self.channel.priority_session.put.assert_not_called()
+        self.assertEqual(self.channel.held, {1: "#000000", 2: "#000000"})
+
+
+if __name__ == '__main__':
+    unittest.main()
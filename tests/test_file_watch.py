@@ -0,0 +1,239 @@
+"""
+Tests for hot reloading watched palette and layer-map files
+"""
+
+import json
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from PySide6.QtWidgets import QApplication
+
+from resolume_colour_picker.file_watch import WATCHED, FileWatcher, parse_layer_map_file, parse_palette_file
+from resolume_colour_picker.metrics import GRID_REBUILDS
+from resolume_colour_picker.replay import ReplayConfig
+from test_dispatcher import create_mock_config
+from test_scene_master import TestSceneMasterBase
+
+
+class TestParsers(unittest.TestCase):
+    """Test watched files are validated before they reach Config"""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+
+    def write(self, name, text):
+        path = Path(self.dir.name) / name
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    def test_palette_formats(self):
+        """Test any swatch format becomes a COLOUR_SET, in file order"""
+        path = self.write("show.json", json.dumps({"Red": "#FF0000", "Blue": "0000ff"}))
+        self.assertEqual(list(parse_palette_file(path).items()), [("Red", "#ff0000"), ("Blue", "#0000ff")])
+        path = self.write("show.csv", "Amber,#FFBF00\n")
+        self.assertEqual(parse_palette_file(path), {"Amber": "#ffbf00"})
+        with self.assertRaises(ValueError):
+            parse_palette_file(self.write("empty.json", "{}"))
+
+    def test_layer_map_is_normalised(self):
+        """Test layer values are validated as the layer map dialog would"""
+        path = self.write("map.json", json.dumps({"All": "all", "Outer": "1-3", "DJ": 5}))
+        self.assertEqual(parse_layer_map_file(path), {"All": "ALL", "Outer": "1-3", "DJ": 5})
+        with self.assertRaisesRegex(ValueError, "DJ"):
+            parse_layer_map_file(self.write("bad.json", json.dumps({"DJ": "0"})))
+        with self.assertRaises(ValueError):
+            parse_layer_map_file(self.write("list.json", "[1, 2]"))
+
+
+    def test_calibration_file_is_watched(self):
+        """Test a calibration file reloads LAYER_CALIBRATION"""
+        path = self.write("calibration.json", json.dumps({"backup:2": {"gain": 0.9}}))
+        key, parse = WATCHED["CALIBRATION_FILE"]
+        self.assertEqual(key, "LAYER_CALIBRATION")
+        self.assertEqual(parse(path), {"backup:2": {"gain": 0.9}})
+        with self.assertRaisesRegex(ValueError, "Outer"):
+            parse(self.write("bad.json", json.dumps({"Outer": {"gain": 0.9}})))
+
+
+class TestFileWatcher(unittest.TestCase):
+    """Test saves to watched files are applied through Config"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        self.palette = Path(self.dir.name) / "palette.json"
+        self.palette.write_text(json.dumps({"Red": "#ff0000"}), encoding="utf-8")
+        self.config = ReplayConfig({"COLOUR_SET": {"White": "#ffffff"}, "PALETTE_FILE": str(self.palette)})
+        self.writes = []
+        self.config.value_changed.connect(lambda key, value: self.writes.append(key))
+        self.watcher = FileWatcher(self.config, debounce_ms=10)
+        self.addCleanup(self.watcher.stop)
+        self.reloads = []
+        self.failures = []
+        self.watcher.reloaded.connect(lambda key, changed: self.reloads.append(changed))
+        self.watcher.reload_failed.connect(lambda path, error: self.failures.append(error))
+
+    def wait_for(self, condition, timeout=3.0):
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            self.app.processEvents()
+            time.sleep(0.005)
+        return condition()
+
+    def test_named_file_is_loaded(self):
+        """Test naming a file loads it straight away"""
+        self.assertTrue(self.wait_for(lambda: self.config["COLOUR_SET"] == {"Red": "#ff0000"}))
+
+    def test_save_is_applied(self):
+        """Test writing the file reaches Config without polling"""
+        self.assertTrue(self.wait_for(lambda: self.reloads))
+        self.palette.write_text(json.dumps({"Red": "#ff0000", "Blue": "#0000ff"}), encoding="utf-8")
+        self.assertTrue(self.wait_for(lambda: len(self.config["COLOUR_SET"]) == 2))
+
+    def test_replaced_file_is_applied(self):
+        """Test an editor's save-to-temp-and-rename is followed"""
+        self.assertTrue(self.wait_for(lambda: self.reloads))
+        temp = Path(self.dir.name) / "palette.json.tmp"
+        temp.write_text(json.dumps({"Green": "#00ff00"}), encoding="utf-8")
+        os.replace(temp, self.palette)
+        self.assertTrue(self.wait_for(lambda: self.config["COLOUR_SET"] == {"Green": "#00ff00"}))
+        # and it is still watched afterwards
+        self.palette.write_text(json.dumps({"Blue": "#0000ff"}), encoding="utf-8")
+        self.assertTrue(self.wait_for(lambda: self.config["COLOUR_SET"] == {"Blue": "#0000ff"}))
+
+    def test_bad_save_keeps_running_values(self):
+        """Test a file that doesn't parse is reported and leaves Config alone"""
+        self.assertTrue(self.wait_for(lambda: self.reloads))
+        self.palette.write_text("{not json", encoding="utf-8")
+        self.assertTrue(self.wait_for(lambda: self.failures))
+        self.assertEqual(self.config["COLOUR_SET"], {"Red": "#ff0000"})
+
+    def test_unchanged_save_writes_nothing(self):
+        """Test only a value that differs is written back through Config"""
+        self.assertTrue(self.wait_for(lambda: self.reloads))
+        self.writes.clear()
+        self.palette.write_text(json.dumps({"Red": "#FF0000"}), encoding="utf-8")
+        self.assertTrue(self.wait_for(lambda: len(self.reloads) == 2))
+        self.assertEqual(self.reloads, [True, False])
+        self.assertEqual(self.writes, [])
+
+
+class TestIncrementalApply(TestSceneMasterBase):
+    """Test reloaded values are applied to the grid in place"""
+
+    def _create_mock_config(self):
+        config = create_mock_config({
+            "COLOUR_SET": {"Red": "#FF0000", "Blue": "#0000FF", "Yellow": "#FFFF00"},
+            "LAYER_MAP": {"ALL": "ALL", "Outer": 1, "Inner": 2},
+        })
+        self.data = config.data
+        return config
+
+    def setUp(self):
+        super().setUp()
+        self.sent = []
+        self.engine.dispatcher.send = lambda targets, force=False: self.sent.append(dict(targets))
+
+    def set(self, key, value):
+        self.data[key] = value
+        self.engine.config_callback(key, value)
+
+    def test_recolour_restyles_in_place(self):
+        """Test an edited colour restyles its row's buttons and keeps every widget"""
+        buttons = dict(self.engine.buttons)
+        self.set("COLOUR_SET", {"Red": "#FF0000", "Blue": "#0000AA", "Yellow": "#FFFF00"})
+        self.assertEqual(self.engine.buttons, buttons)
+        self.assertIn("#0000aa", self.engine.buttons[("Outer", 1)].styleSheet())
+        self.assertEqual(self.engine.colour_rows[1], ("Blue", "#0000AA"))
+
+    def test_live_on_recoloured_row_is_carried(self):
+        """Test a column live on a recoloured row keeps what Resolume shows, and other columns stay selected"""
+        self.engine.on_press("Outer", 1, None)
+        self.engine.on_press("Inner", 0, None)
+        self.set("COLOUR_SET", {"Red": "#FF0000", "Navy": "#000080", "Yellow": "#FFFF00"})
+        self.assertEqual(self.engine.button_states, {("Inner", 0): 1})
+        self.assertEqual(self.engine.carried_live, {"Outer": "#0000FF"})
+        self.assertEqual(self.engine.buttons[("Outer", 1)].text(), "Navy")
+        self.engine.force_resend()
+        self.assertEqual(self.sent[-1], {("main", 1): "#0000FF", ("main", 2): "#FF0000"})
+
+    def test_renamed_row_keeps_selection(self):
+        """Test a label change alone leaves the row selected"""
+        self.engine.on_press("Outer", 0, None)
+        self.set("COLOUR_SET", {"Scarlet": "#ff0000", "Blue": "#0000FF", "Yellow": "#FFFF00"})
+        self.assertEqual(self.engine.button_states, {("Outer", 0): 1})
+        self.assertEqual(self.engine.buttons[("Outer", 0)].text(), "Scarlet")
+
+    def test_new_row_adds_only_its_buttons(self):
+        """Test adding a row adds a button per column and keeps the rest of the grid"""
+        self.engine.on_press("Outer", 1, None)
+        buttons = dict(self.engine.buttons)
+        self.set("COLOUR_SET", {"Red": "#FF0000", "Blue": "#0000FF", "Yellow": "#FFFF00", "White": "#FFFFFF"})
+        self.assertEqual(len(self.engine.buttons), 12)
+        self.assertEqual({key: self.engine.buttons[key] for key in buttons}, buttons)
+        self.assertEqual(self.engine.buttons[("Inner", 3)].text(), "White")
+        self.assertEqual(self.engine.button_states, {("Outer", 1): 1})
+
+    def test_removed_row_drops_its_buttons(self):
+        """Test removing a row deletes its buttons, and a column live on it keeps its colour"""
+        self.engine.on_press("Outer", 2, None)
+        self.engine.on_press("Inner", 0, None)
+        button = self.engine.buttons[("Inner", 0)]
+        self.set("COLOUR_SET", {"Red": "#FF0000", "Blue": "#0000FF"})
+        self.assertEqual(len(self.engine.buttons), 6)
+        self.assertNotIn(("Outer", 2), self.engine.base_colours)
+        self.assertIs(self.engine.buttons[("Inner", 0)], button)
+        self.assertEqual(self.engine.button_states, {("Inner", 0): 1})
+        self.assertEqual(self.engine.carried_live, {"Outer": "#FFFF00"})
+
+    def test_remap_keeps_grid(self):
+        """Test moving the layers behind the same columns keeps buttons and selections"""
+        self.engine.on_press("Outer", 2, None)
+        self.engine.apply_gradient("#ff0000", "#0000ff")
+        self.engine.on_press("Outer", 2, None)
+        button = self.engine.buttons[("Outer", 2)]
+        self.set("LAYER_MAP", {"ALL": "ALL", "Outer": "1-2", "Inner": 3})
+        self.assertIs(self.engine.buttons[("Outer", 2)], button)
+        self.assertEqual(self.engine.button_states, {("Outer", 2): 1})
+        self.assertEqual(self.engine.live_gradients, {})
+
+    def test_renamed_column_replaces_only_its_widgets(self):
+        """Test a renamed column gets fresh buttons while the others keep theirs and their selections"""
+        self.engine.on_press("Outer", 0, None)
+        self.engine.on_press("Inner", 1, None)
+        button = self.engine.buttons[("Outer", 0)]
+        self.set("LAYER_MAP", {"ALL": "ALL", "Outer": 1, "DJ": 2})
+        self.assertIs(self.engine.buttons[("Outer", 0)], button)
+        self.assertIn(("DJ", 0), self.engine.buttons)
+        self.assertNotIn(("Inner", 0), self.engine.buttons)
+        self.assertEqual(self.engine.button_states, {("Outer", 0): 1})
+        self.assertEqual(self.engine.selected_in_column, {"Outer": 0})
+        self.assertEqual(list(self.engine.header_labels), ["ALL", "Outer", "DJ"])
+
+    def test_inserted_column_moves_the_others(self):
+        """Test a new column in the middle shifts the columns after it without recreating them"""
+        button = self.engine.buttons[("Inner", 0)]
+        self.set("LAYER_MAP", {"ALL": "ALL", "Outer": 1, "DJ": 3, "Inner": 2})
+        self.assertIs(self.engine.buttons[("Inner", 0)], button)
+        self.assertEqual(self.engine.layout.getItemPosition(self.engine.layout.indexOf(button))[:2], (1, 3))
+        self.assertEqual(len(self.engine.buttons), 12)
+        self.assertEqual(self.engine.non_all_columns, ["Outer", "DJ", "Inner"])
+
+    def test_reloads_are_counted(self):
+        """Test palette and layer map reloads show up in the grid rebuilds metric"""
+        reloads = GRID_REBUILDS.value(reason="reload")
+        self.set("COLOUR_SET", {"Red": "#FF0000", "Blue": "#0000AA", "Yellow": "#FFFF00"})
+        self.set("LAYER_MAP", {"ALL": "ALL", "Outer": "1-2", "Inner": 3})
+        self.assertEqual(GRID_REBUILDS.value(reason="reload") - reloads, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
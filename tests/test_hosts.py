@@ -0,0 +1,46 @@
+"""
+Tests for host list parsing and column host resolution
+"""
+
+import unittest
+
+from resolume_colour_picker.hosts import column_hosts, configured_hosts, format_hosts, parse_hosts
+from test_dispatcher import create_mock_config
+
+
+class TestHosts(unittest.TestCase):
+    """Test the EXTRA_HOSTS / COLUMN_HOSTS helpers"""
+
+    def test_parse_and_format_round_trip(self):
+        """Test the editable text form round-trips"""
+        text = "backup=192.168.1.11:8080, side=10.0.0.3:9000"
+        hosts = parse_hosts(text)
+        self.assertEqual(hosts, [
+            {"name": "backup", "ip": "192.168.1.11", "port": "8080"},
+            {"name": "side", "ip": "10.0.0.3", "port": "9000"},
+        ])
+        self.assertEqual(format_hosts(hosts), text)
+
+    def test_parse_rejects_bad_entries(self):
+        """Test malformed, duplicate and reserved names are rejected"""
+        for text in ("backup", "backup=10.0.0.2", "a=1.2.3.4:80, a=1.2.3.5:80", "main=1.2.3.4:80"):
+            with self.assertRaises(ValueError):
+                parse_hosts(text)
+
+    def test_configured_hosts_includes_main(self):
+        """Test the main host comes from WEBSERVER_IP/PORT"""
+        config = create_mock_config({"EXTRA_HOSTS": [{"name": "backup", "ip": "10.0.0.2", "port": "80"}]})
+        self.assertEqual(configured_hosts(config), {"main": ("localhost", "8080"), "backup": ("10.0.0.2", "80")})
+
+    def test_unlisted_column_drives_every_host(self):
+        """Test columns without COLUMN_HOSTS fan out to all hosts"""
+        config = create_mock_config({
+            "EXTRA_HOSTS": [{"name": "backup", "ip": "10.0.0.2", "port": "80"}],
+            "COLUMN_HOSTS": {"Side": ["backup"]},
+        })
+        self.assertEqual(column_hosts(config, "Inner"), ["main", "backup"])
+        self.assertEqual(column_hosts(config, "Side"), ["backup"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+"""
+Tests for dominant-colour extraction from images
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+from PySide6.QtGui import QImage
+from PySide6.QtWidgets import QApplication
+
+from resolume_colour_picker.image_palette import (
+    dominant_colours, extract_palette, image_to_array, kmeans
+)
+
+
+class TestKMeans(unittest.TestCase):
+    """Test the clustering pass"""
+
+    def test_finds_separated_clusters(self):
+        """Test well separated groups are recovered, largest first"""
+        rng = np.random.default_rng(1)
+        big = rng.normal(0.0, 0.01, size=(300, 3))
+        small = rng.normal(1.0, 0.01, size=(100, 3))
+        centres, counts = kmeans(np.vstack([small, big]), 2)
+        self.assertEqual(list(counts), [300, 100])
+        np.testing.assert_allclose(centres[0], 0.0, atol=0.01)
+        np.testing.assert_allclose(centres[1], 1.0, atol=0.01)
+
+    def test_fewer_colours_than_clusters(self):
+        """Test a flat image returns a single colour rather than duplicates"""
+        pixels = np.tile([[1.0, 0.0, 0.0]], (50, 1))
+        self.assertEqual(dominant_colours(pixels, 8), ["#ff0000"])
+
+
+class TestImageExtraction(unittest.TestCase):
+    """Test palette extraction from image files"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance()
+        if cls.app is None:
+            cls.app = QApplication([])
+
+    def _make_image(self, width=120, height=80):
+        # Left two thirds red, right third blue
+        image = QImage(width, height, QImage.Format_RGB888)
+        image.fill(0x0000FF)
+        for x in range(width * 2 // 3):
+            for y in range(height):
+                image.setPixel(x, y, 0xFF0000)
+        return image
+
+    def test_image_to_array_handles_row_padding(self):
+        """Test odd widths (padded scanlines) convert correctly"""
+        pixels = image_to_array(self._make_image(width=7, height=3))
+        self.assertEqual(pixels.shape, (21, 3))
+        np.testing.assert_allclose(pixels[3], [1.0, 0.0, 0.0])
+        np.testing.assert_allclose(pixels[4], [0.0, 0.0, 1.0])
+
+    def test_extract_palette_from_file(self):
+        """Test a saved image yields a COLOUR_SET ordered by coverage"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "art.png"
+            self._make_image().save(str(path))
+            palette = extract_palette(path, 2)
+        self.assertEqual(palette, {"1 - #ff0000": "#ff0000", "2 - #0000ff": "#0000ff"})
+
+    def test_unreadable_file_raises(self):
+        """Test a missing image raises ValueError"""
+        with self.assertRaises(ValueError):
+            extract_palette("does-not-exist.png")
+
+
+if __name__ == '__main__':
+    unittest.main()
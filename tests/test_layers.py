@@ -0,0 +1,70 @@
+"""
+Tests for layer list parsing
+"""
+
+import unittest
+
+from resolume_colour_picker.layers import (
+    MAX_LAYER, GroupRef, format_layers, group_index, normalise_layers, parse_group, parse_layers, target_path
+)
+
+
+class TestLayers(unittest.TestCase):
+    """Test the LAYER_MAP value helpers"""
+
+    def test_parse_lists_and_ranges(self):
+        """Test single layers, lists and inclusive ranges expand in order"""
+        self.assertEqual(parse_layers(3), [3])
+        self.assertEqual(parse_layers("3"), [3])
+        self.assertEqual(parse_layers("5-10,12"), [5, 6, 7, 8, 9, 10, 12])
+        self.assertEqual(parse_layers(" 2 , 4-5 "), [2, 4, 5])
+        self.assertEqual(parse_layers("3,1-4"), [3, 1, 2, 4])
+
+    def test_parse_rejects_bad_values(self):
+        """Test garbage, reversed ranges, layer 0 and empty lists are rejected"""
+        for value in ("x", "10-5", "0", 0, "1-", "", ",", "Layer 1", True):
+            with self.assertRaises(ValueError, msg=repr(value)):
+                parse_layers(value)
+
+    def test_parse_rejects_huge_ranges(self):
+        """Test a range past the layer limit is refused at once rather than expanded"""
+        self.assertEqual(len(parse_layers(f"1-{MAX_LAYER}")), MAX_LAYER)
+        for value in ("1-1000000", MAX_LAYER + 1, f"2,{MAX_LAYER + 1}"):
+            with self.assertRaisesRegex(ValueError, "go up to", msg=repr(value)):
+                parse_layers(value)
+
+    def test_format_collapses_runs(self):
+        """Test consecutive layers collapse back into ranges"""
+        self.assertEqual(format_layers([5, 6, 7, 8, 9, 10, 12]), "5-10,12")
+        self.assertEqual(format_layers([1, 3]), "1,3")
+
+    def test_normalise_dialog_input(self):
+        """Test what the layer map dialog stores"""
+        self.assertEqual(normalise_layers("all"), "ALL")
+        self.assertEqual(normalise_layers(" 4 "), 4)
+        self.assertEqual(normalise_layers("12, 5-10"), "12,5-10")
+        self.assertEqual(normalise_layers("5,6,7"), "5-7")
+        with self.assertRaises(ValueError):
+            normalise_layers("5-")
+
+    def test_parse_groups(self):
+        """Test layer groups by position or name, and that plain layers aren't groups"""
+        self.assertEqual(parse_group("group:2"), GroupRef(2))
+        self.assertEqual(parse_group(" Group: Stage Left "), GroupRef("Stage Left"))
+        self.assertIsNone(parse_group("5-10"))
+        self.assertIsNone(parse_group(3))
+        for value in ("group:", "group: ", "group:0"):
+            with self.assertRaises(ValueError, msg=repr(value)):
+                parse_group(value)
+        self.assertEqual(normalise_layers("GROUP:  DJ Booth"), "group:DJ Booth")
+
+    def test_target_paths(self):
+        """Test layers go through their first clip and groups through the group itself"""
+        self.assertEqual(target_path(3), "/layers/3/clips/1")
+        self.assertEqual(target_path("G2"), "/layergroups/2")
+        self.assertEqual(group_index("G12"), 12)
+        self.assertIsNone(group_index(12))
+
+
+if __name__ == '__main__':
+    unittest.main()
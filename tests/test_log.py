@@ -0,0 +1,114 @@
+"""
+Tests for queued, structured logging and the log window
+"""
+
+import io
+import logging
+import unittest
+from unittest.mock import MagicMock
+
+from PySide6.QtWidgets import QApplication
+
+from resolume_colour_picker.log import (
+    PACKAGE_LOGGER, RING, RingBufferHandler, StructuredFormatter, setup_logging, shutdown_logging
+)
+from resolume_colour_picker.log_dialogue import LogDialog
+
+
+class TestStructuredLogging(unittest.TestCase):
+    """Test the formatter, ring buffer and background listener"""
+
+    def setUp(self):
+        self.stream = io.StringIO()
+        self.listener = setup_logging("INFO", stream=self.stream)
+        self.logger = logging.getLogger(f"{PACKAGE_LOGGER}.test")
+
+    def tearDown(self):
+        shutdown_logging()
+
+    def test_structured_fields_follow_message(self):
+        """Test extra fields are shown as key=value pairs"""
+        record = logging.LogRecord("x", logging.INFO, __file__, 1, "Sent", None, None)
+        record.layer, record.colour, record.latency_ms = 3, "#ff0000", 4.25
+        text = StructuredFormatter().format(record)
+        self.assertTrue(text.endswith("Sent [layer=3 colour=#ff0000 latency_ms=4.2]"))
+
+    def test_missing_group_is_named(self):
+        """Test a layer group warning shows which group is missing"""
+        record = logging.LogRecord("x", logging.WARNING, __file__, 1, "Layer group not in composition", None, None)
+        record.host, record.column, record.group = "main", "Outer", "Stage Left"
+        text = StructuredFormatter().format(record)
+        self.assertTrue(text.endswith("[host=main column=Outer group=Stage Left]"))
+
+    def test_ignored_binding_says_why(self):
+        """Test parameter binding warnings show the binding, its values and the error"""
+        record = logging.LogRecord("x", logging.WARNING, __file__, 1, "Ignoring parameter binding", None, None)
+        record.binding, record.error = "Hue", "Give either a parameter path or a parameter id"
+        self.assertTrue(StructuredFormatter().format(record).endswith(
+            "[binding=Hue error=Give either a parameter path or a parameter id]"
+        ))
+        record = logging.LogRecord("x", logging.WARNING, __file__, 1, "API error", None, None)
+        record.layer, record.parameters = 2, {"Opacity": 0.5}
+        self.assertTrue(StructuredFormatter().format(record).endswith("[layer=2 parameters={'Opacity': 0.5}]"))
+
+    def test_records_reach_console_and_ring(self):
+        """Test records are written by the listener thread to both handlers"""
+        before = RING.since()[-1][0] if RING.entries else 0
+        self.logger.warning("Resolume unreachable", extra={"host": "main"})
+        shutdown_logging()  # flushes the queue
+        self.assertIn("Resolume unreachable [host=main]", self.stream.getvalue())
+        entries = RING.since(before)
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0][1], logging.WARNING)
+
+    def test_debug_is_skipped_at_default_level(self):
+        """Test hot-path debug calls don't even build a record at INFO"""
+        handler = MagicMock(level=logging.DEBUG)
+        self.logger.addHandler(handler)
+        self.logger.debug("Press %s", "Red")
+        self.logger.removeHandler(handler)
+        handler.handle.assert_not_called()
+
+    def test_message_is_formatted_off_the_calling_thread(self):
+        """Test the queue handler leaves formatting to the listener"""
+        queue_handler = logging.getLogger(PACKAGE_LOGGER).handlers[-1]
+        record = logging.LogRecord("x", logging.INFO, __file__, 1, "Press %s", ("Red",), None)
+        prepared = queue_handler.prepare(record)
+        self.assertEqual(prepared.msg, "Press %s")
+        self.assertEqual(prepared.args, ("Red",))
+
+    def test_ring_keeps_only_recent_entries(self):
+        """Test the ring drops the oldest entries when full"""
+        ring = RingBufferHandler(capacity=3)
+        for i in range(5):
+            ring.emit(logging.LogRecord("x", logging.INFO, __file__, 1, f"entry {i}", None, None))
+        self.assertEqual([entry[0] for entry in ring.since()], [3, 4, 5])
+        self.assertEqual([entry[0] for entry in ring.since(4)], [5])
+
+
+class TestLogDialog(unittest.TestCase):
+    """Test the log window"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance()
+        if cls.app is None:
+            cls.app = QApplication([])
+
+    def test_shows_new_entries_and_sets_level(self):
+        """Test the window appends new entries and changes the recorded level"""
+        ring = RingBufferHandler()
+        config = MagicMock()
+        config.get = MagicMock(return_value="INFO")
+        dialog = LogDialog(config, ring=ring)
+        ring.emit(logging.LogRecord("x", logging.INFO, __file__, 1, "Scene Master Mode: ACTIVE", None, None))
+        dialog.refresh()
+        self.assertIn("Scene Master Mode: ACTIVE", dialog.text.toPlainText())
+
+        dialog.level_combo.setCurrentText("DEBUG")
+        config.__setitem__.assert_called_with("LOG_LEVEL", "DEBUG")
+        dialog.deleteLater()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+"""
+Tests for the metrics registry and Prometheus endpoint
+"""
+
+import gc
+import threading
+import unittest
+import urllib.request
+from concurrent.futures import Future
+
+from resolume_colour_picker.metrics import (
+    REGISTRY, REQUESTS_DROPPED, REQUESTS_SENT, Counter, Gauge, Histogram, MetricsServer, Registry
+)
+from test_dispatcher import create_dispatcher, create_mock_config, main
+from test_scene_master import TestSceneMasterBase
+
+
+class TestMetrics(unittest.TestCase):
+    """Test counters, histograms and gauges"""
+
+    def setUp(self):
+        self.registry = Registry()
+
+    def test_counter_sums_across_threads(self):
+        """Test increments from many threads all count"""
+        counter = self.registry.register(Counter("test_total", "Test", ["host"]))
+
+        def work():
+            for _ in range(1000):
+                counter.inc(host="main")
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(counter.value(host="main"), 8000)
+        self.assertIn('test_total{host="main"} 8000', self.registry.render())
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test histogram output follows the Prometheus bucket format"""
+        histogram = self.registry.register(Histogram("latency_seconds", "Test", ["layer"], buckets=(0.01, 0.1)))
+        for value in (0.005, 0.01, 0.05, 0.5):
+            histogram.observe(value, layer=1)
+        text = self.registry.render()
+        self.assertIn("# TYPE latency_seconds histogram", text)
+        self.assertIn('latency_seconds_bucket{layer="1",le="0.01"} 2', text)
+        self.assertIn('latency_seconds_bucket{layer="1",le="0.1"} 3', text)
+        self.assertIn('latency_seconds_bucket{layer="1",le="+Inf"} 4', text)
+        self.assertIn('latency_seconds_count{layer="1"} 4', text)
+        self.assertEqual(histogram.count(layer=1), 4)
+
+    def test_label_values_are_escaped(self):
+        """Test quotes in label values can't break the output"""
+        counter = self.registry.register(Counter("test_total", "Test", ["host"]))
+        counter.inc(host='stage "left"')
+        self.assertIn('test_total{host="stage \\"left\\""} 1', self.registry.render())
+
+    def test_gauge_reads_callback_and_forgets_dead_owners(self):
+        """Test gauges are read at scrape time without keeping their owner alive"""
+        gauge = self.registry.register(Gauge("depth", "Test", ["host"]))
+
+        class Owner:
+            def depths(self):
+                return {("main",): 3}
+
+        owner = Owner()
+        gauge.add_callback(owner.depths)
+        self.assertIn('depth{host="main"} 3', self.registry.render())
+        del owner
+        gc.collect()
+        self.assertNotIn('depth{host="main"}', self.registry.render())
+
+    def test_endpoint_serves_registry(self):
+        """Test /metrics serves the text format and other paths 404"""
+        counter = self.registry.register(Counter("served_total", "Test"))
+        counter.inc()
+        server = MetricsServer(0, host="127.0.0.1", registry=self.registry).start()
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics") as response:
+                self.assertIn("text/plain", response.headers["Content-Type"])
+                self.assertIn("served_total 1", response.read().decode())
+            with self.assertRaises(urllib.error.HTTPError):
+                urllib.request.urlopen(f"http://127.0.0.1:{server.port}/other")
+        finally:
+            server.stop()
+
+
+class TestDispatchMetrics(unittest.TestCase):
+    """Test the dispatcher reports sends and skips"""
+
+    def test_sent_and_skipped_requests_are_counted(self):
+        """Test each request handed to the transport, and each skip, is counted"""
+        dispatcher = create_dispatcher()
+        sent = REQUESTS_SENT.value(host="main", lane="normal")
+        unchanged = REQUESTS_DROPPED.value(host="main", reason="unchanged")
+        dispatcher.send(main({1: "#ff0000", 2: "#ff0000"}))
+        dispatcher.send(main({1: "#ff0000"}))
+        self.assertEqual(REQUESTS_SENT.value(host="main", lane="normal") - sent, 2)
+        self.assertEqual(REQUESTS_DROPPED.value(host="main", reason="unchanged") - unchanged, 1)
+        self.assertIn("picker_request_latency_seconds_bucket", REGISTRY.render())
+
+    def test_queue_depth_counts_unfinished_requests(self):
+        """Test each lane's depth counts submitted requests until they finish"""
+        dispatcher = create_dispatcher()
+        channel = dispatcher.hosts["main"]
+        futures = []
+        channel.executor.submit = lambda fn, *args: futures.append(Future()) or futures[-1]
+        dispatcher.send(main({1: "#ff0000", 2: "#00ff00"}))
+        self.assertEqual(dispatcher.queue_depths()[("main", "normal")], 2)
+        futures[0].set_result(None)
+        futures[1].cancel()
+        self.assertEqual(dispatcher.queue_depths()[("main", "normal")], 0)
+        self.assertEqual(dispatcher.queue_depths()[("main", "panic")], 0)
+
+
+class TestMetricsPort(TestSceneMasterBase):
+    """Test the engine only rebinds the endpoint when METRICS_PORT changes"""
+
+    def _create_mock_config(self):
+        config = create_mock_config({
+            "COLOUR_SET": {"Red": "#FF0000"},
+            "LAYER_MAP": {"ALL": "ALL", "Outer": 1},
+            "METRICS_PORT": "0",
+        })
+        self.data = config.data
+        return config
+
+    def tearDown(self):
+        if self.engine.metrics_server is not None:
+            self.engine.metrics_server.stop()
+        super().tearDown()
+
+    def test_unchanged_port_keeps_endpoint(self):
+        """Test a settings save that leaves METRICS_PORT alone keeps the endpoint bound"""
+        server = self.engine.metrics_server
+        self.assertIsNotNone(server)
+        self.engine.config_callback("METRICS_PORT", "0")
+        self.assertIs(self.engine.metrics_server, server)
+        self.data["METRICS_PORT"] = ""
+        self.engine.config_callback("METRICS_PORT", "")
+        self.assertIsNone(self.engine.metrics_server)
+
+    def test_all_interfaces_is_opt_in(self):
+        """Test the endpoint listens locally until METRICS_ALL_INTERFACES is ticked"""
+        self.assertEqual(self.engine.metrics_server.httpd.server_address[0], "127.0.0.1")
+        self.data["METRICS_ALL_INTERFACES"] = True
+        self.engine.config_callback("METRICS_ALL_INTERFACES", True)
+        self.assertEqual(self.engine.metrics_server.httpd.server_address[0], "0.0.0.0")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+"""
+Tests for swatch library import and the nearest-colour index
+"""
+
+import json
+import unittest
+
+from resolume_colour_picker.palette import (
+    PaletteIndex, gradient, normalise_hex, parse_csv, parse_gpl, parse_json
+)
+
+
+class TestParsers(unittest.TestCase):
+    """Test the swatch library parsers"""
+
+    def test_parse_gpl(self):
+        """Test GIMP palettes skip headers and comments"""
+        text = "GIMP Palette\nName: Stage\nColumns: 4\n# comment\n255   0   0\tRed\n  0 0 255 Deep Blue\n0 255 0\n"
+        self.assertEqual(parse_gpl(text), [
+            ("Red", "#ff0000"),
+            ("Deep Blue", "#0000ff"),
+            ("#00ff00", "#00ff00"),
+        ])
+
+    def test_parse_gpl_requires_header(self):
+        """Test a file without the GIMP header is rejected"""
+        with self.assertRaises(ValueError):
+            parse_gpl("255 0 0 Red\n")
+
+    def test_parse_csv_formats(self):
+        """Test CSV accepts name/hex, name/r/g/b and bare hex rows"""
+        text = "name,hex\nRed,#FF0000\nBlue,0,0,255\n00ff00\n"
+        self.assertEqual(parse_csv(text), [
+            ("Red", "#ff0000"),
+            ("Blue", "#0000ff"),
+            ("#00ff00", "#00ff00"),
+        ])
+
+    def test_parse_csv_rejects_bad_row(self):
+        """Test a malformed row after the header raises"""
+        with self.assertRaises(ValueError):
+            parse_csv("Red,#FF0000\nBlue,not-a-colour\n")
+
+    def test_parse_json_colour_set_format(self):
+        """Test the COLOUR_SET dict format round-trips"""
+        text = json.dumps({"1 - Red": "#FF0000", "2 - Blue": "#0000ff"})
+        self.assertEqual(parse_json(text), [("1 - Red", "#ff0000"), ("2 - Blue", "#0000ff")])
+
+    def test_parse_json_list_format(self):
+        """Test lists of objects and bare strings"""
+        text = json.dumps([{"name": "Red", "hex": "#ff0000"}, "#00FF00"])
+        self.assertEqual(parse_json(text), [("Red", "#ff0000"), ("#00FF00", "#00ff00")])
+
+    def test_normalise_hex(self):
+        """Test hex normalisation"""
+        self.assertEqual(normalise_hex(" FFa500 "), "#ffa500")
+        self.assertIsNone(normalise_hex("#fff"))
+        self.assertIsNone(normalise_hex("Red"))
+
+
+class TestPaletteIndex(unittest.TestCase):
+    """Test nearest-colour lookups"""
+
+    def setUp(self):
+        self.index = PaletteIndex([
+            ("Red", "#ff0000"),
+            ("Blue", "#0000ff"),
+            ("White", "#ffffff"),
+            ("Black", "#000000"),
+        ])
+
+    def test_exact_match(self):
+        """Test an exact swatch snaps to itself"""
+        self.assertEqual(self.index.snap("#0000ff"), ("Blue", "#0000ff"))
+
+    def test_nearest(self):
+        """Test near colours snap to the perceptually closest swatch"""
+        self.assertEqual(self.index.snap("#e01010")[0], "Red")
+        self.assertEqual(self.index.snap("#f0f0f0")[0], "White")
+        self.assertEqual(self.index.snap("#101018")[0], "Black")
+
+    def test_nearest_many_matches_single(self):
+        """Test batched lookups agree with single lookups"""
+        queries = ["#e01010", "#f0f0f0", "#101018", "#2020c0"] * 300
+        expected = [self.index.nearest(q) for q in queries]
+        self.assertEqual(list(self.index.nearest_many(queries, chunk=7)), expected)
+
+    def test_empty_index_raises(self):
+        """Test lookups on an empty index raise ValueError"""
+        with self.assertRaises(ValueError):
+            PaletteIndex([]).nearest("#ffffff")
+
+
+
+class TestGradient(unittest.TestCase):
+    """Test gradients blended in OKLab"""
+
+    def test_ends_are_the_stops(self):
+        """Test the first and last layers get the start and end colours exactly"""
+        colours = gradient(["#FF0000", "#0000ff"], 7)
+        self.assertEqual(len(colours), 7)
+        self.assertEqual((colours[0], colours[-1]), ("#ff0000", "#0000ff"))
+        self.assertEqual(gradient(["#ff0000", "#0000ff"], 1), ["#ff0000"])
+        self.assertEqual(gradient(["#ff0000", "#0000ff"], 0), [])
+
+    def test_middle_stop_is_passed_through(self):
+        """Test an odd count puts the middle stop on the centre layer"""
+        colours = gradient(["#ff0000", "#ffffff", "#0000ff"], 5)
+        self.assertEqual(colours[2], "#ffffff")
+        # Blended perceptually, not as the sRGB average
+        self.assertNotEqual(colours[1], "#ff8080")
+
+    def test_bad_stops_raise(self):
+        """Test a gradient needs two valid hex stops"""
+        with self.assertRaises(ValueError):
+            gradient(["#ff0000"], 4)
+        with self.assertRaises(ValueError):
+            gradient(["#ff0000", "Blue"], 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
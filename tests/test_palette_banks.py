@@ -0,0 +1,148 @@
+"""
+Tests for palette banks: the page cache and switching banks in the engine
+"""
+
+import unittest
+
+from resolume_colour_picker.palette_banks import PageCache
+from test_dispatcher import create_mock_config
+from test_scene_master import TestSceneMasterBase
+
+
+BANKS = {
+    "Warm": {"Red": "#FF0000", "Amber": "#FFBF00", "Orange": "#FFA500"},
+    "Cool": {"Blue": "#0000FF", "Cyan": "#00FFFF", "Red": "#ff0000"},
+    "Mono": {"White": "#FFFFFF", "Grey": "#808080"},
+}
+
+
+class Page:
+    def __init__(self, bank):
+        self.bank = bank
+
+
+class TestPageCache(unittest.TestCase):
+    """Test least-recently-shown eviction"""
+
+    def test_least_recently_shown_is_evicted(self):
+        """Test going over the size evicts the page shown longest ago"""
+        cache = PageCache(2)
+        warm, cool, mono = Page("Warm"), Page("Cool"), Page("Mono")
+        self.assertEqual(cache.put(warm), [])
+        self.assertEqual(cache.put(cool), [])
+        self.assertIs(cache.get("Warm"), warm)
+        self.assertEqual(cache.put(mono), [cool])
+        self.assertEqual([page.bank for page in cache.pages()], ["Warm", "Mono"])
+
+    def test_replaced_page_is_returned(self):
+        """Test caching a rebuilt page hands back the one it replaces"""
+        cache = PageCache(2)
+        old, new = Page("Warm"), Page("Warm")
+        cache.put(old)
+        self.assertEqual(cache.put(new), [old])
+        self.assertEqual(len(cache), 1)
+
+
+class TestBankSwitching(TestSceneMasterBase):
+    """Test switching banks in the engine"""
+
+    def _create_mock_config(self):
+        config = create_mock_config({
+            "COLOUR_SET": dict(BANKS["Warm"]),
+            "PALETTE_BANKS": {name: dict(colours) for name, colours in BANKS.items()},
+            "ACTIVE_BANK": "Warm",
+            "LAYER_MAP": {"ALL": "ALL", "Outer": 1, "Inner": 2},
+        })
+        self.data = config.data
+        return config
+
+    def setUp(self):
+        super().setUp()
+        self.sent = []
+        self.engine.dispatcher.send = lambda targets, force=False: self.sent.append(dict(targets))
+
+    def test_first_switch_builds_then_flips(self):
+        """Test a bank's grid is built once and reused, buttons and all"""
+        warm = self.engine.page
+        self.assertEqual(warm.bank, "Warm")
+        self.engine.switch_bank("Cool")
+        self.assertEqual(self.engine.colour_rows[0], ("Blue", "#0000FF"))
+        self.assertEqual(self.data["COLOUR_SET"], BANKS["Cool"])
+        self.assertEqual(self.data["ACTIVE_BANK"], "Cool")
+        button = self.engine.buttons[("Outer", 0)]
+        self.engine.switch_bank("Warm")
+        self.assertIs(self.engine.page, warm)
+        self.assertIs(self.engine.grid_stack.currentWidget(), warm.widget)
+        self.engine.switch_bank("Cool")
+        self.assertIs(self.engine.buttons[("Outer", 0)], button)
+
+    def test_colour_set_echo_does_not_rebuild(self):
+        """Test the COLOUR_SET change a switch makes doesn't tear the new grid down"""
+        self.engine.switch_bank("Cool")
+        button = self.engine.buttons[("Outer", 0)]
+        self.engine.config_callback("COLOUR_SET", self.data["COLOUR_SET"])
+        self.assertIs(self.engine.buttons[("Outer", 0)], button)
+
+    def test_live_state_follows_colours(self):
+        """Test live columns stay selected where the new bank has their colour, and come back when it returns"""
+        self.engine.on_press("Outer", 0, None)  # Red
+        self.engine.on_press("Inner", 1, None)  # Amber
+        self.engine.switch_bank("Cool")
+        self.assertEqual(self.engine.selected_in_column, {"Outer": 2})
+        self.assertEqual(self.engine.button_states, {("Outer", 2): 1})
+        self.assertEqual(self.engine.carried_live, {"Inner": "#FFBF00"})
+        self.engine.force_resend()
+        self.assertEqual(self.sent[-1], {("main", 1): "#ff0000", ("main", 2): "#FFBF00"})
+
+        self.engine.switch_bank("Warm")
+        self.assertEqual(self.engine.selected_in_column, {"Outer": 0, "Inner": 1})
+        self.assertEqual(self.engine.button_states, {("Outer", 0): 1, ("Inner", 1): 1})
+        self.assertEqual(len(self.sent), 3)  # switching sends nothing
+
+    def test_standby_follows_colours(self):
+        """Test a queued button moves to the same colour in the new bank"""
+        self.engine.toggle_scene_master()
+        self.engine.on_press("Outer", 0, None)
+        self.engine.switch_bank("Cool")
+        self.assertEqual(self.engine.standby_selections, {("Outer", 2): True})
+        self.assertEqual(self.engine.button_states, {("Outer", 2): 2})
+        self.engine.send_queued_changes()
+        self.assertEqual(self.sent, [{("main", 1): "#FF0000"}])
+
+    def test_cache_is_bounded(self):
+        """Test the least recently shown grid is deleted once the cache is full"""
+        self.engine.switch_bank("Cool")
+        self.engine.switch_bank("Mono")
+        self.assertEqual([page.bank for page in self.engine.pages.pages()], ["Cool", "Mono"])
+        self.assertEqual(self.engine.grid_stack.count(), 2)
+
+    def test_edits_update_the_bank(self):
+        """Test editing COLOUR_SET saves into the bank on screen, and a bank edited elsewhere is rebuilt"""
+        self.engine.switch_bank("Cool")
+        self.data["COLOUR_SET"] = {"Blue": "#0000FF"}
+        self.engine.config_callback("COLOUR_SET", None)
+        self.assertEqual(self.data["PALETTE_BANKS"]["Cool"], {"Blue": "#0000FF"})
+
+        self.data["PALETTE_BANKS"]["Warm"] = {"Red": "#FF0000"}
+        self.engine.config_callback("PALETTE_BANKS", None)
+        self.assertNotIn("Warm", self.engine.pages)
+        self.engine.switch_bank("Warm")
+        self.assertEqual(len(self.engine.colour_rows), 1)
+
+    def test_bank_bar(self):
+        """Test there is a button per bank and the one on screen is checked"""
+        self.assertEqual(list(self.engine.bank_buttons), ["Warm", "Cool", "Mono"])
+        self.engine.bank_buttons["Mono"].click()
+        self.assertEqual(self.engine.page.bank, "Mono")
+        self.assertTrue(self.engine.bank_buttons["Mono"].isChecked())
+        self.assertFalse(self.engine.bank_buttons["Warm"].isChecked())
+
+    def test_unknown_bank_is_ignored(self):
+        """Test a bank that doesn't exist leaves the grid alone"""
+        with self.assertLogs("resolume_colour_picker.application", "WARNING"):
+            self.engine.switch_bank("Nope")
+        self.assertEqual(self.engine.page.bank, "Warm")
+
+
+if __name__ == '__main__':
+    unittest.main()
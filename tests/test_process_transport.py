@@ -0,0 +1,167 @@
+"""
+Tests for the shared-memory command ring and the dispatch process
+"""
+
+import time
+import unittest
+
+from PySide6.QtCore import QCoreApplication
+
+from resolume_colour_picker.dispatcher import Dispatcher
+from resolume_colour_picker.process_transport import ACK, COMMAND, DROPPED, GROUP, OK, PANIC, DispatchProcess, Ring
+from resolume_colour_picker.stand_in_server import StandInResolume
+from test_dispatcher import BASE_PAYLOAD, create_mock_config, main
+
+
+def wait_for(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return condition()
+
+
+class TestRing(unittest.TestCase):
+    """Test the single-producer, single-consumer ring"""
+
+    def setUp(self):
+        self.ring = Ring(ACK, capacity=4)
+
+    def tearDown(self):
+        self.ring.close()
+
+    def test_records_come_out_in_order(self):
+        """Test records are read back in the order written"""
+        for seq in range(3):
+            self.assertTrue(self.ring.push(seq, OK, 200, 1.5))
+        self.assertEqual([self.ring.pop()[0] for _ in range(3)], [0, 1, 2])
+        self.assertIsNone(self.ring.pop())
+
+    def test_full_ring_refuses_push(self):
+        """Test a full ring reports back-pressure rather than overwriting"""
+        for seq in range(4):
+            self.assertTrue(self.ring.push(seq, OK, 200, 0.0))
+        self.assertFalse(self.ring.push(4, OK, 200, 0.0))
+        self.assertEqual(self.ring.pop()[0], 0)
+        self.assertTrue(self.ring.push(4, OK, 200, 0.0))
+
+    def test_wraps_around(self):
+        """Test indices keep working past the end of the buffer"""
+        for seq in range(10):
+            self.ring.push(seq, OK, 200, 0.0)
+            self.assertEqual(self.ring.pop()[0], seq)
+        self.assertEqual(len(self.ring), 0)
+
+    def test_second_handle_sees_same_records(self):
+        """Test a ring attached by name shares the records"""
+        other = Ring(ACK, capacity=4, name=self.ring.name)
+        self.ring.push(7, OK, 204, 2.0)
+        seq, outcome, status, latency = other.pop()
+        self.assertEqual((seq, outcome, status), (7, OK, 204))
+        self.assertAlmostEqual(latency, 2.0)
+        other.close()
+
+    def test_command_is_fixed_size(self):
+        """Test commands stay compact"""
+        self.assertEqual(COMMAND.size, 20)
+
+
+class TestDispatchProcess(unittest.TestCase):
+    """Test sending through the child process"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+        cls.server = StandInResolume().start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def test_commands_are_sent_and_acknowledged(self):
+        """Test the child sends each command and acknowledges it"""
+        transport = DispatchProcess([("main", "127.0.0.1", str(self.server.port))], BASE_PAYLOAD)
+        try:
+            acks = []
+            first = transport.push("main", 3, "#FF8000")
+            wait_for(lambda: acks.extend(transport.drain_acks()) or len(acks) == 1)
+            second = transport.push("main", 4, "#000000", PANIC)
+            wait_for(lambda: acks.extend(transport.drain_acks()) or len(acks) == 2)
+        finally:
+            transport.stop()
+        self.assertEqual([ack[0] for ack in acks], [first, second])
+        self.assertEqual([ack[1] for ack in acks], [OK, OK])
+        self.assertEqual(self.server.colours[3], "#ff8000")
+        self.assertEqual(self.server.colours[4], "#000000")
+
+    def test_group_commands_colour_the_group(self):
+        """Test a command flagged as a group goes to the layer group, not the layer"""
+        transport = DispatchProcess([("main", "127.0.0.1", str(self.server.port))], BASE_PAYLOAD)
+        try:
+            acks = []
+            transport.push("main", 2, "#00FFFF", GROUP)
+            wait_for(lambda: acks.extend(transport.drain_acks()) or len(acks) == 1)
+        finally:
+            transport.stop()
+        self.assertEqual([ack[1] for ack in acks], [OK])
+        self.assertEqual(self.server.colours["G2"], "#00ffff")
+
+    def test_panic_drops_queued_commands(self):
+        """Test commands queued in the child before a panic are not sent"""
+        transport = DispatchProcess([("main", "127.0.0.1", str(self.server.port))], BASE_PAYLOAD)
+        try:
+            for _ in range(20):
+                transport.push("main", 5, "#123456")
+            panic = transport.push("main", 5, "#000000", PANIC)
+            acks = []
+            wait_for(lambda: acks.extend(transport.drain_acks()) or len(acks) == 21)
+        finally:
+            transport.stop()
+        self.assertIn(DROPPED, [ack[1] for ack in acks])
+        # Requests already on the wire may still land after it; the reconciler catches those
+        self.assertEqual([ack[1] for ack in acks if ack[0] == panic], [OK])
+
+    def test_dispatcher_confirms_layers_from_acks(self):
+        """Test isolated dispatch updates layer state like threaded dispatch"""
+        config = create_mock_config({
+            "WEBSERVER_IP": "127.0.0.1",
+            "WEBSERVER_PORT": str(self.server.port),
+            "ISOLATED_DISPATCH": True,
+        })
+        dispatcher = Dispatcher(config, BASE_PAYLOAD)
+        try:
+            self.assertIsNotNone(dispatcher.transport)
+            dispatcher.send(main({1: "#00ff00", 2: "#0000ff"}))
+            state = dispatcher.hosts["main"].state
+
+            def confirmed():
+                dispatcher.poll_acks()
+                return state.confirmed == {1: "#00ff00", 2: "#0000ff"}
+
+            self.assertTrue(wait_for(confirmed))
+            self.assertEqual(state.in_flight, {})
+        finally:
+            dispatcher.close()
+        self.assertIsNone(dispatcher.transport)
+
+    def test_unchanged_hosts_keep_the_process(self):
+        """Test a settings save that changes no host leaves the dispatch process running"""
+        config = create_mock_config({
+            "WEBSERVER_IP": "127.0.0.1",
+            "WEBSERVER_PORT": str(self.server.port),
+            "ISOLATED_DISPATCH": True,
+        })
+        dispatcher = Dispatcher(config, BASE_PAYLOAD)
+        try:
+            transport = dispatcher.transport
+            for key in ("WEBSERVER_IP", "WEBSERVER_PORT", "EXTRA_HOSTS"):
+                dispatcher.config_callback(key, config.get(key))
+            self.assertIs(dispatcher.transport, transport)
+            config["WEBSERVER_PORT"] = "1"
+            dispatcher.config_callback("WEBSERVER_PORT", "1")
+            self.assertIsNot(dispatcher.transport, transport)
+        finally:
+            dispatcher.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
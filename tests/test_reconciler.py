@@ -0,0 +1,98 @@
+"""
+Tests for read-back reconciliation of layer colours
+"""
+
+import unittest
+from unittest.mock import MagicMock
+
+from PySide6.QtWidgets import QApplication
+
+from resolume_colour_picker.reconciler import Reconciler, reported_colour
+from test_dispatcher import create_dispatcher, main
+
+
+def clip_with_colour(colour):
+    return {"video": {"effects": [{"params": {"Color": {"value": colour}}}]}}
+
+
+class TestReconciler(unittest.TestCase):
+    """Test divergence detection and bounded read-backs"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance()
+        if cls.app is None:
+            cls.app = QApplication([])
+
+    def setUp(self):
+        self.dispatcher = create_dispatcher()
+        self.reconciler = Reconciler(self.dispatcher)
+        self.reconciler.executor = MagicMock()
+        self.reconciler.executor.submit = MagicMock(side_effect=lambda fn, *args: fn(*args))
+        self.reconciler.session = MagicMock()
+        self.events = []
+        self.reconciler.layer_diverged.connect(lambda layer, diverged: self.events.append((layer, diverged)))
+
+    def _report(self, colour):
+        self.reconciler.session.get.return_value = MagicMock(ok=True, json=lambda: clip_with_colour(colour))
+
+    def test_reported_colour_normalises(self):
+        """Test alpha and case are ignored in read-backs"""
+        self.assertEqual(reported_colour(clip_with_colour("#FF0000FF")), "#ff0000")
+        self.assertIsNone(reported_colour({"video": {"effects": []}}))
+
+    def test_matching_layer_is_not_resent(self):
+        """Test a layer showing the desired colour is left alone"""
+        self.dispatcher.send(main({1: "#ff0000"}))
+        self._report("#FF0000")
+        self.reconciler.tick()
+        self.assertEqual(self.dispatcher.session.put.call_count, 1)
+        self.assertEqual(self.events, [])
+
+    def test_diverged_layer_is_marked_and_resent(self):
+        """Test a layer showing the wrong colour is flagged and resent"""
+        self.dispatcher.send(main({1: "#ff0000"}))
+        self._report("#0000ff")
+        self.reconciler.tick()
+        self.assertEqual(self.dispatcher.session.put.call_count, 2)
+        self.assertEqual(self.events, [(("main", 1), True)])
+
+        self._report("#ff0000")
+        self.reconciler.tick()
+        self.assertEqual(self.events, [(("main", 1), True), (("main", 1), False)])
+        self.assertEqual(self.reconciler.diverged, set())
+
+    def test_one_read_per_tick_round_robin(self):
+        """Test each tick reads exactly one layer, cycling through all of them"""
+        self.dispatcher.send(main({1: "#ff0000", 2: "#ff0000", 3: "#ff0000"}))
+        self._report("#ff0000")
+        for _ in range(6):
+            self.reconciler.tick()
+        urls = [call.args[0] for call in self.reconciler.session.get.call_args_list]
+        self.assertEqual(len(urls), 6)
+        self.assertEqual([url.split("/layers/")[1][0] for url in urls], ["1", "2", "3", "1", "2", "3"])
+
+    def test_no_read_while_one_outstanding(self):
+        """Test a slow read-back blocks further reads rather than stacking them"""
+        self.reconciler.executor.submit = MagicMock()
+        self.dispatcher.send(main({1: "#ff0000", 2: "#ff0000"}))
+        self.reconciler.tick()
+        self.reconciler.tick()
+        self.assertEqual(self.reconciler.executor.submit.call_count, 1)
+
+    def test_stale_read_is_ignored(self):
+        """Test a press made during the read-back discards the result"""
+        self.dispatcher.send(main({1: "#ff0000"}))
+        self.reconciler._compare(("main", 1), "#00ff00", "#ff0000")
+        self.assertEqual(self.dispatcher.session.put.call_count, 1)
+
+    def test_no_reads_while_breaker_open(self):
+        """Test nothing is read while Resolume is unreachable"""
+        self.dispatcher.send(main({1: "#ff0000"}))
+        self.dispatcher.on_heartbeat("main", False)
+        self.reconciler.tick()
+        self.reconciler.session.get.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
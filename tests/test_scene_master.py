@@ -11,6 +11,8 @@ from PySide6.QtWidgets import QApplication
 
 from resolume_colour_picker.application import ColourPickerEngine
 from resolume_colour_picker.config import Config
+from resolume_colour_picker.gradient_dialogue import GradientDialog
+from resolume_colour_picker.stall_watchdog import Stall
 
 
 class TestSceneMasterBase(unittest.TestCase):
@@ -29,10 +31,19 @@ class TestSceneMasterBase(unittest.TestCase):
         self.consts = self._create_consts()
         self.engine = self._create_engine()
 
+    def tearDown(self):
+        """Stop the engine's timers so they don't fire during later tests"""
+        self.engine.timer.stop()
+        self.engine.reconciler.stop()
+        self.engine.watchdog.stop()
+        self.engine.dispatcher.close()
+        self.engine.close()
+        self.engine.deleteLater()
+
     def _create_mock_config(self):
         """Create a mock config object"""
         config = MagicMock(spec=Config)
-        config.__getitem__ = MagicMock(side_effect=lambda key: {
+        data = {
             "WEBSERVER_IP": "localhost",
             "WEBSERVER_PORT": 8080,
             "COLOUR_SET": {
@@ -42,10 +53,12 @@ class TestSceneMasterBase(unittest.TestCase):
             },
             "LAYER_MAP": {
                 "ALL": "ALL",
-                "Outer": "Layer 1",
-                "Inner": "Layer 2",
+                "Outer": 1,
+                "Inner": 2,
             }
-        }[key])
+        }
+        config.__getitem__ = MagicMock(side_effect=lambda key: data[key])
+        config.get = MagicMock(side_effect=lambda key, default=None: data.get(key, default))
         config.value_changed = MagicMock()
         config.value_changed.connect = MagicMock()
         return config
@@ -56,7 +69,18 @@ class TestSceneMasterBase(unittest.TestCase):
             "WINDOW_SIZE": (900, 700),
             "BUTTON_HEIGHT": 55,
             "DARKEN_FACTOR": 0.65,
-            "HEARTBEAT_INTERVAL": 3000
+            "HEARTBEAT_INTERVAL": 3000,
+            "RECONCILE_INTERVAL": 1000,
+            "KEEPALIVE_INTERVAL": 10000,
+            "STALL_PROBE_INTERVAL": 10,
+            "STALL_THRESHOLD": 100,
+            "BANK_CACHE_SIZE": 2,
+            "FILE_RELOAD_DEBOUNCE": 10,
+            "THUMBNAIL_HEIGHT": 48,
+            "THUMBNAIL_WORKERS": 2,
+            "THUMBNAIL_CACHE_BYTES": 1024 * 1024,
+            "FADER_STEPS": 1000,
+            "PANIC_COLOURS": {"Blackout": ("#000000", "Ctrl+Shift+B")}
         }
 
     def _create_engine(self):
@@ -82,8 +106,11 @@ class TestSceneMasterBase(unittest.TestCase):
             with patch('resolume_colour_picker.application.files', mock_files):
                 engine = ColourPickerEngine(self.mock_config, self.consts)
                 engine.show()  # Make sure the widget is shown for visibility checks
-                engine.session = MagicMock()
-                engine.executor = MagicMock()
+                for channel in engine.dispatcher.hosts.values():
+                    channel.session = MagicMock()
+                    channel.executor = MagicMock()
+                    channel.priority_session = MagicMock()
+                    channel.priority_executor = MagicMock()
                 return engine
 
 
@@ -435,5 +462,122 @@ class TestUIConsistency(TestSceneMasterBase):
         self.assertEqual(len(self.engine.queued_changes), non_all_count)
 
 
+
+class TestPanic(TestSceneMasterBase):
+    """Test the panic action from the engine"""
+
+    def test_panic_sends_through_priority_lane(self):
+        """Test a panic goes out on the priority lane for every mapped layer"""
+        self.engine.panic("Blackout")
+        for channel in self.engine.dispatcher.hosts.values():
+            self.assertEqual(channel.priority_executor.submit.call_count, 2)
+            channel.executor.submit.assert_not_called()
+
+    def test_panic_clears_live_selection(self):
+        """Test no grid button stays selected once a panic has gone out"""
+        self.engine._add_buttons()
+        self.engine.select_single("Outer", 0)
+        self.engine.panic("Blackout")
+        self.assertEqual(self.engine.live_selections, {})
+        self.assertNotIn("Outer", self.engine.selected_in_column)
+
+    def test_panic_keeps_standby_selection(self):
+        """Test a queued scene survives a panic so it can still be sent"""
+        self.engine._add_buttons()
+        self.engine.toggle_scene_master()
+        self.engine.select_single("Outer", 1)
+        self.engine.panic("Blackout")
+        self.assertIn(("Outer", 1), self.engine.standby_selections)
+        self.assertEqual(self.engine.selected_in_column["Outer"], 1)
+
+    def test_panic_requested_signal(self):
+        """Test remote inputs can trigger a panic through the signal"""
+        self.engine.dispatcher.panic = MagicMock()
+        self.engine.panic_requested.emit("Blackout")
+        self.engine.dispatcher.panic.assert_called_once_with("Blackout")
+
+
+class TestGradient(TestSceneMasterBase):
+    """Test gradients spread across the mapped layers"""
+
+    def setUp(self):
+        super().setUp()
+        self.engine._add_buttons()
+        self.sent = []
+        self.engine.dispatcher.send = lambda targets, force=False: self.sent.append(dict(targets))
+
+    def test_live_gradient_is_one_batch(self):
+        """Test every layer gets its own colour in a single send, and the headers show them"""
+        self.engine.select_single("Outer", 0)
+        self.engine.apply_gradient("#FF0000", "#0000FF")
+        self.assertEqual(self.sent, [{("main", 1): "#ff0000", ("main", 2): "#0000ff"}])
+        self.assertNotIn("Outer", self.engine.selected_in_column)
+        self.assertNotIn(("Outer", 0), self.engine.button_states)
+        self.assertIn("#ff0000", self.engine.header_labels["Outer"].styleSheet())
+        self.assertIn("solid", self.engine.header_labels["Outer"].styleSheet())
+
+    def test_press_replaces_gradient_on_its_column(self):
+        """Test a button press takes the column off the gradient and force resend keeps the rest"""
+        self.engine.apply_gradient("#FF0000", "#0000FF", "#FFFFFF")
+        self.engine.on_press("Outer", 1, None)
+        self.assertNotIn("Outer", self.engine.live_gradients)
+        self.assertNotIn("#ff0000", self.engine.header_labels["Outer"].styleSheet())
+        self.engine.force_resend()
+        self.assertEqual(self.sent[-1], {("main", 1): "#0000FF", ("main", 2): "#0000ff"})
+
+    def test_scene_master_queues_gradient_until_go(self):
+        """Test a gradient is standby until GO, then goes out with the other queued changes"""
+        self.engine.select_single("Inner", 0)
+        self.engine.toggle_scene_master()
+        self.engine.on_press("Outer", 1, None)
+        self.engine.apply_gradient("#FF0000", "#0000FF")
+        self.assertEqual(self.sent, [])
+        self.assertEqual(self.engine.queued_changes, [])
+        self.assertNotIn(("Outer", 1), self.engine.standby_selections)
+        self.assertIn("dashed", self.engine.header_labels["Inner"].styleSheet())
+        self.engine.on_press("Inner", 2, None)
+        self.engine.send_queued_changes()
+        self.assertEqual(self.sent, [{("main", 1): "#ff0000", ("main", 2): "#FFFF00"}])
+        self.assertEqual(list(self.engine.live_gradients), ["Outer"])
+        self.assertEqual(self.engine.selected_in_column, {"Inner": 2})
+
+    def test_cancel_and_panic_drop_gradients(self):
+        """Test cancel drops a queued gradient and a panic drops a live one"""
+        self.engine.apply_gradient("#FF0000", "#0000FF")
+        self.engine.toggle_scene_master()
+        self.engine.apply_gradient("#00FF00", "#FFFFFF")
+        self.engine.cancel_scene_master()
+        self.assertEqual(self.engine.standby_gradients, {})
+        self.assertIn("#ff0000", self.engine.header_labels["Outer"].styleSheet())
+        self.engine.panic("Blackout")
+        self.assertEqual(self.engine.live_gradients, {})
+        self.assertNotIn("background", self.engine.header_labels["Outer"].styleSheet())
+
+
+    def test_dialog_sends_picked_stops(self):
+        """Test the dialog resolves palette names and typed hex, and rejects anything else"""
+        dialog = GradientDialog(self.mock_config, self.engine)
+        self.assertEqual(dialog.stops(), ("#FF0000", "#FFFF00", None))
+        self.assertEqual(dialog.info_label.text(), "Across 2 layer(s)")
+        dialog.middle_combo.setCurrentText("00ff00")
+        dialog.end_combo.setCurrentText("2 - Blue")
+        dialog.apply()
+        self.assertEqual(self.sent, [{("main", 1): "#ff0000", ("main", 2): "#0000ff"}])
+        dialog.end_combo.setCurrentText("blue-ish")
+        self.assertFalse(dialog.apply_btn.isEnabled())
+        dialog.deleteLater()
+
+class TestStallIndicator(TestSceneMasterBase):
+    """Test the event-loop stall warning in the status bar"""
+
+    def test_stall_shows_warning_with_stack_tail(self):
+        """Test a stall lights the indicator and puts the stack in its tooltip"""
+        stall = Stall(0.0, 250.0, '  File "grid.py", line 12, in rebuild\n    apply_stylesheet()\n')
+        self.engine.update_stall_display(stall)
+        self.assertIn("250 ms", self.engine.stall_label.text())
+        self.assertIn("rebuild", self.engine.stall_label.toolTip())
+        self.assertTrue(self.engine.stall_clear_timer.isActive())
+
+
 if __name__ == '__main__':
     unittest.main()
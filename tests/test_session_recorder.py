@@ -0,0 +1,159 @@
+"""
+Tests for the session recorder and accelerated replay
+"""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from PySide6.QtCore import QCoreApplication
+
+from resolume_colour_picker import CONSTS, session_recorder
+from resolume_colour_picker.replay import HeadlessCore, ReplayConfig, analyse, replay
+from resolume_colour_picker.session_recorder import SessionRecorder, load_session
+
+
+LAYER_MAP = {"ALL": "ALL", "Inner": 1, "Outer": 2}
+COLOUR_SET = {"Red": "#FF0000", "Blue": "#0000FF"}
+
+
+def write_session(path, events, **header):
+    """Write a recording with chosen timestamps"""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"version": 1, "layer_map": LAYER_MAP, "colour_set": COLOUR_SET, **header}) + "\n")
+        for event in events:
+            f.write(json.dumps(event) + "\n")
+
+
+class TestSessionRecorder(unittest.TestCase):
+    """Test recording and loading sessions"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "sessions" / "session.jsonl"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        """Test events come back in order with their arguments"""
+        recorder = SessionRecorder(self.path, LAYER_MAP, COLOUR_SET)
+        recorder.record(session_recorder.PRESS, "Inner", 0, "#FF0000")
+        recorder.record(session_recorder.SCENE_MASTER)
+        recorder.record(session_recorder.GO)
+        recorder.record(session_recorder.PANIC, "Blackout")
+        recorder.close()
+
+        header, events = load_session(self.path)
+        self.assertEqual(header["layer_map"], LAYER_MAP)
+        self.assertEqual([kind for _, kind, _ in events], ["p", "s", "g", "x"])
+        self.assertEqual(events[0][2], ["Inner", 0, "#FF0000"])
+        self.assertEqual(events[3][2], ["Blackout"])
+        times = [ms for ms, _, _ in events]
+        self.assertEqual(times, sorted(times))
+
+    def test_torn_last_line_is_ignored(self):
+        """Test a recording cut off mid-write still loads"""
+        write_session(Path(self.tmp.name) / "torn.jsonl", [[0, "p", "Inner", 0, "#FF0000"]])
+        with open(Path(self.tmp.name) / "torn.jsonl", "a", encoding="utf-8") as f:
+            f.write('[12.5,"p","Out')
+        _, events = load_session(Path(self.tmp.name) / "torn.jsonl")
+        self.assertEqual(len(events), 1)
+
+
+class TestReplay(unittest.TestCase):
+    """Test replaying sessions against the stand-in server"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+
+    def test_headless_replay_delivers_every_final_colour(self):
+        """Test a fast replay lands each layer's last colour with nothing stale"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "session.jsonl"
+            write_session(path, [
+                [0, "p", "Inner", 0, "#FF0000"],
+                [3000, "p", "Outer", 1, "#0000FF"],
+                [6000, "p", "ALL", 1, "#0000FF"],
+                [9000, "s"],
+                [12000, "p", "Inner", 0, "#FF0000"],
+                [15000, "g"],
+                [18000, "x", "Blackout"],
+                [21000, "p", "Outer", 0, "#FF0000"],
+            ])
+            report = replay(path, speed=100, headless=True)
+        self.assertEqual(report["events"], 8)
+        self.assertEqual(report["dropped_final"], 0)
+        self.assertEqual(report["stale_arrivals"], 0)
+        self.assertEqual(report["mismatched_layers"], 0)
+        self.assertGreater(report["delivered"], 0)
+
+    def test_gradients_replay_headless(self):
+        """Test live and queued gradients replay and land on every layer"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "session.jsonl"
+            write_session(path, [
+                [0, "r", "#FF0000", "#0000FF", None],
+                [3000, "s"],
+                [6000, "r", "#00FF00", "#FFFFFF", "#FF00FF"],
+                [9000, "g"],
+                [12000, "f"],
+            ])
+            report = replay(path, speed=100, headless=True)
+        self.assertEqual(report["events"], 5)
+        self.assertEqual(report["dropped_final"], 0)
+        self.assertEqual(report["mismatched_layers"], 0)
+
+    def test_parameters_replay_headless(self):
+        """Test bound parameter moves replay with the bindings they were recorded with"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "session.jsonl"
+            write_session(path, [
+                [0, "v", "ALL", "Opacity", 0.5],
+                [3000, "p", "Inner", 0, "#FF0000"],
+                [6000, "v", "Inner", "Opacity", 1.0],
+            ], parameter_bindings={"Opacity": {"path": "video/opacity"}})
+            report = replay(path, speed=100, headless=True)
+        self.assertEqual(report["requests"], 4)  # one per layer for the ALL fader
+        self.assertEqual(report["mismatched_layers"], 0)
+
+    def test_press_replaces_gradient_headless(self):
+        """Test a press takes its column off the gradient, so force resend keeps the pressed colour"""
+        core = HeadlessCore(ReplayConfig({
+            "WEBSERVER_IP": "127.0.0.1",
+            "WEBSERVER_PORT": "9",
+            "LAYER_MAP": LAYER_MAP,
+            "EXTRA_HOSTS": [],
+            "COLUMN_HOSTS": {},
+        }), CONSTS)
+        core.dispatcher.send = MagicMock()
+        try:
+            core.apply_gradient("#FF0000", "#0000FF")
+            core.on_press("Inner", 1, "#00FF00")
+            self.assertEqual(list(core.live_gradient), core.dispatcher.targets_for("Outer"))
+            core.force_resend()
+            sent = core.dispatcher.send.call_args.args[0]
+            self.assertEqual([sent[target] for target in core.dispatcher.targets_for("Inner")], ["#00FF00"])
+
+            core.toggle_scene_master()
+            core.on_press("Outer", 0, "#FF0000")
+            core.send_queued_changes()
+            self.assertEqual(core.live_gradient, {})
+        finally:
+            core.dispatcher.close()
+
+    def test_analyse_counts_stale_and_dropped(self):
+        """Test an older colour landing after a newer one is stale, and lost changes are dropped"""
+        changes = [(0.0, 1, "#ff0000"), (0.1, 1, "#0000ff"), (0.2, 2, "#ff0000")]
+        arrivals = [(0.15, 1, "#0000ff"), (0.16, 1, "#ff0000")]
+        report = analyse(changes, arrivals, {1: "#ff0000"})
+        self.assertEqual(report["stale_arrivals"], 1)
+        self.assertEqual(report["dropped_final"], 1)
+        self.assertEqual(report["mismatched_layers"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+"""
+Tests for the memory soak harness, run briefly as a leak check
+"""
+
+import io
+import logging
+import unittest
+from unittest import mock
+
+from PySide6.QtWidgets import QApplication
+
+from resolume_colour_picker import soak
+
+
+class TestSoak(unittest.TestCase):
+    """Test repeated rebuilds, dialog opens and Scene Master cycles don't accumulate objects"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance()
+        if cls.app is None:
+            cls.app = QApplication([])
+
+    def test_short_soak_stays_flat(self):
+        """Test no widgets, QObjects or Python objects pile up over repeated cycles"""
+        out = io.StringIO()
+        # Keep the test runner's log capture, which holds every record, out of the count
+        logger = logging.getLogger("resolume_colour_picker")
+        level = logger.level
+        logger.setLevel(logging.WARNING)
+        try:
+            checkpoints = soak.run(cycles=30, warmup=5, report_every=15, out=out)
+        finally:
+            logger.setLevel(level)
+        self.assertEqual([cycles for cycles, _ in checkpoints], [15, 30])
+        final = checkpoints[-1][1]
+        self.assertLessEqual(final["widgets"], 0)
+        self.assertLessEqual(final["qobjects"], 0)
+        # Per-button or per-dialog leaks would add hundreds of objects a cycle
+        self.assertLess(final["objects"], 300, final["top_types"])
+
+    def test_growth_names_the_types_that_grew(self):
+        """Test the report lists grown types, largest first"""
+        before = soak.Snapshot(1000, 10, 10, soak.collections.Counter({"dict": 5, "QPushButton": 2}))
+        after = soak.Snapshot(3048, 12, 11, soak.collections.Counter({"dict": 6, "QPushButton": 40}))
+        result = soak.growth(before, after)
+        self.assertEqual(result["rss_kib"], 2048)
+        self.assertEqual(result["objects"], 39)
+        self.assertEqual(result["top_types"], [("QPushButton", 38), ("dict", 1)])
+
+
+    def test_rss_without_proc(self):
+        """Test memory is read where /proc isn't available, and importing the harness needs no Unix-only module"""
+        self.assertNotIn("resource", vars(soak))
+        with mock.patch("builtins.open", side_effect=OSError):
+            self.assertGreater(soak.rss_kib(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
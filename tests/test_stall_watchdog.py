@@ -0,0 +1,72 @@
+"""
+Tests for the GUI event-loop stall watchdog
+"""
+
+import time
+import unittest
+
+from PySide6.QtCore import QEventLoop, QTimer
+from PySide6.QtWidgets import QApplication
+
+from resolume_colour_picker.metrics import EVENT_LOOP_STALLS
+from resolume_colour_picker.stall_watchdog import StallWatchdog
+
+
+def block_gui(ms):
+    time.sleep(ms / 1000)
+
+
+def run_loop(ms):
+    loop = QEventLoop()
+    QTimer.singleShot(ms, loop.quit)
+    loop.exec()
+
+
+class TestStallWatchdog(unittest.TestCase):
+    """Test lag measurement and stack sampling"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance()
+        if cls.app is None:
+            cls.app = QApplication([])
+
+    def setUp(self):
+        run_loop(50)  # let anything earlier tests left queued, such as painting their windows, finish first
+        self.watchdog = StallWatchdog(probe_ms=10, threshold_ms=100)
+        self.stalls = []
+        self.watchdog.stall_detected.connect(self.stalls.append)
+        self.watchdog.start()
+
+    def tearDown(self):
+        self.watchdog.stop()
+
+    def test_idle_loop_has_no_stalls(self):
+        """Test a free-running event loop stays under the threshold"""
+        run_loop(200)
+        self.assertEqual(self.stalls, [])
+        self.assertLess(self.watchdog.last_lag_ms, 100)
+
+    def test_stall_is_logged_with_the_blocking_stack(self):
+        """Test a blocked GUI thread is reported with what was running"""
+        before = EVENT_LOOP_STALLS.value()
+        QTimer.singleShot(20, lambda: block_gui(300))
+        run_loop(400)
+
+        self.assertEqual(len(self.stalls), 1)
+        stall = self.stalls[0]
+        self.assertGreaterEqual(stall.duration_ms, 250)
+        self.assertIn("block_gui", stall.stack)
+        self.assertEqual(list(self.watchdog.stalls), [stall])
+        self.assertEqual(EVENT_LOOP_STALLS.value(), before + 1)
+
+    def test_stop_ends_the_monitor_thread(self):
+        """Test stopping joins the background thread"""
+        thread = self.watchdog._thread
+        self.watchdog.stop()
+        self.assertFalse(thread.is_alive())
+        self.assertFalse(self.watchdog.timer.isActive())
+
+
+if __name__ == '__main__':
+    unittest.main()
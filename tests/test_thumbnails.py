@@ -0,0 +1,182 @@
+"""
+Tests for clip thumbnails: the disk cache, fetching and the column headers
+"""
+
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from PySide6.QtWidgets import QApplication
+
+from resolume_colour_picker.stand_in_server import StandInResolume, solid_png
+from resolume_colour_picker.thumbnails import ThumbnailCache, ThumbnailFetcher
+from test_dispatcher import create_dispatcher, create_mock_config
+from test_palette_banks import BANKS
+from test_scene_master import TestSceneMasterBase
+
+
+def wait_for(app, condition, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.002)
+    return condition()
+
+
+class TestThumbnailCache(unittest.TestCase):
+    """Test the size-capped LRU on disk"""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+
+    def test_round_trip_survives_restart(self):
+        """Test images and their validators are there for the next launch"""
+        cache = ThumbnailCache(self.dir.name, 1000)
+        cache.put("http://a/1", b"image", etag='"abc"')
+        cache.close()
+        reopened = ThumbnailCache(self.dir.name, 1000)
+        self.assertEqual(reopened.get("http://a/1"), (b"image", {"etag": '"abc"'}))
+        self.assertIsNone(reopened.get("http://a/2"))
+
+    def test_least_recently_used_is_deleted(self):
+        """Test going over the size cap deletes the image used longest ago, file and all"""
+        cache = ThumbnailCache(self.dir.name, 10)
+        cache.put("one", b"1234")
+        time.sleep(0.01)
+        cache.put("two", b"1234")
+        time.sleep(0.01)
+        cache.get("one")
+        time.sleep(0.01)
+        cache.put("three", b"1234")
+        self.assertIn("one", cache)
+        self.assertNotIn("two", cache)
+        self.assertEqual(cache.total_bytes, 8)
+        self.assertEqual(len(list(Path(self.dir.name).glob("*.img"))), 2)
+
+
+class TestThumbnailFetcher(unittest.TestCase):
+    """Test fetching is cached, revalidated, bounded and kept out of dispatch's way"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        self.server = StandInResolume(latency_ms=5).start()
+        self.addCleanup(self.server.stop)
+        self.dispatcher = create_dispatcher(config_values={
+            "WEBSERVER_IP": "127.0.0.1", "WEBSERVER_PORT": str(self.server.port),
+        })
+        self.addCleanup(self.dispatcher.close)
+
+    def fetcher(self):
+        fetcher = ThumbnailFetcher(self.dispatcher, self.dir.name, 1024 * 1024, workers=2, retry_ms=5)
+        self.addCleanup(fetcher.close)
+        ready = []
+        fetcher.thumbnail_ready.connect(lambda target, data: ready.append((target, data)))
+        return fetcher, ready
+
+    def test_fetch_then_instant_from_cache(self):
+        """Test a second run shows the cached image at once and only revalidates it"""
+        fetcher, ready = self.fetcher()
+        fetcher.request([("main", 1)])
+        self.assertTrue(wait_for(self.app, lambda: ready))
+        self.assertEqual(ready, [(("main", 1), self.server.thumbnails[1])])
+        fetcher.close()
+
+        fetcher, ready = self.fetcher()
+        fetcher.request([("main", 1)])
+        self.assertEqual(ready, [(("main", 1), self.server.thumbnails[1])])  # before any network
+        self.assertTrue(wait_for(self.app, lambda: len(self.server.thumbnail_requests) == 2))
+        self.assertTrue(wait_for(self.app, lambda: not fetcher.running))
+        self.assertEqual(self.server.thumbnail_requests, [(1, False), (1, True)])
+        self.assertEqual(len(ready), 1)
+
+    def test_changed_clip_is_shown(self):
+        """Test revalidation picks up a thumbnail that changed since it was cached"""
+        fetcher, ready = self.fetcher()
+        fetcher.request([("main", 1)])
+        self.assertTrue(wait_for(self.app, lambda: ready))
+        fetcher.close()
+        self.server.thumbnails[1] = solid_png("#ff0000")
+
+        fetcher, ready = self.fetcher()
+        fetcher.request([("main", 1)])
+        self.assertTrue(wait_for(self.app, lambda: len(ready) == 2))
+        self.assertEqual(ready[-1][1], self.server.thumbnails[1])
+
+    def test_concurrency_is_bounded(self):
+        """Test no more than the worker count is fetched at once, and each layer once"""
+        fetcher, ready = self.fetcher()
+        fetcher.request([("main", layer) for layer in range(1, 7)] + [("main", 1), ("main", "G1")])
+        self.assertEqual(fetcher.running, 2)
+        self.assertEqual(len(fetcher.pending), 4)
+        self.assertTrue(wait_for(self.app, lambda: len(ready) == 6))
+        self.assertEqual(fetcher.fetch_count, 6)
+
+    def test_waits_for_dispatch(self):
+        """Test nothing is fetched while a colour request is in flight"""
+        fetcher, ready = self.fetcher()
+        self.dispatcher.hosts["main"].state.in_flight[1] = "#ff0000"
+        fetcher.request([("main", 1)])
+        wait_for(self.app, lambda: False, timeout=0.05)
+        self.assertEqual(fetcher.fetch_count, 0)
+        del self.dispatcher.hosts["main"].state.in_flight[1]
+        self.assertTrue(wait_for(self.app, lambda: ready))
+
+
+class TestHeaderThumbnails(TestSceneMasterBase):
+    """Test the column headers show their clip's thumbnail"""
+
+    def _create_mock_config(self):
+        self.server = StandInResolume().start()
+        self.addCleanup(self.server.stop)
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        config = create_mock_config({
+            "WEBSERVER_IP": "127.0.0.1",
+            "WEBSERVER_PORT": str(self.server.port),
+            "COLOUR_SET": dict(BANKS["Warm"]),
+            "PALETTE_BANKS": {name: dict(colours) for name, colours in BANKS.items()},
+            "ACTIVE_BANK": "Warm",
+            "LAYER_MAP": {"ALL": "ALL", "Outer": 1, "Inner": 2},
+            "SHOW_THUMBNAILS": True,
+        })
+        config.cache_dir = Path(self.dir.name)
+        self.data = config.data
+        return config
+
+    def tearDown(self):
+        self.engine.thumbnails.close()
+        super().tearDown()
+
+    def test_headers_show_thumbnails(self):
+        """Test each mapped column's header gets its clip's image, scaled to the header"""
+        labels = self.engine.thumbnail_labels
+        self.assertTrue(wait_for(self.app, lambda: not labels["Outer"].isHidden() and not labels["Inner"].isHidden()))
+        self.assertTrue(labels["ALL"].isHidden())
+        self.assertEqual(labels["Outer"].pixmap().height(), 48)
+
+    def test_new_bank_grid_shows_them_at_once(self):
+        """Test a grid built later shows thumbnails already fetched, without fetching again"""
+        self.assertTrue(wait_for(self.app, lambda: len(self.engine.thumbnail_pixmaps) == 2))
+        self.engine.switch_bank("Cool")
+        self.assertFalse(self.engine.thumbnail_labels["Outer"].isHidden())
+        self.assertEqual(self.engine.thumbnails.fetch_count, 2)
+
+    def test_turning_off_hides_them(self):
+        """Test SHOW_THUMBNAILS off stops fetching and hides every thumbnail"""
+        self.assertTrue(wait_for(self.app, lambda: len(self.engine.thumbnail_pixmaps) == 2))
+        fetcher = self.engine.thumbnails
+        self.data["SHOW_THUMBNAILS"] = False
+        self.engine.config_callback("SHOW_THUMBNAILS", False)
+        self.engine.thumbnails = fetcher  # for tearDown
+        self.assertTrue(self.engine.thumbnail_labels["Outer"].isHidden())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,247 @@
+"""
+Tests for the browser remote: delta state, the event stream and remote presses
+"""
+
+import http.client
+import json
+import queue
+import threading
+import time
+import unittest
+
+from PySide6.QtWidgets import QApplication
+
+from resolume_colour_picker.web_remote import RemoteState, WebRemote, button_key
+from test_scene_master import TestSceneMasterBase
+
+
+GRID = {
+    "columns": ["ALL", "Outer", "Inner"],
+    "rows": [["1 - Red", "#FF0000"], ["2 - Blue", "#0000FF"]],
+    "panics": {"Blackout": "#000000"},
+    "scene_master": False,
+}
+
+
+class EventClient:
+    """Reads one /events stream on its own thread, queueing (event, data) pairs"""
+
+    def __init__(self, port):
+        self.conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        self.conn.request("GET", "/events")
+        self.response = self.conn.getresponse()
+        self.events = queue.Queue()
+        threading.Thread(target=self._read, daemon=True).start()
+
+    def _read(self):
+        name = None
+        try:
+            for line in self.response:
+                line = line.decode().rstrip("\n")
+                if line.startswith("event: "):
+                    name = line[7:]
+                elif line.startswith("data: "):
+                    self.events.put((name, json.loads(line[6:])))
+        except (OSError, ValueError):
+            pass
+
+    def next(self, timeout=2.0):
+        return self.events.get(timeout=timeout)
+
+    def close(self):
+        self.conn.close()
+
+
+TOKEN = "secret"
+
+
+def post(port, path, body, **headers):
+    headers = {"Content-Type": "application/json", "X-Remote-Token": TOKEN, **headers}
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    conn.request("POST", path, json.dumps(body), headers)
+    status = conn.getresponse().status
+    conn.close()
+    return status
+
+
+class TestRemoteState(unittest.TestCase):
+    """Test versioned deltas"""
+
+    def setUp(self):
+        self.state = RemoteState(history=4)
+        self.state.reset({"scene_master": False})
+
+    def test_unchanged_keys_are_not_published(self):
+        """Test a publish of the same values changes nothing"""
+        self.assertEqual(self.state.publish({"scene_master": False}), 0)
+        self.assertEqual(self.state.publish({"scene_master": True, "held": 0}), 2)
+        self.assertEqual(self.state.values, {"scene_master": True, "held": 0})
+
+    def test_missed_deltas_are_merged(self):
+        """Test a late client gets one delta with the newest value of each key, and None for removals"""
+        version, _ = self.state.snapshot()
+        self.state.publish({"b0:Outer": 1})
+        self.state.publish({"b0:Outer": None, "b1:Outer": 1})
+        latest, changes = self.state.wait(version, 0)
+        self.assertEqual(latest, version + 2)
+        self.assertEqual(changes, {"b0:Outer": None, "b1:Outer": 1})
+        self.assertNotIn("b0:Outer", self.state.values)
+
+    def test_far_behind_or_reset_needs_a_snapshot(self):
+        """Test a client past the delta history, or across a reset, is told to resync"""
+        version, _ = self.state.snapshot()
+        for i in range(6):
+            self.state.publish({"held": i + 1})
+        self.assertIsNone(self.state.wait(version, 0)[1])
+        version, _ = self.state.snapshot()
+        self.state.reset({"columns": []})
+        self.assertIsNone(self.state.wait(version, 0)[1])
+
+    def test_wait_times_out_quietly(self):
+        """Test nothing new is an empty change set at the same version"""
+        version, _ = self.state.snapshot()
+        self.assertEqual(self.state.wait(version, 0.01), (version, {}))
+
+
+class TestWebRemote(unittest.TestCase):
+    """Test the event stream and POSTed actions against a running remote"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.remote = WebRemote(0, host="127.0.0.1", token=TOKEN)
+        self.remote.state.reset(GRID)
+        self.remote.start()
+        self.clients = []
+
+    def tearDown(self):
+        for client in self.clients:
+            client.close()
+        self.remote.stop()
+
+    def test_page_is_served(self):
+        """Test the control surface is served at /"""
+        conn = http.client.HTTPConnection("127.0.0.1", self.remote.port, timeout=5)
+        conn.request("GET", "/")
+        response = conn.getresponse()
+        self.assertEqual(response.status, 200)
+        self.assertIn(b"EventSource", response.read())
+        conn.close()
+
+    def test_ten_clients_get_each_delta(self):
+        """Test ten connected clients all receive a snapshot and then just the changed key"""
+        self.clients = [EventClient(self.remote.port) for _ in range(10)]
+        for client in self.clients:
+            event, data = client.next()
+            self.assertEqual(event, "snapshot")
+            self.assertEqual(data["state"]["columns"], GRID["columns"])
+        self.assertEqual(self.remote.clients, 10)
+
+        start = time.perf_counter()
+        self.remote.state.publish({button_key("Outer", 1): 1, "scene_master": False})
+        for client in self.clients:
+            event, data = client.next()
+            self.assertEqual(event, "delta")
+            self.assertEqual(data["changes"], {"b1:Outer": 1})
+        self.assertLess(time.perf_counter() - start, 1.0)
+
+    def test_presses_are_checked_and_emitted(self):
+        """Test a valid press becomes a signal and an unknown button is refused"""
+        presses = []
+        self.remote.press_requested.connect(lambda column, row: presses.append((column, row)))
+        self.assertEqual(post(self.remote.port, "/press", {"column": "Outer", "row": 1}), 204)
+        self.assertEqual(post(self.remote.port, "/press", {"column": "Nope", "row": 1}), 400)
+        self.assertEqual(post(self.remote.port, "/press", {"column": "Outer", "row": 9}), 400)
+        self.assertEqual(post(self.remote.port, "/scene", {"action": "explode"}), 400)
+        self.assertEqual(post(self.remote.port, "/press", {}), 400)
+        deadline = time.monotonic() + 2
+        while not presses and time.monotonic() < deadline:
+            self.app.processEvents()
+        self.assertEqual(presses, [("Outer", 1)])
+
+    def test_untrusted_posts_are_refused(self):
+        """Test a POST without JSON, from another page, or without the token does nothing"""
+        panics = []
+        self.remote.panic_requested.connect(panics.append)
+        port = self.remote.port
+        with self.assertLogs("resolume_colour_picker.web_remote", "WARNING"):
+            self.assertEqual(post(port, "/panic", {"name": "Blackout"}, **{"Content-Type": "text/plain"}), 415)
+            self.assertEqual(post(port, "/panic", {"name": "Blackout"}, Origin="http://evil.example"), 403)
+            self.assertEqual(post(port, "/panic", {"name": "Blackout"}, **{"X-Remote-Token": "guess"}), 403)
+        self.assertEqual(post(port, "/panic", {"name": "Blackout"}, Origin=f"http://127.0.0.1:{port}"), 204)
+        deadline = time.monotonic() + 2
+        while not panics and time.monotonic() < deadline:
+            self.app.processEvents()
+        self.assertEqual(panics, ["Blackout"])
+
+
+class TestEngineMirror(TestSceneMasterBase):
+    """Test the engine keeps the remote's state in step with the grid"""
+
+    def setUp(self):
+        super().setUp()
+        self.remote = WebRemote(0, host="127.0.0.1", token=TOKEN)
+        self.engine.remote = self.remote
+        self.engine.reset_remote()
+        self.values = self.remote.state.values
+
+    def tearDown(self):
+        self.remote.stop()
+        super().tearDown()
+
+    def test_unchanged_port_keeps_clients(self):
+        """Test a settings save that leaves WEB_REMOTE_PORT alone keeps the remote and its streams"""
+        self.engine.remote_port = "0"
+        settings = {"WEB_REMOTE_PORT": "0", "WEB_REMOTE_TOKEN": TOKEN}
+        get = self.engine.config.get.side_effect
+        self.engine.config.get.side_effect = lambda key, default=None: settings.get(key) or get(key, default)
+        self.engine.config_callback("WEB_REMOTE_PORT", "0")
+        self.assertIs(self.engine.remote, self.remote)
+
+        settings["WEB_REMOTE_TOKEN"] = "changed"
+        self.engine.config_callback("WEB_REMOTE_TOKEN", "changed")
+        self.assertIsNot(self.engine.remote, self.remote)
+        self.assertEqual(self.engine.remote.token, "changed")
+        self.assertIn("token=changed", self.engine.remote_label.text())
+        self.engine.remote.stop()
+
+    def test_snapshot_describes_the_grid(self):
+        """Test the snapshot carries columns, colours and panic names"""
+        self.assertEqual(self.values["columns"], ["ALL", "Outer", "Inner"])
+        self.assertEqual(self.values["rows"][1], ["2 - Blue", "#0000FF"])
+        self.assertEqual(list(self.values["panics"]), ["Blackout"])
+
+    def test_selections_and_scene_master_are_mirrored(self):
+        """Test live and standby buttons and the mode follow the grid"""
+        self.engine.on_press("Outer", 0, None)
+        self.assertEqual(self.remote.state.values[button_key("Outer", 0)], 1)
+        self.engine.toggle_scene_master()
+        self.engine.on_press("Outer", 2, None)
+        values = self.remote.state.values
+        self.assertTrue(values["scene_master"])
+        self.assertEqual(values[button_key("Outer", 2)], 2)
+        self.engine.cancel_scene_master()
+        values = self.remote.state.values
+        self.assertFalse(values["scene_master"])
+        self.assertNotIn(button_key("Outer", 2), values)
+        self.assertEqual(values[button_key("Outer", 0)], 1)
+
+    def test_remote_press_goes_through_dispatch(self):
+        """Test a remote press is sent like a click"""
+        self.engine.dispatcher.send = lambda targets, force=False: self.sent.update(targets)
+        self.sent = {}
+        self.engine.remote_press("Inner", 1)
+        self.assertEqual(self.sent, {("main", 2): "#0000FF"})
+        self.engine.remote_press("Gone", 0)
+        self.assertEqual(len(self.sent), 1)
+
+    def test_status_is_published(self):
+        """Test heartbeat results reach the remote"""
+        self.engine.update_status_display("Connected", 3.25, "#00FF00")
+        self.assertEqual(self.remote.state.values["status"], ["Connected", 3.2, "#00FF00"])
+
+
+if __name__ == '__main__':
+    unittest.main()